@@ -0,0 +1,9 @@
+"""
+Benchmarks
+Standalone timing scripts, run from the project root:
+
+    python -m benchmarks.<name>
+
+Each script builds its own throwaway database; the application database in
+data/ is never opened (the shared logger still writes to data/logs).
+"""
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Party balance benchmark: per-party loop vs. set-based LedgerService.get_all_party_balances
+
+Builds a throwaway database per size with invoices, purchases and payments
+for every party, then times:
+  - legacy loop:   the original five aggregate queries per party
+  - per-party:     LedgerService.get_party_balance() for each party
+  - set-based:     LedgerService.get_all_party_balances() (one query)
+
+Usage:
+    python -m benchmarks.party_balances [--parties 1000 10000]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from core.db.sqlite_db import Database
+from core.services.ledger_service import LedgerService
+
+COMPANY_ID = 1
+
+
+def _legacy_party_balance(db: Database, party_id: int) -> tuple:
+    """The pre-materialization calculation: one query per source table."""
+    q = lambda sql: float(db._query(sql, (party_id,))[0]['total'] or 0)
+    opening = float(db._query("SELECT * FROM parties WHERE id = ?", (party_id,))[0]['opening_balance'] or 0)
+    invoices = q("SELECT SUM(grand_total) as total FROM invoices WHERE party_id = ?")
+    receipts = q("SELECT SUM(amount) as total FROM payments WHERE party_id = ? AND (type = 'RECEIPT' OR type IS NULL)")
+    purchases = q("SELECT SUM(grand_total) as total FROM purchase_invoices WHERE supplier_id = ?")
+    payments = q("SELECT SUM(amount) as total FROM payments WHERE party_id = ? AND type = 'PAYMENT'")
+    return opening, invoices - receipts, purchases - payments
+
+
+def _populate(db: Database, parties: int, rnd: random.Random):
+    """Insert parties plus ~3 invoices and ~2 payments each; suppliers also get purchases."""
+    types = ['Customer', 'Customer', 'Supplier', 'Both']
+    with db.transaction():
+        db.conn.executemany(
+            "INSERT INTO parties(company_id, name, party_type, opening_balance) VALUES(?,?,?,?)",
+            [(COMPANY_ID, f"PARTY {i:06d}", rnd.choice(types), rnd.choice([0, 0, rnd.randint(1, 50000)]))
+             for i in range(parties)],
+        )
+        ids = [r[0] for r in db.conn.execute("SELECT id FROM parties WHERE company_id = ?", (COMPANY_ID,))]
+        db.conn.executemany(
+            "INSERT INTO invoices(company_id, invoice_no, date, party_id, grand_total) VALUES(?,?,?,?,?)",
+            [(COMPANY_ID, f"INV-{n:07d}", "2025-06-01", pid, rnd.randint(100, 200000))
+             for n, pid in enumerate(p for p in ids for _ in range(3))],
+        )
+        db.conn.executemany(
+            "INSERT INTO purchase_invoices(company_id, invoice_no, date, supplier_id, grand_total) VALUES(?,?,?,?,?)",
+            [(COMPANY_ID, f"PUR-{n:07d}", "2025-06-01", pid, rnd.randint(100, 200000))
+             for n, pid in enumerate(rnd.sample(ids, len(ids) // 2))],
+        )
+        db.conn.executemany(
+            "INSERT INTO payments(company_id, payment_id, party_id, amount, date, type) VALUES(?,?,?,?,?,?)",
+            [(COMPANY_ID, f"PAY-{n:07d}", pid, rnd.randint(100, 100000), "2025-06-15", rnd.choice(['RECEIPT', 'PAYMENT', None]))
+             for n, pid in enumerate(p for p in ids for _ in range(2))],
+        )
+    return ids
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def run(parties: int, seed: int = 7) -> dict:
+    """Build a database with `parties` parties and time the three strategies."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "bench.db"))
+        db.set_current_company(COMPANY_ID)
+        ledger = LedgerService(db)
+        ids = _populate(db, parties, random.Random(seed))
+
+        legacy, t_legacy = _timed(lambda: {pid: _legacy_party_balance(db, pid) for pid in ids})
+        per_party, t_per_party = _timed(lambda: [ledger.get_party_balance(pid) for pid in ids])
+        set_based, t_set = _timed(ledger.get_all_party_balances)
+
+        # Sanity check: all three agree
+        by_id = {b['party_id']: b for b in set_based}
+        assert len(by_id) == len(ids) == len(per_party)
+        for one in per_party:
+            row = by_id[one['party_id']]
+            assert abs(one['customer_balance'] - row['customer_balance']) < 0.01
+            assert abs(one['supplier_balance'] - row['supplier_balance']) < 0.01
+            opening, cust, supp = legacy[one['party_id']]
+            assert abs(cust + supp - (one['customer_balance'] + one['supplier_balance'] - opening)) < 0.01
+
+        db.close()
+    return {'parties': parties, 'legacy': t_legacy, 'per_party': t_per_party, 'set_based': t_set}
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--parties', type=int, nargs='+', default=[1000, 10000])
+    args = parser.parse_args()
+
+    print(f"{'parties':>8}  {'legacy loop':>12}  {'per-party':>12}  {'set-based':>12}  {'speed-up':>9}")
+    for n in args.parties:
+        r = run(n)
+        print(f"{r['parties']:>8}  {r['legacy'] * 1000:>10.1f}ms  {r['per_party'] * 1000:>10.1f}ms  "
+              f"{r['set_based'] * 1000:>10.1f}ms  {r['legacy'] / r['set_based']:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Row memory benchmark: dict-per-row vs. compact RowSet results
+
+Builds a throwaway database per size with that many invoices, then loads
+the invoice list both ways and reports, for each:
+  - memory:  bytes still allocated while the result list is held (tracemalloc)
+  - time:    wall time of the _query call
+
+Usage:
+    python -m benchmarks.row_memory [--invoices 20000 200000]
+"""
+
+import argparse
+import gc
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from core.db.sqlite_db import Database
+
+COMPANY_ID = 1
+LIST_SQL = "SELECT * FROM invoices WHERE company_id = ? ORDER BY id DESC"
+
+
+def _populate(db: Database, invoices: int, rnd: random.Random):
+    """Insert `invoices` invoices spread over 500 parties."""
+    with db.transaction():
+        db.conn.executemany(
+            "INSERT INTO parties(company_id, name) VALUES(?,?)",
+            [(COMPANY_ID, f"PARTY {i:04d}") for i in range(500)],
+        )
+        db.conn.executemany(
+            "INSERT INTO invoices(company_id, invoice_no, date, party_id, tax_type, bill_type, "
+            "subtotal, cgst, sgst, grand_total, balance_due, status) VALUES(?,?,?,?,?,?,?,?,?,?,?,?)",
+            [
+                (COMPANY_ID, f"INV-{n:07d}", f"2025-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}",
+                 rnd.randint(1, 500), 'GST - Same State', rnd.choice(['CASH', 'CREDIT']),
+                 subtotal, subtotal * 0.09, subtotal * 0.09, subtotal * 1.18, rnd.choice([0, subtotal * 1.18]),
+                 rnd.choice(['Paid', 'Unpaid']))
+                for n, subtotal in ((n, float(rnd.randint(100, 200000))) for n in range(invoices))
+            ],
+        )
+
+
+def _measure(load):
+    """Return (bytes held by the result, seconds to load it)."""
+    gc.collect()
+    start = time.perf_counter()
+    result = load()
+    elapsed = time.perf_counter() - start
+    del result
+
+    # Memory is traced on a second load; tracemalloc slows allocation down
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = load()
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del result
+    return held, elapsed
+
+
+def run(invoices: int, seed: int = 7) -> dict:
+    """Build a database with `invoices` invoices and measure both result modes."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "bench.db"))
+        db.set_current_company(COMPANY_ID)
+        _populate(db, invoices, random.Random(seed))
+
+        # Sanity check: both modes return the same data
+        dicts = db._query(LIST_SQL, (COMPANY_ID,))
+        rows = db._query(LIST_SQL, (COMPANY_ID,), compact=True)
+        assert len(dicts) == len(rows) == invoices
+        assert dicts[0] == dict(rows[0]) and dicts[-1] == dict(rows[-1])
+        del dicts, rows
+
+        dict_bytes, dict_time = _measure(lambda: db._query(LIST_SQL, (COMPANY_ID,)))
+        row_bytes, row_time = _measure(lambda: db._query(LIST_SQL, (COMPANY_ID,), compact=True))
+        db.close()
+    return {'invoices': invoices, 'dict_bytes': dict_bytes, 'dict_time': dict_time,
+            'row_bytes': row_bytes, 'row_time': row_time}
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--invoices', type=int, nargs='+', default=[20000, 200000])
+    args = parser.parse_args()
+
+    mb = 1024 * 1024
+    print(f"{'invoices':>9}  {'dicts':>10}  {'compact':>10}  {'saved':>6}  {'dict load':>10}  {'compact load':>12}")
+    for n in args.invoices:
+        r = run(n)
+        print(f"{r['invoices']:>9}  {r['dict_bytes'] / mb:>8.1f}MB  {r['row_bytes'] / mb:>8.1f}MB  "
+              f"{1 - r['row_bytes'] / r['dict_bytes']:>6.0%}  {r['dict_time'] * 1000:>8.0f}ms  "
+              f"{r['row_time'] * 1000:>10.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -65,7 +65,9 @@ class Config:
             "database": {
                 "path": "data/gst_billing.db",
                 "backup_enabled": True,
-                "backup_interval_days": 7
+                "backup_interval_days": 7,
+                "wal_mode": True,
+                "reader_pool_size": 4
             }
         }
     
@@ -28,6 +28,27 @@ from theme import (
 logger = get_logger(__name__)
 
 
+# The stored status ('Paid', 'Partially Paid', 'Unpaid', 'Cancelled') is kept
+# by the payment allocation triggers; only 'Overdue' depends on today and is
+# derived on read. SQL twin of InvoiceController._compute_invoice_status -
+# keep the two in step.
+_OVERDUE_DAYS = 30
+_INVOICE_STATUS_SQL = f"""
+    CASE
+        WHEN i.status = 'Unpaid' AND i.date < date('now', 'localtime', '-{_OVERDUE_DAYS} days') THEN 'Overdue'
+        ELSE COALESCE(i.status, 'Unpaid')
+    END
+"""
+
+# Amount filter label -> (min inclusive, max exclusive)
+_AMOUNT_RANGES = {
+    "Under ₹10K": (None, 10000),
+    "₹10K - ₹50K": (10000, 50000),
+    "₹50K - ₹1L": (50000, 100000),
+    "Above ₹1L": (100000, None),
+}
+
+
 @dataclass
 class InvoiceStats:
     """Data class for invoice statistics"""
@@ -243,6 +264,211 @@ class InvoiceController:
         
         return True
     
+    # ─────────────────────────────────────────────────────────────────────────
+    # Paged Queries (filters pushed down to SQL)
+    # ─────────────────────────────────────────────────────────────────────────
+    
+    def _build_invoice_where(
+        self,
+        search_text: str = "",
+        status_filter: str = "All",
+        period_filter: str = "All Time",
+        amount_filter: str = "All Amounts",
+        party_filter: str = "All Parties"
+    ) -> Tuple[str, list]:
+        """
+        Translate the list screen filters into a SQL WHERE clause.
+        
+        Same criteria as filter_invoices(); the period and company conditions
+        hit the (company_id, date) and (company_id, id) indexes.
+        
+        Returns:
+            Tuple of (where_sql, params)
+        """
+        clauses, params = [], []
+        
+        company_id = db.get_current_company_id()
+        if company_id:
+            clauses.append("i.company_id = ?")
+            params.append(company_id)
+        
+        search = (search_text or "").strip()
+        if search:
+            invoice_sql, invoice_params = db.search_subquery('invoice', search)
+            party_sql, party_params = db.search_subquery('party', search)
+            # Invoices without a party show as 'Unknown Party' and match on that label
+            unknown_sql = " OR p.name IS NULL" if search.lower() in "unknown party" else ""
+            clauses.append(f"(i.id IN ({invoice_sql}) OR i.party_id IN ({party_sql}){unknown_sql})")
+            params.extend(invoice_params + party_params)
+        
+        if status_filter and status_filter != "All":
+            # Plain comparisons on the stored status, so the (company_id, status) index applies
+            overdue_before = (date.today() - timedelta(days=_OVERDUE_DAYS)).isoformat()
+            if status_filter == "Overdue":
+                clauses.append("i.status = 'Unpaid' AND i.date < ?")
+                params.append(overdue_before)
+            elif status_filter == "Unpaid":
+                clauses.append("i.status = 'Unpaid' AND i.date >= ?")
+                params.append(overdue_before)
+            else:
+                clauses.append("i.status = ?")
+                params.append(status_filter)
+        
+        low, high = _AMOUNT_RANGES.get(amount_filter, (None, None))
+        if low is not None:
+            clauses.append("COALESCE(i.grand_total, 0) >= ?")
+            params.append(low)
+        if high is not None:
+            clauses.append("COALESCE(i.grand_total, 0) < ?")
+            params.append(high)
+        
+        if party_filter and party_filter != "All Parties":
+            clauses.append("COALESCE(p.name, 'Unknown Party') = ?")
+            params.append(party_filter)
+        
+        period = self._period_bounds(period_filter)
+        if period:
+            start, end = period
+            clauses.append("i.date >= ?")
+            params.append(start.isoformat())
+            if end:
+                clauses.append("i.date < ?")
+                params.append(end.isoformat())
+        
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+    
+    def _period_bounds(self, period_filter: str) -> Optional[Tuple[date, Optional[date]]]:
+        """Return (start, end-exclusive) dates for a period filter, or None for all time."""
+        today = date.today()
+        if period_filter == "Today":
+            return today, today + timedelta(days=1)
+        elif period_filter == "This Week":
+            return today - timedelta(days=today.weekday()), None
+        elif period_filter == "This Month":
+            start = today.replace(day=1)
+            end = (start + timedelta(days=32)).replace(day=1)
+            return start, end
+        elif period_filter == "This Year":
+            return today.replace(month=1, day=1), today.replace(year=today.year + 1, month=1, day=1)
+        return None
+    
+    @log_performance
+    def get_invoice_page(
+        self,
+        search_text: str = "",
+        status_filter: str = "All",
+        period_filter: str = "All Time",
+        amount_filter: str = "All Amounts",
+        party_filter: str = "All Parties",
+        limit: int = 49,
+        offset: int = 0
+    ) -> Tuple[List[Dict], int]:
+        """
+        Fetch one page of filtered invoices, newest first.
+        
+        Args:
+            search_text: Text to search in invoice_no, party_name
+            status_filter: Status filter ("All", "Paid", "Overdue", ...)
+            period_filter: Time period filter
+            amount_filter: Amount range filter
+            party_filter: Party name filter
+            limit: Page size
+            offset: Rows to skip
+            
+        Returns:
+            Tuple of (invoices on the page, total matching invoices)
+        """
+        try:
+            where, params = self._build_invoice_where(
+                search_text, status_filter, period_filter, amount_filter, party_filter
+            )
+            from_sql = f"""
+                FROM invoices i
+                LEFT JOIN parties p ON i.party_id = p.id
+                {where}
+            """
+            total = db._query(f"SELECT COUNT(*) AS n {from_sql}", tuple(params))[0]['n']
+            # Compact rows: a page can hold the whole list. The computed status
+            # comes last, so it is the value a row's 'status' key reads.
+            invoices = db._query(
+                f"""
+                SELECT 
+                    i.*,
+                    COALESCE(p.name, 'Unknown Party') as party_name,
+                    {_INVOICE_STATUS_SQL} as status
+                {from_sql}
+                ORDER BY i.id DESC
+                LIMIT ? OFFSET ?
+                """,
+                tuple(params) + (int(limit), int(offset)),
+                compact=True
+            )
+            return invoices, total
+        except Exception as e:
+            logger.error(f"Error fetching invoice page: {e}", exc_info=True)
+            return [], 0
+    
+    def get_invoice_stats(self) -> InvoiceStats:
+        """
+        Calculate the stat-card figures over all invoices in SQL.
+        
+        Returns:
+            InvoiceStats with computed values
+        """
+        try:
+            where, params = self._build_invoice_where()
+            row = db._query(
+                f"""
+                SELECT
+                    COUNT(*) AS total,
+                    COALESCE(SUM(i.grand_total), 0) AS total_amount,
+                    COALESCE(SUM(status = 'Paid'), 0) AS paid_count,
+                    COALESCE(SUM(status = 'Overdue'), 0) AS overdue_count
+                FROM (
+                    SELECT i.grand_total, {_INVOICE_STATUS_SQL} AS status
+                    FROM invoices i
+                    LEFT JOIN parties p ON i.party_id = p.id
+                    {where}
+                ) i
+                """,
+                tuple(params)
+            )[0]
+            return InvoiceStats(
+                total=row['total'],
+                total_amount=float(row['total_amount'] or 0),
+                paid_count=row['paid_count'],
+                overdue_count=row['overdue_count']
+            )
+        except Exception as e:
+            logger.error(f"Error calculating invoice stats: {e}", exc_info=True)
+            return InvoiceStats()
+    
+    def get_invoice_party_names(self) -> List[str]:
+        """
+        Get the sorted, distinct party names that appear on invoices.
+        
+        Returns:
+            Sorted list of unique party names
+        """
+        try:
+            where, params = self._build_invoice_where()
+            where = f"{where} AND" if where else "WHERE"
+            rows = db._query(
+                f"""
+                SELECT DISTINCT p.name AS party_name
+                FROM invoices i
+                JOIN parties p ON i.party_id = p.id
+                {where} p.name IS NOT NULL AND p.name != 'Unknown Party'
+                ORDER BY p.name
+                """,
+                tuple(params)
+            )
+            return [r['party_name'] for r in rows]
+        except Exception as e:
+            logger.error(f"Error fetching invoice party names: {e}", exc_info=True)
+            return []
+    
     # ─────────────────────────────────────────────────────────────────────────
     # Statistics
     # ─────────────────────────────────────────────────────────────────────────
@@ -334,7 +560,8 @@ class InvoiceController:
     
     def _compute_invoice_status(self, invoice: Dict) -> str:
         """
-        Compute invoice status based on business rules.
+        Display status of an invoice: the stored status, or 'Overdue' for an
+        unpaid invoice older than 30 days.
         
         Args:
             invoice: Invoice dictionary
@@ -342,44 +569,24 @@ class InvoiceController:
         Returns:
             Status string ('Paid', 'Partially Paid', 'Unpaid', 'Overdue', 'Cancelled')
         """
-        # Check for explicit status
-        explicit_status = invoice.get('status')
-        if explicit_status and explicit_status in ('Paid', 'Cancelled'):
-            return explicit_status
-        
-        grand_total = float(invoice.get('grand_total', 0) or 0)
-        balance_due = float(invoice.get('balance_due', grand_total) or grand_total)
-        
-        # Paid if no balance due
-        if balance_due <= 0 and grand_total > 0:
-            return 'Paid'
-        
-        # Partially Paid if some payment received but balance remains
-        if 0 < balance_due < grand_total and grand_total > 0:
-            return 'Partially Paid'
+        status = invoice.get('status') or 'Unpaid'
+        if status != 'Unpaid':
+            return status
         
-        # Check for overdue (older than 30 days with balance)
         invoice_date = invoice.get('date')
-        if invoice_date and balance_due > 0:
-            try:
-                if isinstance(invoice_date, str):
-                    inv_date = datetime.strptime(invoice_date, "%Y-%m-%d").date()
-                elif isinstance(invoice_date, (date, datetime)):
-                    inv_date = invoice_date if isinstance(invoice_date, date) else invoice_date.date()
-                else:
-                    inv_date = None
-                
-                if inv_date:
-                    days_old = (date.today() - inv_date).days
-                    if days_old > 30:
-                        return 'Overdue'
-            except (ValueError, TypeError):
-                pass
-        
-        # Default to Unpaid if has value
-        if grand_total > 0:
-            return 'Unpaid'
-        return 'Unpaid'
+        try:
+            if isinstance(invoice_date, str):
+                inv_date = datetime.strptime(invoice_date, "%Y-%m-%d").date()
+            elif isinstance(invoice_date, (date, datetime)):
+                inv_date = invoice_date if isinstance(invoice_date, date) else invoice_date.date()
+            else:
+                inv_date = None
+            
+            if inv_date and (date.today() - inv_date).days > _OVERDUE_DAYS:
+                return 'Overdue'
+        except (ValueError, TypeError):
+            pass
+        return status
     
     def get_invoice_status_color(self, status: str) -> Tuple[str, str]:
         """
@@ -433,46 +640,61 @@ class InvoiceFormController:
     # Invoice Number Generation
     # ─────────────────────────────────────────────────────────────────────────
     
+    # Sales invoices are numbered from the plain "INV" series: INV-00001, INV-00002, ...
+    SERIES_PREFIX = "INV"
+    
+    def _format_invoice_number(self, number: int) -> str:
+        return f"{self.SERIES_PREFIX}-{number:05d}"
+    
+    def _series_number(self, invoice_no: str) -> Optional[int]:
+        """Number within the invoice series, or None for a custom invoice number."""
+        prefix, sep, digits = (invoice_no or '').partition('-')
+        if prefix != self.SERIES_PREFIX or not sep or not digits.isdigit():
+            return None
+        return int(digits)
+    
     def generate_next_invoice_number(self) -> str:
         """
         Generate the next sequential invoice number.
         
+        Reads the number series counter (one row lookup); the number is
+        only taken when the invoice is saved.
+        
         Returns:
             Next invoice number string (e.g., "INV-00001")
         """
         try:
-            company_id = db.get_current_company_id()
-            
-            # Get all invoices and find the highest number
-            if hasattr(db, '_query') and company_id:
-                invoices = db._query(
-                    "SELECT invoice_no FROM invoices WHERE company_id = ? ORDER BY id DESC LIMIT 100",
-                    (company_id,)
-                )
-            else:
-                invoices = db.get_invoices() or []
-            
-            max_num = 0
-            for inv in invoices:
-                inv_no = inv.get('invoice_no', '')
-                # Extract number from patterns like "INV-00001" or "00001"
-                if inv_no:
-                    # Try to extract numeric part
-                    parts = inv_no.split('-')
-                    try:
-                        num = int(parts[-1]) if parts else int(inv_no)
-                        max_num = max(max_num, num)
-                    except ValueError:
-                        continue
-            
-            next_num = max_num + 1
-            return f"INV-{next_num:05d}"
+            return self._format_invoice_number(db.peek_series_number(self.SERIES_PREFIX))
             
         except Exception as e:
             print(f"Error generating invoice number: {e}")
             import random
             return f"INV-{random.randint(10000, 99999)}"
     
+    def _allocate_invoice_number(self, invoice_no: str) -> str:
+        """
+        Take a new invoice's number from the series. Call inside the save transaction.
+        
+        The pre-filled number normally comes back unchanged. If another
+        counter saved it first, or an invoice saved outside the series
+        already has it, the next free number is returned instead.
+        
+        Args:
+            invoice_no: Number shown on the form
+            
+        Returns:
+            Invoice number to save
+        """
+        number = self._series_number(invoice_no)
+        if number is None:
+            return invoice_no  # custom number, outside the series
+        if number < db.peek_series_number(self.SERIES_PREFIX) and not self.invoice_number_exists(invoice_no):
+            return invoice_no  # user deliberately re-used an unused earlier number
+        allocated = db.allocate_series_number(self.SERIES_PREFIX, minimum=number)
+        while self.invoice_number_exists(self._format_invoice_number(allocated)):
+            allocated = db.allocate_series_number(self.SERIES_PREFIX)
+        return self._format_invoice_number(allocated)
+    
     def invoice_number_exists(self, invoice_no: str) -> bool:
         """
         Check if an invoice number already exists.
@@ -513,6 +735,10 @@ class InvoiceFormController:
         if not self.invoice_number_exists(invoice_no):
             return invoice_no
         
+        # A taken series number moves on to the next one in the series
+        if self._series_number(invoice_no) is not None:
+            return self.generate_next_invoice_number()
+        
         # Append suffix to make unique
         base = invoice_no
         suffix = 1
@@ -863,78 +1089,45 @@ class InvoiceFormController:
             invoice_data['igst'] = igst_total
             invoice_data['grand_total'] = grand_total
             
-            # Calculate balance_due based on bill type
-            # CASH invoices: balance_due = 0 (fully paid immediately)
-            # CREDIT invoices: balance_due = grand_total (payment tracking needed)
-            bill_type = invoice_data.get('bill_type', 'CASH')
-            if bill_type == 'CASH':
-                invoice_data['balance_due'] = 0.0  # CASH: No balance due (fully paid)
-            else:
-                invoice_data['balance_due'] = grand_total  # CREDIT: Full amount is due
-            
-            # Compute status based on balance_due and grand_total
-            # Logic:
-            # - If balance_due == 0: 'Paid'
-            # - If balance_due == grand_total: 'Unpaid'
-            # - If grand_total > balance_due > 0: 'Partial Paid'
-            balance_due = invoice_data.get('balance_due', 0)
-            if balance_due == 0:
-                computed_status = 'Paid'
-            elif balance_due == grand_total:
-                computed_status = 'Unpaid'
-            elif 0 < balance_due < grand_total:
-                computed_status = 'Partial Paid'
-            else:
-                # Default for edge cases
-                computed_status = 'Unpaid'
-            invoice_data['status'] = computed_status
-            
+            # balance_due and status are settled by the database from the
+            # invoice's amount_paid (CASH bills count as paid in full), in
+            # the same transaction as the write
             invoice_id = invoice_data.get('id')
             
-            if invoice_id:
-                # Update existing invoice
-                db.update_invoice(invoice_data)
-                # Delete old items and add new ones
-                if hasattr(db, 'delete_invoice_items'):
-                    db.delete_invoice_items(invoice_id)
-            else:
-                # Create new invoice
-                invoice_id = db.add_invoice(
-                    invoice_no=invoice_data.get('invoice_no'),
-                    date=invoice_data.get('date'),
-                    party_id=invoice_data.get('party_id'),
-                    tax_type=invoice_data.get('invoice_type', 'GST - Same State'),
-                    subtotal=invoice_data.get('subtotal', 0),
-                    cgst=invoice_data.get('cgst', 0),
-                    sgst=invoice_data.get('sgst', 0),
-                    igst=invoice_data.get('igst', 0),
-                    round_off=invoice_data.get('round_off', 0),
-                    grand_total=invoice_data.get('grand_total', 0),
-                    status=invoice_data.get('status', 'Unpaid'),
-                    bill_type=invoice_data.get('bill_type', 'CASH'),
-                    discount=invoice_data.get('total_discount', 0),
-                    balance_due=invoice_data.get('balance_due', 0),
-                    notes=invoice_data.get('notes')
-                )
-            
-            # Save items
-            if invoice_id:
-                for item in items:
-                    db.add_invoice_item(
-                        invoice_id=invoice_id,
-                        product_id=item.get('product_id', 0),
-                        product_name=item.get('product_name', ''),
-                        hsn_code=item.get('hsn_code'),
-                        quantity=item.get('quantity', 0),
-                        unit=item.get('unit', 'Piece'),
-                        rate=item.get('rate', 0),
-                        discount_percent=item.get('discount_percent', 0),
-                        discount_amount=item.get('discount_amount', 0),
-                        tax_percent=item.get('tax_percent', 0),
-                        tax_amount=item.get('tax_amount', 0),
-                        amount=item.get('amount', 0)
+            with db.transaction():
+                previous_items = []
+                if invoice_id:
+                    # Update existing invoice
+                    db.update_invoice(invoice_data)
+                    # Delete old items and add new ones
+                    if hasattr(db, 'delete_invoice_items'):
+                        previous_items = db.get_invoice_items(invoice_id)
+                        db.delete_invoice_items(invoice_id)
+                else:
+                    # Create new invoice, taking its number from the series
+                    invoice_data['invoice_no'] = self._allocate_invoice_number(invoice_data.get('invoice_no'))
+                    invoice_id = db.add_invoice(
+                        invoice_no=invoice_data.get('invoice_no'),
+                        date=invoice_data.get('date'),
+                        party_id=invoice_data.get('party_id'),
+                        tax_type=invoice_data.get('invoice_type', 'GST - Same State'),
+                        subtotal=invoice_data.get('subtotal', 0),
+                        cgst=invoice_data.get('cgst', 0),
+                        sgst=invoice_data.get('sgst', 0),
+                        igst=invoice_data.get('igst', 0),
+                        round_off=invoice_data.get('round_off', 0),
+                        grand_total=invoice_data.get('grand_total', 0),
+                        bill_type=invoice_data.get('bill_type', 'CASH'),
+                        discount=invoice_data.get('total_discount', 0),
+                        notes=invoice_data.get('notes')
                     )
             
+                # Save items and take them out of stock (on an edit, only the
+                # change from the old items; untracked products are skipped)
+                if invoice_id:
+                    db.add_invoice_items(invoice_id, items)
+                    db.update_stock_for_sales_items(items, previous_items)
+            
             return True, "Invoice saved successfully!", invoice_id
             
         except Exception as e:
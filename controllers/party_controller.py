@@ -16,6 +16,7 @@ from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
 from core.services.party_service import PartyService
+from core.services.ledger_service import LedgerService
 from core.db.sqlite_db import db
 from core.logger import get_logger, log_performance, UserActionLogger
 from core.error_handler import ErrorHandler, handle_errors
@@ -48,6 +49,7 @@ class PartyController:
     def __init__(self):
         """Initialize controller with service reference."""
         self._service = PartyService(db)
+        self._ledger = LedgerService(db)
     
     # ─────────────────────────────────────────────────────────────────────────
     # Data Fetching
@@ -65,7 +67,7 @@ class PartyController:
             logger.debug("Fetching all parties")
             
             # db.get_parties() already handles company filtering internally
-            parties = db.get_parties() or []
+            parties = db.get_parties(compact=True) or []
             
             logger.info(f"Successfully fetched {len(parties)} parties")
             return parties
@@ -102,30 +104,37 @@ class PartyController:
             List of matching party dictionaries
         """
         try:
-            parties = self.get_all_parties()
-            
             if not query:
+                parties = self.get_all_parties()
                 if party_type:
                     return [p for p in parties if p.get('party_type') == party_type]
                 return parties
             
-            query_lower = query.lower()
-            results = []
-            
-            for party in parties:
-                # Match by name, mobile, or GSTIN
-                if (query_lower in party.get('name', '').lower() or
-                    query_lower in party.get('mobile', '').lower() or
-                    query_lower in party.get('gstin', '').lower()):
-                    
-                    if party_type is None or party.get('party_type') == party_type:
-                        results.append(party)
-            
+            # Match by name, mobile, or GSTIN (full-text index, best match first)
+            results = db.search_parties(query, limit=None)
+            if party_type:
+                results = [p for p in results if p.get('party_type') == party_type]
             return results
         except Exception as e:
             print(f"Error searching parties: {e}")
             return []
     
+    def search_party_ids(self, query: str) -> set:
+        """
+        Get the ids of all parties whose name, mobile or GSTIN contains the query.
+        
+        Args:
+            query: Search query
+            
+        Returns:
+            Set of matching party ids
+        """
+        try:
+            return set(db.search('party', query, limit=None))
+        except Exception as e:
+            logger.error(f"Error searching parties: {e}", exc_info=True)
+            return set()
+    
     def get_customers(self) -> List[Dict]:
         """
         Fetch all customers.
@@ -156,16 +165,16 @@ class PartyController:
             PartyStats dataclass with totals
         """
         try:
-            parties = self.get_all_parties()
+            # One query for every party's balance; net > 0 means they owe us
+            balances = self._ledger.get_all_party_balances()
+            net = [b['customer_balance'] - b['supplier_balance'] for b in balances]
             
             stats = PartyStats(
-                total=len(parties),
-                customers=sum(1 for p in parties if p.get('party_type') in ['Customer', 'Both']),
-                suppliers=sum(1 for p in parties if p.get('party_type') in ['Supplier', 'Both']),
-                receivable_amount=sum(float(p.get('balance', 0) or 0) for p in parties 
-                                     if float(p.get('balance', 0) or 0) > 0),
-                payable_amount=abs(sum(float(p.get('balance', 0) or 0) for p in parties 
-                                      if float(p.get('balance', 0) or 0) < 0))
+                total=len(balances),
+                customers=sum(1 for b in balances if b['party_type'] in ['customer', 'both']),
+                suppliers=sum(1 for b in balances if b['party_type'] in ['supplier', 'both']),
+                receivable_amount=round(sum(n for n in net if n > 0), 2),
+                payable_amount=round(abs(sum(n for n in net if n < 0)), 2)
             )
             return stats
         except Exception as e:
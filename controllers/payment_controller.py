@@ -65,7 +65,7 @@ class PaymentController:
         """
         try:
             logger.debug("Fetching all payments from service")
-            all_payments = self._service.get_payments(payment_type='PAYMENT')
+            all_payments = self._service.get_payments(payment_type='PAYMENT', compact=True)
             logger.info(f"🔄 Fetched {len(all_payments) if all_payments else 0} TOTAL payments from database")
             return all_payments or []
         except Exception as e:
@@ -173,11 +173,10 @@ class ProductController:
         """
         try:
             logger.debug("Fetching all products from database")
-            products = db.get_products()
+            products = db.get_products(compact=True)
             if products:
-                result = [dict(p) if hasattr(p, 'keys') else p for p in products]
-                logger.info(f"Successfully fetched {len(result)} products")
-                return result
+                logger.info(f"Successfully fetched {len(products)} products")
+                return products
             logger.debug("No products found in database")
             return []
         except Exception as e:
@@ -77,7 +77,7 @@ class PurchaseController:
                         WHERE pi.company_id = ?
                         ORDER BY pi.id DESC
                     """
-                    purchases = db._query(query, (company_id,))
+                    purchases = db._query(query, (company_id,), compact=True)
                 else:
                     query = """
                         SELECT 
@@ -87,7 +87,7 @@ class PurchaseController:
                         LEFT JOIN parties p ON pi.supplier_id = p.id
                         ORDER BY pi.id DESC
                     """
-                    purchases = db._query(query)
+                    purchases = db._query(query, compact=True)
             else:
                 # Fallback to basic method
                 purchases = db.get_purchase_invoices() or []
@@ -103,9 +103,11 @@ class PurchaseController:
                     else:
                         purchase['party_name'] = 'Unknown Supplier'
             
-            # Add computed status to each purchase
+            # Add computed status to each purchase (only rows whose stored status differs)
             for purchase in purchases:
-                purchase['status'] = self._compute_purchase_status(purchase)
+                status = self._compute_purchase_status(purchase)
+                if purchase.get('status') != status:
+                    purchase['status'] = status
             
             return list(purchases) if purchases else []
             
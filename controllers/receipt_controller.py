@@ -66,7 +66,7 @@ class ReceiptController:
         """
         try:
             # Get all receipts (RECEIPT type = money IN from customers)
-            all_receipts = self._service.get_payments(payment_type='RECEIPT')
+            all_receipts = self._service.get_payments(payment_type='RECEIPT', compact=True)
             
             # Calculate stats on unfiltered data
             stats = self._calculate_stats(all_receipts)
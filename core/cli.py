@@ -0,0 +1,38 @@
+"""
+Command-line helpers shared by the export scripts (export_gstr1.py,
+export_einvoices.py)
+"""
+
+import argparse
+import calendar
+from typing import Tuple
+
+
+def period_range(period: str) -> Tuple[str, str]:
+    """'MMYYYY' -> (first day, last day) as YYYY-MM-DD."""
+    month, year = int(period[:2]), int(period[2:])
+    last_day = calendar.monthrange(year, month)[1]
+    return f"{year:04d}-{month:02d}-01", f"{year:04d}-{month:02d}-{last_day:02d}"
+
+
+def add_period_arguments(parser: argparse.ArgumentParser):
+    """Add --period, --from and --to to a parser."""
+    parser.add_argument('--period', help="Return period as MMYYYY")
+    parser.add_argument('--from', dest='from_date', help="First day (YYYY-MM-DD), instead of --period")
+    parser.add_argument('--to', dest='to_date', help="Last day (YYYY-MM-DD), instead of --period")
+
+
+def parse_period(parser: argparse.ArgumentParser, args: argparse.Namespace) -> Tuple[str, str]:
+    """
+    (from_date, to_date) of the arguments added by add_period_arguments.
+
+    Exits through parser.error when neither a valid --period nor both
+    --from and --to were given.
+    """
+    if args.period:
+        if len(args.period) != 6 or not args.period.isdigit() or not 1 <= int(args.period[:2]) <= 12:
+            parser.error("--period must be MMYYYY")
+        return period_range(args.period)
+    if args.from_date and args.to_date:
+        return args.from_date, args.to_date
+    parser.error("give --period, or both --from and --to")
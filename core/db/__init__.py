@@ -3,5 +3,6 @@ Database module - SQLite database implementation
 """
 
 from .sqlite_db import db, Database
+from .rows import Row, RowSet
 
-__all__ = ['db', 'Database']
+__all__ = ['db', 'Database', 'Row', 'RowSet']
@@ -0,0 +1,118 @@
+"""In-process cache of the product and party catalogues.
+
+`Database.get_products()` / `get_parties()` and the `get_*_by_id` lookups
+are served from here once a company's catalogue has been loaded. Entries
+are dropped by the Database write methods that touch the table
+(`invalidate`) and whenever `PRAGMA data_version` shows another process
+committed to the file.
+
+Callers always get fresh row objects (or dicts) over shared value tuples,
+so decorating a returned row never leaks into the cache.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from core.db.rows import Row, RowSet
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class CatalogueCache:
+    """Per-company copies of whole tables, keyed by (table, company_id)."""
+
+    TABLES = ('products', 'parties')
+
+    def __init__(self, data_version: Callable[[], int]):
+        """
+        Args:
+            data_version: Returns the writer connection's PRAGMA data_version,
+                which changes only when another connection commits
+        """
+        self._data_version = data_version
+        self._last_version = None
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, Optional[int]], Tuple[RowSet, Dict[Any, Row]]] = {}
+        # Bumped by invalidate(); a load that raced with a write is not stored
+        self._generation = {table: 0 for table in self.TABLES}
+
+    def _check_external_changes(self):
+        version = self._data_version()
+        if version != self._last_version:
+            if self._last_version is not None:
+                logger.debug("Database changed by another connection, clearing catalogue cache")
+            self._last_version = version
+            self._drop(self.TABLES)
+
+    def _entry(self, table: str, company_id: Optional[int], load: Callable[[], RowSet]):
+        key = (table, company_id)
+        with self._lock:
+            self._check_external_changes()
+            entry = self._entries.get(key)
+            generation = self._generation[table]
+        if entry is not None:
+            return entry
+        rows = load()
+        entry = (rows, {row['id']: row for row in rows})
+        with self._lock:
+            if self._generation[table] == generation:
+                self._entries[key] = entry
+        return entry
+
+    def rows(self, table: str, company_id: Optional[int], load: Callable[[], RowSet],
+             compact: bool = False):
+        """
+        Whole catalogue for a company, loading it on first use.
+
+        Args:
+            table: 'products' or 'parties'
+            company_id: Current company (None for all companies)
+            load: Fetches the table as a compact RowSet on a miss
+            compact: Return a RowSet instead of a list of dicts
+
+        Returns:
+            Fresh RowSet or list of dicts, in the order load() returned
+        """
+        rows, _ = self._entry(table, company_id, load)
+        if compact:
+            return RowSet(rows.columns, [Row(row._index, row._values) for row in rows])
+        return rows.to_dicts()
+
+    def row_by_id(self, table: str, company_id: Optional[int], row_id,
+                  load: Callable[[], RowSet]) -> Optional[Dict]:
+        """One row of a company's catalogue as a dict, or None if it is not in it."""
+        _, by_id = self._entry(table, company_id, load)
+        row = by_id.get(row_id)
+        return dict(row) if row is not None else None
+
+    def refresh(self, table: str, fresh: RowSet):
+        """
+        Replace cached rows with newly read versions of the same rows.
+
+        Used for narrow updates such as stock changes, where re-reading the
+        whole catalogue for a few changed rows would be wasteful. Rows that
+        are not cached are ignored.
+        """
+        by_id = {row['id']: row for row in fresh}
+        with self._lock:
+            self._generation[table] += 1
+            for key, (rows, index) in list(self._entries.items()):
+                if key[0] != table:
+                    continue
+                if rows.columns != fresh.columns:
+                    del self._entries[key]
+                    continue
+                rows = RowSet(rows.columns, [by_id.get(row['id'], row) for row in rows])
+                self._entries[key] = (rows, {row['id']: row for row in rows})
+
+    def invalidate(self, table: Optional[str] = None):
+        """Drop cached catalogues for one table (all tables when None)."""
+        with self._lock:
+            self._drop((table,) if table else self.TABLES)
+
+    def _drop(self, tables):
+        # Caller holds self._lock
+        for name in tables:
+            self._generation[name] += 1
+        self._entries = {key: entry for key, entry in self._entries.items() if key[0] not in tables}
@@ -0,0 +1,53 @@
+"""Per-table change counters.
+
+`Database._execute` / `_executemany` bump the counter of the table each
+write statement targets. A screen remembers `db.get_change_version(...)`
+for the tables its data comes from and skips reloading while it is
+unchanged. Commits from other processes are picked up through the writer
+connection's `PRAGMA data_version`, which changes every version at once.
+"""
+
+import re
+import threading
+from typing import Callable, Optional
+
+# Target table of an INSERT / REPLACE / UPDATE / DELETE statement
+_WRITE_TABLE_RE = re.compile(
+    r"^\s*(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM)\s+[\"`\[]?(\w+)",
+    re.IGNORECASE,
+)
+
+
+def written_table(sql: str) -> Optional[str]:
+    """Table a write statement targets, or None for anything else (DDL, PRAGMA, ...)."""
+    match = _WRITE_TABLE_RE.match(sql)
+    return match.group(1).lower() if match else None
+
+
+class ChangeVersions:
+    """Write counters per table, combined with PRAGMA data_version."""
+
+    def __init__(self, data_version: Callable[[], int]):
+        """
+        Args:
+            data_version: Returns the writer connection's PRAGMA data_version
+        """
+        self._data_version = data_version
+        self._lock = threading.Lock()
+        self._counters = {}
+
+    def bump(self, table: str):
+        """Record a write to `table`."""
+        table = table.lower()
+        with self._lock:
+            self._counters[table] = self._counters.get(table, 0) + 1
+
+    def version(self, *tables: str) -> tuple:
+        """
+        Opaque token that changes whenever any of `tables` is written.
+
+        Compare tokens for equality only; they are not ordered.
+        """
+        with self._lock:
+            counters = tuple(self._counters.get(t.lower(), 0) for t in tables)
+        return (self._data_version(),) + counters
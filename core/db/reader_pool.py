@@ -0,0 +1,76 @@
+"""Read-only SQLite connection pool.
+
+Used by `Database._query` when the database runs in WAL mode: readers get
+their own connections and never wait on (or block) the single writer
+connection that handles every INSERT/UPDATE/DELETE.
+"""
+
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from urllib.request import pathname2url
+
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ReaderPool:
+    """Small, lazily-filled pool of read-only connections to one database file."""
+
+    def __init__(self, path: str, size: int = 4, timeout: float = 20.0):
+        self.path = path
+        self.size = max(1, int(size))
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._all = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _connect(self) -> sqlite3.Connection:
+        uri = f"file:{pathname2url(self.path)}?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False, timeout=self.timeout)
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA busy_timeout={int(self.timeout * 1000)}")
+        logger.debug(f"Opened reader connection {len(self._all) + 1}/{self.size}")
+        return conn
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._closed:
+                raise sqlite3.ProgrammingError("Reader pool is closed")
+            if len(self._all) < self.size:
+                conn = self._connect()
+                self._all.append(conn)
+                return conn
+        # Pool exhausted - wait for another reader to finish
+        return self._idle.get(timeout=self.timeout)
+
+    @contextmanager
+    def connection(self):
+        """Borrow a reader connection for the duration of the block."""
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            # End any implicit read transaction so the WAL can checkpoint
+            if conn.in_transaction:
+                conn.rollback()
+            self._idle.put(conn)
+
+    def close(self):
+        """Close every connection owned by the pool."""
+        with self._lock:
+            self._closed = True
+            for conn in self._all:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._all = []
+        self._idle = queue.LifoQueue()
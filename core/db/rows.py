@@ -0,0 +1,133 @@
+"""Compact query results.
+
+`Database._query(..., compact=True)` returns a `RowSet` of `Row` objects
+instead of a list of dicts. Each row keeps its values in one tuple and
+shares the column -> position map with every other row of the result, so
+a large list costs a fraction of the memory of dict-per-row results.
+
+Rows read like the dicts they replace (`row['name']`, `row.get('name')`,
+`dict(row)`) and also allow attribute access (`row.name`). Assigning a key
+stores an override on that row only, which keeps the controller habit of
+decorating rows (`row['status'] = ...`) working.
+"""
+
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+_DELETED = object()
+
+# A column whose first values are mostly distinct (invoice numbers, names)
+# gains nothing from sharing; skip it.
+_SAMPLE_SIZE = 256
+_SHARED_TYPES = (str, float)
+
+
+def _share_repeats(values: tuple) -> tuple:
+    """Replace equal strings/floats in one column with a single shared object."""
+    sample = [v for v in values[:_SAMPLE_SIZE] if type(v) in _SHARED_TYPES]
+    if not sample or len(set(sample)) > len(sample) // 2:
+        return values
+    seen = {}
+    return tuple([seen.setdefault(v, v) if type(v) in _SHARED_TYPES else v for v in values])
+
+
+class Row(MutableMapping):
+    """One result row: a values tuple plus the shared column index."""
+
+    __slots__ = ('_index', '_values', '_extra')
+
+    def __init__(self, index: Dict[str, int], values: tuple):
+        self._index = index
+        self._values = values
+        self._extra = None  # per-row overrides, created on first assignment
+
+    def __getitem__(self, key):
+        extra = self._extra
+        if extra is not None and key in extra:
+            value = extra[key]
+            if value is _DELETED:
+                raise KeyError(key)
+            return value
+        try:
+            return self._values[self._index[key]]
+        except KeyError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        if self._extra is None:
+            self._extra = {}
+        self._extra[key] = value
+
+    def __delitem__(self, key):
+        self[key]  # KeyError for unknown or already deleted keys
+        if key in self._index:
+            self[key] = _DELETED
+        else:
+            del self._extra[key]
+
+    def __iter__(self) -> Iterator[str]:
+        extra = self._extra
+        if extra is None:
+            yield from self._index
+            return
+        for key in self._index:
+            if extra.get(key) is not _DELETED:
+                yield key
+        for key, value in extra.items():
+            if key not in self._index and value is not _DELETED:
+                yield key
+
+    def __len__(self) -> int:
+        if self._extra is None:
+            return len(self._values)
+        return sum(1 for _ in self)
+
+    def __contains__(self, key) -> bool:
+        extra = self._extra
+        if extra is not None and key in extra:
+            return extra[key] is not _DELETED
+        return key in self._index
+
+    def __getattr__(self, name):
+        # Only reached for names that are not methods or slots
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __repr__(self) -> str:
+        return f"Row({dict(self)!r})"
+
+    def copy(self) -> Dict[str, Any]:
+        """Plain dict copy, safe to mutate or serialize."""
+        return dict(self)
+
+
+class RowSet(list):
+    """List of `Row` objects sharing one column index."""
+
+    __slots__ = ('columns',)
+
+    def __init__(self, columns: Sequence[str] = (), rows: List[Row] = ()):
+        super().__init__(rows)
+        self.columns = tuple(columns)
+
+    @classmethod
+    def from_rows(cls, columns: Sequence[str], rows: Sequence[Tuple]) -> 'RowSet':
+        """Build a row set from raw value tuples (or sqlite3.Row objects).
+
+        sqlite3 creates a new object for every text and real cell, so a date,
+        status or 0.0 balance repeated across 200k rows is stored 200k times.
+        Repeated values are collapsed to one shared object per column.
+        """
+        index = {name: i for i, name in enumerate(columns)}
+        if not rows:
+            return cls(columns)
+        by_column = [_share_repeats(values) for values in zip(*rows)]
+        return cls(columns, [Row(index, values) for values in zip(*by_column)])
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Materialize every row as a plain dict."""
+        return [dict(row) for row in self]
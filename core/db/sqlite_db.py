@@ -7,10 +7,17 @@ screens. Data is stored in a local SQLite file configured via
 
 import json
 import os
+import re
 import sqlite3
+import threading
 import time
-from typing import List, Dict, Optional, Any
+from contextlib import contextmanager, nullcontext
+from typing import List, Dict, Iterator, Optional, Any
 from core.logger import get_logger, log_performance, SQLLogger
+from core.db.reader_pool import ReaderPool
+from core.db.rows import RowSet
+from core.db.catalogue_cache import CatalogueCache
+from core.db.change_versions import ChangeVersions, written_table
 
 logger = get_logger(__name__)
 
@@ -20,36 +27,481 @@ def _get_project_root() -> str:
     return os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 
-def _load_db_path() -> str:
-    project_root = _get_project_root()
-    cfg_path = os.path.join(project_root, 'data', 'config.json')
+def _load_db_settings() -> Dict[str, Any]:
+    """Read the `database` section of data/config.json (empty dict on error)."""
+    cfg_path = os.path.join(_get_project_root(), 'data', 'config.json')
     try:
         with open(cfg_path, 'r', encoding='utf-8') as f:
             cfg = json.load(f)
-        db_path = cfg.get('database', {}).get('path') or 'data/gst_billing.db'
+        return cfg.get('database', {}) or {}
     except Exception:
-        db_path = 'data/gst_billing.db'
+        return {}
+
+
+def _load_db_path() -> str:
+    project_root = _get_project_root()
+    db_path = _load_db_settings().get('path') or 'data/gst_billing.db'
     # Ensure directory exists
     abs_path = os.path.join(project_root, db_path)
     os.makedirs(os.path.dirname(abs_path), exist_ok=True)
     return abs_path
 
 
+# Secondary indexes managed by the schema step: (name, table, column list).
+# Every company-scoped list screen filters on company_id and orders by id,
+# and the ledger / item lookups filter on the parent foreign key.
+_INDEXES = [
+    ("idx_invoices_company_id", "invoices", "company_id, id"),
+    ("idx_invoices_company_date", "invoices", "company_id, date"),
+    ("idx_invoices_company_no", "invoices", "company_id, invoice_no"),
+    ("idx_invoices_party", "invoices", "party_id"),
+    ("idx_invoices_company_status", "invoices", "company_id, status"),
+    ("idx_invoice_items_invoice", "invoice_items", "invoice_id"),
+    # Covers the line columns GST returns sum, so they are read from the index alone
+    ("idx_invoice_items_gst", "invoice_items",
+     "invoice_id, tax_percent, hsn_code, unit, product_id, quantity, amount, discount_amount, tax_amount"),
+    ("idx_payments_company_id", "payments", "company_id, id"),
+    ("idx_payments_company_date", "payments", "company_id, date"),
+    ("idx_payments_party_type", "payments", "party_id, type"),
+    ("idx_payments_invoice", "payments", "invoice_id"),
+    ("idx_payment_allocations_payment", "payment_allocations", "payment_id"),
+    ("idx_payment_allocations_invoice", "payment_allocations", "invoice_id"),
+    ("idx_parties_company_id", "parties", "company_id, id"),
+    ("idx_parties_company_name", "parties", "company_id, name COLLATE NOCASE"),
+    ("idx_products_company_id", "products", "company_id, id"),
+    ("idx_products_company_name", "products", "company_id, name COLLATE NOCASE"),
+    ("idx_products_company_barcode", "products", "company_id, barcode"),
+    ("idx_purchase_invoices_company_id", "purchase_invoices", "company_id, id"),
+    ("idx_purchase_invoices_company_date", "purchase_invoices", "company_id, date"),
+    ("idx_purchase_invoices_supplier", "purchase_invoices", "supplier_id"),
+    ("idx_purchase_invoice_items_invoice", "purchase_invoice_items", "purchase_invoice_id"),
+]
+
+# Managed indexes that a UNIQUE constraint on a single column makes redundant:
+# index name -> (table, column). Databases from before the company column
+# declare invoice_no UNIQUE, and SQLite answers the invoice number lookup
+# from that autoindex, so there the managed index is dropped rather than kept
+# as write cost only.
+_INDEXES_UNLESS_UNIQUE = {
+    "idx_invoices_company_no": ("invoices", "invoice_no"),
+}
+
+# Representative hot-path queries used by index_report() to show which
+# managed index (if any) SQLite picks for each of them.
+_INDEX_PROBE_QUERIES = {
+    "invoice list": ("SELECT * FROM invoices WHERE company_id = ? ORDER BY id DESC", (0,)),
+    "invoices by period": ("SELECT * FROM invoices WHERE company_id = ? AND date BETWEEN ? AND ?", (0, '', '')),
+    "invoice number lookup": ("SELECT 1 FROM invoices WHERE company_id = ? AND invoice_no = ?", (0, '')),
+    "party ledger (sales)": ("SELECT SUM(grand_total) FROM invoices WHERE party_id = ?", (0,)),
+    "party ledger (receipts)": ("SELECT SUM(amount) FROM payments WHERE party_id = ? AND type = 'RECEIPT'", (0,)),
+    "invoice items": ("SELECT * FROM invoice_items WHERE invoice_id = ? ORDER BY id", (0,)),
+    "GST return lines": ("SELECT tax_percent, hsn_code, unit, SUM(amount - discount_amount), SUM(tax_amount) "
+                         "FROM invoice_items WHERE invoice_id = ? GROUP BY 1, 2, 3", (0,)),
+    "invoice payments": ("SELECT SUM(amount) FROM payments WHERE invoice_id = ?", (0,)),
+    "invoice allocations": ("SELECT * FROM payment_allocations WHERE invoice_id = ?", (0,)),
+    "invoices by status": ("SELECT * FROM invoices WHERE company_id = ? AND status = ?", (0, '')),
+    "payment list": ("SELECT * FROM payments WHERE company_id = ? ORDER BY id DESC", (0,)),
+    "party list": ("SELECT * FROM parties WHERE company_id = ? ORDER BY id DESC", (0,)),
+    "party name lookup": ("SELECT id FROM parties WHERE company_id = ? AND name = ? COLLATE NOCASE", (0, '')),
+    "product list": ("SELECT * FROM products WHERE company_id = ? ORDER BY id DESC", (0,)),
+    "product name lookup": ("SELECT * FROM products WHERE company_id = ? AND name = ? COLLATE NOCASE", (0, '')),
+    "product barcode lookup": ("SELECT * FROM products WHERE company_id = ? AND barcode = ?", (0, '')),
+    "purchase list": ("SELECT * FROM purchase_invoices WHERE company_id = ? ORDER BY id DESC", (0,)),
+    "supplier ledger": ("SELECT SUM(grand_total) FROM purchase_invoices WHERE supplier_id = ?", (0,)),
+    "purchase items": ("SELECT * FROM purchase_invoice_items WHERE purchase_invoice_id = ? ORDER BY id", (0,)),
+}
+
+# Ordered schema migrations: (version, description, Database method name).
+# PRAGMA user_version records the last step applied; append new steps to the
+# end and never renumber existing ones.
+_MIGRATIONS = [
+    (1, "base tables and legacy column backfill", "_migration_base_schema"),
+    (2, "composite index set", "create_indexes"),
+    (3, "full-text search index", "create_search_indexes"),
+    (4, "materialized party balances", "_migration_party_balances"),
+    (5, "invoice number series", "_migration_number_series"),
+    (6, "payment allocations and invoice amount paid", "_migration_payment_allocations"),
+    (7, "GST return line item index", "create_indexes"),
+    (8, "receipt edit allocation trigger and invoice settlement refresh", "_migration_allocation_refresh"),
+    (9, "invoice line HSN codes from products", "_migration_line_hsn_codes"),
+    (10, "drop invoice number index covered by UNIQUE(invoice_no)", "create_indexes"),
+    (11, "monthly GST supply totals", "_migration_gst_supply_totals"),
+]
+SCHEMA_VERSION = _MIGRATIONS[-1][0]
+
+
+# Full-text search: entity -> (table, FTS5 table, indexed columns). The FTS
+# tables are external-content (they store only the index) and use the
+# trigram tokenizer, so any 3+ character substring of a name, mobile, GSTIN,
+# barcode or invoice number is an index lookup rather than a LIKE scan.
+_SEARCH_INDEXES = {
+    "party": ("parties", "parties_fts", ("name", "mobile", "gst_number")),
+    "product": ("products", "products_fts", ("name", "barcode", "hsn_code")),
+    "invoice": ("invoices", "invoices_fts", ("invoice_no",)),
+    "purchase_invoice": ("purchase_invoices", "purchase_invoices_fts", ("invoice_no", "supplier_invoice_no")),
+}
+
+# Triggers keeping party_balances in step with invoices, purchases and
+# payments. They run inside the writing statement's transaction, so every
+# write path (including direct update_payment / delete_invoice calls) keeps
+# the totals exact. Receipts include untyped legacy payments, matching
+# LedgerService.
+_PARTY_BALANCE_TRIGGERS = {
+    "trg_party_balances_invoice_ai": """
+        AFTER INSERT ON invoices WHEN new.party_id IS NOT NULL BEGIN
+            INSERT INTO party_balances(party_id, invoice_total) VALUES (new.party_id, COALESCE(new.grand_total, 0))
+            ON CONFLICT(party_id) DO UPDATE SET invoice_total = invoice_total + excluded.invoice_total;
+        END""",
+    "trg_party_balances_invoice_ad": """
+        AFTER DELETE ON invoices WHEN old.party_id IS NOT NULL BEGIN
+            UPDATE party_balances SET invoice_total = invoice_total - COALESCE(old.grand_total, 0)
+            WHERE party_id = old.party_id;
+        END""",
+    "trg_party_balances_invoice_au": """
+        AFTER UPDATE OF party_id, grand_total ON invoices BEGIN
+            UPDATE party_balances SET invoice_total = invoice_total - COALESCE(old.grand_total, 0)
+            WHERE party_id = old.party_id;
+            INSERT INTO party_balances(party_id, invoice_total)
+            SELECT new.party_id, COALESCE(new.grand_total, 0) WHERE new.party_id IS NOT NULL
+            ON CONFLICT(party_id) DO UPDATE SET invoice_total = invoice_total + excluded.invoice_total;
+        END""",
+    "trg_party_balances_purchase_ai": """
+        AFTER INSERT ON purchase_invoices WHEN new.supplier_id IS NOT NULL BEGIN
+            INSERT INTO party_balances(party_id, purchase_total) VALUES (new.supplier_id, COALESCE(new.grand_total, 0))
+            ON CONFLICT(party_id) DO UPDATE SET purchase_total = purchase_total + excluded.purchase_total;
+        END""",
+    "trg_party_balances_purchase_ad": """
+        AFTER DELETE ON purchase_invoices WHEN old.supplier_id IS NOT NULL BEGIN
+            UPDATE party_balances SET purchase_total = purchase_total - COALESCE(old.grand_total, 0)
+            WHERE party_id = old.supplier_id;
+        END""",
+    "trg_party_balances_purchase_au": """
+        AFTER UPDATE OF supplier_id, grand_total ON purchase_invoices BEGIN
+            UPDATE party_balances SET purchase_total = purchase_total - COALESCE(old.grand_total, 0)
+            WHERE party_id = old.supplier_id;
+            INSERT INTO party_balances(party_id, purchase_total)
+            SELECT new.supplier_id, COALESCE(new.grand_total, 0) WHERE new.supplier_id IS NOT NULL
+            ON CONFLICT(party_id) DO UPDATE SET purchase_total = purchase_total + excluded.purchase_total;
+        END""",
+    "trg_party_balances_payment_ai": """
+        AFTER INSERT ON payments WHEN new.party_id IS NOT NULL BEGIN
+            INSERT INTO party_balances(party_id, receipt_total, payment_total) VALUES (
+                new.party_id,
+                CASE WHEN new.type IS NULL OR new.type = 'RECEIPT' THEN COALESCE(new.amount, 0) ELSE 0 END,
+                CASE WHEN new.type = 'PAYMENT' THEN COALESCE(new.amount, 0) ELSE 0 END)
+            ON CONFLICT(party_id) DO UPDATE SET
+                receipt_total = receipt_total + excluded.receipt_total,
+                payment_total = payment_total + excluded.payment_total;
+        END""",
+    "trg_party_balances_payment_ad": """
+        AFTER DELETE ON payments WHEN old.party_id IS NOT NULL BEGIN
+            UPDATE party_balances SET
+                receipt_total = receipt_total - CASE WHEN old.type IS NULL OR old.type = 'RECEIPT' THEN COALESCE(old.amount, 0) ELSE 0 END,
+                payment_total = payment_total - CASE WHEN old.type = 'PAYMENT' THEN COALESCE(old.amount, 0) ELSE 0 END
+            WHERE party_id = old.party_id;
+        END""",
+    "trg_party_balances_payment_au": """
+        AFTER UPDATE OF party_id, amount, type ON payments BEGIN
+            UPDATE party_balances SET
+                receipt_total = receipt_total - CASE WHEN old.type IS NULL OR old.type = 'RECEIPT' THEN COALESCE(old.amount, 0) ELSE 0 END,
+                payment_total = payment_total - CASE WHEN old.type = 'PAYMENT' THEN COALESCE(old.amount, 0) ELSE 0 END
+            WHERE party_id = old.party_id;
+            INSERT INTO party_balances(party_id, receipt_total, payment_total)
+            SELECT new.party_id,
+                CASE WHEN new.type IS NULL OR new.type = 'RECEIPT' THEN COALESCE(new.amount, 0) ELSE 0 END,
+                CASE WHEN new.type = 'PAYMENT' THEN COALESCE(new.amount, 0) ELSE 0 END
+            WHERE new.party_id IS NOT NULL
+            ON CONFLICT(party_id) DO UPDATE SET
+                receipt_total = receipt_total + excluded.receipt_total,
+                payment_total = payment_total + excluded.payment_total;
+        END""",
+    "trg_party_balances_party_ad": """
+        AFTER DELETE ON parties BEGIN
+            DELETE FROM party_balances WHERE party_id = old.id;
+        END""",
+}
+
+# Re-derives an invoice's balance and status from its amount_paid. Cancelled
+# invoices and invoices without a total keep their status. A CASH bill is
+# settled at the counter: add_invoice / update_invoice count its total as
+# paid, so it settles as Paid without a receipt.
+_SETTLE_INVOICE_SQL = """
+            UPDATE invoices SET
+                balance_due = MAX(ROUND(COALESCE(grand_total, 0) - amount_paid, 2), 0),
+                status = CASE
+                    WHEN status = 'Cancelled' OR COALESCE(grand_total, 0) <= 0 THEN status
+                    WHEN ROUND(grand_total - amount_paid, 2) <= 0 THEN 'Paid'
+                    WHEN amount_paid > 0 THEN 'Partially Paid'
+                    ELSE 'Unpaid'
+                END
+            WHERE id = {invoice_id};"""
+
+# Triggers keeping payment_allocations and invoices.amount_paid in step with
+# payments. A receipt with an invoice_id is settled against that invoice in
+# full and mirrored as one allocation row; a receipt spread over several
+# invoices has no invoice_id and its rows are written by
+# add_payment_allocations(). Editing a spread receipt keeps its rows while
+# they still fit: they are dropped when it stops being a receipt or its
+# amount falls below what is allocated, leaving it unallocated (on account).
+# Supplier payments (type 'PAYMENT') point at purchase invoices and are not
+# allocated.
+_PAYMENT_ALLOCATION_TRIGGERS = {
+    "trg_payment_allocations_ai": f"""
+        AFTER INSERT ON payment_allocations BEGIN
+            UPDATE invoices SET amount_paid = COALESCE(amount_paid, 0) + new.amount WHERE id = new.invoice_id;
+            {_SETTLE_INVOICE_SQL.format(invoice_id='new.invoice_id')}
+        END""",
+    "trg_payment_allocations_ad": f"""
+        AFTER DELETE ON payment_allocations BEGIN
+            UPDATE invoices SET amount_paid = COALESCE(amount_paid, 0) - old.amount WHERE id = old.invoice_id;
+            {_SETTLE_INVOICE_SQL.format(invoice_id='old.invoice_id')}
+        END""",
+    "trg_payment_allocations_au": f"""
+        AFTER UPDATE OF invoice_id, amount ON payment_allocations BEGIN
+            UPDATE invoices SET amount_paid = COALESCE(amount_paid, 0) - old.amount WHERE id = old.invoice_id;
+            {_SETTLE_INVOICE_SQL.format(invoice_id='old.invoice_id')}
+            UPDATE invoices SET amount_paid = COALESCE(amount_paid, 0) + new.amount WHERE id = new.invoice_id;
+            {_SETTLE_INVOICE_SQL.format(invoice_id='new.invoice_id')}
+        END""",
+    "trg_payment_allocations_payment_ai": """
+        AFTER INSERT ON payments
+        WHEN new.invoice_id IS NOT NULL AND (new.type IS NULL OR new.type = 'RECEIPT') BEGIN
+            INSERT INTO payment_allocations(payment_id, invoice_id, amount)
+            VALUES (new.id, new.invoice_id, COALESCE(new.amount, 0));
+        END""",
+    "trg_payment_allocations_payment_au": """
+        AFTER UPDATE OF invoice_id, amount, type ON payments
+        WHEN old.invoice_id IS NOT new.invoice_id OR old.amount IS NOT new.amount
+             OR old.type IS NOT new.type BEGIN
+            DELETE FROM payment_allocations
+            WHERE payment_id = old.id AND (
+                old.invoice_id IS NOT NULL OR new.invoice_id IS NOT NULL
+                OR NOT (new.type IS NULL OR new.type = 'RECEIPT')
+                OR ROUND(COALESCE(new.amount, 0)
+                         - (SELECT SUM(amount) FROM payment_allocations WHERE payment_id = old.id), 2) < 0);
+            INSERT INTO payment_allocations(payment_id, invoice_id, amount)
+            SELECT new.id, new.invoice_id, COALESCE(new.amount, 0)
+            WHERE new.invoice_id IS NOT NULL AND (new.type IS NULL OR new.type = 'RECEIPT');
+        END""",
+    "trg_payment_allocations_payment_ad": """
+        AFTER DELETE ON payments BEGIN
+            DELETE FROM payment_allocations WHERE payment_id = old.id;
+        END""",
+    "trg_payment_allocations_invoice_ad": """
+        AFTER DELETE ON invoices BEGIN
+            DELETE FROM payment_allocations WHERE invoice_id = old.id;
+        END""",
+}
+
+# A sales line saved without an HSN code takes its product's, so GST returns
+# read the code from the line alone.
+_LINE_HSN_TRIGGER = ("trg_invoice_items_hsn_ai", """
+        AFTER INSERT ON invoice_items
+        WHEN COALESCE(TRIM(new.hsn_code), '') = '' AND new.product_id IS NOT NULL BEGIN
+            UPDATE invoice_items SET hsn_code = (SELECT TRIM(hsn_code) FROM products WHERE id = new.product_id)
+            WHERE id = new.id
+              AND EXISTS (SELECT 1 FROM products WHERE id = new.product_id AND COALESCE(TRIM(hsn_code), '') <> '');
+        END""")
+
+# gst_supply_totals: the invoice lines of active (not cancelled) invoices
+# summed per company, month and GST supply group, so a GST return reads a
+# few hundred rows per month instead of every line (GSTReturnService). A
+# group is the invoice's supply class (bits: 8 non-GST, 4 registered
+# recipient, 2 inter-state, 1 invoice value above GST_SUPPLY_B2CL_LIMIT),
+# the state of an unregistered customer, and the line's rate, HSN and unit.
+GST_SUPPLY_B2CL_LIMIT = 100000
+
+
+def _supply_totals_sql(sign: str, line: str, invoice: str, party: str, source: str) -> str:
+    """Statement adding (sign '') or taking out (sign '-') invoice lines in gst_supply_totals.
+
+    line, invoice and party name what the line, its invoice and the
+    customer are read from (table aliases, or a trigger's old/new row);
+    source is the FROM ... WHERE clause that yields them.
+    """
+    gstin = f"UPPER(TRIM(COALESCE({party}.gst_number, '')))"
+    return f"""
+            INSERT INTO gst_supply_totals(company_id, month, supply_class, place, rate, hsn_code, unit,
+                                          lines, quantity, taxable_value, tax)
+            SELECT COALESCE({invoice}.company_id, 0), SUBSTR({invoice}.date, 1, 7),
+                   (COALESCE({invoice}.tax_type, '') LIKE '%Non-GST%') * 8 + ({gstin} <> '') * 4
+                       + (COALESCE({invoice}.tax_type, '') LIKE '%Other State%') * 2
+                       + (COALESCE({invoice}.grand_total, 0) > {GST_SUPPLY_B2CL_LIMIT}),
+                   CASE WHEN {gstin} = '' THEN COALESCE({party}.state, '') ELSE '' END,
+                   COALESCE({line}.tax_percent, 0), COALESCE(TRIM({line}.hsn_code), ''), COALESCE({line}.unit, ''),
+                   {sign}COUNT(*), {sign}SUM(COALESCE({line}.quantity, 0)),
+                   {sign}SUM(COALESCE({line}.amount, 0) - COALESCE({line}.discount_amount, 0)),
+                   {sign}SUM(COALESCE({line}.tax_amount, 0))
+            {source} AND COALESCE({invoice}.status, '') <> 'Cancelled'
+            GROUP BY 1, 2, 3, 4, 5, 6, 7
+            ON CONFLICT(company_id, month, supply_class, place, rate, hsn_code, unit) DO UPDATE SET
+                lines = lines + excluded.lines,
+                quantity = quantity + excluded.quantity,
+                taxable_value = taxable_value + excluded.taxable_value,
+                tax = tax + excluded.tax;"""
+
+
+_ITEM_INVOICE_SQL = "FROM invoices i LEFT JOIN parties p ON p.id = i.party_id WHERE i.id = {row}.invoice_id"
+_INVOICE_ITEMS_SQL = "FROM invoice_items it LEFT JOIN parties p ON p.id = {row}.party_id WHERE it.invoice_id = {row}.id"
+_PARTY_ITEMS_SQL = "FROM invoices i JOIN invoice_items it ON it.invoice_id = i.id WHERE i.party_id = {row}.id"
+_ALL_ITEMS_SQL = ("FROM invoices i JOIN invoice_items it ON it.invoice_id = i.id "
+                  "LEFT JOIN parties p ON p.id = i.party_id WHERE {condition}")
+
+# Triggers keeping gst_supply_totals in step with invoice lines, invoices
+# and customers: each takes the old version of the changed lines out of
+# their group and adds the new one. Emptied groups stay with lines = 0.
+_SUPPLY_TOTALS_TRIGGERS = {
+    "trg_gst_supply_totals_item_ai": f"""
+        AFTER INSERT ON invoice_items BEGIN
+            {_supply_totals_sql('', 'new', 'i', 'p', _ITEM_INVOICE_SQL.format(row='new'))}
+        END""",
+    "trg_gst_supply_totals_item_ad": f"""
+        AFTER DELETE ON invoice_items BEGIN
+            {_supply_totals_sql('-', 'old', 'i', 'p', _ITEM_INVOICE_SQL.format(row='old'))}
+        END""",
+    "trg_gst_supply_totals_item_au": f"""
+        AFTER UPDATE OF invoice_id, hsn_code, quantity, unit, discount_amount, tax_percent, tax_amount, amount
+        ON invoice_items BEGIN
+            {_supply_totals_sql('-', 'old', 'i', 'p', _ITEM_INVOICE_SQL.format(row='old'))}
+            {_supply_totals_sql('', 'new', 'i', 'p', _ITEM_INVOICE_SQL.format(row='new'))}
+        END""",
+    "trg_gst_supply_totals_invoice_ad": f"""
+        AFTER DELETE ON invoices BEGIN
+            {_supply_totals_sql('-', 'it', 'old', 'p', _INVOICE_ITEMS_SQL.format(row='old'))}
+        END""",
+    # Settling a payment rewrites status on every receipt; only a change of
+    # group or of cancellation moves the invoice's lines
+    "trg_gst_supply_totals_invoice_au": f"""
+        AFTER UPDATE OF company_id, date, party_id, tax_type, grand_total, status ON invoices
+        WHEN old.company_id IS NOT new.company_id OR old.date IS NOT new.date
+             OR old.party_id IS NOT new.party_id OR old.tax_type IS NOT new.tax_type
+             OR (COALESCE(old.grand_total, 0) > {GST_SUPPLY_B2CL_LIMIT}) <> (COALESCE(new.grand_total, 0) > {GST_SUPPLY_B2CL_LIMIT})
+             OR (COALESCE(old.status, '') = 'Cancelled') <> (COALESCE(new.status, '') = 'Cancelled') BEGIN
+            {_supply_totals_sql('-', 'it', 'old', 'p', _INVOICE_ITEMS_SQL.format(row='old'))}
+            {_supply_totals_sql('', 'it', 'new', 'p', _INVOICE_ITEMS_SQL.format(row='new'))}
+        END""",
+    "trg_gst_supply_totals_party_au": f"""
+        AFTER UPDATE OF gst_number, state ON parties
+        WHEN old.gst_number IS NOT new.gst_number OR old.state IS NOT new.state BEGIN
+            {_supply_totals_sql('-', 'it', 'i', 'old', _PARTY_ITEMS_SQL.format(row='old'))}
+            {_supply_totals_sql('', 'it', 'i', 'new', _PARTY_ITEMS_SQL.format(row='new'))}
+        END""",
+    # The invoices of a deleted customer count as unregistered, state unknown
+    "trg_gst_supply_totals_party_ad": f"""
+        AFTER DELETE ON parties BEGIN
+            {_supply_totals_sql('-', 'it', 'i', 'old', _PARTY_ITEMS_SQL.format(row='old'))}
+            {_supply_totals_sql('', 'it', 'i', 'p', _ALL_ITEMS_SQL.format(condition='i.party_id = old.id'))}
+        END""",
+}
+
+# Tables the triggers above write besides the statement's own target, so
+# their change versions move with it
+_TRIGGER_WRITES = {
+    "payments": ("payment_allocations", "invoices"),
+    "payment_allocations": ("invoices",),
+    "invoices": ("payment_allocations", "gst_supply_totals"),
+    "invoice_items": ("gst_supply_totals",),
+    "parties": ("gst_supply_totals",),
+}
+
+
+def _like_pattern(text: str) -> str:
+    """Escape `text` for a substring LIKE ... ESCAPE '\\' match."""
+    return "%" + text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+# Invoice numbers that belong to a number series: PREFIX-NNNN, or
+# PREFIX-YYYY-NNNN where YYYY is the financial year (e.g. 2526). Anything
+# else (suffixed duplicates, free text) is a custom number outside any series.
+_SERIES_NUMBER_RE = re.compile(r"^(?P<prefix>[^-]+)-(?:(?P<fy>\d{4})-)?(?P<number>\d+)$")
+
+
+def _series_keys(invoice_no: str) -> List[tuple]:
+    """(prefix, fy, number) for every series an invoice number counts towards.
+
+    A financial-year number also counts towards its plain-prefix series, the
+    way the old "highest trailing number" scan treated it.
+    """
+    match = _SERIES_NUMBER_RE.match(invoice_no or "")
+    if not match:
+        return []
+    prefix, fy, number = match.group("prefix"), match.group("fy"), int(match.group("number"))
+    keys = [(prefix, "", number)]
+    if fy:
+        keys.append((prefix, fy, number))
+    return keys
+
+
+# Stock change applied in SQL, keyed by operation. Untracked products are left
+# alone; a product without a current stock yet starts from its opening stock,
+# the same figure the dashboard's low-stock list reads.
+_STOCK_ADJUST_SQL = {
+    'add': "UPDATE products SET current_stock = COALESCE(current_stock, opening_stock, 0) + ? "
+           "WHERE id = ? AND track_stock = 1",
+    # Prevent negative stock
+    'subtract': "UPDATE products SET current_stock = MAX(0, COALESCE(current_stock, opening_stock, 0) - ?) "
+                "WHERE id = ? AND track_stock = 1",
+}
+
+
 class Database:
-    def __init__(self, path: Optional[str] = None):
+    def __init__(self, path: Optional[str] = None, wal_mode: Optional[bool] = None,
+                 reader_pool_size: Optional[int] = None):
+        """
+        Open the database and bring its schema up to date.
+
+        Args:
+            path: Database file (defaults to `database.path` in config.json)
+            wal_mode: Use WAL journaling (defaults to `database.wal_mode`, on)
+            reader_pool_size: Read-only connections used by _query in WAL mode
+                (defaults to `database.reader_pool_size`, 4; 0 disables the pool)
+        """
+        settings = _load_db_settings()
         self.path = path or _load_db_path()
+        if wal_mode is None:
+            wal_mode = bool(settings.get('wal_mode', True))
+        if reader_pool_size is None:
+            reader_pool_size = int(settings.get('reader_pool_size', 4))
         logger.info(f"Initializing database at {self.path}")
+        # Sole writer connection - every INSERT/UPDATE/DELETE goes through it
         self.conn = sqlite3.connect(self.path, check_same_thread=False, timeout=20.0)
         self.conn.row_factory = sqlite3.Row
         # Set busy timeout to wait up to 20 seconds on locked database
         self.conn.execute("PRAGMA busy_timeout=20000")
         self._current_company_id = None  # Track current company for data isolation
-        logger.debug("Database connection established")
-        self.create_tables()
-        self._ensure_schema()
+        # Unit-of-work state: nesting depth of transaction() and the owning thread
+        self._write_lock = threading.RLock()
+        self._tx_depth = 0
+        self._tx_owner = None
+        # Master data served from memory; see core/db/catalogue_cache.py
+        self._catalogue = CatalogueCache(self._data_version)
+        self._tx_dirty = {}  # catalogue table -> changed ids (None: whole table) in the open transaction
+        # Per-table write counters for screens that skip unchanged reloads
+        self._versions = ChangeVersions(self._data_version)
+        self._tx_tables = set()  # tables written by the open transaction
+        self.wal_mode = False
+        self._readers = None
+        if wal_mode:
+            mode = self.conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+            self.wal_mode = str(mode).lower() == 'wal'
+            if not self.wal_mode:
+                logger.warning(f"WAL journal mode unavailable, using '{mode}'")
+        if self.wal_mode and reader_pool_size > 0:
+            # Readers see the last committed snapshot and never block the writer
+            self._readers = ReaderPool(self.path, reader_pool_size)
+        logger.debug(f"Database connection established (wal={self.wal_mode}, readers={reader_pool_size if self._readers else 0})")
+        self.migrate_schema()
+        self._search_ready = self._load_search_ready()
         self.ensure_seed()
         logger.info("Database initialization completed successfully")
 
+    def close(self):
+        """Close the reader pool and the writer connection."""
+        if self._readers is not None:
+            self._readers.close()
+            self._readers = None
+        self.conn.close()
+
     def set_current_company(self, company_id: int):
         """Set the current company for data isolation"""
         self._current_company_id = company_id
@@ -60,17 +512,173 @@ class Database:
         return self._current_company_id
 
     # --- utilities ---
+    @contextmanager
+    def transaction(self):
+        """
+        Group writes into one unit of work.
+
+        The outermost block opens a write transaction and commits once on
+        exit; nested blocks become savepoints, so an inner failure only
+        rolls back its own writes. Any exception rolls back and re-raises.
+        While a transaction is open, _execute does not commit.
+
+        Usage:
+            with db.transaction():
+                invoice_id = db.add_invoice(...)
+                db.add_invoice_items(invoice_id, items)
+        """
+        with self._write_lock:
+            depth = self._tx_depth
+            savepoint = f"sp_{depth}"
+            if depth == 0:
+                self.conn.execute("BEGIN IMMEDIATE")
+                self._tx_owner = threading.get_ident()
+            else:
+                self.conn.execute(f"SAVEPOINT {savepoint}")
+            self._tx_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._tx_depth -= 1
+                if depth == 0:
+                    self._tx_owner = None
+                    self.conn.rollback()
+                    self._flush_pending_changes()
+                    logger.warning("Transaction rolled back")
+                else:
+                    self.conn.execute(f"ROLLBACK TO SAVEPOINT {savepoint}")
+                    self.conn.execute(f"RELEASE SAVEPOINT {savepoint}")
+                raise
+            else:
+                self._tx_depth -= 1
+                if depth == 0:
+                    self._tx_owner = None
+                    self.conn.commit()
+                    self._flush_pending_changes()
+                else:
+                    self.conn.execute(f"RELEASE SAVEPOINT {savepoint}")
+
+    def in_transaction(self) -> bool:
+        """True while the calling thread is inside db.transaction()."""
+        return self._tx_depth > 0 and self._tx_owner == threading.get_ident()
+
+    def _data_version(self) -> int:
+        """PRAGMA data_version of the writer connection; changes when another process commits."""
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _catalogue_changed(self, table: str, ids=None):
+        """
+        Bring the cached catalogue for `table` up to date after a write.
+
+        Args:
+            table: 'products' or 'parties'
+            ids: Ids of updated rows to re-read; None drops the whole
+                catalogue (inserts, deletes, edits)
+        """
+        if not self._tx_depth:
+            self._apply_catalogue_change(table, ids)
+            return
+        # Applied once the transaction commits; until then readers still see
+        # (and may re-cache) the old snapshot
+        if ids is None:
+            self._catalogue.invalidate(table)
+            self._tx_dirty[table] = None
+        elif table not in self._tx_dirty or self._tx_dirty[table] is not None:
+            self._tx_dirty.setdefault(table, set()).update(ids)
+
+    def _apply_catalogue_change(self, table: str, ids):
+        if ids is None:
+            self._catalogue.invalidate(table)
+        elif ids:
+            ids = list(ids)
+            fresh = self._query(
+                f"SELECT * FROM {table} WHERE id IN ({','.join('?' * len(ids))})", tuple(ids), compact=True
+            )
+            self._catalogue.refresh(table, fresh)
+
+    def _flush_pending_changes(self):
+        """Apply the cache and version changes of a transaction that just ended."""
+        dirty, self._tx_dirty = self._tx_dirty, {}
+        for table, ids in dirty.items():
+            self._apply_catalogue_change(table, ids)
+        tables, self._tx_tables = self._tx_tables, set()
+        for table in tables:
+            self._versions.bump(table)
+
+    def _note_write(self, sql: str):
+        """Bump the change version of the table a write statement targeted.
+
+        Inside a transaction the bump waits for the commit, so a screen
+        cannot pair the new version with a pre-commit snapshot.
+        """
+        table = written_table(sql)
+        if table is None:
+            return
+        tables = (table,) + _TRIGGER_WRITES.get(table, ())
+        if self._tx_depth:
+            self._tx_tables.update(tables)
+        else:
+            for name in tables:
+                self._versions.bump(name)
+
+    def get_change_version(self, *tables: str) -> tuple:
+        """
+        Change token for a set of tables.
+
+        The token differs after any committed write to one of the tables by
+        this process, and after any commit by another process. Screens keep
+        the token of their last load and skip reloading while it matches.
+
+        Args:
+            tables: Table names the caller's data is read from
+
+        Returns:
+            Opaque tuple; compare with == only
+        """
+        return self._versions.version(*tables)
+
+    def _catalogue_rows(self, table: str, compact: bool = False):
+        """All rows of a catalogue table for the current company, from the cache."""
+        company_id = self._current_company_id
+        if company_id:
+            sql, params = f"SELECT * FROM {table} WHERE company_id = ? ORDER BY id DESC", (company_id,)
+        else:
+            sql, params = f"SELECT * FROM {table} ORDER BY id DESC", ()
+        if self.in_transaction():
+            # Uncommitted rows must not be cached
+            return self._query(sql, params, compact=compact)
+        return self._catalogue.rows(table, company_id, lambda: self._query(sql, params, compact=True), compact)
+
+    def _catalogue_row(self, table: str, row_id) -> Optional[Dict[str, Any]]:
+        """One catalogue row by id: the cache for the current company, else the database."""
+        if not self.in_transaction():
+            row = self._catalogue.row_by_id(
+                table, self._current_company_id, row_id,
+                lambda: self._catalogue_rows(table, compact=True),
+            )
+            if row is not None:
+                return row
+        result = self._query(f"SELECT * FROM {table} WHERE id = ?", (row_id,))
+        return result[0] if result else None
+
     def _execute(self, sql: str, params: tuple = ()):  # write ops
-        """Execute a write operation with automatic retry on database lock"""
+        """Execute a write operation with automatic retry on database lock.
+
+        Commits immediately unless called inside transaction(), in which case
+        the enclosing unit of work commits.
+        """
         max_retries = 5
         retry_count = 0
         
         while retry_count < max_retries:
             try:
                 start_time = time.time()
-                cur = self.conn.cursor()
-                cur.execute(sql, params)
-                self.conn.commit()
+                with self._write_lock:
+                    cur = self.conn.cursor()
+                    cur.execute(sql, params)
+                    if not self._tx_depth:
+                        self.conn.commit()
+                    self._note_write(sql)
                 execution_time = time.time() - start_time
                 
                 # Log the query with execution time
@@ -91,23 +699,88 @@ class Database:
                     logger.error(f"Database execution error: {str(e)}", exc_info=True)
                     raise
 
-    def _query(self, sql: str, params: tuple = ()) -> List[Dict[str, Any]]:
+    def _executemany(self, sql: str, seq_of_params: List[tuple]) -> int:
+        """Execute one write statement for many parameter rows in a single transaction.
+
+        Returns:
+            Number of rows affected
+        """
+        rows = list(seq_of_params)
+        if not rows:
+            return 0
         start_time = time.time()
-        cur = self.conn.cursor()
-        cur.execute(sql, params)
-        rows = cur.fetchall()
+        with self.transaction():
+            cur = self.conn.executemany(sql, rows)
+            self._note_write(sql)
+        execution_time = time.time() - start_time
+        SQLLogger.log_query(sql, rows[0], execution_time, cur.rowcount)
+        return cur.rowcount
+
+    def _query(self, sql: str, params: tuple = (), compact: bool = False) -> List[Dict[str, Any]]:
+        """Run a read query.
+
+        Args:
+            sql: SELECT statement
+            params: Query parameters
+            compact: Return a RowSet of tuple-backed rows (key and attribute
+                access, a fraction of the memory) instead of one dict per
+                row. Use it for results that are kept around, e.g. list screens.
+        """
+        start_time = time.time()
+        if self._readers is not None and not self.in_transaction():
+            with self._readers.connection() as conn:
+                cur = conn.execute(sql, params)
+                rows = cur.fetchall()
+        else:
+            # No pool, or this thread's unit of work has uncommitted rows to see
+            cur = self.conn.cursor()
+            cur.execute(sql, params)
+            rows = cur.fetchall()
         execution_time = time.time() - start_time
         
         # Log the query with execution time
         row_count = len(rows)
         SQLLogger.log_query(sql, params, execution_time, row_count)
         
+        if compact:
+            return RowSet.from_rows([d[0] for d in cur.description or ()], rows)
         return [dict(r) for r in rows]
 
+    def _query_batches(self, sql: str, params: tuple = (), batch_size: int = 1000) -> Iterator[RowSet]:
+        """Run a read query and yield its rows in compact batches.
+
+        For results too large to fetch in one go (reports over a year of
+        invoices): the caller can show progress after each batch and stop
+        early. The connection is held until the generator is exhausted or
+        closed, so close it when abandoning the iteration.
+
+        Args:
+            sql: SELECT statement
+            params: Query parameters
+            batch_size: Rows per yielded RowSet
+        """
+        start_time = time.time()
+        row_count = 0
+        if self._readers is not None and not self.in_transaction():
+            connection = self._readers.connection()
+        else:
+            connection = nullcontext(self.conn)
+        with connection as conn:
+            cur = conn.execute(sql, params)
+            columns = [d[0] for d in cur.description or ()]
+            while True:
+                rows = cur.fetchmany(batch_size)
+                if not rows:
+                    break
+                row_count += len(rows)
+                yield RowSet.from_rows(columns, rows)
+        SQLLogger.log_query(sql, params, time.time() - start_time, row_count)
+
     # --- schema ---
     def create_tables(self):
+        """Create the base tables. Runs inside the migration transaction."""
         # Create table for companies
-        self._execute(
+        self.conn.execute(
             """
             CREATE TABLE IF NOT EXISTS companies (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -131,7 +804,7 @@ class Database:
             """
         )
         # Create table for parties
-        self._execute(
+        self.conn.execute(
             """
             CREATE TABLE IF NOT EXISTS parties (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -163,7 +836,7 @@ class Database:
         )
         
         # Create table for products
-        self._execute(
+        self.conn.execute(
             """
             CREATE TABLE IF NOT EXISTS products (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -195,7 +868,7 @@ class Database:
             """
         )
         # Create table for invoices
-        self._execute(
+        self.conn.execute(
             """
             CREATE TABLE IF NOT EXISTS invoices (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -213,6 +886,7 @@ class Database:
                 round_off REAL DEFAULT 0,
                 grand_total REAL DEFAULT 0,
                 balance_due REAL DEFAULT 0,
+                amount_paid REAL NOT NULL DEFAULT 0,
                 status TEXT DEFAULT 'Unpaid',
                 notes TEXT,
                 created_at TEXT DEFAULT CURRENT_TIMESTAMP,
@@ -223,7 +897,7 @@ class Database:
         )
         
         # Create table for invoice items (line items)
-        self._execute(
+        self.conn.execute(
             """
             CREATE TABLE IF NOT EXISTS invoice_items (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -246,7 +920,7 @@ class Database:
         )
         
         # Create table for payments
-        self._execute(
+        self.conn.execute(
             """
             CREATE TABLE IF NOT EXISTS payments (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -265,8 +939,23 @@ class Database:
             """
         )
         
+        # Create table for receipt amounts settled against sales invoices
+        # (payment_id is payments.id, not the REC-... reference)
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS payment_allocations (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                payment_id INTEGER NOT NULL,
+                invoice_id INTEGER NOT NULL,
+                amount REAL NOT NULL DEFAULT 0,
+                FOREIGN KEY(payment_id) REFERENCES payments(id),
+                FOREIGN KEY(invoice_id) REFERENCES invoices(id)
+            )
+            """
+        )
+        
         # Create table for purchase invoices (separate from sales invoices)
-        self._execute(
+        self.conn.execute(
             """
             CREATE TABLE IF NOT EXISTS purchase_invoices (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -286,7 +975,7 @@ class Database:
         )
         
         # Create table for purchase invoice items (line items)
-        self._execute(
+        self.conn.execute(
             """
             CREATE TABLE IF NOT EXISTS purchase_invoice_items (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -314,6 +1003,45 @@ class Database:
         pass
 
     # --- migrations / schema checks ---
+    def get_schema_version(self) -> int:
+        """Return the last applied schema migration (PRAGMA user_version)."""
+        return self.conn.execute("PRAGMA user_version").fetchone()[0]
+
+    def migrate_schema(self) -> int:
+        """
+        Apply pending schema migrations.
+
+        An up-to-date database costs one PRAGMA read. Otherwise every pending
+        step runs inside a single transaction together with the version bump,
+        so a failed upgrade leaves the database untouched.
+
+        Returns:
+            The schema version after migrating
+        """
+        current = self.get_schema_version()
+        pending = [m for m in _MIGRATIONS if m[0] > current]
+        if not pending:
+            return current
+
+        logger.info(f"Migrating schema from version {current} to {SCHEMA_VERSION}")
+        self.conn.execute('BEGIN')
+        try:
+            for version, description, step in pending:
+                logger.info(f"Applying schema migration {version}: {description}")
+                getattr(self, step)()
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            self.conn.commit()
+        except Exception as e:
+            self.conn.rollback()
+            logger.error(f"Schema migration failed, rolled back to version {current}: {e}", exc_info=True)
+            raise
+        return SCHEMA_VERSION
+
+    def _migration_base_schema(self):
+        """Migration 1: base tables plus column backfill for pre-versioning databases."""
+        self.create_tables()
+        self._ensure_schema()
+
     def _table_columns(self, table: str) -> List[str]:
         cur = self.conn.cursor()
         cur.execute(f"PRAGMA table_info({table})")
@@ -322,14 +1050,14 @@ class Database:
     def _ensure_column(self, table: str, name: str, decl: str):
         cols = set(self._table_columns(table))
         if name not in cols:
-            self._execute(f"ALTER TABLE {table} ADD COLUMN {name} {decl}")
+            self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {decl}")
 
     def _drop_column(self, table: str, column_name: str):
         """Drop a column from a table (SQLite 3.35.0+)"""
         cols = set(self._table_columns(table))
         if column_name in cols:
             try:
-                self._execute(f"ALTER TABLE {table} DROP COLUMN {column_name}")
+                self.conn.execute(f"ALTER TABLE {table} DROP COLUMN {column_name}")
                 print(f"✅ Dropped column '{column_name}' from table '{table}'")
             except Exception as e:
                 print(f"⚠️  Could not drop column '{column_name}' from '{table}': {e}")
@@ -429,6 +1157,7 @@ class Database:
             ("mode", "TEXT"),
             ("invoice_id", "INTEGER"),
             ("notes", "TEXT"),
+            ("type", "TEXT"),
         ]:
             try:
                 self._ensure_column("payments", col, decl)
@@ -476,6 +1205,321 @@ class Database:
         # Drop deprecated columns
         self._drop_column("invoices", "internal_type")
 
+    # --- indexes ---
+    def create_indexes(self):
+        """Create the managed secondary index set (idempotent)."""
+        for name, table, columns in _INDEXES:
+            if name in _INDEXES_UNLESS_UNIQUE and self._has_unique_index(*_INDEXES_UNLESS_UNIQUE[name]):
+                self.conn.execute(f"DROP INDEX IF EXISTS {name}")
+                continue
+            try:
+                self.conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table}({columns})")
+            except Exception as e:
+                logger.warning(f"Could not create index {name} on {table}: {e}")
+
+    def _has_unique_index(self, table: str, column: str) -> bool:
+        """Whether a UNIQUE index (or constraint) covers exactly this one column."""
+        for index in self.conn.execute(f"PRAGMA index_list({table})").fetchall():
+            if index[2]:
+                columns = [info[2] for info in self.conn.execute(f"PRAGMA index_info('{index[1]}')")]
+                if columns == [column]:
+                    return True
+        return False
+
+    def create_search_indexes(self):
+        """Create the FTS5 search tables and their sync triggers, then index existing rows.
+
+        Skipped with a warning when this SQLite build lacks FTS5 or the
+        trigram tokenizer; search() then falls back to LIKE.
+        """
+        for entity, (table, fts, columns) in _SEARCH_INDEXES.items():
+            cols = ", ".join(columns)
+            new_vals = ", ".join(f"new.{c}" for c in columns)
+            old_vals = ", ".join(f"old.{c}" for c in columns)
+            try:
+                self.conn.execute(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+                    f"{cols}, content='{table}', content_rowid='id', tokenize='trigram')"
+                )
+            except sqlite3.OperationalError as e:
+                logger.warning(f"Full-text search unavailable, using LIKE search: {e}")
+                return
+            self.conn.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+                f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_vals}); END"
+            )
+            self.conn.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+                f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_vals}); END"
+            )
+            # Only re-index when a searched column changes (not on every stock update)
+            self.conn.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN "
+                f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_vals}); "
+                f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_vals}); END"
+            )
+            self.conn.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+    def _migration_party_balances(self):
+        """Migration 4: party_balances table, its triggers and an initial fill."""
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS party_balances (
+                party_id INTEGER PRIMARY KEY,
+                invoice_total REAL NOT NULL DEFAULT 0,
+                receipt_total REAL NOT NULL DEFAULT 0,
+                purchase_total REAL NOT NULL DEFAULT 0,
+                payment_total REAL NOT NULL DEFAULT 0
+            )
+            """
+        )
+        for name, body in _PARTY_BALANCE_TRIGGERS.items():
+            self.conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+        self._fill_party_balances()
+
+    def _fill_party_balances(self):
+        """Recompute every row of party_balances from the source tables."""
+        self.conn.execute("DELETE FROM party_balances")
+        self.conn.execute(
+            """
+            INSERT INTO party_balances(party_id, invoice_total, receipt_total, purchase_total, payment_total)
+            SELECT party_id, SUM(inv), SUM(rec), SUM(pur), SUM(pay) FROM (
+                SELECT party_id, COALESCE(grand_total, 0) AS inv, 0 AS rec, 0 AS pur, 0 AS pay
+                FROM invoices WHERE party_id IS NOT NULL
+                UNION ALL
+                SELECT supplier_id, 0, 0, COALESCE(grand_total, 0), 0
+                FROM purchase_invoices WHERE supplier_id IS NOT NULL
+                UNION ALL
+                SELECT party_id, 0,
+                       CASE WHEN type IS NULL OR type = 'RECEIPT' THEN COALESCE(amount, 0) ELSE 0 END,
+                       0,
+                       CASE WHEN type = 'PAYMENT' THEN COALESCE(amount, 0) ELSE 0 END
+                FROM payments WHERE party_id IS NOT NULL
+            )
+            GROUP BY party_id
+            """
+        )
+
+    def rebuild_party_balances(self) -> int:
+        """
+        Recompute the materialized party balances from scratch.
+
+        Only needed after editing the database outside the application or
+        to clear accumulated float rounding; the triggers keep it current
+        otherwise.
+
+        Returns:
+            Number of parties with balance rows
+        """
+        with self.transaction():
+            self._fill_party_balances()
+            count = self.conn.execute("SELECT COUNT(*) FROM party_balances").fetchone()[0]
+        logger.info(f"Rebuilt party balances for {count} parties")
+        return count
+
+    def get_party_balance_totals(self, party_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Party row plus its materialized invoice/receipt/purchase/payment totals.
+
+        Returns:
+            Dict with the party columns and the four totals, or None if the party does not exist
+        """
+        rows = self._query(
+            """
+            SELECT p.*,
+                   COALESCE(b.invoice_total, 0) AS invoice_total,
+                   COALESCE(b.receipt_total, 0) AS receipt_total,
+                   COALESCE(b.purchase_total, 0) AS purchase_total,
+                   COALESCE(b.payment_total, 0) AS payment_total
+            FROM parties p
+            LEFT JOIN party_balances b ON b.party_id = p.id
+            WHERE p.id = ?
+            """,
+            (party_id,),
+        )
+        return rows[0] if rows else None
+
+    def _migration_number_series(self):
+        """Migration 5: number_series table, backfilled from existing invoice numbers."""
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS number_series (
+                company_id INTEGER NOT NULL,
+                prefix TEXT NOT NULL,
+                fy TEXT NOT NULL DEFAULT '',
+                last_number INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (company_id, prefix, fy)
+            ) WITHOUT ROWID
+            """
+        )
+        highest = {}
+        for company_id, invoice_no in self.conn.execute("SELECT company_id, invoice_no FROM invoices"):
+            for prefix, fy, number in _series_keys(invoice_no):
+                key = (company_id or 0, prefix, fy)
+                highest[key] = max(highest.get(key, 0), number)
+        self.conn.executemany(
+            "INSERT INTO number_series(company_id, prefix, fy, last_number) VALUES(?,?,?,?) "
+            "ON CONFLICT(company_id, prefix, fy) DO UPDATE SET last_number = MAX(last_number, excluded.last_number)",
+            [(*key, number) for key, number in highest.items()],
+        )
+
+    def _migration_payment_allocations(self):
+        """Migration 6: payment_allocations table and invoices.amount_paid, backfilled from payments.
+
+        amount_paid is the receipts allocated to the invoice or, when larger,
+        the part its legacy balance_due records as settled (e.g. a CASH bill
+        paid at the counter), so re-deriving balance_due and status from it
+        (as the allocation triggers do from here on) keeps every balance.
+        Cancelled invoices keep their status.
+        """
+        self.create_tables()
+        self._ensure_column("invoices", "amount_paid", "REAL NOT NULL DEFAULT 0")
+        self.conn.execute(
+            """
+            INSERT INTO payment_allocations(payment_id, invoice_id, amount)
+            SELECT p.id, p.invoice_id, COALESCE(p.amount, 0)
+            FROM payments p
+            JOIN invoices i ON i.id = p.invoice_id
+            WHERE (p.type IS NULL OR p.type = 'RECEIPT')
+              AND NOT EXISTS (SELECT 1 FROM payment_allocations a WHERE a.payment_id = p.id)
+            """
+        )
+        self.conn.execute(
+            """
+            UPDATE invoices SET amount_paid = MAX(
+                COALESCE((SELECT SUM(a.amount) FROM payment_allocations a WHERE a.invoice_id = invoices.id), 0),
+                ROUND(COALESCE(grand_total, 0) - COALESCE(balance_due, 0), 2))
+            """
+        )
+        for name, body in _PAYMENT_ALLOCATION_TRIGGERS.items():
+            self.conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+        self.create_indexes()
+        self._settle_all_invoices()
+
+    def _migration_allocation_refresh(self):
+        """Migration 8: replace the receipt update trigger and re-settle every invoice.
+
+        The old trigger left a spread receipt's allocations alone when its
+        amount or type changed; balances written by it are re-derived too.
+        """
+        name = "trg_payment_allocations_payment_au"
+        self.conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+        self.conn.execute(f"CREATE TRIGGER {name} {_PAYMENT_ALLOCATION_TRIGGERS[name]}")
+        self._settle_all_invoices()
+
+    def _migration_line_hsn_codes(self):
+        """Migration 9: fill invoice lines without an HSN code from their product, and keep doing so."""
+        name, body = _LINE_HSN_TRIGGER
+        self.conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+        self.conn.execute(
+            """
+            UPDATE invoice_items SET hsn_code = (
+                SELECT TRIM(pr.hsn_code) FROM products pr WHERE pr.id = invoice_items.product_id)
+            WHERE COALESCE(TRIM(hsn_code), '') = ''
+              AND EXISTS (SELECT 1 FROM products pr
+                          WHERE pr.id = invoice_items.product_id AND COALESCE(TRIM(pr.hsn_code), '') <> '')
+            """
+        )
+
+    def _migration_gst_supply_totals(self):
+        """Migration 11: gst_supply_totals table, its triggers and an initial fill."""
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS gst_supply_totals (
+                company_id INTEGER NOT NULL,
+                month TEXT NOT NULL,
+                supply_class INTEGER NOT NULL,
+                place TEXT NOT NULL,
+                rate REAL NOT NULL,
+                hsn_code TEXT NOT NULL,
+                unit TEXT NOT NULL,
+                lines INTEGER NOT NULL DEFAULT 0,
+                quantity REAL NOT NULL DEFAULT 0,
+                taxable_value REAL NOT NULL DEFAULT 0,
+                tax REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (company_id, month, supply_class, place, rate, hsn_code, unit)
+            ) WITHOUT ROWID
+            """
+        )
+        for name, body in _SUPPLY_TOTALS_TRIGGERS.items():
+            self.conn.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+        self._fill_gst_supply_totals()
+
+    def _fill_gst_supply_totals(self):
+        """Recompute every row of gst_supply_totals from the invoice lines."""
+        self.conn.execute("DELETE FROM gst_supply_totals")
+        self.conn.execute(_supply_totals_sql('', 'it', 'i', 'p', _ALL_ITEMS_SQL.format(condition='1')))
+
+    def rebuild_gst_supply_totals(self) -> int:
+        """
+        Recompute the monthly GST supply totals from scratch.
+
+        Only needed after editing the database outside the application or
+        to clear accumulated float rounding; the triggers keep it current
+        otherwise.
+
+        Returns:
+            Number of supply total rows
+        """
+        with self.transaction():
+            self._fill_gst_supply_totals()
+            count = self.conn.execute("SELECT COUNT(*) FROM gst_supply_totals").fetchone()[0]
+        logger.info(f"Rebuilt {count} GST supply total rows")
+        return count
+
+    def _settle_all_invoices(self):
+        """Re-derive every invoice's balance_due and status from its amount_paid."""
+        self.conn.execute(_SETTLE_INVOICE_SQL.format(invoice_id='id'))
+
+    def _load_search_ready(self) -> set:
+        """Names of the FTS tables present in this database."""
+        wanted = [fts for _, fts, _ in _SEARCH_INDEXES.values()]
+        rows = self.conn.execute(
+            f"SELECT name FROM sqlite_master WHERE type = 'table' AND name IN ({','.join('?' * len(wanted))})",
+            wanted,
+        ).fetchall()
+        return {r[0] for r in rows}
+
+    def get_indexes(self) -> List[Dict[str, Any]]:
+        """List the indexes present in the database.
+
+        Each entry has name, table_name, sql (None for UNIQUE/PK autoindexes)
+        and a ``managed`` flag telling whether the index belongs to the set
+        maintained by ``create_indexes()``.
+        """
+        managed = {name for name, _, _ in _INDEXES}
+        rows = self._query(
+            "SELECT name, tbl_name AS table_name, sql FROM sqlite_master "
+            "WHERE type = 'index' ORDER BY tbl_name, name"
+        )
+        for row in rows:
+            row['managed'] = row['name'] in managed
+        return rows
+
+    def explain_query_plan(self, sql: str, params: tuple = ()) -> List[str]:
+        """Return the EXPLAIN QUERY PLAN detail lines for a query."""
+        cur = self.conn.cursor()
+        cur.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        return [r[3] for r in cur.fetchall()]
+
+    def index_report(self) -> List[Dict[str, Any]]:
+        """Show which index each hot-path query uses.
+
+        Returns:
+            List of dicts with query label, the plan lines and the index
+            names found in the plan (empty when SQLite falls back to a scan).
+        """
+        index_names = [row['name'] for row in self.get_indexes()]
+        report = []
+        for label, (sql, params) in _INDEX_PROBE_QUERIES.items():
+            try:
+                plan = self.explain_query_plan(sql, params)
+            except sqlite3.Error as e:
+                plan = [f"error: {e}"]
+            used = [name for name in index_names if any(name in line for line in plan)]
+            report.append({'query': label, 'plan': plan, 'indexes': used})
+        return report
+
     # --- companies ---
     def add_company(self, name, gstin=None, mobile=None, email=None, address=None,
                     website=None, tax_type=None, fy_start=None, fy_end=None,
@@ -533,7 +1577,6 @@ class Database:
         Dict keys: name, phone/mobile, email, gst_number/gstin, pan, address, city, state, pincode, opening_balance, balance_type, is_gst_registered, party_type
         Positional signature: (name, phone=None, email=None, gstin=None, pan=None, address=None, city=None, state=None, pincode=None, opening_balance=0, balance_type='dr', is_gst_registered=0, party_type='Customer')
         """
-        self.conn.execute('BEGIN')
         name = None  # Ensure name is always defined for logging
         try:
             if args and isinstance(args[0], dict):
@@ -586,31 +1629,31 @@ class Database:
                 account_holder = kwargs.get('account_holder')
                 upi = kwargs.get('upi')
 
-            # Check for duplicate party name (case-insensitive)
-            if name:
-                existing_parties = self._query(
+            with self.transaction():
+                # Check for duplicate party name (case-insensitive)
+                if name:
+                    existing_parties = self._query(
+                        """
+                        SELECT id FROM parties 
+                        WHERE company_id = ? AND name = ? COLLATE NOCASE LIMIT 1
+                        """,
+                        (self._current_company_id, name)
+                    )
+                    if existing_parties:
+                        from core.exceptions import PartyAlreadyExists
+                        raise PartyAlreadyExists(f"A party with the name '{name}' already exists")
+
+                cur = self._execute(
                     """
-                    SELECT id FROM parties 
-                    WHERE company_id = ? AND UPPER(name) = UPPER(?) LIMIT 1
+                    INSERT INTO parties(company_id, name, mobile, email, party_type, gst_number, pan, address, city, state, pincode, opening_balance, balance_type, status, credit_limit, credit_days, account_number, ifsc, bank_branch, account_holder, upi)
+                    VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
                     """,
-                    (self._current_company_id, name)
+                    (self._current_company_id, name, phone, email, party_type, gst, pan, address, city, state, pincode, float(opening or 0), balance_type, status, float(credit_limit or 0), int(credit_days or 0), account_number, ifsc, bank_branch, account_holder, upi),
                 )
-                if existing_parties:
-                    from core.exceptions import PartyAlreadyExists
-                    raise PartyAlreadyExists(f"A party with the name '{name}' already exists")
-
-            cur = self._execute(
-                """
-                INSERT INTO parties(company_id, name, mobile, email, party_type, gst_number, pan, address, city, state, pincode, opening_balance, balance_type, status, credit_limit, credit_days, account_number, ifsc, bank_branch, account_holder, upi)
-                VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
-                """,
-                (self._current_company_id, name, phone, email, party_type, gst, pan, address, city, state, pincode, float(opening or 0), balance_type, status, float(credit_limit or 0), int(credit_days or 0), account_number, ifsc, bank_branch, account_holder, upi),
-            )
-            self.conn.commit()
+            self._catalogue_changed('parties')
             logger.info(f"Party created: {name} (ID: {cur.lastrowid}) by company {self._current_company_id}")
             return cur.lastrowid
         except Exception as e:
-            self.conn.rollback()
             logger.error(f"Failed to create party: {name if name else ''} | Error: {e}")
             raise
 
@@ -666,45 +1709,125 @@ class Database:
                 """,
                 (name, phone, email, party_type, gst, pan, address, city, state, pincode, float(opening or 0), balance_type, status, float(credit_limit or 0), int(credit_days or 0), account_number, ifsc, bank_branch, account_holder, upi, party_id),
             )
-            self.conn.commit()
+            self._catalogue_changed('parties')
             logger.info(f"Party updated: {name} (ID: {party_id}) by company {self._current_company_id}")
             return True
         except Exception as e:
-            self.conn.rollback()
             logger.error(f"Failed to update party: {name if 'name' in locals() else ''} | Error: {e}")
             raise
 
-    def get_parties(self):
-        if self._current_company_id:
-            return self._query("SELECT * FROM parties WHERE company_id = ? ORDER BY id DESC", (self._current_company_id,))
-        return self._query("SELECT * FROM parties ORDER BY id DESC")
+    def get_parties(self, compact: bool = False):
+        return self._catalogue_rows('parties', compact)
 
-    def search_parties(self, search_term: str):
-        like = f"%{search_term}%"
-        if self._current_company_id:
-            return self._query(
-                "SELECT * FROM parties WHERE company_id = ? AND (name LIKE ? OR gst_number LIKE ?) ORDER BY id DESC",
-                (self._current_company_id, like, like),
-            )
-        return self._query(
-            "SELECT * FROM parties WHERE name LIKE ? OR gst_number LIKE ? ORDER BY id DESC",
-            (like, like),
-        )
+    def search_parties(self, search_term: str, limit: Optional[int] = 200):
+        """Parties matching name, mobile or GSTIN, best match first."""
+        return self._rows_by_ids("parties", self.search("party", search_term, limit))
 
     def delete_party(self, party_id: int):
-        # Start transaction
-        self.conn.execute('BEGIN')
         try:
-            party = self.get_party_by_id(party_id)
-            self._execute("DELETE FROM parties WHERE id = ?", (party_id,))
-            self.conn.commit()
+            with self.transaction():
+                party = self.get_party_by_id(party_id)
+                self._execute("DELETE FROM parties WHERE id = ?", (party_id,))
+                self._catalogue_changed('parties')
             logger.info(f"Party deleted: {party.get('name', '') if party else ''} (ID: {party_id}) by company {self._current_company_id}")
             return True
         except Exception as e:
-            self.conn.rollback()
             logger.error(f"Failed to delete party: ID {party_id} | Error: {e}")
             raise
 
+    # --- search ---
+    def search_subquery(self, entity: str, text: str) -> tuple:
+        """
+        SQL selecting the ids of `entity` rows whose searched columns contain `text`.
+
+        Meant for `id IN (...)` filters inside larger queries. Uses the FTS
+        index for 3+ characters (trigrams), a LIKE scan otherwise.
+
+        Returns:
+            Tuple of (sql, params)
+        """
+        table, fts, columns = _SEARCH_INDEXES[entity]
+        text = (text or "").strip()
+        phrase = self._fts_phrase(entity, text)
+        if phrase:
+            return f"SELECT rowid FROM {fts} WHERE {fts} MATCH ?", (phrase,)
+        like = _like_pattern(text)
+        where = " OR ".join(f"{c} LIKE ? ESCAPE '\\'" for c in columns)
+        return f"SELECT id FROM {table} WHERE {where}", (like,) * len(columns)
+
+    def search(self, entity: str, text: str, limit: Optional[int] = 50) -> List[int]:
+        """
+        Search parties, products or invoice numbers for the current company.
+
+        Candidates come newest-first (so a term matching thousands of rows
+        still stops early) and are then ranked: exact match, then prefix
+        match, then any substring match.
+
+        Args:
+            entity: 'party', 'product', 'invoice' or 'purchase_invoice'
+            text: Substring to look for (case-insensitive)
+            limit: Maximum ids to return (None for all)
+
+        Returns:
+            Matching row ids, best match first
+        """
+        if entity not in _SEARCH_INDEXES:
+            raise ValueError(f"Unknown search entity: {entity}")
+        text = (text or "").strip()
+        if not text:
+            return []
+        table, fts, columns = _SEARCH_INDEXES[entity]
+        company_sql, company_params = "", ()
+        if self._current_company_id:
+            company_sql, company_params = "AND t.company_id = ?", (self._current_company_id,)
+        # Over-fetch a little so an exact or prefix hit just past the cut still surfaces
+        fetch = -1 if limit is None else max(int(limit) * 4, 200)
+        select_cols = ", ".join(f"t.{c}" for c in columns)
+
+        phrase = self._fts_phrase(entity, text)
+        if phrase:
+            sql = (f"SELECT t.id, {select_cols} FROM {fts} f JOIN {table} t ON t.id = f.rowid "
+                   f"WHERE {fts} MATCH ? {company_sql} ORDER BY f.rowid DESC LIMIT ?")
+            params = (phrase,)
+        else:
+            like = _like_pattern(text)
+            where = " OR ".join(f"t.{c} LIKE ? ESCAPE '\\'" for c in columns)
+            sql = (f"SELECT t.id, {select_cols} FROM {table} t WHERE ({where}) {company_sql} "
+                   f"ORDER BY t.id DESC LIMIT ?")
+            params = (like,) * len(columns)
+        rows = self._query(sql, params + company_params + (fetch,))
+
+        needle = text.lower()
+
+        def rank(row):
+            values = [str(row[c] or "").lower() for c in columns]
+            if needle in values:
+                return 0
+            if any(v.startswith(needle) for v in values):
+                return 1
+            return 2
+
+        ids = [r['id'] for r in sorted(rows, key=rank)]
+        return ids if limit is None else ids[:int(limit)]
+
+    def _fts_phrase(self, entity: str, text: str) -> Optional[str]:
+        """FTS5 phrase query for `text`, or None when the LIKE fallback applies.
+
+        Trigram indexes cannot match fewer than 3 characters.
+        """
+        fts = _SEARCH_INDEXES[entity][1]
+        if len(text) < 3 or fts not in self._search_ready:
+            return None
+        return '"' + text.replace('"', '""') + '"'
+
+    def _rows_by_ids(self, table: str, ids: List[int]) -> List[Dict[str, Any]]:
+        """Fetch full rows for `ids`, keeping the order of `ids`."""
+        if not ids:
+            return []
+        rows = self._query(f"SELECT * FROM {table} WHERE id IN ({','.join('?' * len(ids))})", tuple(ids))
+        by_id = {r['id']: r for r in rows}
+        return [by_id[i] for i in ids if i in by_id]
+
     # --- products ---
     def add_product(self, name, hsn_code=None, barcode=None, unit='PCS', sales_rate=0, purchase_rate=0, discount_percent=0, mrp=0, tax_rate=18, sgst_rate=9, cgst_rate=9, opening_stock=0, low_stock=0, product_type='Goods', category=None, description=None, warranty_months=0, has_serial_number=0, track_stock=0, is_gst_registered=0):
         # current_stock starts with opening_stock value
@@ -716,6 +1839,7 @@ class Database:
                current_stock, created_at) VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,datetime('now'))""",
             (self._current_company_id, name, hsn_code, barcode, unit, float(sales_rate or 0), float(purchase_rate or 0), float(discount_percent or 0), float(mrp or 0), float(tax_rate or 0), float(sgst_rate or 0), float(cgst_rate or 0), float(opening_stock or 0), float(low_stock or 0), product_type, category, description, int(warranty_months or 0), int(has_serial_number or 0), int(track_stock or 0), int(is_gst_registered or 0), current_stock),
         )
+        self._catalogue_changed('products')
         return cur.lastrowid
 
     def update_product(self, data: dict):
@@ -754,29 +1878,31 @@ class Database:
             return
         vals.append(pid)
         self._execute(f"UPDATE products SET {', '.join(parts)} WHERE id=?", tuple(vals))
+        self._catalogue_changed('products')
         return True
 
-    def get_products(self):
-        if self._current_company_id:
-            return self._query("SELECT * FROM products WHERE company_id = ? ORDER BY id DESC", (self._current_company_id,))
-        return self._query("SELECT * FROM products ORDER BY id DESC")
+    def get_products(self, compact: bool = False):
+        return self._catalogue_rows('products', compact)
+
+    def search_products(self, search_term: str, limit: Optional[int] = 200):
+        """Products matching name, barcode or HSN code, best match first."""
+        return self._rows_by_ids("products", self.search("product", search_term, limit))
 
 
     def get_product_by_id(self, product_id: int):
         """Get a single product by ID"""
-        result = self._query("SELECT * FROM products WHERE id = ?", (product_id,))
-        return result[0] if result else None
+        return self._catalogue_row('products', product_id)
 
     def get_product_by_name(self, name: str):
         """Get a product by name (case-insensitive) for current company"""
         if self._current_company_id:
             result = self._query(
-                "SELECT * FROM products WHERE UPPER(name) = UPPER(?) AND company_id = ?",
-                (name, self._current_company_id)
+                "SELECT * FROM products WHERE company_id = ? AND name = ? COLLATE NOCASE",
+                (self._current_company_id, name)
             )
         else:
             result = self._query(
-                "SELECT * FROM products WHERE UPPER(name) = UPPER(?)",
+                "SELECT * FROM products WHERE name = ? COLLATE NOCASE",
                 (name,)
             )
         return result[0] if result else None
@@ -785,8 +1911,8 @@ class Database:
         """Get a product by barcode for current company"""
         if self._current_company_id:
             result = self._query(
-                "SELECT * FROM products WHERE barcode = ? AND company_id = ?",
-                (barcode, self._current_company_id)
+                "SELECT * FROM products WHERE company_id = ? AND barcode = ?",
+                (self._current_company_id, barcode)
             )
         else:
             result = self._query(
@@ -797,11 +1923,11 @@ class Database:
 
     def get_party_by_id(self, party_id: int):
         """Get a single party by ID"""
-        result = self._query("SELECT * FROM parties WHERE id = ?", (party_id,))
-        return result[0] if result else None
+        return self._catalogue_row('parties', party_id)
 
     def delete_product(self, product_id: int):
         self._execute("DELETE FROM products WHERE id = ?", (product_id,))
+        self._catalogue_changed('products')
 
     def get_product_categories(self) -> list:
         """Get all unique product categories for the current company"""
@@ -823,105 +1949,145 @@ class Database:
         operation: 'add' for purchase (increase stock), 'subtract' for sales (decrease stock)
         Only updates if track_stock is enabled for the product.
         """
-        product = self.get_product_by_id(product_id)
-        if not product:
+        sql = _STOCK_ADJUST_SQL.get(operation)
+        if not sql:
             return False
-        
-        # Check if track_stock is enabled
-        if not product.get('track_stock', 0):
-            return False  # Stock tracking not enabled for this product
-        
-        current_stock = float(product.get('current_stock', 0) or 0)
-        
-        if operation == 'add':
-            new_stock = current_stock + float(quantity_change)
-        elif operation == 'subtract':
-            new_stock = current_stock - float(quantity_change)
-            # Prevent negative stock
-            if new_stock < 0:
-                new_stock = 0
-        else:
-            return False
-        
-        self._execute("UPDATE products SET current_stock = ? WHERE id = ?", (new_stock, product_id))
-        return True
+        cur = self._execute(sql, (float(quantity_change), product_id))
+        if cur.rowcount > 0:
+            self._catalogue_changed('products', [product_id])
+        return cur.rowcount > 0
 
-    def update_stock_for_purchase_items(self, items: list):
+    def adjust_stock(self, items: list, operation: str, previous_items: Optional[list] = None) -> int:
         """
-        Update stock for all items in a purchase invoice.
-        items: list of dicts with 'product_id' and 'quantity'
+        Apply the stock change for every line of an invoice in one statement.
+
+        Quantities are summed per product and applied in SQL, so concurrent
+        saves cannot overwrite each other's stock. Runs inside the caller's
+        transaction when there is one.
+
+        Args:
+            items: list of dicts with 'product_id' and 'quantity'
+            operation: 'add' (purchase) or 'subtract' (sale)
+            previous_items: Lines the invoice had before an edit; only the
+                net change per product is applied, and a product whose
+                quantity went down gets the difference back
+
+        Returns:
+            Number of tracked products updated
         """
+        sql = _STOCK_ADJUST_SQL.get(operation)
+        if not sql:
+            raise ValueError(f"Unknown stock operation: {operation}")
+        reverse_sql = _STOCK_ADJUST_SQL['subtract' if operation == 'add' else 'add']
+        deltas = self._stock_quantities(items)
+        for product_id, quantity in self._stock_quantities(previous_items or []).items():
+            deltas[product_id] = deltas.get(product_id, 0.0) - quantity
+        forward = [(qty, pid) for pid, qty in deltas.items() if qty > 0]
+        backward = [(-qty, pid) for pid, qty in deltas.items() if qty < 0]
+        with self.transaction():
+            updated = self._executemany(sql, forward) + self._executemany(reverse_sql, backward)
+            self._catalogue_changed('products', [pid for _, pid in forward + backward])
+        return updated
+
+    @staticmethod
+    def _stock_quantities(items: list) -> Dict[int, float]:
+        """Product id -> total quantity of a list of lines."""
+        quantities = {}
         for item in items:
             product_id = item.get('product_id')
-            quantity = float(item.get('quantity', 0))
+            quantity = float(item.get('quantity', 0) or 0)
             if product_id and quantity > 0:
-                self.update_product_stock(product_id, quantity, 'add')
+                quantities[product_id] = quantities.get(product_id, 0.0) + quantity
+        return quantities
 
-    def update_stock_for_sales_items(self, items: list):
+    def update_stock_for_purchase_items(self, items: list, previous_items: Optional[list] = None):
+        """
+        Update stock for all items in a purchase invoice.
+        items: list of dicts with 'product_id' and 'quantity'
+        previous_items: the invoice's lines before an edit (see adjust_stock)
+        """
+        return self.adjust_stock(items, 'add', previous_items)
+
+    def update_stock_for_sales_items(self, items: list, previous_items: Optional[list] = None):
         """
         Update stock for all items in a sales invoice.
         items: list of dicts with 'product_id' and 'quantity'
+        previous_items: the invoice's lines before an edit (see adjust_stock)
         """
-        print(f"DEBUG: update_stock_for_sales_items called with {len(items)} items")
-        for item in items:
-            product_id = item.get('product_id')
-            quantity = float(item.get('quantity', 0))
-            print(f"DEBUG: Processing item - product_id: {product_id}, quantity: {quantity}")
-            if product_id and quantity > 0:
-                result = self.update_product_stock(product_id, quantity, 'subtract')
-                print(f"DEBUG: update_product_stock returned: {result}")
+        return self.adjust_stock(items, 'subtract', previous_items)
 
     # --- invoices ---
-    def add_invoice(self, invoice_no, date, party_id, tax_type='GST - Same State', subtotal=0, cgst=0, sgst=0, igst=0, round_off=0, grand_total=0, status='Unpaid', bill_type='CASH', discount=0, balance_due=0, notes=None):
-        cur = self._execute(
-            """INSERT INTO invoices(
-                company_id, invoice_no, date, party_id, tax_type, bill_type,
-                subtotal, discount, cgst, sgst, igst, round_off, grand_total,
-                balance_due, status, notes
-            ) VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)""",
-            (
-                self._current_company_id, invoice_no, date, party_id, tax_type, bill_type,
-                float(subtotal or 0), float(discount or 0), float(cgst or 0), float(sgst or 0), float(igst or 0),
-                float(round_off or 0), float(grand_total or 0), float(balance_due or 0),
-                status, notes
-            ),
-        )
+    def add_invoice(self, invoice_no, date, party_id, tax_type='GST - Same State', subtotal=0, cgst=0, sgst=0, igst=0, round_off=0, grand_total=0, bill_type='CASH', discount=0, notes=None):
+        """Insert an invoice; its balance_due and status are settled from amount_paid (see _SETTLE_INVOICE_SQL)."""
+        grand_total = float(grand_total or 0)
+        amount_paid = grand_total if bill_type == 'CASH' else 0.0
+        with self.transaction():
+            cur = self._execute(
+                """INSERT INTO invoices(
+                    company_id, invoice_no, date, party_id, tax_type, bill_type,
+                    subtotal, discount, cgst, sgst, igst, round_off, grand_total,
+                    amount_paid, status, notes
+                ) VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?,?,'Unpaid',?)""",
+                (
+                    self._current_company_id, invoice_no, date, party_id, tax_type, bill_type,
+                    float(subtotal or 0), float(discount or 0), float(cgst or 0), float(sgst or 0), float(igst or 0),
+                    float(round_off or 0), grand_total, amount_paid, notes
+                ),
+            )
+            self._execute(_SETTLE_INVOICE_SQL.format(invoice_id='?'), (cur.lastrowid,))
         return cur.lastrowid
 
-    def get_invoices(self):
+    def get_invoices(self, compact: bool = False):
         if self._current_company_id:
-            return self._query("SELECT * FROM invoices WHERE company_id = ? ORDER BY id DESC", (self._current_company_id,))
-        return self._query("SELECT * FROM invoices ORDER BY id DESC")
+            return self._query("SELECT * FROM invoices WHERE company_id = ? ORDER BY id DESC", (self._current_company_id,), compact=compact)
+        return self._query("SELECT * FROM invoices ORDER BY id DESC", compact=compact)
 
     def update_invoice(self, invoice_data: Dict):
+        """
+        Update an invoice's header; balance_due and status are re-settled from amount_paid.
+
+        A CASH bill counts its (new) total as paid; a bill moved off CASH
+        goes back to the receipts allocated to it. A Cancelled invoice stays
+        Cancelled.
+        """
         iid = invoice_data.get('id')
         if not iid:
             return False
-        self._execute(
-            """UPDATE invoices SET 
-                invoice_no = ?, date = ?, party_id = ?, tax_type = ?, bill_type = ?,
-                subtotal = ?, discount = ?, cgst = ?, sgst = ?, igst = ?, round_off = ?,
-                grand_total = ?, balance_due = ?, status = ?, notes = ?
-            WHERE id = ?""",
-            (
-                invoice_data.get('invoice_no'),
-                invoice_data.get('date'),
-                invoice_data.get('party_id'),
-                invoice_data.get('tax_type', 'GST - Same State'),
-                invoice_data.get('bill_type', 'CASH'),
-                float(invoice_data.get('subtotal') or 0),
-                float(invoice_data.get('discount') or 0),
-                float(invoice_data.get('cgst') or 0),
-                float(invoice_data.get('sgst') or 0),
-                float(invoice_data.get('igst') or 0),
-                float(invoice_data.get('round_off') or 0),
-                float(invoice_data.get('grand_total') or 0),
-                float(invoice_data.get('balance_due') or 0),
-                invoice_data.get('status', 'Unpaid'),
-                invoice_data.get('notes'),
-                iid,
+        bill_type = invoice_data.get('bill_type', 'CASH')
+        grand_total = float(invoice_data.get('grand_total') or 0)
+        with self.transaction():
+            # amount_paid's CASE reads the row's old bill_type
+            self._execute(
+                """UPDATE invoices SET 
+                    invoice_no = ?, date = ?, party_id = ?, tax_type = ?, bill_type = ?,
+                    subtotal = ?, discount = ?, cgst = ?, sgst = ?, igst = ?, round_off = ?,
+                    grand_total = ?, notes = ?,
+                    amount_paid = CASE
+                        WHEN ? = 'CASH' THEN MAX(amount_paid, ?)
+                        WHEN bill_type = 'CASH' THEN COALESCE(
+                            (SELECT SUM(a.amount) FROM payment_allocations a WHERE a.invoice_id = invoices.id), 0)
+                        ELSE amount_paid
+                    END
+                WHERE id = ?""",
+                (
+                    invoice_data.get('invoice_no'),
+                    invoice_data.get('date'),
+                    invoice_data.get('party_id'),
+                    invoice_data.get('tax_type', 'GST - Same State'),
+                    bill_type,
+                    float(invoice_data.get('subtotal') or 0),
+                    float(invoice_data.get('discount') or 0),
+                    float(invoice_data.get('cgst') or 0),
+                    float(invoice_data.get('sgst') or 0),
+                    float(invoice_data.get('igst') or 0),
+                    float(invoice_data.get('round_off') or 0),
+                    grand_total,
+                    invoice_data.get('notes'),
+                    bill_type, grand_total,
+                    iid,
+                )
             )
-        )
+            self._execute(_SETTLE_INVOICE_SQL.format(invoice_id='?'), (iid,))
         return True
 
     def delete_invoice(self, invoice_id: int):
@@ -951,6 +2117,94 @@ class Database:
             result = self._query("SELECT COUNT(*) as count FROM invoices WHERE invoice_no = ?", (invoice_no,))
         return result[0]['count'] > 0 if result else False
 
+    # --- number series ---
+    def _series_highest_number(self, company_id: int, prefix: str, fy: str) -> int:
+        """Highest number of a series already used by an invoice (0 if none).
+
+        This is the only place that reads invoice numbers. It runs once per
+        series, when its number_series row is created (e.g. the first
+        invoice of a new financial year), and reads the numbers starting
+        with the series head as an index range.
+        """
+        head = f"{prefix}-{fy}-" if fy else f"{prefix}-"
+        # Every string starting with head sorts in [head, head with its last character bumped)
+        sql = "SELECT invoice_no FROM invoices WHERE invoice_no >= ? AND invoice_no < ?"
+        params = (head, head[:-1] + chr(ord(head[-1]) + 1))
+        if company_id:
+            sql += " AND company_id = ?"
+            params += (company_id,)
+        return max(
+            (number for row in self._query(sql, params)
+             for p, f, number in _series_keys(row['invoice_no']) if (p, f) == (prefix, fy)),
+            default=0,
+        )
+
+    def _seed_number_series(self, company_id: int, prefix: str, fy: str):
+        """Create a missing series row, starting after the highest number already used."""
+        self._execute(
+            "INSERT INTO number_series(company_id, prefix, fy, last_number) VALUES(?,?,?,?) "
+            "ON CONFLICT(company_id, prefix, fy) DO NOTHING",
+            (company_id, prefix, fy, self._series_highest_number(company_id, prefix, fy)),
+        )
+
+    def peek_series_number(self, prefix: str, fy: str = '') -> int:
+        """
+        Next number a series would hand out, without taking it.
+
+        Use this to pre-fill a new document; the number is only reserved
+        by allocate_series_number() when the document is saved. A series
+        seen for the first time gets its number_series row here (starting
+        after the highest number already used), so later peeks are one
+        key lookup; the counter itself is not moved.
+
+        Args:
+            prefix: Series prefix, e.g. 'INV'
+            fy: Financial year code such as '2526', or '' for a plain series
+
+        Returns:
+            The next number in the series for the current company
+        """
+        key = (self._current_company_id or 0, prefix, fy)
+        sql = "SELECT last_number FROM number_series WHERE company_id = ? AND prefix = ? AND fy = ?"
+        rows = self._query(sql, key)
+        if not rows:
+            with self.transaction():
+                self._seed_number_series(*key)
+                rows = self._query(sql, key)
+        return rows[0]['last_number'] + 1
+
+    def allocate_series_number(self, prefix: str, fy: str = '', minimum: int = 0) -> int:
+        """
+        Atomically take the next number from a series.
+
+        Call it inside the transaction that saves the document: the write
+        lock held from BEGIN IMMEDIATE keeps two counters from taking the
+        same number, and a rolled-back save gives the number back.
+
+        Args:
+            prefix: Series prefix, e.g. 'INV'
+            fy: Financial year code such as '2526', or '' for a plain series
+            minimum: Lowest acceptable number; the series jumps forward to it
+                when the user typed a number ahead of the counter
+
+        Returns:
+            The allocated number
+        """
+        company_id = self._current_company_id or 0
+        key = (company_id, prefix, fy)
+        with self.transaction():
+            bump = (
+                "UPDATE number_series SET last_number = MAX(last_number + 1, ?) "
+                "WHERE company_id = ? AND prefix = ? AND fy = ?"
+            )
+            if self._execute(bump, (minimum, *key)).rowcount == 0:
+                self._seed_number_series(*key)
+                self._execute(bump, (minimum, *key))
+            rows = self._query(
+                "SELECT last_number FROM number_series WHERE company_id = ? AND prefix = ? AND fy = ?", key
+            )
+        return rows[0]['last_number']
+
     # --- invoice items ---
     def add_invoice_item(self, invoice_id: int, product_id: int, product_name: str, 
                         hsn_code: str = None, quantity: float = 0, unit: str = 'Piece',
@@ -970,6 +2224,27 @@ class Database:
         )
         return cur.lastrowid
 
+    def add_invoice_items(self, invoice_id: int, items: List[Dict[str, Any]]) -> int:
+        """
+        Add all line items of an invoice with a single executemany.
+
+        Args:
+            invoice_id: ID of the invoice
+            items: Item dicts using the add_invoice_item keyword names
+
+        Returns:
+            Number of rows inserted
+        """
+        return self._executemany(
+            """
+            INSERT INTO invoice_items(invoice_id, product_id, product_name, hsn_code, 
+                                    quantity, unit, rate, discount_percent, discount_amount,
+                                    tax_percent, tax_amount, amount) 
+            VALUES(?,?,?,?,?,?,?,?,?,?,?,?)
+            """,
+            [self._line_item_row(invoice_id, item) for item in items],
+        )
+
     def get_invoice_items(self, invoice_id: int):
         """Get all line items for an invoice"""
         return self._query("SELECT * FROM invoice_items WHERE invoice_id = ? ORDER BY id", (invoice_id,))
@@ -1022,14 +2297,19 @@ class Database:
 
     # --- payments (minimal) ---
     def add_payment(self, payment_id, party_id, amount, date, mode='Cash', invoice_id=None, notes=None, payment_type=None):
-        """Add a payment or receipt. payment_type should be 'PAYMENT' or 'RECEIPT'"""
+        """Add a payment or receipt. payment_type should be 'PAYMENT' or 'RECEIPT'
+
+        A receipt with an invoice_id is allocated to that invoice in full; for
+        one spread over several invoices pass no invoice_id and call
+        add_payment_allocations() in the same transaction.
+        """
         cur = self._execute(
             "INSERT INTO payments(company_id, payment_id, party_id, amount, date, mode, invoice_id, notes, type) VALUES(?,?,?,?,?,?,?,?,?)",
             (self._current_company_id, payment_id, party_id, float(amount or 0), date, mode, invoice_id, notes, payment_type),
         )
         return cur.lastrowid
 
-    def get_payments(self, payment_type=None):
+    def get_payments(self, payment_type=None, compact: bool = False):
         """Get payments. Optionally filter by type ('PAYMENT' or 'RECEIPT')"""
         if self._current_company_id:
             if payment_type:
@@ -1039,14 +2319,14 @@ class Database:
                     LEFT JOIN parties pa ON p.party_id = pa.id 
                     WHERE p.company_id = ? AND p.type = ?
                     ORDER BY p.id DESC
-                """, (self._current_company_id, payment_type))
+                """, (self._current_company_id, payment_type), compact=compact)
             return self._query("""
                 SELECT p.*, pa.name as party_name
                 FROM payments p 
                 LEFT JOIN parties pa ON p.party_id = pa.id 
                 WHERE p.company_id = ?
                 ORDER BY p.id DESC
-            """, (self._current_company_id,))
+            """, (self._current_company_id,), compact=compact)
         if payment_type:
             return self._query("""
                 SELECT p.*, pa.name as party_name
@@ -1054,13 +2334,13 @@ class Database:
                 LEFT JOIN parties pa ON p.party_id = pa.id 
                 WHERE p.type = ?
                 ORDER BY p.id DESC
-            """, (payment_type,))
+            """, (payment_type,), compact=compact)
         return self._query("""
             SELECT p.*, pa.name as party_name
             FROM payments p 
             LEFT JOIN parties pa ON p.party_id = pa.id 
             ORDER BY p.id DESC
-        """)
+        """, compact=compact)
 
     def update_payment(self, payment_data: Dict):
         pid = payment_data.get('id')
@@ -1085,6 +2365,37 @@ class Database:
     def delete_payment(self, payment_id: int):
         self._execute("DELETE FROM payments WHERE id = ?", (payment_id,))
 
+    def add_payment_allocations(self, payment_id: int, allocations: List[tuple]) -> int:
+        """Settle parts of a receipt against sales invoices.
+
+        The invoices' amount_paid, balance_due and status follow in the same
+        transaction (payment allocation triggers).
+
+        Args:
+            payment_id: payments.id of the receipt (not its REC-... reference)
+            allocations: (invoice_id, amount) pairs
+
+        Returns:
+            Number of allocation rows added
+        """
+        return self._executemany(
+            "INSERT INTO payment_allocations(payment_id, invoice_id, amount) VALUES(?,?,?)",
+            [(payment_id, invoice_id, float(amount or 0)) for invoice_id, amount in allocations],
+        )
+
+    def get_payment_allocations(self, payment_id: int):
+        """Invoices a receipt is settled against, with their invoice numbers."""
+        return self._query(
+            """
+            SELECT a.*, i.invoice_no
+            FROM payment_allocations a
+            LEFT JOIN invoices i ON i.id = a.invoice_id
+            WHERE a.payment_id = ?
+            ORDER BY a.id
+            """,
+            (payment_id,),
+        )
+
     # --- purchase invoices ---
     def add_purchase_invoice(self, invoice_no, date, supplier_id, supplier_invoice_no=None, 
                              invoice_type='GST', grand_total=0, status='Unpaid', notes=None):
@@ -1097,11 +2408,11 @@ class Database:
         )
         return cur.lastrowid
 
-    def get_purchase_invoices(self):
+    def get_purchase_invoices(self, compact: bool = False):
         """Get all purchase invoices for current company"""
         if self._current_company_id:
-            return self._query("SELECT * FROM purchase_invoices WHERE company_id = ? ORDER BY id DESC", (self._current_company_id,))
-        return self._query("SELECT * FROM purchase_invoices ORDER BY id DESC")
+            return self._query("SELECT * FROM purchase_invoices WHERE company_id = ? ORDER BY id DESC", (self._current_company_id,), compact=compact)
+        return self._query("SELECT * FROM purchase_invoices ORDER BY id DESC", compact=compact)
 
     def get_purchase_invoice_by_id(self, purchase_id: int):
         """Get purchase invoice by ID"""
@@ -1167,6 +2478,42 @@ class Database:
         )
         return cur.lastrowid
 
+    def add_purchase_invoice_items(self, purchase_invoice_id: int, items: List[Dict[str, Any]]) -> int:
+        """
+        Add all line items of a purchase invoice with a single executemany.
+
+        Args:
+            purchase_invoice_id: ID of the purchase invoice
+            items: Item dicts using the add_purchase_invoice_item keyword names
+
+        Returns:
+            Number of rows inserted
+        """
+        return self._executemany(
+            """INSERT INTO purchase_invoice_items(purchase_invoice_id, product_id, product_name, hsn_code,
+               quantity, unit, rate, discount_percent, discount_amount, tax_percent, tax_amount, amount)
+               VALUES(?,?,?,?,?,?,?,?,?,?,?,?)""",
+            [self._line_item_row(purchase_invoice_id, item) for item in items],
+        )
+
+    @staticmethod
+    def _line_item_row(parent_id: int, item: Dict[str, Any]) -> tuple:
+        """Map an item dict to the 12-column invoice_items / purchase_invoice_items row."""
+        return (
+            parent_id,
+            item.get('product_id', 0),
+            item.get('product_name', ''),
+            item.get('hsn_code'),
+            float(item.get('quantity', 0) or 0),
+            item.get('unit', 'Piece'),
+            float(item.get('rate', 0) or 0),
+            float(item.get('discount_percent', 0) or 0),
+            float(item.get('discount_amount', 0) or 0),
+            float(item.get('tax_percent', 0) or 0),
+            float(item.get('tax_amount', 0) or 0),
+            float(item.get('amount', 0) or 0),
+        )
+
     def get_purchase_invoice_items(self, purchase_invoice_id: int):
         """Get all line items for a purchase invoice"""
         return self._query("SELECT * FROM purchase_invoice_items WHERE purchase_invoice_id = ? ORDER BY id", 
@@ -1232,6 +2579,7 @@ class Database:
                 (company_id,)
             )
             migrated[table] = result.rowcount
+        self._catalogue.invalidate()
         return migrated
 
     def get_unassigned_data_count(self):
@@ -1247,5 +2595,35 @@ class Database:
         return counts
 
 
+class _DefaultDatabase:
+    """
+    The app-wide Database, opened on first use.
+
+    Importing this module (or a service built on it) does not open, migrate
+    or switch the journal mode of the application database, so scripts that
+    open their own file with Database(path) never touch it.
+    """
+
+    def __init__(self):
+        self._instance = None
+        self._lock = threading.Lock()
+
+    def _get(self) -> Database:
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = Database()
+        return self._instance
+
+    def __getattr__(self, name):
+        return getattr(self._get(), name)
+
+    def __setattr__(self, name, value):
+        if name in ('_instance', '_lock'):
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._get(), name, value)
+
+
 # single global instance used by the app
-db = Database()
+db = _DefaultDatabase()
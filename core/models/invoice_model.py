@@ -80,6 +80,7 @@ class Invoice:
     round_off: float = 0.0
     grand_total: float = 0.0
     balance_due: float = 0.0
+    amount_paid: float = 0.0  # receipts allocated to the invoice
     status: str = "Unpaid"
     notes: Optional[str] = None
     created_at: Optional[str] = None
@@ -104,6 +105,7 @@ class Invoice:
             round_off=float(data.get('round_off', 0) or 0),
             grand_total=float(data.get('grand_total', 0) or 0),
             balance_due=float(data.get('balance_due', 0) or 0),
+            amount_paid=float(data.get('amount_paid', 0) or 0),
             status=data.get('status', 'Unpaid'),
             notes=data.get('notes'),
             created_at=data.get('created_at')
@@ -132,6 +134,7 @@ class Invoice:
             'round_off': self.round_off,
             'grand_total': self.grand_total,
             'balance_due': self.balance_due,
+            'amount_paid': self.amount_paid,
             'status': self.status,
             'notes': self.notes,
             'created_at': self.created_at
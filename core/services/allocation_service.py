@@ -0,0 +1,178 @@
+"""
+Allocation Service
+Settlement of a customer receipt against the customer's open invoices
+
+One query per party fetches the invoices still due, oldest first, from
+their settled status and balance_due (kept by the payment allocation
+triggers) instead of loading every invoice of the company and summing
+payments per screen refresh. Cancelled and paid invoices are never open.
+The result is cached until invoices or allocations change, and FIFO /
+bill-to-bill allocations are computed from it in memory, so they can be
+recomputed on every amount keystroke.
+"""
+
+import threading
+from bisect import bisect_right
+from dataclasses import dataclass
+from itertools import accumulate
+from typing import Dict, List, Optional, Tuple
+
+from core.db.sqlite_db import db as default_db
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Amounts are rupees; differences below a paisa are rounding noise
+_EPSILON = 0.005
+
+
+@dataclass
+class Allocation:
+    """Part of a receipt applied to one invoice."""
+    invoice: Dict
+    amount: float
+    status: str  # 'Full', 'Partial' or 'Pending' (nothing applied)
+
+    @property
+    def invoice_id(self):
+        return self.invoice['id']
+
+    @property
+    def invoice_no(self) -> str:
+        return self.invoice.get('invoice_no') or f"INV-{self.invoice.get('id', 0):03d}"
+
+
+class OpenInvoices:
+    """
+    A party's open invoices, oldest first, with running totals of their dues.
+
+    Each invoice dict is the invoices row plus:
+        - paid_amount: amount settled against it (invoices.amount_paid)
+        - balance_due / due_amount: invoices.balance_due, as last settled
+    """
+
+    def __init__(self, party_id: int, invoices: List[Dict]):
+        self.party_id = party_id
+        self.invoices = invoices
+        # _cumulative[i] = total due of invoices[0..i]
+        self._cumulative = list(accumulate(inv['balance_due'] for inv in invoices))
+        self._by_id = {inv['id']: inv for inv in invoices}
+
+    def __len__(self) -> int:
+        return len(self.invoices)
+
+    @property
+    def total_due(self) -> float:
+        return self._cumulative[-1] if self._cumulative else 0.0
+
+    def newest_first(self) -> List[Dict]:
+        """Invoices in bill-to-bill display order."""
+        return self.invoices[::-1]
+
+    def find(self, invoice_id) -> Optional[Dict]:
+        """Open invoice by id, or None if it is not open."""
+        return self._by_id.get(invoice_id)
+
+    def fifo(self, amount: float) -> Tuple[List[Allocation], float]:
+        """
+        Split an amount over the invoices, oldest first.
+
+        The invoices covered in full are found by bisecting the running
+        dues, so only the boundary invoice needs arithmetic.
+
+        Args:
+            amount: Receipt amount
+
+        Returns:
+            (allocation for every open invoice, advance left over)
+        """
+        amount = max(0.0, float(amount or 0))
+        full = bisect_right(self._cumulative, amount + _EPSILON)
+        covered = self._cumulative[full - 1] if full else 0.0
+        remaining = amount - covered
+
+        allocations = [Allocation(inv, inv['balance_due'], 'Full') for inv in self.invoices[:full]]
+        rest = self.invoices[full:]
+        if rest and remaining > _EPSILON:
+            allocations.append(Allocation(rest[0], remaining, 'Partial'))
+            rest = rest[1:]
+            remaining = 0.0
+        allocations.extend(Allocation(inv, 0.0, 'Pending') for inv in rest)
+        return allocations, max(0.0, remaining)
+
+    @staticmethod
+    def bill_to_bill(invoice: Dict, amount: float) -> Tuple[float, float, float]:
+        """
+        Apply an amount to one invoice.
+
+        Returns:
+            (amount applied, balance still due, excess over the due)
+        """
+        due = float(invoice.get('balance_due') or 0)
+        amount = max(0.0, float(amount or 0))
+        applied = min(amount, due)
+        return applied, due - applied, amount - applied
+
+
+class AllocationService:
+    """Service class for receipt allocation"""
+
+    # A party's open invoices stay cached until one of these tables changes
+    SOURCE_TABLES = ('invoices', 'payment_allocations')
+
+    def __init__(self, db=None):
+        self.db = db or default_db
+        self._lock = threading.Lock()
+        self._cache = {}  # (company_id, party_id) -> (change version, OpenInvoices)
+
+    def get_open_invoices(self, party_id: int) -> OpenInvoices:
+        """
+        A party's invoices with an amount still due, oldest first.
+
+        Args:
+            party_id: Customer ID
+
+        Returns:
+            OpenInvoices (cached until invoices or payments change)
+        """
+        company_id = self.db.get_current_company_id()
+        key = (company_id, party_id)
+        version = self.db.get_change_version(*self.SOURCE_TABLES)
+        with self._lock:
+            cached = self._cache.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        open_invoices = OpenInvoices(party_id, self._query_open_invoices(party_id, company_id))
+        with self._lock:
+            # Entries of other versions are stale; keep the cache to one version
+            self._cache = {k: v for k, v in self._cache.items() if v[0] == version}
+            self._cache[key] = (version, open_invoices)
+        return open_invoices
+
+    def _query_open_invoices(self, party_id: int, company_id: Optional[int]) -> List[Dict]:
+        company_sql, company_params = ("AND i.company_id = ?", (company_id,)) if company_id else ("", ())
+        invoices = self.db._query(
+            f"""
+            SELECT i.*, i.amount_paid AS paid_amount
+            FROM invoices i
+            WHERE i.party_id = ? {company_sql}
+              AND COALESCE(i.status, '') NOT IN ('Cancelled', 'Paid')
+              AND ROUND(COALESCE(i.balance_due, 0), 2) > 0
+            ORDER BY i.date, i.id
+            """,
+            (party_id,) + company_params
+        )
+        for inv in invoices:
+            inv['balance_due'] = inv['due_amount'] = round(float(inv['balance_due'] or 0), 2)
+        logger.debug(f"Party {party_id} has {len(invoices)} open invoices")
+        return invoices
+
+    def invalidate(self):
+        """Drop all cached open invoices."""
+        with self._lock:
+            self._cache = {}
+
+
+# Singleton instance for app-wide use
+allocation_service = AllocationService()
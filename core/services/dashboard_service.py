@@ -0,0 +1,242 @@
+"""
+Dashboard Service
+Aggregate figures and short recent-activity lists for the dashboard
+
+Everything is computed in SQL: a few aggregate queries for the metric cards
+and LIMITed queries for the tables, instead of loading whole tables and
+summing in Python. Results are cached until one of the source tables
+changes (Database.get_change_version), the company changes or the day rolls
+over, so repeated refreshes cost one version check.
+
+The service does not touch widgets and can be called from a worker thread.
+"""
+
+import threading
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from core.db.sqlite_db import db as default_db
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class DashboardData:
+    """Raw dashboard figures; formatting is left to the screen."""
+    sales_today: float = 0.0
+    pending_amount: float = 0.0
+    total_invoices: int = 0
+    new_invoices: int = 0  # invoices dated within the last 7 days
+    total_parties: int = 0
+    customers: int = 0
+    total_products: int = 0
+    recent_invoices: List[Dict] = field(default_factory=list)
+    low_stock: List[Dict] = field(default_factory=list)
+    recent_receipts: List[Dict] = field(default_factory=list)
+
+
+class DashboardService:
+    """Service class for dashboard figures"""
+
+    # Tables the dashboard reads; a write to any of them invalidates the cache
+    SOURCE_TABLES = ('invoices', 'payments', 'parties', 'products')
+
+    RECENT_INVOICES_LIMIT = 8
+    LOW_STOCK_LIMIT = 5
+    RECENT_RECEIPTS_LIMIT = 5
+
+    def __init__(self, db=None):
+        self.db = db or default_db
+        self._lock = threading.Lock()
+        self._cache_key = None
+        self._cache_data: Optional[DashboardData] = None
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Cached access
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def _current_key(self, today: date) -> tuple:
+        return (
+            self.db.get_current_company_id(),
+            today,
+            self.db.get_change_version(*self.SOURCE_TABLES),
+        )
+
+    def get_cached_data(self, today: Optional[date] = None) -> Optional[DashboardData]:
+        """
+        Dashboard data if the cached copy is still current, else None.
+
+        Cheap enough for the GUI thread: only reads the change version.
+        """
+        key = self._current_key(today or date.today())
+        with self._lock:
+            return self._cache_data if self._cache_key == key else None
+
+    def get_dashboard_data(self, today: Optional[date] = None) -> DashboardData:
+        """
+        Dashboard data, computed only when a source table changed.
+
+        Args:
+            today: Date "today" / "this week" are relative to (defaults to today)
+
+        Returns:
+            DashboardData (the cached instance while nothing changed)
+        """
+        today = today or date.today()
+        # Read the key first: a write during the queries then shows up as a change
+        key = self._current_key(today)
+        with self._lock:
+            if self._cache_key == key:
+                return self._cache_data
+
+        data = self.compute(today)
+        with self._lock:
+            self._cache_key, self._cache_data = key, data
+        return data
+
+    def invalidate(self):
+        """Drop the cached data."""
+        with self._lock:
+            self._cache_key = self._cache_data = None
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Queries
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def _company_where(self, alias: str) -> Tuple[str, tuple]:
+        """WHERE clause limiting a table to the current company (all rows without one)."""
+        company_id = self.db.get_current_company_id()
+        if company_id:
+            return f"WHERE {alias}.company_id = ?", (company_id,)
+        return "", ()
+
+    def compute(self, today: date) -> DashboardData:
+        """
+        Run the dashboard queries.
+
+        Args:
+            today: Date "today" / "this week" are relative to
+
+        Returns:
+            Freshly computed DashboardData
+        """
+        data = DashboardData()
+        self._fill_invoice_metrics(data, today)
+        self._fill_catalogue_counts(data)
+        data.recent_invoices = self.get_recent_invoices()
+        data.low_stock = self.get_low_stock_items()
+        data.recent_receipts = self.get_recent_receipts()
+        return data
+
+    def _fill_invoice_metrics(self, data: DashboardData, today: date):
+        """Sales today, amount still due and invoice counts in one pass over invoices."""
+        where, params = self._company_where('i')
+        week_ago = (today - timedelta(days=7)).isoformat()
+        row = self.db._query(
+            f"""
+            SELECT
+                COUNT(*) AS total,
+                COALESCE(SUM(CASE WHEN i.date = ? THEN i.grand_total END), 0) AS sales_today,
+                COALESCE(SUM(CASE WHEN LOWER(COALESCE(i.status, '')) NOT IN ('paid', 'cancelled')
+                                  THEN i.balance_due END), 0) AS pending,
+                COALESCE(SUM(i.date >= ?), 0) AS new_invoices
+            FROM invoices i
+            {where}
+            """,
+            (today.isoformat(), week_ago) + params
+        )[0]
+        data.total_invoices = row['total']
+        data.sales_today = float(row['sales_today'] or 0)
+        data.pending_amount = float(row['pending'] or 0)
+        data.new_invoices = row['new_invoices']
+
+    def _fill_catalogue_counts(self, data: DashboardData):
+        """Party, customer and product counts."""
+        where, params = self._company_where('p')
+        row = self.db._query(
+            f"""
+            SELECT COUNT(*) AS total, COALESCE(SUM(LOWER(p.party_type) = 'customer'), 0) AS customers
+            FROM parties p
+            {where}
+            """,
+            params
+        )[0]
+        data.total_parties = row['total']
+        data.customers = row['customers']
+
+        where, params = self._company_where('p')
+        data.total_products = self.db._query(
+            f"SELECT COUNT(*) AS total FROM products p {where}", params
+        )[0]['total']
+
+    def get_recent_invoices(self, limit: int = RECENT_INVOICES_LIMIT) -> List[Dict]:
+        """
+        Latest invoices with their party name.
+
+        Returns:
+            Dicts with invoice_no, date, party_name, grand_total, status
+        """
+        where, params = self._company_where('i')
+        return self.db._query(
+            f"""
+            SELECT i.invoice_no, i.date, p.name AS party_name, i.grand_total, i.status
+            FROM invoices i
+            LEFT JOIN parties p ON i.party_id = p.id
+            {where}
+            ORDER BY i.id DESC
+            LIMIT ?
+            """,
+            params + (limit,)
+        )
+
+    def get_low_stock_items(self, limit: int = LOW_STOCK_LIMIT) -> List[Dict]:
+        """
+        Products at or below their low-stock level (newest first).
+
+        Reads current_stock, which invoice saves keep up to date (sales take
+        their quantities out, purchases add theirs; see Database.adjust_stock),
+        falling back to the opening stock of a product never moved.
+
+        Returns:
+            Dicts with name, stock, low_stock
+        """
+        where, params = self._company_where('p')
+        where = f"{where} AND" if where else "WHERE"
+        return self.db._query(
+            f"""
+            SELECT p.name, COALESCE(p.current_stock, p.opening_stock, 0) AS stock, p.low_stock
+            FROM products p
+            {where} p.low_stock > 0 AND COALESCE(p.current_stock, p.opening_stock, 0) <= p.low_stock
+            ORDER BY p.id DESC
+            LIMIT ?
+            """,
+            params + (limit,)
+        )
+
+    def get_recent_receipts(self, limit: int = RECENT_RECEIPTS_LIMIT) -> List[Dict]:
+        """
+        Latest money received from parties (untyped legacy rows count as
+        receipts, as in the party balances).
+
+        Returns:
+            Dicts with party_name, amount, date, mode
+        """
+        where, params = self._company_where('p')
+        where = f"{where} AND" if where else "WHERE"
+        return self.db._query(
+            f"""
+            SELECT pa.name AS party_name, p.amount, p.date, p.mode
+            FROM payments p
+            LEFT JOIN parties pa ON p.party_id = pa.id
+            {where} (p.type IS NULL OR p.type = 'RECEIPT')
+            ORDER BY p.id DESC
+            LIMIT ?
+            """,
+            params + (limit,)
+        )
+
+
+# Singleton instance for app-wide use
+dashboard_service = DashboardService()
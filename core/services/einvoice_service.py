@@ -0,0 +1,308 @@
+"""
+E-Invoice Service
+Bulk NIC e-invoice (IRN request) JSON payloads for a period's B2B invoices
+
+The main process reads each invoice with Database.get_invoice_with_items_by_id
+and hands chunks of them to a ProcessPoolExecutor. Workers build the payload
+(schema version 1.1), validate it and serialise it:
+- supplier and recipient GSTINs with GSTService.validate_gstin
+- the PIN code and location NIC requires of both parties, and an HSN code
+  on every line
+- invoice value against its lines with ValidatorWithException.validate_invoice_total
+Payloads come back as JSON text and are written in invoice order, either as
+one <invoice no>.json per invoice or as a single JSONL stream. Invoice
+numbers that map to the same file name (INV/1 and INV_1) keep apart by the
+later one's invoice id. Only a few
+chunks are in flight at a time, so memory does not grow with the period.
+
+Worker functions are module level so the pool can pickle them. Under the
+'spawn' start method (Windows) each worker imports this module, and with it
+the core.services package, once.
+"""
+
+import json
+import os
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from core.db.sqlite_db import db as default_db
+from core.exception_validators import ValidatorWithException
+from core.exceptions import InvalidInvoiceTotal
+from core.logger import get_logger
+from core.services.gst_return_service import GSTReturnService
+from core.services.gst_service import STATE_CODES, STATE_NAME_CODES, GSTService, round_amount
+
+logger = get_logger(__name__)
+
+# NIC e-invoice schema version of the payloads
+SCHEMA_VERSION = "1.1"
+
+# Line taxes are halved and rounded per line, so the lines may sum a few
+# paise away from the invoice value
+_TOTAL_TOLERANCE = 1.0
+
+# PIN code written inside an address, e.g. '... Pune - 411001'
+_ADDRESS_PIN = re.compile(r'(?<!\d)[1-9]\d{2}\s?\d{3}(?!\d)')
+
+
+def _state_code(gstin: str, state_name: str = '') -> str:
+    """State code from a GSTIN, else from a state name ('' if unknown)."""
+    code = (gstin or '').strip()[:2]
+    if code in STATE_CODES:
+        return code
+    return STATE_NAME_CODES.get((state_name or '').strip().lower(), '')
+
+
+def _pin(value) -> Optional[int]:
+    digits = re.sub(r'\D', '', str(value or ''))
+    return int(digits) if len(digits) == 6 else None
+
+
+def _address_pin(address: str) -> Optional[int]:
+    """Last PIN code written in an address, if any."""
+    matches = _ADDRESS_PIN.findall(address or '')
+    return _pin(matches[-1]) if matches else None
+
+
+def _party_details(gstin: str, name: str, address: str, location: str, pin, state_code: str,
+                   phone: str, email: str) -> Dict:
+    """SellerDtls / BuyerDtls block; optional fields are left out when empty."""
+    details = {
+        'Gstin': (gstin or '').strip().upper(),
+        'LglNm': name or '',
+        'Addr1': (address or '')[:100],
+        'Loc': (location or '').strip()[:50],
+        'Stcd': state_code,
+    }
+    if _pin(pin):
+        details['Pin'] = _pin(pin)
+    if phone:
+        details['Ph'] = re.sub(r'\D', '', str(phone))[-12:]
+    if email:
+        details['Em'] = email
+    return details
+
+
+def build_payload(record: Dict, seller: Dict) -> Dict:
+    """
+    NIC e-invoice payload of one invoice.
+
+    Args:
+        record: Result of Database.get_invoice_with_items_by_id
+        seller: Company record
+
+    Returns:
+        Payload dict
+    """
+    invoice, party, items = record['invoice'], record.get('party') or {}, record['items']
+    inter_state = 'Other State' in (invoice.get('tax_type') or '')
+    buyer_gstin = (party.get('gst_number') or '').strip().upper()
+    seller_code = _state_code(seller.get('gstin'))
+    buyer_code = _state_code(buyer_gstin, party.get('state'))
+
+    item_list = []
+    assessable = cgst_total = sgst_total = igst_total = 0.0
+    for number, item in enumerate(items, 1):
+        gross = round_amount(item.get('amount'))
+        discount = round_amount(item.get('discount_amount'))
+        taxable = round(gross - discount, 2)
+        tax = float(item.get('tax_amount') or 0)
+        igst = round_amount(tax) if inter_state else 0.0
+        cgst = sgst = 0.0 if inter_state else round_amount(tax / 2)
+        item_list.append({
+            'SlNo': str(number),
+            'PrdDesc': item.get('product_name') or '',
+            'IsServc': 'N',
+            'HsnCd': (item.get('hsn_code') or '').strip(),
+            'Qty': float(item.get('quantity') or 0),
+            'Unit': (item.get('unit') or 'OTH').upper(),
+            'UnitPrice': round_amount(item.get('rate')),
+            'TotAmt': gross,
+            'Discount': discount,
+            'AssAmt': taxable,
+            'GstRt': float(item.get('tax_percent') or 0),
+            'IgstAmt': igst,
+            'CgstAmt': cgst,
+            'SgstAmt': sgst,
+            'CesRt': 0,
+            'CesAmt': 0,
+            'TotItemVal': round(taxable + igst + cgst + sgst, 2),
+        })
+        assessable += taxable
+        cgst_total += cgst
+        sgst_total += sgst
+        igst_total += igst
+
+    invoice_date = (invoice.get('date') or '')[:10]
+    return {
+        'Version': SCHEMA_VERSION,
+        'TranDtls': {'TaxSch': 'GST', 'SupTyp': 'B2B', 'RegRev': 'N', 'IgstOnIntra': 'N'},
+        'DocDtls': {'Typ': 'INV', 'No': invoice.get('invoice_no') or '',
+                    'Dt': '/'.join(reversed(invoice_date.split('-')))},
+        # Companies record no city or PIN: the PIN is read from the address,
+        # which also stands in for the location
+        'SellerDtls': _party_details(seller.get('gstin'), seller.get('name'), seller.get('address'),
+                                     seller.get('address'), _address_pin(seller.get('address')),
+                                     seller_code, seller.get('mobile'), seller.get('email')),
+        'BuyerDtls': {
+            **_party_details(buyer_gstin, party.get('name'), party.get('address'), party.get('city'),
+                             party.get('pincode'), buyer_code, party.get('mobile'), party.get('email')),
+            'Pos': buyer_code,
+        },
+        'ItemList': item_list,
+        'ValDtls': {
+            'AssVal': round(assessable, 2),
+            'CgstVal': round(cgst_total, 2),
+            'SgstVal': round(sgst_total, 2),
+            'IgstVal': round(igst_total, 2),
+            'CesVal': 0,
+            'Discount': 0,
+            'RndOffAmt': round_amount(invoice.get('round_off')),
+            'TotInvVal': round_amount(invoice.get('grand_total')),
+        },
+    }
+
+
+def validate_payload(payload: Dict) -> List[str]:
+    """Problems that would make NIC reject a payload (empty if none)."""
+    gst = GSTService(None)
+    errors = []
+    for role, details in (('Supplier', payload['SellerDtls']), ('Recipient', payload['BuyerDtls'])):
+        if not details['Gstin']:
+            errors.append(f"{role} GSTIN is missing")
+        else:
+            result = gst.validate_gstin(details['Gstin'])
+            if not result['valid']:
+                errors.append(f"{role} GSTIN {details['Gstin']!r}: {result['message']}")
+        if 'Pin' not in details:
+            errors.append(f"{role} PIN code is missing")
+        if len(details['Loc']) < 3:
+            errors.append(f"{role} location (city) is missing")
+    for item in payload['ItemList']:
+        if not re.fullmatch(r'\d{4,8}', item['HsnCd']):
+            errors.append(f"Line {item['SlNo']} ({item['PrdDesc']}): HSN code "
+                          f"{item['HsnCd']!r} must be 4 to 8 digits")
+    values = payload['ValDtls']
+    try:
+        ValidatorWithException.validate_invoice_total(
+            [{'amount': item['TotItemVal']} for item in payload['ItemList']],
+            values['TotInvVal'] - values['RndOffAmt'],
+            tolerance=_TOTAL_TOLERANCE
+        )
+    except InvalidInvoiceTotal as e:
+        errors.append(e.to_user_message())
+    return errors
+
+
+def process_invoices(records: List[Dict], seller: Dict) -> List[Tuple[int, str, Optional[str], List[str]]]:
+    """
+    Pool task: build, validate and serialise a chunk of invoices.
+
+    Returns:
+        (invoice id, invoice_no, payload JSON or None if invalid, errors) per invoice
+    """
+    results = []
+    for record in records:
+        invoice_id = record['invoice']['id']
+        invoice_no = record['invoice'].get('invoice_no') or f"INV-{invoice_id}"
+        try:
+            payload = build_payload(record, seller)
+            errors = validate_payload(payload)
+        except Exception as e:
+            payload, errors = None, [f"Could not build payload: {e}"]
+        results.append((invoice_id, invoice_no, None if errors else json.dumps(payload), errors))
+    return results
+
+
+class EInvoiceService:
+    """Service class for bulk e-invoice payloads"""
+
+    # Invoices per pool task, and tasks in flight per worker
+    CHUNK_SIZE = 200
+    TASKS_PER_WORKER = 2
+
+    def __init__(self, db=None):
+        self.db = db or default_db
+        self.returns = GSTReturnService(self.db)
+
+    def generate(self, from_date: str, to_date: str, output: str, jsonl: bool = False,
+                 workers: Optional[int] = None) -> Dict:
+        """
+        Write e-invoice payloads for the current company's B2B invoices of a period.
+
+        Args:
+            from_date: First day (YYYY-MM-DD)
+            to_date: Last day (YYYY-MM-DD)
+            output: Directory for one <invoice no>.json per invoice, or the
+                .jsonl file when jsonl is set
+            jsonl: Write one payload per line to a single file
+            workers: Worker processes (default: one per CPU)
+
+        Returns:
+            Dict with invoices, written, failed and errors
+            ({'invoice_no', 'errors'} per invalid invoice)
+        """
+        company_id = self.db.get_current_company_id()
+        seller = dict((self.db.get_company_by_id(company_id) if company_id else None) or {})
+        invoice_ids = self.returns.get_invoice_ids('B2B', from_date, to_date)
+        stats = {'invoices': len(invoice_ids), 'written': 0, 'failed': 0, 'errors': []}
+        workers = workers or os.cpu_count() or 1
+
+        if jsonl:
+            partial = f"{output}.part"
+            sink = open(partial, 'w', encoding='utf-8')
+        else:
+            os.makedirs(output, exist_ok=True)
+            sink = None
+        file_names = set()  # lower-cased, as case-insensitive file systems compare them
+
+        def collect(results):
+            for invoice_id, invoice_no, text, errors in results:
+                if errors:
+                    stats['failed'] += 1
+                    stats['errors'].append({'invoice_no': invoice_no, 'errors': errors})
+                    logger.warning(f"E-invoice {invoice_no} skipped: {'; '.join(errors)}")
+                    continue
+                if sink is not None:
+                    sink.write(text + '\n')
+                else:
+                    name = re.sub(r'[^A-Za-z0-9._-]', '_', invoice_no)
+                    while name.lower() in file_names:
+                        logger.warning(f"E-invoice {invoice_no}: {name}.json is taken by another invoice number, "
+                                       f"adding invoice id {invoice_id}")
+                        name = f"{name}_{invoice_id}"
+                    file_names.add(name.lower())
+                    with open(os.path.join(output, f"{name}.json"), 'w', encoding='utf-8') as f:
+                        f.write(text)
+                stats['written'] += 1
+
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                pending = deque()
+                for start in range(0, len(invoice_ids), self.CHUNK_SIZE):
+                    records = [self.db.get_invoice_with_items_by_id(invoice_id)
+                               for invoice_id in invoice_ids[start:start + self.CHUNK_SIZE]]
+                    pending.append(pool.submit(process_invoices, [r for r in records if r], seller))
+                    if len(pending) >= workers * self.TASKS_PER_WORKER:
+                        collect(pending.popleft().result())
+                while pending:
+                    collect(pending.popleft().result())
+            if sink is not None:
+                sink.close()
+                os.replace(partial, output)
+        except Exception:
+            if sink is not None:
+                sink.close()
+                if os.path.exists(partial):
+                    os.remove(partial)
+            raise
+
+        logger.info(f"E-invoices {from_date}..{to_date}: {stats['written']} written to {output}, "
+                    f"{stats['failed']} failed validation")
+        return stats
+
+
+# Singleton instance for app-wide use
+einvoice_service = EInvoiceService()
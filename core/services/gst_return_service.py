@@ -0,0 +1,609 @@
+"""
+GST Return Service
+Period summaries for GSTR-1 (outward supplies) and GSTR-3B
+
+Everything is grouped in SQL over the period, reached through the
+(company_id, date) index on invoices and the invoice index on line items:
+- the invoice lines summed by supply type, place of supply, rate and HSN
+  come from the monthly gst_supply_totals the database keeps on every
+  write; only the days of a partly covered month are summed from the lines
+  themselves. The rate-wise, HSN-wise, B2CS and GSTR-3B tables are folded
+  from those few hundred groups
+- one query counts the invoices of each supply type (B2B, B2CL, ...)
+- one query counts the invoices issued per number series
+- one query sums input tax from the purchase invoice lines
+The B2B and B2C-large tables, which GSTR-1 lists invoice by invoice, are
+summarised here and read row by row only for an export
+(iter_invoice_rates).
+
+Same conventions as the invoice form and InvoiceService:
+- taxable value of a line = amount - discount_amount; its tax = tax_amount
+- 'Other State' tax types are inter-state (IGST), the rest split CGST/SGST
+- 'Non-GST' invoices only count as non-GST outward supplies
+- a customer with a GSTIN is a registered (B2B) recipient
+- cancelled invoices are left out of every figure and only counted as
+  cancelled documents (GSTR1Summary.docs)
+
+The service does not touch widgets and can be called from a worker thread.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from core.db.sqlite_db import db as default_db, GST_SUPPLY_B2CL_LIMIT
+from core.db.rows import RowSet
+from core.logger import get_logger
+from core.services.gst_service import STATE_CODES, STATE_NAME_CODES
+
+logger = get_logger(__name__)
+
+# SQL expressions (aliases: i invoice, it line item, p party). Line items
+# carry their product's HSN code (filled in on insert, see Database).
+_LINE_TAXABLE_SQL = "COALESCE(it.amount, 0) - COALESCE(it.discount_amount, 0)"
+_LINE_TAX_SQL = "COALESCE(it.tax_amount, 0)"
+_LINE_HSN_SQL = "COALESCE(TRIM(it.hsn_code), '')"
+_ACTIVE_SQL = "COALESCE(i.status, '') <> 'Cancelled'"
+_CANCELLED_SQL = "COALESCE(i.status, '') = 'Cancelled'"
+_INTER_STATE_SQL = "(COALESCE(i.tax_type, '') LIKE '%Other State%')"
+_NON_GST_SQL = "(COALESCE(i.tax_type, '') LIKE '%Non-GST%')"
+_GSTIN_SQL = "UPPER(TRIM(COALESCE(p.gst_number, '')))"
+# Recipient's GSTIN state code, else the customer's state as entered
+_PLACE_SQL = f"CASE WHEN {_GSTIN_SQL} <> '' THEN SUBSTR({_GSTIN_SQL}, 1, 2) ELSE COALESCE(p.state, '') END"
+# GSTR-1 table of an invoice; the one parameter is the B2CL invoice value limit
+_SUPPLY_TYPE_SQL = f"""
+    CASE
+        WHEN {_NON_GST_SQL} THEN 'NON_GST'
+        WHEN {_GSTIN_SQL} <> '' THEN 'B2B'
+        WHEN {_INTER_STATE_SQL} AND COALESCE(i.grand_total, 0) > ? THEN 'B2CL'
+        ELSE 'B2CS'
+    END"""
+# Supply type of an invoice as bits (cheaper to group by than the CASE above):
+# 8 non-GST, 4 registered recipient, 2 inter-state, 1 above the B2CL limit (parameter)
+_SUPPLY_CLASS_SQL = (f"{_NON_GST_SQL} * 8 + ({_GSTIN_SQL} <> '') * 4 + {_INTER_STATE_SQL} * 2 "
+                     "+ (COALESCE(i.grand_total, 0) > ?)")
+# Number series of an invoice: its number without the trailing digits
+# ('INV-2627-0042' -> 'INV-2627-')
+_SERIES_SQL = "RTRIM(i.invoice_no, '0123456789')"
+# Invoice-wise tables: condition selecting their invoices, whether it takes
+# the B2CL limit parameter, and the column GSTR-1 nests their invoices under
+_SUPPLY_TYPE_CONDITIONS = {
+    'B2B': (f"{_ACTIVE_SQL} AND NOT {_NON_GST_SQL} AND {_GSTIN_SQL} <> ''", False, 'gstin'),
+    'B2CL': (f"{_ACTIVE_SQL} AND NOT {_NON_GST_SQL} AND {_GSTIN_SQL} = '' AND {_INTER_STATE_SQL} "
+             "AND COALESCE(i.grand_total, 0) > ?", True, 'place'),
+}
+
+
+@dataclass
+class TaxTotals:
+    """Taxable value and GST heads of a group of supplies."""
+    taxable_value: float = 0.0
+    igst: float = 0.0
+    cgst: float = 0.0
+    sgst: float = 0.0
+
+    def add(self, taxable_value: float, tax: float, inter_state: bool):
+        """Add supplies, putting their tax under IGST or CGST/SGST."""
+        self.taxable_value += taxable_value
+        if inter_state:
+            self.igst += tax
+        else:
+            self.cgst += tax / 2
+            self.sgst += tax / 2
+
+    @property
+    def total_tax(self) -> float:
+        return self.igst + self.cgst + self.sgst
+
+    def as_dict(self) -> Dict[str, float]:
+        """Rounded figures."""
+        return {
+            'taxable_value': round(self.taxable_value, 2),
+            'igst': round(self.igst, 2),
+            'cgst': round(self.cgst, 2),
+            'sgst': round(self.sgst, 2),
+        }
+
+
+@dataclass
+class GSTR1Summary:
+    """
+    GSTR-1 tables for a period. Figures are rounded.
+
+    b2b / b2cl: invoices, recipients, invoice_value and tax totals
+        (the invoices themselves: GSTReturnService.iter_invoice_rates)
+    b2cs: rows per inter/intra-state supply, place of supply and rate
+    hsn: rows per HSN, unit and rate
+    rate_summary: taxable supplies per rate
+    nil_non_gst: nil-rated and non-GST outward supplies
+    docs: invoices issued per number series, cancelled ones included
+        (series, first/last number, total, cancelled)
+    """
+    from_date: str
+    to_date: str
+    b2b: Dict = field(default_factory=dict)
+    b2cl: Dict = field(default_factory=dict)
+    b2cs: List[Dict] = field(default_factory=list)
+    hsn: List[Dict] = field(default_factory=list)
+    rate_summary: List[Dict] = field(default_factory=list)
+    nil_non_gst: Dict = field(default_factory=dict)
+    docs: List[Dict] = field(default_factory=list)
+
+
+@dataclass
+class GSTR3BSummary:
+    """
+    GSTR-3B figures for a period. Figures are rounded.
+
+    outward_taxable: 3.1(a) taxable outward supplies
+    outward_nil: 3.1(c) nil-rated outward supplies (taxable_value only)
+    outward_non_gst: 3.1(e) non-GST outward supplies (taxable_value only)
+    inter_state_unregistered: 3.2 inter-state supplies to unregistered
+        persons, per place of supply
+    itc: 4(A)(5) input tax credit on purchases
+    net_payable: output tax less ITC, per head and in total
+    """
+    from_date: str
+    to_date: str
+    outward_taxable: Dict = field(default_factory=dict)
+    outward_nil: Dict = field(default_factory=dict)
+    outward_non_gst: Dict = field(default_factory=dict)
+    inter_state_unregistered: List[Dict] = field(default_factory=list)
+    itc: Dict = field(default_factory=dict)
+    net_payable: Dict = field(default_factory=dict)
+
+
+class GSTReturnService:
+    """Service class for GST return summaries"""
+
+    BATCH_SIZE = 500
+
+    # Inter-state B2C invoices above this value are reported invoice-wise (B2CL)
+    B2CL_LIMIT = 100000
+
+    def __init__(self, db=None):
+        self.db = db or default_db
+
+    def _range_where(self, alias: str, from_date: str, to_date: str) -> Tuple[str, tuple]:
+        """WHERE clause for a date range within the current company (uses the company/date index)."""
+        company_id = self.db.get_current_company_id()
+        if company_id:
+            return (f"WHERE {alias}.company_id = ? AND {alias}.date BETWEEN ? AND ?",
+                    (company_id, from_date, to_date))
+        return f"WHERE {alias}.date BETWEEN ? AND ?", (from_date, to_date)
+
+    def company_state_code(self) -> str:
+        """State code of the current company's GSTIN ('' if unknown)."""
+        company_id = self.db.get_current_company_id()
+        company = self.db.get_company_by_id(company_id) if company_id else None
+        code = ((company or {}).get('gstin') or '').strip()[:2]
+        return code if code in STATE_CODES else ''
+
+    @staticmethod
+    def _split_months(from_date: str, to_date: str) -> Tuple[Optional[Tuple[str, str]], List[Tuple[str, str]]]:
+        """
+        Whole months of a date range and the days left over.
+
+        Returns:
+            ((first, last) month as YYYY-MM, or None if no month is covered
+            in full, [(from, to) day ranges outside those months])
+        """
+        start, end = date.fromisoformat(from_date), date.fromisoformat(to_date)
+        first = start if start.day == 1 else (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+        after = end + timedelta(days=1)
+        last = end if after.day == 1 else end.replace(day=1) - timedelta(days=1)
+        if first > last:
+            return None, [(from_date, to_date)]
+        days = []
+        if start < first:
+            days.append((from_date, (first - timedelta(days=1)).isoformat()))
+        if last < end:
+            days.append(((last + timedelta(days=1)).isoformat(), to_date))
+        return (first.isoformat()[:7], last.isoformat()[:7]), days
+
+    @staticmethod
+    def place_of_supply(place: str, inter_state: bool, home_code: str) -> str:
+        """
+        Place of supply as a state code.
+
+        Args:
+            place: 'place' of a query row (GSTIN prefix or state name)
+            inter_state: Whether the supply is inter-state
+            home_code: company_state_code(), used for intra-state supplies
+                to customers without a known state
+
+        Returns:
+            Two-digit state code, or '' if unknown
+        """
+        place = (place or '').strip()
+        if place in STATE_CODES:
+            return place
+        code = STATE_NAME_CODES.get(place.lower())
+        if code:
+            return code
+        return '' if inter_state else home_code
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Queries
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def get_supply_groups(self, from_date: str, to_date: str) -> List[Dict]:
+        """
+        Invoice lines of the period summed per supply type, state, rate and HSN.
+
+        Whole months are read from gst_supply_totals and the remaining days
+        from the invoice lines; a B2CL_LIMIT other than the one the totals
+        were kept with reads every line.
+
+        Returns:
+            Dicts with supply_type ('B2B', 'B2CL', 'B2CS', 'NON_GST'),
+            inter_state, place (state of an unregistered customer, else ''),
+            rate, hsn_code, unit, quantity, taxable_value, tax
+        """
+        if self.B2CL_LIMIT == GST_SUPPLY_B2CL_LIMIT:
+            months, days = self._split_months(from_date, to_date)
+        else:
+            months, days = None, [(from_date, to_date)]
+        parts = [self._month_supply_groups(*months)] if months else []
+        parts.extend(self._line_supply_groups(first, last) for first, last in days)
+        if len(parts) == 1:
+            groups = parts[0]
+        else:
+            merged: Dict[tuple, Dict] = {}
+            for group in (group for part in parts for group in part):
+                key = (group['supply_class'], group['place'], group['rate'], group['hsn_code'], group['unit'])
+                total = merged.get(key)
+                if total is None:
+                    merged[key] = group
+                else:
+                    for column in ('quantity', 'taxable_value', 'tax'):
+                        total[column] = (total[column] or 0) + (group[column] or 0)
+            groups = list(merged.values())
+
+        for group in groups:
+            supply_class = group.pop('supply_class')
+            group['inter_state'] = bool(supply_class & 2)
+            if supply_class & 8:
+                group['supply_type'] = 'NON_GST'
+            elif supply_class & 4:
+                group['supply_type'] = 'B2B'
+            elif supply_class & 3 == 3:
+                group['supply_type'] = 'B2CL'
+            else:
+                group['supply_type'] = 'B2CS'
+        return groups
+
+    def _month_supply_groups(self, first_month: str, last_month: str) -> List[Dict]:
+        """gst_supply_totals of whole months (YYYY-MM), summed per supply group."""
+        company_id = self.db.get_current_company_id()
+        company_sql, params = ("company_id = ? AND ", (company_id,)) if company_id else ("", ())
+        return self.db._query(
+            f"""
+            SELECT supply_class, place, rate, hsn_code, unit,
+                   SUM(quantity) AS quantity, SUM(taxable_value) AS taxable_value, SUM(tax) AS tax
+            FROM gst_supply_totals
+            WHERE {company_sql}month BETWEEN ? AND ? AND lines <> 0
+            GROUP BY 1, 2, 3, 4, 5
+            """,
+            params + (first_month, last_month)
+        )
+
+    def _line_supply_groups(self, from_date: str, to_date: str) -> List[Dict]:
+        """
+        Invoice lines of a date range summed per supply group.
+
+        The supply class and place of each invoice are materialised once,
+        so the per-line work is the join and the grouping.
+        """
+        where, params = self._range_where('i', from_date, to_date)
+        return self.db._query(
+            f"""
+            WITH period_invoices AS MATERIALIZED (
+                SELECT i.id,
+                       {_SUPPLY_CLASS_SQL} AS supply_class,
+                       CASE WHEN {_GSTIN_SQL} = '' THEN COALESCE(p.state, '') ELSE '' END AS place
+                FROM invoices i
+                LEFT JOIN parties p ON p.id = i.party_id
+                {where} AND {_ACTIVE_SQL}
+            )
+            SELECT v.supply_class, v.place,
+                   COALESCE(it.tax_percent, 0) AS rate,
+                   {_LINE_HSN_SQL} AS hsn_code,
+                   COALESCE(it.unit, '') AS unit,
+                   SUM(COALESCE(it.quantity, 0)) AS quantity,
+                   SUM({_LINE_TAXABLE_SQL}) AS taxable_value,
+                   SUM({_LINE_TAX_SQL}) AS tax
+            FROM period_invoices v
+            JOIN invoice_items it ON it.invoice_id = v.id
+            GROUP BY 1, 2, 3, 4, 5
+            """,
+            (self.B2CL_LIMIT,) + params
+        )
+
+    def get_invoice_groups(self, from_date: str, to_date: str) -> List[Dict]:
+        """
+        Invoices of the period counted per supply type.
+
+        Returns:
+            Dicts with supply_type, invoices, recipients and invoice_value
+            (cancelled invoices left out)
+        """
+        where, params = self._range_where('i', from_date, to_date)
+        return self.db._query(
+            f"""
+            SELECT {_SUPPLY_TYPE_SQL} AS supply_type,
+                   COUNT(*) AS invoices,
+                   COUNT(DISTINCT i.party_id) AS recipients,
+                   SUM(COALESCE(i.grand_total, 0)) AS invoice_value
+            FROM invoices i
+            LEFT JOIN parties p ON p.id = i.party_id
+            {where} AND {_ACTIVE_SQL}
+            GROUP BY 1
+            """,
+            (self.B2CL_LIMIT,) + params
+        )
+
+    def get_document_series(self, from_date: str, to_date: str) -> List[Dict]:
+        """
+        Invoices of the period counted per number series, for the GSTR-1
+        documents issued table.
+
+        First and last are the lowest and highest numbers of the series, so
+        'INV-999' comes before 'INV-1000': numbers of one length are compared
+        as text in SQL, and the few lengths of a series by value here.
+
+        Returns:
+            Dicts with series, first, last, total (cancelled invoices
+            included) and cancelled, by series
+        """
+        where, params = self._range_where('i', from_date, to_date)
+        rows = self.db._query(
+            f"""
+            SELECT {_SERIES_SQL} AS series,
+                   COUNT(*) AS total, SUM({_CANCELLED_SQL}) AS cancelled,
+                   MIN(i.invoice_no) AS first, MAX(i.invoice_no) AS last
+            FROM invoices i
+            {where}
+            GROUP BY 1, LENGTH(i.invoice_no)
+            """,
+            params
+        )
+
+        def number(row: Dict, column: str) -> int:
+            return int(row[column][len(row['series']):] or 0)
+
+        series: Dict[str, Dict] = {}
+        for row in rows:
+            entry = series.get(row['series'])
+            if entry is None:
+                series[row['series']] = dict(row)
+                continue
+            entry['total'] += row['total']
+            entry['cancelled'] += row['cancelled']
+            if number(row, 'first') < number(entry, 'first'):
+                entry['first'] = row['first']
+            if number(row, 'last') > number(entry, 'last'):
+                entry['last'] = row['last']
+        return [series[name] for name in sorted(series)]
+
+    def iter_invoice_rates(self, supply_type: str, from_date: str, to_date: str,
+                           batch_size: int = BATCH_SIZE, nested: bool = False) -> Iterator[RowSet]:
+        """
+        Invoices of a GSTR-1 invoice-wise table, one row per invoice and
+        rate, oldest first, in batches.
+
+        Args:
+            supply_type: 'B2B' or 'B2CL'
+            nested: Order by recipient GSTIN (B2B) or place (B2CL) first,
+                the way the GSTR-1 JSON nests invoices
+
+        Yields:
+            RowSets with invoice_id, invoice_no, date, invoice_value, gstin,
+            party_name, place, inter_state, rate, taxable_value, tax
+        """
+        condition, uses_limit, nest_column = _SUPPLY_TYPE_CONDITIONS[supply_type]
+        order = f"{nest_column}, i.date, i.id, 9" if nested else "i.date, i.id, 9"
+        where, params = self._range_where('i', from_date, to_date)
+        return self.db._query_batches(
+            f"""
+            SELECT i.id AS invoice_id, i.invoice_no, i.date,
+                   COALESCE(i.grand_total, 0) AS invoice_value,
+                   {_GSTIN_SQL} AS gstin, p.name AS party_name,
+                   {_PLACE_SQL} AS place, {_INTER_STATE_SQL} AS inter_state,
+                   COALESCE(it.tax_percent, 0) AS rate,
+                   SUM({_LINE_TAXABLE_SQL}) AS taxable_value,
+                   SUM({_LINE_TAX_SQL}) AS tax
+            FROM invoices i
+            JOIN invoice_items it ON it.invoice_id = i.id
+            LEFT JOIN parties p ON p.id = i.party_id
+            {where} AND {condition}
+            GROUP BY i.id, 9
+            ORDER BY {order}
+            """,
+            params + ((self.B2CL_LIMIT,) if uses_limit else ()),
+            batch_size
+        )
+
+    def get_invoice_ids(self, supply_type: str, from_date: str, to_date: str) -> List[int]:
+        """
+        IDs of the invoices of a GSTR-1 invoice-wise table, oldest first.
+
+        Args:
+            supply_type: 'B2B' or 'B2CL'
+        """
+        condition, uses_limit, _ = _SUPPLY_TYPE_CONDITIONS[supply_type]
+        where, params = self._range_where('i', from_date, to_date)
+        rows = self.db._query(
+            f"""
+            SELECT i.id
+            FROM invoices i
+            LEFT JOIN parties p ON p.id = i.party_id
+            {where} AND {condition}
+            ORDER BY i.date, i.id
+            """,
+            params + ((self.B2CL_LIMIT,) if uses_limit else ()),
+            compact=True
+        )
+        return [row['id'] for row in rows]
+
+    def get_input_tax_credit(self, from_date: str, to_date: str) -> TaxTotals:
+        """
+        GST paid on the period's purchases (purchase invoice line items).
+
+        Purchase invoices record no tax split; 'Other State' types count as
+        IGST, the rest as CGST/SGST. Non-GST purchases are left out.
+        """
+        where, params = self._range_where('pi', from_date, to_date)
+        rows = self.db._query(
+            f"""
+            SELECT (COALESCE(pi.type, '') LIKE '%Other State%') AS inter_state,
+                   SUM({_LINE_TAXABLE_SQL}) AS taxable_value,
+                   SUM({_LINE_TAX_SQL}) AS tax
+            FROM purchase_invoices pi
+            JOIN purchase_invoice_items it ON it.purchase_invoice_id = pi.id
+            {where} AND COALESCE(pi.type, '') NOT LIKE '%Non-GST%'
+            GROUP BY 1
+            """,
+            params
+        )
+        itc = TaxTotals()
+        for row in rows:
+            itc.add(float(row['taxable_value'] or 0), float(row['tax'] or 0), bool(row['inter_state']))
+        return itc
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Returns
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def get_gstr1(self, from_date: str, to_date: str,
+                  supply_groups: Optional[List[Dict]] = None) -> GSTR1Summary:
+        """
+        GSTR-1 tables for a period.
+
+        Args:
+            from_date: First day (YYYY-MM-DD)
+            to_date: Last day (YYYY-MM-DD)
+            supply_groups: Result of get_supply_groups() if already fetched
+
+        Returns:
+            GSTR1Summary
+        """
+        if supply_groups is None:
+            supply_groups = self.get_supply_groups(from_date, to_date)
+        home_code = self.company_state_code()
+
+        by_type: Dict[str, TaxTotals] = {}
+        b2cs: Dict[tuple, TaxTotals] = {}
+        hsn: Dict[tuple, list] = {}  # (hsn, unit, rate) -> [quantity, TaxTotals]
+        rates: Dict[float, TaxTotals] = {}
+        nil_rated = non_gst = 0.0
+        for group in supply_groups:
+            supply_type = group['supply_type']
+            inter_state = bool(group['inter_state'])
+            rate = float(group['rate'] or 0)
+            taxable = float(group['taxable_value'] or 0)
+            tax = float(group['tax'] or 0)
+            if supply_type == 'NON_GST':
+                non_gst += taxable
+                continue
+            if rate == 0:
+                nil_rated += taxable
+            by_type.setdefault(supply_type, TaxTotals()).add(taxable, tax, inter_state)
+            if supply_type == 'B2CS':
+                place = self.place_of_supply(group['place'], inter_state, home_code)
+                b2cs.setdefault((inter_state, place, rate), TaxTotals()).add(taxable, tax, inter_state)
+            entry = hsn.setdefault((group['hsn_code'], group['unit'], rate), [0.0, TaxTotals()])
+            entry[0] += float(group['quantity'] or 0)
+            entry[1].add(taxable, tax, inter_state)
+            rates.setdefault(rate, TaxTotals()).add(taxable, tax, inter_state)
+
+        invoice_groups = {row['supply_type']: row for row in self.get_invoice_groups(from_date, to_date)}
+
+        def invoice_table(supply_type: str) -> Dict:
+            row = invoice_groups.get(supply_type) or {}
+            return {
+                'invoices': row.get('invoices', 0),
+                'recipients': row.get('recipients', 0),
+                'invoice_value': round(float(row.get('invoice_value') or 0), 2),
+                **by_type.get(supply_type, TaxTotals()).as_dict(),
+            }
+
+        return GSTR1Summary(
+            from_date, to_date,
+            b2b=invoice_table('B2B'),
+            b2cl=invoice_table('B2CL'),
+            b2cs=[
+                {'supply_type': 'INTER' if inter_state else 'INTRA', 'place_of_supply': place,
+                 'rate': rate, **totals.as_dict()}
+                for (inter_state, place, rate), totals in sorted(b2cs.items())
+            ],
+            hsn=[
+                {'hsn_code': hsn_code, 'unit': unit, 'rate': rate, 'quantity': round(quantity, 3),
+                 **totals.as_dict(), 'total_value': round(totals.taxable_value + totals.total_tax, 2)}
+                for (hsn_code, unit, rate), (quantity, totals) in sorted(hsn.items())
+            ],
+            rate_summary=[{'rate': rate, **totals.as_dict()} for rate, totals in sorted(rates.items())],
+            nil_non_gst={'nil_rated': round(nil_rated, 2), 'non_gst': round(non_gst, 2)},
+            docs=self.get_document_series(from_date, to_date),
+        )
+
+    def get_gstr3b(self, from_date: str, to_date: str,
+                   supply_groups: Optional[List[Dict]] = None) -> GSTR3BSummary:
+        """
+        GSTR-3B figures for a period.
+
+        Args:
+            from_date: First day (YYYY-MM-DD)
+            to_date: Last day (YYYY-MM-DD)
+            supply_groups: Result of get_supply_groups() if already fetched
+
+        Returns:
+            GSTR3BSummary
+        """
+        if supply_groups is None:
+            supply_groups = self.get_supply_groups(from_date, to_date)
+        home_code = self.company_state_code()
+
+        taxable, nil_rated, non_gst = TaxTotals(), TaxTotals(), TaxTotals()
+        unregistered: Dict[str, TaxTotals] = {}
+        for group in supply_groups:
+            supply_type = group['supply_type']
+            inter_state = bool(group['inter_state'])
+            value = float(group['taxable_value'] or 0)
+            tax = float(group['tax'] or 0)
+            if supply_type == 'NON_GST':
+                non_gst.add(value, 0.0, inter_state)
+                continue
+            (nil_rated if float(group['rate'] or 0) == 0 else taxable).add(value, tax, inter_state)
+            if inter_state and supply_type in ('B2CL', 'B2CS'):
+                place = self.place_of_supply(group['place'], inter_state, home_code)
+                unregistered.setdefault(place, TaxTotals()).add(value, tax, inter_state)
+
+        itc = self.get_input_tax_credit(from_date, to_date)
+        net = {head: round(getattr(taxable, head) - getattr(itc, head), 2) for head in ('igst', 'cgst', 'sgst')}
+        net['total'] = round(sum(net.values()), 2)
+
+        return GSTR3BSummary(
+            from_date, to_date,
+            outward_taxable=taxable.as_dict(),
+            outward_nil={'taxable_value': round(nil_rated.taxable_value, 2)},
+            outward_non_gst={'taxable_value': round(non_gst.taxable_value, 2)},
+            inter_state_unregistered=[
+                {'place_of_supply': place, 'taxable_value': round(totals.taxable_value, 2),
+                 'igst': round(totals.igst, 2)}
+                for place, totals in sorted(unregistered.items())
+            ],
+            itc=itc.as_dict(),
+            net_payable=net,
+        )
+
+    def get_returns(self, from_date: str, to_date: str) -> Tuple[GSTR1Summary, GSTR3BSummary]:
+        """GSTR-1 and GSTR-3B for a period, sharing one pass over the invoice lines."""
+        supply_groups = self.get_supply_groups(from_date, to_date)
+        logger.debug(f"GST returns {from_date}..{to_date}: {len(supply_groups)} supply groups")
+        return (self.get_gstr1(from_date, to_date, supply_groups),
+                self.get_gstr3b(from_date, to_date, supply_groups))
+
+
+# Singleton instance for app-wide use
+gst_return_service = GSTReturnService()
@@ -7,6 +7,55 @@ from typing import List, Dict, Optional
 from datetime import datetime
 
 
+# GSTIN state code (first two digits) -> state name
+STATE_CODES = {
+    '01': 'Jammu and Kashmir',
+    '02': 'Himachal Pradesh',
+    '03': 'Punjab',
+    '04': 'Chandigarh',
+    '05': 'Uttarakhand',
+    '06': 'Haryana',
+    '07': 'Delhi',
+    '08': 'Rajasthan',
+    '09': 'Uttar Pradesh',
+    '10': 'Bihar',
+    '11': 'Sikkim',
+    '12': 'Arunachal Pradesh',
+    '13': 'Nagaland',
+    '14': 'Manipur',
+    '15': 'Mizoram',
+    '16': 'Tripura',
+    '17': 'Meghalaya',
+    '18': 'Assam',
+    '19': 'West Bengal',
+    '20': 'Jharkhand',
+    '21': 'Odisha',
+    '22': 'Chhattisgarh',
+    '23': 'Madhya Pradesh',
+    '24': 'Gujarat',
+    '26': 'Dadra and Nagar Haveli and Daman and Diu',
+    '27': 'Maharashtra',
+    '29': 'Karnataka',
+    '30': 'Goa',
+    '31': 'Lakshadweep',
+    '32': 'Kerala',
+    '33': 'Tamil Nadu',
+    '34': 'Puducherry',
+    '35': 'Andaman and Nicobar Islands',
+    '36': 'Telangana',
+    '37': 'Andhra Pradesh',
+    '38': 'Ladakh'
+}
+
+# State name (lower case) -> GSTIN state code, for parties without a GSTIN
+STATE_NAME_CODES = {name.lower(): code for code, name in STATE_CODES.items()}
+
+
+def round_amount(value) -> float:
+    """Amount rounded to paise; None and '' count as 0."""
+    return round(float(value or 0), 2)
+
+
 class GSTService:
     """Service class for GST-related business logic"""
     
@@ -110,6 +159,9 @@ class GSTService:
         """
         Generate GST report for a period
         
+        Output GST is worked out from the invoice line items and input GST
+        from the purchase line items (see GSTReturnService.get_gstr3b).
+        
         Args:
             start_date: Start date (YYYY-MM-DD)
             end_date: End date (YYYY-MM-DD)
@@ -117,62 +169,25 @@ class GSTService:
         Returns:
             dict: GST report
         """
-        # Get sales invoices
-        sales_query = """
-            SELECT * FROM invoices 
-            WHERE date BETWEEN ? AND ? AND tax_type = 'GST'
-        """
-        if self.db._current_company_id:
-            sales_query += " AND company_id = ?"
-            sales = self.db._query(sales_query, (start_date, end_date, self.db._current_company_id))
-        else:
-            sales = self.db._query(sales_query, (start_date, end_date))
-        
-        # Get purchase invoices
-        purchases_query = """
-            SELECT * FROM purchase_invoices 
-            WHERE date BETWEEN ? AND ? AND type = 'GST'
-        """
-        if self.db._current_company_id:
-            purchases_query += " AND company_id = ?"
-            purchases = self.db._query(purchases_query, (start_date, end_date, self.db._current_company_id))
-        else:
-            purchases = self.db._query(purchases_query, (start_date, end_date))
-        
-        # Calculate output GST (from sales)
-        output_cgst = sum(float(inv.get('cgst', 0) or 0) for inv in sales)
-        output_sgst = sum(float(inv.get('sgst', 0) or 0) for inv in sales)
-        output_igst = sum(float(inv.get('igst', 0) or 0) for inv in sales)
-        
-        # For input GST, we would need to track GST on purchases
-        # This is a simplified version
-        input_cgst = 0
-        input_sgst = 0
-        input_igst = 0
-        
+        # Imported here: gst_return_service imports STATE_CODES from this module
+        from core.services.gst_return_service import GSTReturnService
+        from core.services.report_service import ReportService
+
+        gstr3b = GSTReturnService(self.db).get_gstr3b(start_date, end_date)
+        reports = ReportService(self.db)
+
+        def with_total(heads: Dict) -> Dict:
+            figures = {head: heads[head] for head in ('cgst', 'sgst', 'igst')}
+            figures['total'] = round(sum(figures.values()), 2)
+            return figures
+
         return {
             'period': {'start': start_date, 'end': end_date},
-            'output_gst': {
-                'cgst': round(output_cgst, 2),
-                'sgst': round(output_sgst, 2),
-                'igst': round(output_igst, 2),
-                'total': round(output_cgst + output_sgst + output_igst, 2)
-            },
-            'input_gst': {
-                'cgst': round(input_cgst, 2),
-                'sgst': round(input_sgst, 2),
-                'igst': round(input_igst, 2),
-                'total': round(input_cgst + input_sgst + input_igst, 2)
-            },
-            'net_payable': {
-                'cgst': round(output_cgst - input_cgst, 2),
-                'sgst': round(output_sgst - input_sgst, 2),
-                'igst': round(output_igst - input_igst, 2),
-                'total': round((output_cgst + output_sgst + output_igst) - 
-                              (input_cgst + input_sgst + input_igst), 2)
-            },
-            'sales_count': len(sales),
-            'purchases_count': len(purchases)
+            'output_gst': with_total(gstr3b.outward_taxable),
+            'input_gst': with_total(gstr3b.itc),
+            'net_payable': with_total(gstr3b.net_payable),
+            'sales_count': reports.count_sales_invoices(start_date, end_date),
+            'purchases_count': reports.count_purchase_invoices(start_date, end_date)
         }
     
     def validate_gstin(self, gstin: str) -> Dict:
@@ -221,44 +236,5 @@ class GSTService:
         if not gstin or len(gstin) < 2:
             return None
         
-        state_codes = {
-            '01': 'Jammu and Kashmir',
-            '02': 'Himachal Pradesh',
-            '03': 'Punjab',
-            '04': 'Chandigarh',
-            '05': 'Uttarakhand',
-            '06': 'Haryana',
-            '07': 'Delhi',
-            '08': 'Rajasthan',
-            '09': 'Uttar Pradesh',
-            '10': 'Bihar',
-            '11': 'Sikkim',
-            '12': 'Arunachal Pradesh',
-            '13': 'Nagaland',
-            '14': 'Manipur',
-            '15': 'Mizoram',
-            '16': 'Tripura',
-            '17': 'Meghalaya',
-            '18': 'Assam',
-            '19': 'West Bengal',
-            '20': 'Jharkhand',
-            '21': 'Odisha',
-            '22': 'Chhattisgarh',
-            '23': 'Madhya Pradesh',
-            '24': 'Gujarat',
-            '26': 'Dadra and Nagar Haveli and Daman and Diu',
-            '27': 'Maharashtra',
-            '29': 'Karnataka',
-            '30': 'Goa',
-            '31': 'Lakshadweep',
-            '32': 'Kerala',
-            '33': 'Tamil Nadu',
-            '34': 'Puducherry',
-            '35': 'Andaman and Nicobar Islands',
-            '36': 'Telangana',
-            '37': 'Andhra Pradesh',
-            '38': 'Ladakh'
-        }
-        
         code = gstin[:2]
-        return state_codes.get(code)
+        return STATE_CODES.get(code)
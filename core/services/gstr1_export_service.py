@@ -0,0 +1,204 @@
+"""
+GSTR-1 Export Service
+Writes a period's GSTR-1 as the JSON imported by the GST offline tool
+
+Sections: b2b, b2cl, b2cs, hsn and doc_issue. The invoice-wise sections
+(b2b, b2cl) are read from a cursor in batches (GSTReturnService.
+iter_invoice_rates) and written invoice by invoice, so memory stays flat
+however many invoices the period has. The summary sections come from
+GSTReturnService.get_gstr1, whose groups are small.
+
+Figures follow GSTReturnService: taxable value and tax per rate, IGST for
+inter-state supplies, CGST/SGST halves otherwise. Cess is not recorded and
+is written as 0.
+"""
+
+import json
+import os
+from itertools import groupby
+from typing import Callable, Dict, Iterator, Optional, TextIO
+
+from core.db.sqlite_db import db as default_db
+from core.logger import get_logger
+from core.services.gst_return_service import GSTReturnService
+from core.services.gst_service import GSTService, round_amount
+
+logger = get_logger(__name__)
+
+# Document type 1 of the doc_issue section
+_INVOICE_DOC_TYPE = (1, "Invoices for outward supply")
+
+
+def _gst_date(iso_date: str) -> str:
+    """'YYYY-MM-DD' -> 'DD-MM-YYYY' as GSTR-1 writes dates."""
+    year, month, day = (iso_date or '')[:10].split('-')
+    return f"{day}-{month}-{year}"
+
+
+def _tax_amounts(tax: float, inter_state: bool) -> Dict[str, float]:
+    """iamt, or camt/samt halves, plus csamt."""
+    if inter_state:
+        return {'iamt': round_amount(tax), 'csamt': 0}
+    half = round_amount(tax / 2)
+    return {'camt': half, 'samt': half, 'csamt': 0}
+
+
+class GSTR1ExportService:
+    """Service class for the GSTR-1 JSON export"""
+
+    BATCH_SIZE = 1000
+
+    def __init__(self, db=None):
+        self.db = db or default_db
+        self.returns = GSTReturnService(self.db)
+        self.gst = GSTService(self.db)
+
+    def export(self, path: str, from_date: str, to_date: str) -> Dict[str, int]:
+        """
+        Write the current company's GSTR-1 for a period to a file.
+
+        The file is written under a temporary name and renamed when complete,
+        so an interrupted export never leaves a truncated JSON behind.
+
+        Args:
+            path: Output .json file
+            from_date: First day (YYYY-MM-DD)
+            to_date: Last day (YYYY-MM-DD); its month is the return period
+
+        Returns:
+            Dict with b2b_invoices, b2cl_invoices, b2cs_rows, hsn_rows,
+            invalid_gstins, empty_hsn_rows
+        """
+        partial = f"{path}.part"
+        try:
+            with open(partial, 'w', encoding='utf-8') as out:
+                stats = self.write(out, from_date, to_date)
+            os.replace(partial, path)
+        except Exception:
+            if os.path.exists(partial):
+                os.remove(partial)
+            raise
+        logger.info(f"GSTR-1 {from_date}..{to_date} exported to {path}: {stats}")
+        return stats
+
+    def write(self, out: TextIO, from_date: str, to_date: str) -> Dict[str, int]:
+        """
+        Write the current company's GSTR-1 JSON for a period to an open text stream.
+
+        Returns:
+            Same counts as export()
+        """
+        company_id = self.db.get_current_company_id()
+        company = (self.db.get_company_by_id(company_id) if company_id else None) or {}
+        home_code = self.returns.company_state_code()
+        summary = self.returns.get_gstr1(from_date, to_date)
+        stats = {'b2b_invoices': 0, 'b2cl_invoices': 0, 'b2cs_rows': len(summary.b2cs),
+                 'hsn_rows': len(summary.hsn), 'invalid_gstins': 0, 'empty_hsn_rows': 0}
+
+        out.write('{')
+        out.write(f'"gstin": {json.dumps((company.get("gstin") or "").strip().upper())}, ')
+        out.write(f'"fp": {json.dumps(to_date[5:7] + to_date[:4])}')
+
+        def check_gstin(ctin: str):
+            if not self.gst.validate_gstin(ctin)['valid']:
+                stats['invalid_gstins'] += 1
+                logger.warning(f"GSTR-1 export: invalid recipient GSTIN {ctin!r}")
+
+        out.write(', "b2b": ')
+        stats['b2b_invoices'] = self._write_nested(
+            out, 'ctin', self._invoices('B2B', from_date, to_date, home_code), check_gstin)
+        out.write(', "b2cl": ')
+        stats['b2cl_invoices'] = self._write_nested(
+            out, 'pos', self._invoices('B2CL', from_date, to_date, home_code))
+
+        out.write(', "b2cs": ')
+        json.dump([
+            {'sply_ty': row['supply_type'], 'pos': row['place_of_supply'], 'typ': 'OE',
+             'rt': row['rate'], 'txval': row['taxable_value'],
+             **({'iamt': row['igst']} if row['supply_type'] == 'INTER'
+                else {'camt': row['cgst'], 'samt': row['sgst']}),
+             'csamt': 0}
+            for row in summary.b2cs
+        ], out)
+
+        for row in summary.hsn:
+            if not row['hsn_code']:
+                stats['empty_hsn_rows'] += 1
+                logger.warning(f"GSTR-1 export: HSN summary row without an HSN code "
+                               f"(rate {row['rate']}%, unit {row['unit']!r}, taxable value {row['taxable_value']})")
+
+        out.write(', "hsn": ')
+        json.dump({'data': [
+            {'num': num, 'hsn_sc': row['hsn_code'], 'uqc': (row['unit'] or 'OTH').upper(),
+             'qty': row['quantity'], 'rt': row['rate'], 'txval': row['taxable_value'],
+             'iamt': row['igst'], 'camt': row['cgst'], 'samt': row['sgst'], 'csamt': 0,
+             'val': row['total_value']}
+            for num, row in enumerate(summary.hsn, 1)
+        ]}, out)
+
+        # One docs entry per number series
+        out.write(', "doc_issue": ')
+        json.dump({'doc_det': [{
+            'doc_num': _INVOICE_DOC_TYPE[0], 'doc_typ': _INVOICE_DOC_TYPE[1],
+            'docs': [{'num': num, 'from': series['first'], 'to': series['last'], 'totnum': series['total'],
+                      'cancel': series['cancelled'], 'net_issue': series['total'] - series['cancelled']}
+                     for num, series in enumerate(summary.docs, 1)],
+        }] if summary.docs else []}, out)
+
+        out.write('}\n')
+        return stats
+
+    @staticmethod
+    def _write_nested(out: TextIO, key_name: str, entries: Iterator[tuple],
+                      on_key: Optional[Callable[[str], None]] = None) -> int:
+        """
+        Write [{key_name: key, "inv": [...]}, ...] from (key, invoice) entries
+        arriving grouped by key, calling on_key(key) once per group.
+        Returns the number of invoices written.
+        """
+        written = 0
+        out.write('[')
+        for index, (key, invoices) in enumerate(groupby(entries, key=lambda entry: entry[0])):
+            if on_key:
+                on_key(key)
+            out.write(f'{", " if index else ""}{{{json.dumps(key_name)}: {json.dumps(key)}, "inv": [')
+            for count, (_, invoice) in enumerate(invoices):
+                out.write((', ' if count else '') + json.dumps(invoice))
+                written += 1
+            out.write(']}')
+        out.write(']')
+        return written
+
+    def _invoices(self, supply_type: str, from_date: str, to_date: str,
+                  home_code: str) -> Iterator[tuple]:
+        """
+        Invoices of the B2B or B2CL section, in nesting order.
+
+        Yields:
+            (recipient GSTIN for B2B / place of supply for B2CL, GSTR-1 'inv' dict)
+        """
+        batches = self.returns.iter_invoice_rates(supply_type, from_date, to_date,
+                                                  self.BATCH_SIZE, nested=True)
+        try:
+            rows = (row for batch in batches for row in batch)
+            for _, rate_rows in groupby(rows, key=lambda row: row['invoice_id']):
+                rate_rows = list(rate_rows)
+                first = rate_rows[0]
+                inter_state = bool(first['inter_state'])
+                pos = self.returns.place_of_supply(first['place'], inter_state, home_code)
+                invoice = {'inum': first['invoice_no'], 'idt': _gst_date(first['date']),
+                           'val': round_amount(first['invoice_value'])}
+                if supply_type == 'B2B':
+                    invoice.update({'pos': pos, 'rchrg': 'N', 'inv_typ': 'R'})
+                invoice['itms'] = [
+                    {'num': num, 'itm_det': {'txval': round_amount(row['taxable_value']), 'rt': row['rate'],
+                                             **_tax_amounts(float(row['tax'] or 0), inter_state)}}
+                    for num, row in enumerate(rate_rows, 1)
+                ]
+                yield (first['gstin'] if supply_type == 'B2B' else pos), invoice
+        finally:
+            batches.close()
+
+
+# Singleton instance for app-wide use
+gstr1_export_service = GSTR1ExportService()
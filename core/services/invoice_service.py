@@ -40,25 +40,10 @@ class InvoiceService:
             fy_start = today.year - 1
             fy_end = today.year
         
-        # Get last invoice number for this financial year
-        invoices = self.db.get_invoices()
-        
-        # Filter invoices for current financial year
-        max_number = 0
-        fy_prefix = f"{prefix}-{fy_start % 100:02d}{fy_end % 100:02d}-" if year_format else f"{prefix}-"
-        
-        for inv in invoices:
-            inv_no = inv.get('invoice_no', '')
-            if inv_no.startswith(fy_prefix):
-                try:
-                    num_part = inv_no.replace(fy_prefix, '')
-                    num = int(num_part)
-                    if num > max_number:
-                        max_number = num
-                except ValueError:
-                    pass
-        
-        new_number = max_number + 1
+        # Next number from this financial year's series (one row lookup)
+        fy = f"{fy_start % 100:02d}{fy_end % 100:02d}" if year_format else ""
+        fy_prefix = f"{prefix}-{fy}-" if year_format else f"{prefix}-"
+        new_number = self.db.peek_series_number(prefix, fy)
         return f"{fy_prefix}{new_number:04d}"
     
     def calculate_invoice_totals(self, items: List[Dict], tax_type: str = "GST") -> Dict:
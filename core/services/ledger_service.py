@@ -23,44 +23,21 @@ class LedgerService:
         Returns:
             dict: Balance information
         """
-        # Get party opening balance
-        parties = self.db._query("SELECT * FROM parties WHERE id = ?", (party_id,))
-        if not parties:
+        # Party row joined with its materialized totals (kept current by triggers)
+        party = self.db.get_party_balance_totals(party_id)
+        if not party:
             return {'balance': 0}
         
-        party = parties[0]
         opening_balance = float(party.get('opening_balance', 0) or 0)
         party_type = (party.get('party_type', 'Customer') or 'Customer').lower()
         
-        # Calculate from invoices (amount owed by customer)
-        invoices = self.db._query(
-            "SELECT SUM(grand_total) as total FROM invoices WHERE party_id = ?",
-            (party_id,)
-        )
-        invoice_total = float(invoices[0]['total'] or 0) if invoices else 0
-        
-        # Calculate from receipts (amount received from customer)
-        # Include payments with type='RECEIPT' OR type IS NULL (for backward compatibility)
-        receipts = self.db._query(
-            "SELECT SUM(amount) as total FROM payments WHERE party_id = ? AND (type = 'RECEIPT' OR type IS NULL)",
-            (party_id,)
-        )
-        receipt_total = float(receipts[0]['total'] or 0) if receipts else 0
-        
-        # Calculate from purchases (amount owed to supplier)
-        purchases = self.db._query(
-            "SELECT SUM(grand_total) as total FROM purchase_invoices WHERE supplier_id = ?",
-            (party_id,)
-        )
-        purchase_total = float(purchases[0]['total'] or 0) if purchases else 0
-        
-        # Calculate from payments (amount paid to supplier)
-        # Include payments with type='PAYMENT' (supplier payments typically have explicit type)
-        payments = self.db._query(
-            "SELECT SUM(amount) as total FROM payments WHERE party_id = ? AND type = 'PAYMENT'",
-            (party_id,)
-        )
-        payment_total = float(payments[0]['total'] or 0) if payments else 0
+        # Amount owed by customer / received from customer
+        invoice_total = float(party['invoice_total'] or 0)
+        receipt_total = float(party['receipt_total'] or 0)
+        
+        # Amount owed to supplier / paid to supplier
+        purchase_total = float(party['purchase_total'] or 0)
+        payment_total = float(party['payment_total'] or 0)
         
         # Net balance calculation
         # For customers: invoice_total - receipt_total (positive means customer owes)
@@ -89,6 +66,75 @@ class LedgerService:
             'supplier_balance': round(supplier_balance, 2)
         }
     
+    def get_all_party_balances(self, company_id: Optional[int] = None) -> List[Dict]:
+        """
+        Calculate the balance of every party in one query
+        
+        Same figures as get_party_balance(), summed straight from invoices,
+        purchase invoices and payments with one GROUP BY party_id, so the
+        result does not depend on the materialized party_balances totals.
+        Each source is read through its company_id index, so only the
+        company's own rows are summed.
+        
+        Args:
+            company_id: Company to report on (defaults to the current company)
+            
+        Returns:
+            List[Dict]: One get_party_balance()-shaped dict per party
+        """
+        if company_id is None:
+            company_id = self.db._current_company_id
+        
+        # Receipts include untyped legacy payments, as in get_party_balance()
+        scope = "WHERE company_id = ?" if company_id else ""
+        query = f"""
+            SELECT
+                p.id AS party_id,
+                COALESCE(p.name, '') AS party_name,
+                LOWER(COALESCE(NULLIF(p.party_type, ''), 'Customer')) AS party_type,
+                COALESCE(p.opening_balance, 0) AS opening_balance,
+                COALESCE(t.invoice_total, 0) AS invoice_total,
+                COALESCE(t.receipt_total, 0) AS receipt_total,
+                COALESCE(t.purchase_total, 0) AS purchase_total,
+                COALESCE(t.payment_total, 0) AS payment_total
+            FROM parties p
+            LEFT JOIN (
+                SELECT party_id,
+                       SUM(invoice) AS invoice_total,
+                       SUM(receipt) AS receipt_total,
+                       SUM(purchase) AS purchase_total,
+                       SUM(payment) AS payment_total
+                FROM (
+                    SELECT party_id, COALESCE(grand_total, 0) AS invoice,
+                           0 AS receipt, 0 AS purchase, 0 AS payment
+                    FROM invoices {scope}
+                    UNION ALL
+                    SELECT supplier_id, 0, 0, COALESCE(grand_total, 0), 0
+                    FROM purchase_invoices {scope}
+                    UNION ALL
+                    SELECT party_id, 0,
+                           CASE WHEN type IS NULL OR type = 'RECEIPT' THEN COALESCE(amount, 0) ELSE 0 END,
+                           0,
+                           CASE WHEN type = 'PAYMENT' THEN COALESCE(amount, 0) ELSE 0 END
+                    FROM payments {scope}
+                )
+                WHERE party_id IS NOT NULL
+                GROUP BY party_id
+            ) t ON t.party_id = p.id
+        """
+        if company_id:
+            rows = self.db._query(query + " WHERE p.company_id = ? ORDER BY p.id DESC", (company_id,) * 4)
+        else:
+            rows = self.db._query(query + " ORDER BY p.id DESC")
+        
+        for row in rows:
+            # Opening balance: credit for suppliers, debit for everyone else
+            opening = float(row['opening_balance'] or 0)
+            supplier_opening = opening if row['party_type'] == 'supplier' else 0.0
+            row['customer_balance'] = round(row['invoice_total'] - row['receipt_total'] + opening - supplier_opening, 2)
+            row['supplier_balance'] = round(row['purchase_total'] - row['payment_total'] + supplier_opening, 2)
+        return rows
+    
     def get_outstanding_receivables(self) -> List[Dict]:
         """
         Get list of outstanding receivables (customer dues)
@@ -96,24 +142,11 @@ class LedgerService:
         Returns:
             List[Dict]: Customers with outstanding balances
         """
-        parties = self.db.get_parties()
-        receivables = []
-        
-        for party in parties:
-            party_type = party.get('party_type', 'Customer')
-            if (party_type or '').lower() not in ['customer', 'both']:
-                continue
-            
-            balance_info = self.get_party_balance(party['id'])
-            customer_balance = balance_info['customer_balance']
-            
-            if customer_balance > 0:
-                receivables.append({
-                    'party_id': party['id'],
-                    'party_name': party.get('name', ''),
-                    'amount': customer_balance
-                })
-        
+        receivables = [
+            {'party_id': b['party_id'], 'party_name': b['party_name'], 'amount': b['customer_balance']}
+            for b in self.get_all_party_balances()
+            if b['party_type'] in ('customer', 'both') and b['customer_balance'] > 0
+        ]
         return sorted(receivables, key=lambda x: x['amount'], reverse=True)
     
     def get_outstanding_payables(self) -> List[Dict]:
@@ -123,24 +156,11 @@ class LedgerService:
         Returns:
             List[Dict]: Suppliers with outstanding balances
         """
-        parties = self.db.get_parties()
-        payables = []
-        
-        for party in parties:
-            party_type = party.get('party_type', 'Customer')
-            if (party_type or '').lower() not in ['supplier', 'both']:
-                continue
-            
-            balance_info = self.get_party_balance(party['id'])
-            supplier_balance = balance_info['supplier_balance']
-            
-            if supplier_balance > 0:
-                payables.append({
-                    'party_id': party['id'],
-                    'party_name': party.get('name', ''),
-                    'amount': supplier_balance
-                })
-        
+        payables = [
+            {'party_id': b['party_id'], 'party_name': b['party_name'], 'amount': b['supplier_balance']}
+            for b in self.get_all_party_balances()
+            if b['party_type'] in ('supplier', 'both') and b['supplier_balance'] > 0
+        ]
         return sorted(payables, key=lambda x: x['amount'], reverse=True)
     
     def get_financial_summary(self, start_date: str = None, end_date: str = None) -> Dict:
@@ -26,17 +26,18 @@ class PaymentService:
     # CRUD Operations (delegated to DB)
     # ─────────────────────────────────────────────────────────────────────────
     
-    def get_payments(self, payment_type: str = None) -> List[Dict]:
+    def get_payments(self, payment_type: str = None, compact: bool = False) -> List[Dict]:
         """
         Get all payments, optionally filtered by type.
         
         Args:
             payment_type: Filter by type ('PAYMENT' or 'RECEIPT')
+            compact: Return tuple-backed rows (see core.db.rows) for long-lived lists
             
         Returns:
             List of payment dictionaries
         """
-        return self.db.get_payments(payment_type) or []
+        return self.db.get_payments(payment_type, compact=compact) or []
     
     def get_payment_by_id(self, payment_id: int) -> Optional[Dict]:
         """
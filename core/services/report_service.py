@@ -0,0 +1,131 @@
+"""
+Report Service
+Date-range report queries for the reports screen
+
+Date filtering and the party/supplier name join are done in SQL, and report
+rows are read in batches (Database._query_batches), so a long report can be
+shown progressively and abandoned part way. Dates are ISO 'YYYY-MM-DD'
+strings, compared inclusively.
+
+The service does not touch widgets and can be called from a worker thread.
+"""
+
+from typing import Dict, Iterator, Tuple
+
+from core.db.sqlite_db import db as default_db
+from core.db.rows import RowSet
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ReportService:
+    """Service class for report queries"""
+
+    BATCH_SIZE = 500
+
+    def __init__(self, db=None):
+        self.db = db or default_db
+
+    def _range_where(self, alias: str, from_date: str, to_date: str) -> Tuple[str, tuple]:
+        """WHERE clause for a date range within the current company (uses the company/date index)."""
+        company_id = self.db.get_current_company_id()
+        if company_id:
+            return (f"WHERE {alias}.company_id = ? AND {alias}.date BETWEEN ? AND ?",
+                    (company_id, from_date, to_date))
+        return f"WHERE {alias}.date BETWEEN ? AND ?", (from_date, to_date)
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Sales (also the rows of the tax report)
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def count_sales_invoices(self, from_date: str, to_date: str) -> int:
+        """Number of sales invoices dated in the range."""
+        where, params = self._range_where('i', from_date, to_date)
+        return self.db._query(f"SELECT COUNT(*) AS n FROM invoices i {where}", params)[0]['n']
+
+    def iter_sales_invoices(self, from_date: str, to_date: str,
+                            batch_size: int = BATCH_SIZE) -> Iterator[RowSet]:
+        """
+        Sales invoices dated in the range, oldest first, in batches.
+
+        Yields:
+            RowSets with invoice_no, date, party_name, subtotal, cgst, sgst,
+            igst, grand_total
+        """
+        where, params = self._range_where('i', from_date, to_date)
+        return self.db._query_batches(
+            f"""
+            SELECT i.invoice_no, i.date, p.name AS party_name,
+                   i.subtotal, i.cgst, i.sgst, i.igst, i.grand_total
+            FROM invoices i
+            LEFT JOIN parties p ON i.party_id = p.id
+            {where}
+            ORDER BY i.date, i.id
+            """,
+            params,
+            batch_size
+        )
+
+    def get_tax_totals(self, from_date: str, to_date: str) -> Dict[str, float]:
+        """
+        GST collected on sales invoices dated in the range.
+
+        Returns:
+            Dict with cgst, sgst and igst totals
+        """
+        where, params = self._range_where('i', from_date, to_date)
+        row = self.db._query(
+            f"""
+            SELECT COALESCE(SUM(i.cgst), 0) AS cgst,
+                   COALESCE(SUM(i.sgst), 0) AS sgst,
+                   COALESCE(SUM(i.igst), 0) AS igst
+            FROM invoices i
+            {where}
+            """,
+            params
+        )[0]
+        return {key: float(row[key] or 0) for key in ('cgst', 'sgst', 'igst')}
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Purchases
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def count_purchase_invoices(self, from_date: str, to_date: str) -> int:
+        """Number of purchase invoices dated in the range."""
+        where, params = self._range_where('pi', from_date, to_date)
+        return self.db._query(f"SELECT COUNT(*) AS n FROM purchase_invoices pi {where}", params)[0]['n']
+
+    def iter_purchase_invoices(self, from_date: str, to_date: str,
+                               batch_size: int = BATCH_SIZE) -> Iterator[RowSet]:
+        """
+        Purchase invoices dated in the range, oldest first, in batches.
+
+        Purchase invoices store only the grand total; the taxable amount is
+        the grand total less the line items' tax. The GST split is not
+        recorded, so cgst, sgst and igst are 0.
+
+        Yields:
+            RowSets with invoice_no, date, party_name (the supplier),
+            subtotal, cgst, sgst, igst, grand_total
+        """
+        where, params = self._range_where('pi', from_date, to_date)
+        return self.db._query_batches(
+            f"""
+            SELECT pi.invoice_no, pi.date, s.name AS party_name,
+                   COALESCE(pi.grand_total, 0) - COALESCE(
+                       (SELECT SUM(it.tax_amount) FROM purchase_invoice_items it
+                        WHERE it.purchase_invoice_id = pi.id), 0) AS subtotal,
+                   0 AS cgst, 0 AS sgst, 0 AS igst, pi.grand_total
+            FROM purchase_invoices pi
+            LEFT JOIN parties s ON pi.supplier_id = s.id
+            {where}
+            ORDER BY pi.date, pi.id
+            """,
+            params,
+            batch_size
+        )
+
+
+# Singleton instance for app-wide use
+report_service = ReportService()
@@ -22,11 +22,7 @@ class StockService:
         Returns:
             bool: True if successful
         """
-        for item in items:
-            product_id = item.get('product_id')
-            quantity = float(item.get('quantity', 0))
-            if product_id and quantity > 0:
-                self.db.update_product_stock(product_id, quantity, 'subtract')
+        self.db.adjust_stock(items, 'subtract')
         return True
     
     def update_stock_for_purchase(self, items: List[Dict]) -> bool:
@@ -39,11 +35,7 @@ class StockService:
         Returns:
             bool: True if successful
         """
-        for item in items:
-            product_id = item.get('product_id')
-            quantity = float(item.get('quantity', 0))
-            if product_id and quantity > 0:
-                self.db.update_product_stock(product_id, quantity, 'add')
+        self.db.adjust_stock(items, 'add')
         return True
     
     def check_stock_availability(self, product_id: int, required_quantity: float) -> Dict:
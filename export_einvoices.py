@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Generate NIC e-invoice JSON payloads for a company's B2B invoices in a period.
+
+Payloads are built and validated in a pool of worker processes (see
+EInvoiceService). Invoices that fail validation are listed and skipped.
+
+Usage:
+    python export_einvoices.py --company 1 --period 042025 -o einvoices/ [--workers 4] [--db path/to/gst_billing.db]
+    python export_einvoices.py --company 1 --from 2025-04-01 --to 2025-04-30 --jsonl -o april.jsonl
+"""
+
+import argparse
+import sys
+
+# Core imports
+from core.cli import add_period_arguments, parse_period
+from core.db.sqlite_db import Database
+from core.logger import get_logger
+from core.services.einvoice_service import EInvoiceService
+
+logger = get_logger(__name__)
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--company', type=int, required=True, help="Company ID")
+    add_period_arguments(parser)
+    parser.add_argument('-o', '--output', required=True,
+                        help="Directory for one file per invoice, or the file with --jsonl")
+    parser.add_argument('--jsonl', action='store_true', help="Write a single JSONL stream")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: one per CPU)")
+    parser.add_argument('--db', help="Database file (default: the application database)")
+    args = parser.parse_args()
+
+    from_date, to_date = parse_period(parser, args)
+
+    try:
+        db = Database(args.db)
+        logger.info(f"Using database: {db.path}")
+        if not db.get_company_by_id(args.company):
+            logger.error(f"❌ Company {args.company} not found")
+            sys.exit(1)
+        db.set_current_company(args.company)
+
+        stats = EInvoiceService(db).generate(from_date, to_date, args.output,
+                                             jsonl=args.jsonl, workers=args.workers)
+
+        logger.info(f"✅ {stats['written']} of {stats['invoices']} B2B invoices written to {args.output}")
+        if stats['failed']:
+            logger.warning(f"⚠️ {stats['failed']} invoices failed validation and were skipped (see above)")
+        db.close()
+
+    except Exception as e:
+        logger.error(f"❌ Error generating e-invoices: {str(e)}", exc_info=True)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Export a company's GSTR-1 for a return period as offline-tool JSON.
+
+Runs without the GUI, e.g. from a month-end scheduled job. The file is
+written incrementally (see GSTR1ExportService) and only appears once
+complete.
+
+Usage:
+    python export_gstr1.py --company 1 --period 042025 [-o gstr1_042025.json] [--db path/to/gst_billing.db]
+    python export_gstr1.py --company 1 --from 2025-04-01 --to 2025-04-30 -o april.json
+"""
+
+import argparse
+import sys
+
+# Core imports
+from core.cli import add_period_arguments, parse_period
+from core.db.sqlite_db import Database
+from core.logger import get_logger
+from core.services.gstr1_export_service import GSTR1ExportService
+
+logger = get_logger(__name__)
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--company', type=int, required=True, help="Company ID")
+    add_period_arguments(parser)
+    parser.add_argument('-o', '--output', help="Output file (default: gstr1_<MMYYYY>.json)")
+    parser.add_argument('--db', help="Database file (default: the application database)")
+    args = parser.parse_args()
+
+    from_date, to_date = parse_period(parser, args)
+    output = args.output or f"gstr1_{to_date[5:7]}{to_date[:4]}.json"
+
+    try:
+        db = Database(args.db)
+        logger.info(f"Using database: {db.path}")
+        if not db.get_company_by_id(args.company):
+            logger.error(f"❌ Company {args.company} not found")
+            sys.exit(1)
+        db.set_current_company(args.company)
+
+        stats = GSTR1ExportService(db).export(output, from_date, to_date)
+
+        logger.info(f"✅ GSTR-1 {from_date}..{to_date} written to {output}: "
+                    f"{stats['b2b_invoices']} B2B and {stats['b2cl_invoices']} B2CL invoices, "
+                    f"{stats['b2cs_rows']} B2CS and {stats['hsn_rows']} HSN rows")
+        if stats['invalid_gstins']:
+            logger.warning(f"⚠️ {stats['invalid_gstins']} recipient GSTINs failed validation; "
+                           f"fix them before uploading")
+        if stats['empty_hsn_rows']:
+            logger.warning(f"⚠️ {stats['empty_hsn_rows']} HSN summary rows have no HSN code; "
+                           f"set the products' HSN codes before uploading")
+        db.close()
+
+    except Exception as e:
+        logger.error(f"❌ Error exporting GSTR-1: {str(e)}", exc_info=True)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
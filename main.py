@@ -3,8 +3,14 @@ Main entry point and navigation manager for GST Billing Software
 """
 
 import sys
+import time
+import importlib
+
+# Startup reference point for the time-to-first-paint measurement
+_PROCESS_START = time.perf_counter()
+
 from PySide6.QtWidgets import QApplication, QMainWindow, QHBoxLayout, QWidget, QStackedWidget
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QEvent, QTimer
 
 # Enable WebEngine sharing BEFORE QApplication is created
 # This is required for QWebEngineView to work properly
@@ -14,23 +20,42 @@ from theme import APP_STYLESHEET
 from widgets import Sidebar
 from config import config
 from core.db.sqlite_db import db
+from core.logger import get_logger
+
+logger = get_logger(__name__)
 
-# Import screens from ui module (using original working versions)
-from ui.dashboard.dashboard_screen import DashboardScreen
-from ui.parties.party_list_screen import PartiesScreen
-from ui.products.product_list_screen import ProductsScreen
-from ui.invoices.sales.sales_invoice_list_screen import InvoicesScreen
-from ui.invoices.purchase.purchase_invoice_list_screen import PurchasesScreen
-from ui.payments.payment_list_screen import PaymentsScreen
-from ui.receipts.receipt_list_screen import ReceiptsScreen
-from ui.reports.reports_screen import ReportsScreen
+# Screen name -> (module, class). Screen modules (and the dialogs they import)
+# are loaded on first navigation instead of at startup.
+SCREEN_FACTORIES = {
+    'dashboard': ('ui.dashboard.dashboard_screen', 'DashboardScreen'),
+    'invoices': ('ui.invoices.sales.sales_invoice_list_screen', 'InvoicesScreen'),
+    'purchases': ('ui.invoices.purchase.purchase_invoice_list_screen', 'PurchasesScreen'),
+    'products': ('ui.products.product_list_screen', 'ProductsScreen'),
+    'parties': ('ui.parties.party_list_screen', 'PartiesScreen'),
+    'receipts': ('ui.receipts.receipt_list_screen', 'ReceiptsScreen'),
+    'payments': ('ui.payments.payment_list_screen', 'PaymentsScreen'),
+    'reports': ('ui.reports.reports_screen', 'ReportsScreen'),
+}
 
 class MainWindow(QMainWindow):
-    def __init__(self, company_name="GST Billing"):
+    # Build the remaining screens one at a time once the dashboard has painted
+    PREBUILD_SCREENS = True
+    PREBUILD_INTERVAL = 300  # ms between two prebuilt screens
+
+    def __init__(self, company_name="GST Billing", started_at=None):
+        """
+        Args:
+            company_name: Company shown in the sidebar
+            started_at: time.perf_counter() value startup is measured from
+                        (defaults to now)
+        """
         super().__init__()
         self.setWindowTitle("GST Billing Software")
         self.setMinimumSize(1200, 800)
         self.company_name = company_name
+        self._started_at = started_at if started_at is not None else time.perf_counter()
+        self._first_paint_seen = False
+        self._prebuild_queue = []
         
         # Always start maximized
         self.showMaximized()
@@ -39,6 +64,7 @@ class MainWindow(QMainWindow):
         
         # Always start with dashboard as default screen
         self.navigate_to('dashboard')
+        self._watch_first_paint()
     
     def setup_ui(self):
         """Setup the main UI"""
@@ -59,21 +85,8 @@ class MainWindow(QMainWindow):
         self.content_stack = QStackedWidget()
         main_layout.addWidget(self.content_stack, stretch=1)
         
-        # Initialize screens
-        self.screens = {
-            'dashboard': DashboardScreen(),
-            'parties': PartiesScreen(),
-            'products': ProductsScreen(),
-            'invoices': InvoicesScreen(),
-            'purchases': PurchasesScreen(),
-            'receipts': ReceiptsScreen(),
-            'payments': PaymentsScreen(),
-            'reports': ReportsScreen()
-        }
-        
-        # Add screens to stack
-        for screen in self.screens.values():
-            self.content_stack.addWidget(screen)
+        # Screens are built on first navigation (see get_screen)
+        self.screens = {}
     
     def setup_sidebar(self):
         """Setup sidebar menu items without sections"""
@@ -98,10 +111,31 @@ class MainWindow(QMainWindow):
         dashboard_btn.set_active(True)
         self.sidebar.active_button = dashboard_btn
     
+    def get_screen(self, screen_name):
+        """
+        Screen instance for a name, building it on first use
+        
+        Args:
+            screen_name: Key of SCREEN_FACTORIES
+            
+        Returns:
+            The screen widget (already added to the content stack)
+        """
+        screen = self.screens.get(screen_name)
+        if screen is None:
+            module_name, class_name = SCREEN_FACTORIES[screen_name]
+            start = time.perf_counter()
+            screen_class = getattr(importlib.import_module(module_name), class_name)
+            screen = screen_class()
+            self.content_stack.addWidget(screen)
+            self.screens[screen_name] = screen
+            logger.info(f"Built {screen_name} screen in {(time.perf_counter() - start) * 1000:.0f} ms")
+        return screen
+    
     def navigate_to(self, screen_name):
         """Navigate to a specific screen"""
-        if screen_name in self.screens:
-            screen = self.screens[screen_name]
+        if screen_name in SCREEN_FACTORIES:
+            screen = self.get_screen(screen_name)
             self.content_stack.setCurrentWidget(screen)
             
             # Save last screen
@@ -135,6 +169,50 @@ class MainWindow(QMainWindow):
                     self.sidebar.set_active_button(button)
                     break
     
+    # ─────────────────────────────────────────────────────────────────────────
+    # Startup Timing and Idle Prebuilding
+    # ─────────────────────────────────────────────────────────────────────────
+    
+    def _watch_first_paint(self):
+        """Watch application events until the first screen paints."""
+        QApplication.instance().installEventFilter(self)
+    
+    def eventFilter(self, obj, event):
+        """Report time-to-first-paint of the first screen shown."""
+        if (not self._first_paint_seen and event.type() == QEvent.Paint
+                and isinstance(obj, QWidget)):
+            screen = self.content_stack.currentWidget()
+            if screen is not None and (obj is screen or screen.isAncestorOf(obj)):
+                self._on_first_paint(screen)
+        return super().eventFilter(obj, event)
+    
+    def _on_first_paint(self, screen):
+        """Log startup time, then start building the other screens in idle time."""
+        self._first_paint_seen = True
+        QApplication.instance().removeEventFilter(self)
+        screen_name = next((name for name, s in self.screens.items() if s is screen), 'screen')
+        elapsed_ms = (time.perf_counter() - self._started_at) * 1000
+        logger.info(f"Startup: {screen_name} first painted after {elapsed_ms:.0f} ms")
+        
+        if self.PREBUILD_SCREENS:
+            self._prebuild_queue = [name for name in SCREEN_FACTORIES if name not in self.screens]
+            QTimer.singleShot(self.PREBUILD_INTERVAL, self._prebuild_next_screen)
+    
+    def _prebuild_next_screen(self):
+        """Build one pending screen, then schedule the next."""
+        while self._prebuild_queue:
+            screen_name = self._prebuild_queue.pop(0)
+            if screen_name in self.screens:
+                continue
+            try:
+                self.get_screen(screen_name)
+            except Exception as e:
+                # Navigation will retry (and surface the error) later
+                logger.error(f"Prebuilding {screen_name} screen failed: {str(e)}", exc_info=True)
+            break
+        if self._prebuild_queue:
+            QTimer.singleShot(self.PREBUILD_INTERVAL, self._prebuild_next_screen)
+    
     def show_coming_soon(self, feature_name):
         """Show coming soon message for unimplemented features"""
         from PySide6.QtWidgets import QMessageBox
@@ -165,8 +243,8 @@ def main():
     app = QApplication(sys.argv)
     app.setStyleSheet(APP_STYLESHEET)
     
-    # Initialize database
-    db.create_tables()
+    # Initialize database (no-op when the schema is already current)
+    db.migrate_schema()
     
     # Restore current company from config if available
     current_company_id = config.get('company.current_company_id')
@@ -175,7 +253,7 @@ def main():
         print(f"Restored current company ID: {current_company_id}")
     
     # Create and show main window
-    window = MainWindow()
+    window = MainWindow(started_at=_PROCESS_START)
     window.show()
     
     sys.exit(app.exec())
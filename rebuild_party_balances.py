@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Rebuild the materialized party_balances table from invoices, purchases and payments.
+
+The table is kept current by triggers; run this after editing the database
+outside the application (or restoring an old backup into a newer schema).
+
+Usage:
+    python rebuild_party_balances.py [path/to/gst_billing.db]
+"""
+
+import sys
+
+# Core imports
+from core.db.sqlite_db import Database
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def main():
+    """Main entry point"""
+    try:
+        db = Database(sys.argv[1] if len(sys.argv) > 1 else None)
+        logger.info(f"Using database: {db.path}")
+        
+        count = db.rebuild_party_balances()
+        
+        logger.info(f"✅ Party balances rebuilt for {count} parties")
+        db.close()
+        
+    except Exception as e:
+        logger.error(f"❌ Error rebuilding party balances: {str(e)}", exc_info=True)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
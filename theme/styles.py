@@ -967,7 +967,7 @@ def get_enhanced_table_style():
         str: CSS stylesheet string
     """
     return f"""
-        QTableWidget {{
+        QTableView {{
             gridline-color: #F3F4F6;
             background-color: {WHITE};
             border: none;
@@ -975,10 +975,10 @@ def get_enhanced_table_style():
             selection-background-color: #EEF2FF;
             alternate-background-color: #FAFBFC;
         }}
-        QTableWidget::item {{
+        QTableView::item {{
             border-bottom: 1px solid #F3F4F6;
         }}
-        QTableWidget::item:selected {{
+        QTableView::item:selected {{
             background-color: #EEF2FF;
             color: {TEXT_PRIMARY};
         }}
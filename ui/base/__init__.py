@@ -7,5 +7,7 @@ from .base_dialog import BaseDialog
 from .pagination_widget import PaginationWidget
 from .base_list_screen import BaseListScreen
 from .list_table_helper import ListTableHelper
+from .list_load_worker import ListLoadWorker
+from .list_table_model import ListTableModel
 
-__all__ = ['BaseScreen', 'BaseDialog', 'PaginationWidget', 'BaseListScreen', 'ListTableHelper']
+__all__ = ['BaseScreen', 'BaseDialog', 'PaginationWidget', 'BaseListScreen', 'ListTableHelper', 'ListLoadWorker', 'ListTableModel']
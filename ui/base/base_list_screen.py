@@ -10,9 +10,12 @@ Features:
 - Generic data loading with error handling
 - Pagination support (via PaginationWidget)
 - Loading state management
+- Background loading (fetch/filter in a worker thread)
 - Consistent signal emissions
 """
 
+from typing import Any, Optional
+
 from PySide6.QtWidgets import (
     QWidget, QHBoxLayout, QVBoxLayout, QFrame, QLabel
 )
@@ -24,8 +27,10 @@ from theme import (
     get_normal_font
 )
 
+from core.db.sqlite_db import db
 from core.logger import get_logger
 from ui.base.base_screen import BaseScreen
+from ui.base.list_load_worker import ListLoadWorker
 from ui.base.pagination_widget import PaginationWidget
 from ui.error_handler import UIErrorHandler
 from widgets import RefreshButton
@@ -50,6 +55,22 @@ class BaseListScreen(BaseScreen):
     - _create_table_section() - Define table columns
     - filter_data(all_data) - Apply filters to data
     - get_stats(all_data) - Calculate statistics
+    
+    Screens that set PAGED_FETCH = True override _fetch_page() instead of
+    _fetch_all_data()/filter_data(): filtering and paging run in the
+    database and only the visible page is loaded.
+    
+    Screens that list their source tables in DATA_TABLES keep _all_data
+    between loads: showing the screen again or changing a filter reuses it
+    until db.get_change_version() reports a write to one of those tables.
+    
+    Screens that implement _filter_state() load in the background while
+    ASYNC_LOAD is set: the filter values are read on the GUI thread, the
+    fetch and _apply_filters() (or _fetch_page() and _fetch_paged_extras())
+    run in a ListLoadWorker, and the result is applied back on the GUI
+    thread. A "Loading..." indicator covers the screen meanwhile, and
+    starting a new load (e.g. another filter change) discards the result of
+    the one in flight.
     """
     
     # Common signal for data changes
@@ -57,7 +78,15 @@ class BaseListScreen(BaseScreen):
     
     # Configuration (set by subclass in __init__)
     ITEMS_PER_PAGE = 49  # Default pagination size
+    # Page size for screens that show their rows through ListTableModel: the
+    # model formats only the rows in view, so a whole list of this size is
+    # scrolled instead of paged
+    MODEL_PAGE_SIZE = 100_000
     DEBOUNCE_DELAY = 500  # ms - for search debouncing
+    PAGED_FETCH = False  # True: fetch one filtered page at a time via _fetch_page()
+    DATA_TABLES = ()  # Tables the screen's data is read from; empty = always refetch
+    ASYNC_LOAD = True  # Fetch/filter in a worker thread when _filter_state() is implemented
+    LOADING_INDICATOR_DELAY = 150  # ms - loads faster than this never show the indicator
     
     def __init__(self, title: str, parent=None):
         """
@@ -73,8 +102,20 @@ class BaseListScreen(BaseScreen):
         self._is_loading = False
         self._all_data = []
         self._filtered_data = []
+        self._page_data = []
+        self._total_items = 0
+        self._data_version = None  # change version of DATA_TABLES at the last fetch
         self.pagination_widget = None
         
+        # Background loading state
+        self._load_generation = 0  # bumped by every async load; older results are dropped
+        self._load_worker = None
+        self._load_reset_page = False
+        self._loading_label = None
+        self._loading_timer = QTimer()
+        self._loading_timer.setSingleShot(True)
+        self._loading_timer.timeout.connect(self._show_loading_indicator)
+        
         # Search debounce timer
         self._search_debounce_timer = QTimer()
         self._search_debounce_timer.setSingleShot(True)
@@ -88,8 +129,19 @@ class BaseListScreen(BaseScreen):
     def showEvent(self, event):
         """Refresh data when screen becomes visible - common for all list screens."""
         super().showEvent(event)
+        if self._data_version is not None and not self._is_data_stale():
+            logger.debug(f"{self.__class__.__name__}: data unchanged, keeping current view")
+            return
         self._load_data()
     
+    def _current_data_version(self):
+        """Change version of DATA_TABLES, or None when the screen does not declare them."""
+        return db.get_change_version(*self.DATA_TABLES) if self.DATA_TABLES else None
+    
+    def _is_data_stale(self) -> bool:
+        """True if the data must be fetched again (never loaded, or its tables changed)."""
+        return self._data_version is None or self._data_version != self._current_data_version()
+    
     def _setup_ui(self):
         """
         Set up the standard UI layout - IDENTICAL for all list screens
@@ -205,6 +257,9 @@ class BaseListScreen(BaseScreen):
         6. Populate table
         7. Handle errors gracefully
         
+        With background loading (see _filter_state()), steps 2-3 run in a
+        worker thread and steps 4-6 follow in _on_async_load_finished().
+        
         Args:
             reset_page: Reset to page 1 when called after filter change
         """
@@ -220,12 +275,28 @@ class BaseListScreen(BaseScreen):
             if reset_page and self.pagination_widget:
                 self.pagination_widget.reset_to_page_one()
             
-            # Fetch all data (subclass responsibility via service/controller)
-            self._all_data = self._fetch_all_data()
-            logger.info(f"🔄 Fetched {len(self._all_data)} TOTAL items")
+            filters = self._filter_state() if self.ASYNC_LOAD else None
+            if filters is not None:
+                self._start_async_load(filters, reset_page)
+                return
+            
+            if self.PAGED_FETCH:
+                self._load_paged_data(reset_page)
+                return
             
-            if len(self._all_data) == 0:
-                logger.warning("⚠️  No data returned from database!")
+            # Fetch all data (subclass responsibility via service/controller),
+            # unless nothing it is read from has changed since the last fetch
+            if self._is_data_stale():
+                version = self._current_data_version()  # read first: a write during the fetch stays visible
+                self._all_data = self._fetch_all_data()
+                self._data_version = version
+                logger.info(f"🔄 Fetched {len(self._all_data)} TOTAL items")
+                self._on_data_fetched(self._all_data)
+                
+                if len(self._all_data) == 0:
+                    logger.warning("⚠️  No data returned from database!")
+            else:
+                logger.debug(f"Reusing {len(self._all_data)} cached items")
             
             # Apply filters
             self._filtered_data = self.filter_data(self._all_data)
@@ -251,6 +322,94 @@ class BaseListScreen(BaseScreen):
         finally:
             self._is_loading = False
     
+    def _load_paged_data(self, reset_page: bool = False):
+        """
+        PAGED_FETCH flow: refresh filter options and stats, then fetch only
+        the current page with its total count.
+        
+        Args:
+            reset_page: Reset to page 1 when called after filter change
+        """
+        self._data_version = self._current_data_version()
+        self._apply_paged_extras(self._fetch_paged_extras())
+        self._fetch_current_page()
+        self._update_pagination(reset_page)
+        
+        logger.debug(f"📄 Populating table with {len(self._page_data)} of {self._total_items} items")
+        self._populate_table(self._page_data)
+        logger.info(f"Data loaded successfully")
+    
+    def _fetch_current_page(self):
+        """Fetch the current page into _page_data and the match count into _total_items."""
+        current_page = self.pagination_widget.get_current_page() if self.pagination_widget else 1
+        self._page_data, self._total_items, page = self._fetch_page_at(current_page)
+        if page != current_page:
+            self.pagination_widget.set_pagination_state(page, page, self._total_items)
+    
+    def _fetch_page_at(self, page: int, filters: Optional[dict] = None) -> tuple:
+        """
+        Fetch one page, going back to the last page if it is past the end
+        
+        Runs in a worker thread when filters are given.
+        Args:
+            page: Page number to fetch
+            filters: Filter values from _filter_state(); None = read the widgets
+            
+        Returns:
+            Tuple of (rows for the page, total matching rows, page fetched)
+        """
+        offset = (page - 1) * self.ITEMS_PER_PAGE
+        rows, total = self._fetch_page(offset, self.ITEMS_PER_PAGE, filters)
+        
+        # Page fell off the end (rows deleted or filter narrowed) - go back to the last one
+        if not rows and total and offset:
+            page = max(1, (total + self.ITEMS_PER_PAGE - 1) // self.ITEMS_PER_PAGE)
+            rows, total = self._fetch_page((page - 1) * self.ITEMS_PER_PAGE, self.ITEMS_PER_PAGE, filters)
+        return rows, total, page
+    
+    def _fetch_page(self, offset: int, limit: int, filters: Optional[dict] = None) -> tuple:
+        """
+        Fetch one filtered page of data
+        
+        MUST BE OVERRIDDEN by subclasses that set PAGED_FETCH
+        Args:
+            offset: Rows to skip
+            limit: Page size
+            filters: Filter values from _filter_state(); None = read the widgets
+            
+        Returns:
+            Tuple of (rows for the page, total matching rows)
+        """
+        raise NotImplementedError("Subclass must implement _fetch_page()")
+    
+    def _refresh_filter_options(self):
+        """Reload dynamic filter choices (PAGED_FETCH only) - override if needed"""
+        pass
+    
+    def _fetch_paged_extras(self) -> Any:
+        """
+        Read what a PAGED_FETCH load shows besides the page (stat totals,
+        filter choices)
+        
+        Runs in the worker thread together with the page query - must not
+        touch widgets. Override together with _apply_paged_extras().
+        Returns:
+            Anything _apply_paged_extras() understands; None by default
+        """
+        return None
+    
+    def _apply_paged_extras(self, extras: Any):
+        """
+        Show the result of _fetch_paged_extras() (GUI thread)
+        
+        The default, for screens that do not override both, refreshes the
+        filter options and stats with their own queries.
+        Args:
+            extras: Result of _fetch_paged_extras()
+        """
+        self._refresh_filter_options()
+        self._update_stats(None)
+    
     def _fetch_all_data(self) -> list:
         """
         Fetch all data from service/controller
@@ -274,6 +433,183 @@ class BaseListScreen(BaseScreen):
         """
         raise NotImplementedError("Subclass must implement filter_data()")
     
+    def _filter_state(self) -> Optional[dict]:
+        """
+        Snapshot of the current filter values, read on the GUI thread
+        
+        Override to enable background loading. The dict is passed as keyword
+        arguments to _apply_filters(), or to _fetch_page() as `filters` for
+        PAGED_FETCH screens, from a worker thread.
+        Returns:
+            Dict of filter values, or None to load on the GUI thread
+        """
+        return None
+    
+    def _apply_filters(self, all_data: list, **filters) -> list:
+        """
+        Filter data with the values captured by _filter_state()
+        
+        Runs in a worker thread - must not touch widgets.
+        MUST BE OVERRIDDEN by subclasses that implement _filter_state()
+        """
+        raise NotImplementedError("Subclass must implement _apply_filters()")
+    
+    def _on_data_fetched(self, all_data: list):
+        """
+        Called on the GUI thread after fresh data replaced _all_data
+        
+        Override to rebuild filter choices derived from the data.
+        Args:
+            all_data: Newly fetched data (unfiltered)
+        """
+        pass
+    
+    # ─────────────────────────────────────────────────────────────────────────
+    # Background Loading
+    # ─────────────────────────────────────────────────────────────────────────
+    
+    def _start_async_load(self, filters: dict, reset_page: bool):
+        """
+        Start a background load, superseding any load still in flight
+        
+        The worker fetches and filters; for PAGED_FETCH screens it also
+        reads the stats and filter choices (_fetch_paged_extras()), which
+        are applied to the widgets with the page.
+        Args:
+            filters: Filter values from _filter_state()
+            reset_page: Reset to page 1 when called after filter change
+        """
+        if self.PAGED_FETCH:
+            self._data_version = self._current_data_version()
+            page = self.pagination_widget.get_current_page() if self.pagination_widget else 1
+            self._start_load_worker(
+                lambda: (self._fetch_paged_extras(), self._fetch_page_at(page, filters)), reset_page)
+            return
+        
+        if self._is_data_stale():
+            version = self._current_data_version()  # read first: a write during the fetch stays visible
+            cached = None
+        else:
+            version, cached = self._data_version, self._all_data
+        
+        def job():
+            all_data = self._fetch_all_data() if cached is None else cached
+            return version, all_data, self._apply_filters(all_data, **filters)
+        
+        self._start_load_worker(job, reset_page)
+    
+    def _start_load_worker(self, job, reset_page: bool = False):
+        """Run job in a ListLoadWorker; its result goes to _on_async_load_finished."""
+        self._cancel_async_load()
+        self._load_generation += 1
+        self._load_reset_page = reset_page
+        
+        worker = ListLoadWorker(self._load_generation, job)
+        worker.signals.finished.connect(self._on_async_load_finished)
+        worker.signals.failed.connect(self._on_async_load_failed)
+        self._load_worker = worker
+        
+        if not self._loading_timer.isActive() and not self._is_loading_indicator_visible():
+            self._loading_timer.start(self.LOADING_INDICATOR_DELAY)
+        worker.start()
+        logger.debug(f"Started background load #{self._load_generation} for {self.__class__.__name__}")
+    
+    def _cancel_async_load(self):
+        """Discard the load in flight, if any."""
+        if self._load_worker is not None:
+            self._load_worker.cancel()
+            self._load_worker = None
+    
+    def _on_async_load_finished(self, generation: int, result):
+        """Apply the result of a background load (GUI thread)."""
+        if generation != self._load_generation:
+            logger.debug(f"Dropping result of superseded load #{generation}")
+            return
+        self._load_worker = None
+        self._hide_loading_indicator()
+        
+        try:
+            if self.PAGED_FETCH:
+                extras, (self._page_data, self._total_items, page) = result
+                self._apply_paged_extras(extras)
+                if self.pagination_widget and page != self.pagination_widget.get_current_page():
+                    self.pagination_widget.set_pagination_state(page, page, self._total_items)
+                self._update_pagination(self._load_reset_page)
+                logger.debug(f"📄 Populating table with {len(self._page_data)} of {self._total_items} items")
+            else:
+                version, all_data, self._filtered_data = result
+                if all_data is not self._all_data:
+                    self._all_data = all_data
+                    self._data_version = version
+                    logger.info(f"🔄 Fetched {len(self._all_data)} TOTAL items")
+                    self._on_data_fetched(self._all_data)
+                logger.debug(f"🔍 After filtering: {len(self._filtered_data)} items (from {len(self._all_data)} total)")
+                self._update_pagination(self._load_reset_page)
+                self._update_stats(self._all_data)
+            
+            self._populate_table(self._get_current_page_data())
+            logger.info(f"Data loaded successfully")
+            
+        except Exception as e:
+            logger.error(f"Error loading data: {str(e)}", exc_info=True)
+            UIErrorHandler.show_error("Error", f"Failed to load data: {str(e)}")
+    
+    def _on_async_load_failed(self, generation: int, message: str):
+        """Report a failed background load (GUI thread)."""
+        if generation != self._load_generation:
+            return
+        self._load_worker = None
+        self._hide_loading_indicator()
+        UIErrorHandler.show_error("Error", f"Failed to load data: {message}")
+    
+    def _show_loading_indicator(self):
+        """Show the "Loading..." overlay while a background load runs."""
+        if self._load_worker is None:
+            return
+        if self._loading_label is None:
+            self._loading_label = QLabel("Loading...", self)
+            self._loading_label.setFont(get_normal_font())
+            self._loading_label.setAlignment(Qt.AlignCenter)
+            self._loading_label.setStyleSheet(f"""
+                QLabel {{
+                    background: {WHITE};
+                    color: {TEXT_SECONDARY};
+                    border: 1px solid {BORDER};
+                    border-radius: 8px;
+                    padding: 10px 24px;
+                }}
+            """)
+        self._loading_label.adjustSize()
+        self._position_loading_indicator()
+        self._loading_label.show()
+        self._loading_label.raise_()
+        self.setCursor(Qt.BusyCursor)
+    
+    def _hide_loading_indicator(self):
+        """Hide the loading overlay (and cancel it if not shown yet)."""
+        self._loading_timer.stop()
+        if self._loading_label is not None:
+            self._loading_label.hide()
+        self.unsetCursor()
+    
+    def _is_loading_indicator_visible(self) -> bool:
+        return self._loading_label is not None and self._loading_label.isVisible()
+    
+    def _position_loading_indicator(self):
+        """Center the loading overlay on the screen."""
+        label = self._loading_label
+        label.move((self.width() - label.width()) // 2, (self.height() - label.height()) // 2)
+    
+    def resizeEvent(self, event):
+        """Keep the loading overlay centered."""
+        super().resizeEvent(event)
+        if self._is_loading_indicator_visible():
+            self._position_loading_indicator()
+    
+    # ─────────────────────────────────────────────────────────────────────────
+    # Pagination and Display
+    # ─────────────────────────────────────────────────────────────────────────
+    
     def _update_pagination(self, reset_page: bool = False):
         """
         Update pagination widget state
@@ -285,14 +621,15 @@ class BaseListScreen(BaseScreen):
             return
         
         # Calculate pagination based on filtered data
-        total_pages = max(1, (len(self._filtered_data) + self.ITEMS_PER_PAGE - 1) // self.ITEMS_PER_PAGE)
+        total_items = self._total_items if self.PAGED_FETCH else len(self._filtered_data)
+        total_pages = max(1, (total_items + self.ITEMS_PER_PAGE - 1) // self.ITEMS_PER_PAGE)
         current_page = 1 if reset_page else self.pagination_widget.get_current_page()
         
         # Update widget state
         self.pagination_widget.set_pagination_state(
             current_page=current_page,
             total_pages=total_pages,
-            total_items=len(self._filtered_data)
+            total_items=total_items
         )
         
         logger.debug(f"Pagination updated: Page {current_page}/{total_pages}")
@@ -314,7 +651,8 @@ class BaseListScreen(BaseScreen):
         
         MUST BE OVERRIDDEN by subclass
         Args:
-            all_data: All items for calculation (not filtered)
+            all_data: All items for calculation (not filtered);
+                      None for PAGED_FETCH screens, which query their own totals
         """
         raise NotImplementedError("Subclass must implement _update_stats()")
     
@@ -335,6 +673,9 @@ class BaseListScreen(BaseScreen):
         Returns:
             Slice of filtered data for current page
         """
+        if self.PAGED_FETCH:
+            return self._page_data
+        
         if not self.pagination_widget:
             return self._filtered_data
         
@@ -381,6 +722,12 @@ class BaseListScreen(BaseScreen):
         """Handle pagination page change"""
         try:
             logger.info(f"Page changed to {page}")
+            if self.PAGED_FETCH:
+                filters = self._filter_state() if self.ASYNC_LOAD else None
+                if filters is not None:
+                    self._start_load_worker(lambda: self._fetch_page_at(page, filters))
+                    return
+                self._fetch_current_page()
             page_data = self._get_current_page_data()
             self._populate_table(page_data)
         except Exception as e:
@@ -404,6 +751,7 @@ class BaseListScreen(BaseScreen):
         if hasattr(self, '_filter_widget') and self._filter_widget:
             self._filter_widget.reset_filters()
             self._filter_widget.clear_search()
+        self._data_version = None
         self._load_data(reset_page=True)
     
     # ─────────────────────────────────────────────────────────────────────────
@@ -439,6 +787,7 @@ class BaseListScreen(BaseScreen):
     def refresh(self):
         """Public method to refresh the data list"""
         logger.info("Manual refresh triggered")
+        self._data_version = None
         self._load_data(reset_page=True)
     
     def get_safe_filter_value(self, value: str) -> str:
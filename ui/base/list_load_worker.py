@@ -0,0 +1,96 @@
+"""
+ListLoadWorker - Runs a list screen's fetch/filter stage off the GUI thread
+
+Features:
+- Runs one load job in QThreadPool.globalInstance()
+- Delivers the result (or error) back to the GUI thread through signals
+- Each job carries the screen's load generation, so results of a load that
+  was superseded by a newer one can be recognised and dropped
+- A streamed job (batches=...) emits its rows batch by batch with the
+  progress so far, so a table fills while the query is still running
+- cancel() removes a job that has not started and silences one that has;
+  a streamed job also stops at the next batch and releases its cursor
+
+The job must not touch widgets. Database reads made from the pool thread go
+through Database's reader connections, so they do not queue behind writes.
+"""
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ListLoadSignals(QObject):
+    """Signals of ListLoadWorker (QRunnable cannot declare its own)."""
+
+    batch_ready = Signal(int, object, int, int)  # generation, rows, rows so far, total rows
+    finished = Signal(int, object)  # generation, job result
+    failed = Signal(int, str)  # generation, error message
+
+
+class ListLoadWorker(QRunnable):
+    """Runs one load job for a list screen in the global thread pool."""
+
+    def __init__(self, generation: int, job=None, batches=None, count=None):
+        """
+        Args:
+            generation: Load generation of the screen that started the job
+            job: Callable run in the pool thread; its return value is emitted
+                with finished (None without a job)
+            batches: Optional callable returning an iterator of row batches,
+                emitted with batch_ready before job runs
+            count: Optional callable returning the expected number of rows
+                of batches, for progress
+        """
+        super().__init__()
+        # The screen keeps a reference until the next load; the pool must not delete us
+        self.setAutoDelete(False)
+        self.generation = generation
+        self.signals = ListLoadSignals()
+        self._job = job
+        self._batches = batches
+        self._count = count
+        self._cancelled = False
+
+    def start(self):
+        """Queue the job in the global thread pool."""
+        QThreadPool.globalInstance().start(self)
+
+    def cancel(self):
+        """Drop the job if still queued; otherwise stop streaming and discard its result."""
+        self._cancelled = True
+        QThreadPool.globalInstance().tryTake(self)
+
+    def run(self):
+        """Stream the batches, run the job and emit its result unless cancelled meanwhile."""
+        if self._cancelled:
+            return
+        try:
+            if self._batches is not None and not self._stream():
+                return
+            result = self._job() if self._job else None
+        except Exception as e:
+            logger.error(f"Background load failed: {str(e)}", exc_info=True)
+            if not self._cancelled:
+                self.signals.failed.emit(self.generation, str(e))
+            return
+        if not self._cancelled:
+            self.signals.finished.emit(self.generation, result)
+
+    def _stream(self) -> bool:
+        """Emit batch_ready for each batch; False if cancelled part way."""
+        total = self._count() if self._count else 0
+        done = 0
+        batches = self._batches()
+        try:
+            for rows in batches:
+                if self._cancelled:
+                    return False
+                done += len(rows)
+                self.signals.batch_ready.emit(self.generation, rows, done, max(total, done))
+        finally:
+            if hasattr(batches, 'close'):
+                batches.close()
+        return True
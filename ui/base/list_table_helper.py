@@ -27,6 +27,68 @@ from core.logger import get_logger
 logger = get_logger(__name__)
 
 
+def format_cell_value(value, config: dict) -> str:
+    """Format a cell value according to its column config (see ListTableHelper.populate)"""
+    if value is None:
+        return '-'
+    
+    value_type = config.get('type', 'text')
+    
+    # Use custom formatter if provided
+    if 'formatter' in config:
+        try:
+            return config['formatter'](value)
+        except Exception as e:
+            logger.warning(f"Error in custom formatter: {e}")
+            return str(value)
+    
+    # Type-specific formatting
+    if value_type == 'text':
+        return str(value)
+    elif value_type == 'number':
+        try:
+            return str(int(value)) if isinstance(value, (int, float)) else str(value)
+        except:
+            return str(value)
+    elif value_type == 'currency':
+        from core.core_utils import format_currency
+        try:
+            return format_currency(float(value))
+        except:
+            return '-'
+    elif value_type == 'status':
+        return str(value).upper()
+    elif value_type == 'date':
+        return str(value)
+    else:
+        return str(value)
+
+
+def cell_foreground(text: str, config: dict):
+    """Text color for a formatted cell, or None for the default color"""
+    color = None
+    value_type = config.get('type', 'text')
+    if value_type == 'status':
+        cell_text = text.lower()
+        if 'paid' in cell_text or 'complete' in cell_text:
+            color = '#10B981'  # Green
+        elif 'pending' in cell_text:
+            color = WARNING  # Orange
+        elif 'cancelled' in cell_text or 'failed' in cell_text:
+            color = DANGER  # Red
+    elif value_type == 'balance_type':
+        cell_text = text.upper()
+        if cell_text == 'DR':
+            color = WARNING
+        elif cell_text == 'CR':
+            color = DANGER
+    
+    # Custom color from config
+    if config.get('color'):
+        color = config['color']
+    return color
+
+
 class ListTableHelper:
     """Helper class for populating list tables with common patterns"""
     
@@ -143,39 +205,7 @@ class ListTableHelper:
     
     def _format_value(self, value, config: dict) -> str:
         """Format value based on type"""
-        if value is None:
-            return '-'
-        
-        value_type = config.get('type', 'text')
-        
-        # Use custom formatter if provided
-        if 'formatter' in config:
-            try:
-                return config['formatter'](value)
-            except Exception as e:
-                logger.warning(f"Error in custom formatter: {e}")
-                return str(value)
-        
-        # Type-specific formatting
-        if value_type == 'text':
-            return str(value)
-        elif value_type == 'number':
-            try:
-                return str(int(value)) if isinstance(value, (int, float)) else str(value)
-            except:
-                return str(value)
-        elif value_type == 'currency':
-            from core.core_utils import format_currency
-            try:
-                return format_currency(float(value))
-            except:
-                return '-'
-        elif value_type == 'status':
-            return str(value).upper()
-        elif value_type == 'date':
-            return str(value)
-        else:
-            return str(value)
+        return format_cell_value(value, config)
     
     def _configure_cell(self, cell: QTableWidgetItem, config: dict):
         """Configure cell appearance"""
@@ -189,26 +219,10 @@ class ListTableHelper:
         alignment = config.get('align', Qt.AlignLeft)
         cell.setTextAlignment(alignment | Qt.AlignVCenter)
         
-        # Color - for status-based coloring
-        value_type = config.get('type', 'text')
-        if value_type == 'status':
-            cell_text = cell.text().lower()
-            if 'paid' in cell_text or 'complete' in cell_text:
-                cell.setForeground(QColor('#10B981'))  # Green
-            elif 'pending' in cell_text:
-                cell.setForeground(QColor(WARNING))  # Orange
-            elif 'cancelled' in cell_text or 'failed' in cell_text:
-                cell.setForeground(QColor(DANGER))  # Red
-        elif value_type == 'balance_type':
-            cell_text = cell.text().upper()
-            if cell_text == 'DR':
-                cell.setForeground(QColor(WARNING))
-            elif cell_text == 'CR':
-                cell.setForeground(QColor(DANGER))
-        
-        # Custom color from config
-        if 'color' in config and config['color']:
-            cell.setForeground(QColor(config['color']))
+        # Color - status-based coloring or custom color from config
+        color = cell_foreground(cell.text(), config)
+        if color:
+            cell.setForeground(QColor(color))
     
     def create_action_buttons(self, actions: list) -> 'QWidget':
         """Create action buttons widget for table row - eliminates duplication across screens
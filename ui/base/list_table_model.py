@@ -0,0 +1,178 @@
+"""
+ListTableModel - Table model over list screen rows
+Model/view replacement for ListTableHelper.populate() on large lists
+
+Features:
+- Wraps the row list (dicts or compact core.db Row objects) without copying
+- Cells are formatted on demand, so only visible rows are ever touched
+- Same column configs as ListTableHelper (row_number, text, currency, ...)
+- Status and action columns are left to delegates (widgets.table_delegates)
+"""
+
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PySide6.QtGui import QColor
+
+from theme import TEXT_SECONDARY, get_normal_font, get_bold_font
+
+from core.logger import get_logger
+from ui.base.list_table_helper import format_cell_value, cell_foreground
+from widgets.table_delegates import PILL_COLORS_ROLE
+
+logger = get_logger(__name__)
+
+
+class ListTableModel(QAbstractTableModel):
+    """
+    Read-only table model for list screens.
+
+    Column configs use the ListTableHelper.populate() format, plus:
+        {'type': 'pill', 'key': 'status', 'default': 'Unpaid'}
+            raw value for a StatusPillDelegate
+        {'type': 'pill', 'display': callable(row), 'colors': callable(row)}
+            pill text and (text_color, bg_color) computed from the whole row
+        {'type': 'actions'}
+            empty cell for an ActionButtonsDelegate
+        'display': callable(row) -> str
+            on any text column, replaces key/formatter lookup
+
+    Example:
+        model = ListTableModel(headers, column_configs, self.ITEMS_PER_PAGE)
+        table = ListTableView(model)
+        model.populate(page_rows, current_page)
+        row = model.row_data(index.row())
+    """
+
+    def __init__(self, headers: list, column_configs: list, items_per_page: int = 49, parent=None):
+        """
+        Initialize model
+
+        Args:
+            headers: Column header labels
+            column_configs: Column configuration dicts (see ListTableHelper.populate)
+            items_per_page: Items per page (for row numbering across pages)
+            parent: Parent object
+        """
+        super().__init__(parent)
+        self._headers = list(headers)
+        self._configs = list(column_configs)
+        self.items_per_page = items_per_page
+        self._rows = []
+        self._first_row_number = 1
+
+        # Shared per model, not per cell
+        self._normal_font = get_normal_font()
+        self._bold_font = get_bold_font()
+        self._row_number_color = QColor(TEXT_SECONDARY)
+        self._colors = {}  # color string -> QColor
+
+    def populate(self, data: list, current_page: int = 1):
+        """
+        Show a new list of rows
+
+        Args:
+            data: Rows for the current page (kept by reference, not copied)
+            current_page: Current page number (for row numbering)
+        """
+        self.beginResetModel()
+        self._rows = data
+        self._first_row_number = (current_page - 1) * self.items_per_page + 1
+        self.endResetModel()
+        logger.debug(f"Table model holds {len(data)} rows, starting row: {self._first_row_number}")
+
+    def append(self, rows: list):
+        """
+        Add rows after the ones shown, e.g. a report arriving in batches
+
+        Args:
+            rows: Rows to add (the list given to populate() is extended)
+        """
+        if not rows:
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self._rows.extend(rows)
+        self.endInsertRows()
+
+    def row_data(self, row: int):
+        """Row object shown at a model row, or None if out of range."""
+        if 0 <= row < len(self._rows):
+            return self._rows[row]
+        return None
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # QAbstractTableModel interface
+    # ─────────────────────────────────────────────────────────────────────────
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._headers)
+
+    def headerData(self, section: int, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole and section < len(self._headers):
+            return self._headers[section]
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        item = self._rows[row]
+        config = self._configs[index.column()] if index.column() < len(self._configs) else {}
+        value_type = config.get('type', 'text')
+
+        if role == Qt.UserRole:
+            return item
+
+        if value_type == 'row_number':
+            if role == Qt.DisplayRole:
+                return str(self._first_row_number + row)
+            if role == Qt.TextAlignmentRole:
+                return int(Qt.AlignCenter)
+            if role == Qt.ForegroundRole:
+                return self._row_number_color
+            if role == Qt.FontRole:
+                return self._normal_font
+            return None
+
+        if value_type == 'actions':
+            return None
+
+        if value_type == 'pill':
+            if role == Qt.DisplayRole:
+                if 'display' in config:
+                    return config['display'](item)
+                return item.get(config.get('key')) or config.get('default', '')
+            if role == PILL_COLORS_ROLE and 'colors' in config:
+                return config['colors'](item)
+            return None
+
+        if role == Qt.DisplayRole:
+            return self._display_text(item, config)
+        if role == Qt.TextAlignmentRole:
+            return int(config.get('align', Qt.AlignLeft) | Qt.AlignVCenter)
+        if role == Qt.FontRole:
+            return self._bold_font if config.get('bold') else self._normal_font
+        if role == Qt.ForegroundRole and (config.get('color') or value_type in ('status', 'balance_type')):
+            color = cell_foreground(self._display_text(item, config), config)
+            return self._color(color) if color else None
+        return None
+
+    def _display_text(self, item, config: dict) -> str:
+        if 'display' in config:
+            return config['display'](item)
+        key = config.get('key')
+        value = item.get(key) if hasattr(item, 'get') else getattr(item, key, None)
+        return format_cell_value(value, config)
+
+    def _color(self, name: str) -> QColor:
+        color = self._colors.get(name)
+        if color is None:
+            color = self._colors[name] = QColor(name)
+        return color
@@ -11,20 +11,17 @@ from PySide6.QtCore import Qt, QTimer, QPropertyAnimation, QEasingCurve
 from PySide6.QtGui import QFont, QColor, QLinearGradient, QPainter, QBrush
 
 from ui.base.base_screen import BaseScreen
+from ui.base.list_load_worker import ListLoadWorker
 from widgets import CustomButton, CustomTable
 from theme import (
     SUCCESS, DANGER, PRIMARY, PURPLE, WHITE, TEXT_PRIMARY, TEXT_SECONDARY,
     BORDER, BACKGROUND, get_title_font, WARNING
 )
-from core.db.sqlite_db import db
-from datetime import datetime, timedelta
+from core.services.dashboard_service import dashboard_service
+from datetime import datetime
 
-# Import dialog classes for direct navigation
-from ui.invoices.sales.sales_invoice_form_dialog import InvoiceDialog
-from ui.products.product_form_dialog import ProductDialog  
-from ui.parties.party_form_dialog import PartyDialog
-from ui.payments.payment_form_dialog import SupplierPaymentDialog
-from ui.receipts.receipt_form_dialog import ReceiptDialog
+# Dialog classes for the quick actions are imported when first opened,
+# so they do not delay the dashboard's first paint
 
 
 class GradientFrame(QFrame):
@@ -128,21 +125,9 @@ class MetricCard(QFrame):
         text_layout.addWidget(self.val_label)
         
         # Trend indicator - uses card's accent color
-        if description:
-            trend_label = QLabel(description)
-            # Use green for positive trends, card color for others
-            if "↑" in description or "+" in description:
-                trend_color = "#10B981"  # Green for positive
-            else:
-                trend_color = color  # Use card's accent color
-            trend_label.setStyleSheet(f"""
-                color: {trend_color};
-                font-size: 11px;
-                font-weight: normal;
-                background: transparent;
-                border: none;
-            """)
-            text_layout.addWidget(trend_label)
+        self.trend_label = QLabel()
+        text_layout.addWidget(self.trend_label)
+        self.update_description(description)
         
         layout.addLayout(text_layout)
         layout.addStretch()
@@ -151,6 +136,23 @@ class MetricCard(QFrame):
         """Update the displayed value"""
         self.value = new_value
         self.val_label.setText(str(new_value))
+    
+    def update_description(self, description):
+        """Update the trend line under the value (hidden when empty)"""
+        # Use green for positive trends, card color for others
+        if "↑" in description or "+" in description:
+            trend_color = "#10B981"  # Green for positive
+        else:
+            trend_color = self.color  # Use card's accent color
+        self.trend_label.setText(description)
+        self.trend_label.setStyleSheet(f"""
+            color: {trend_color};
+            font-size: 11px;
+            font-weight: normal;
+            background: transparent;
+            border: none;
+        """)
+        self.trend_label.setVisible(bool(description))
 
 
 class QuickActionButton(QPushButton):
@@ -290,7 +292,13 @@ class DataCard(QFrame):
             }}
         """)
         
-        # Populate table with styled items
+        self.set_data(data)
+        
+        layout.addWidget(self.table)
+    
+    def set_data(self, data):
+        """Fill the table with rows of cell values, color-coding status cells"""
+        self.table.setRowCount(len(data))
         for row_idx, row_data in enumerate(data):
             for col_idx, cell_data in enumerate(row_data):
                 item = self.table.create_item(str(cell_data))
@@ -304,8 +312,6 @@ class DataCard(QFrame):
                 elif "Low" in str(cell_data):
                     item.setForeground(QColor(WARNING))
                 self.table.setItem(row_idx, col_idx, item)
-        
-        layout.addWidget(self.table)
     
     def _darken_color(self, hex_color):
         color = QColor(hex_color)
@@ -387,6 +393,10 @@ class WelcomeHeader(QFrame):
 class DashboardScreen(BaseScreen):
     def __init__(self):
         super().__init__("Dashboard")
+        # Figures come from dashboard_service, loaded in a worker on first show
+        self._data = None  # DashboardData currently displayed
+        self._load_generation = 0
+        self._load_worker = None
         self.setup_dashboard()
         
         # Auto-refresh timer
@@ -435,8 +445,8 @@ class DashboardScreen(BaseScreen):
         metrics_layout = QHBoxLayout()
         metrics_layout.setSpacing(20)
         
-        # Get real data from database
-        metrics_data = self._calculate_metrics()
+        # Placeholder figures until the first load finishes
+        metrics_data = self._format_metrics(None)
         
         # Create metric cards
         metrics = [
@@ -456,53 +466,17 @@ class DashboardScreen(BaseScreen):
         metrics_widget.setLayout(metrics_layout)
         parent_layout.addWidget(metrics_widget)
     
-    def _calculate_metrics(self):
-        """Calculate real metrics from database"""
-        try:
-            invoices = db.get_invoices()
-            payments = db.get_payments()
-            parties = db.get_parties()
-            products = db.get_products()
-            
-            # Today's date
-            today = datetime.now().strftime('%Y-%m-%d')
-            week_ago = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
-            
-            # Calculate sales today
-            sales_today = sum(
-                float(inv.get('grand_total', 0)) 
-                for inv in invoices 
-                if inv.get('date', '') == today
-            )
-            
-            # Calculate pending payments (invoices with Pending/Unpaid status)
-            pending = sum(
-                float(inv.get('grand_total', 0) or 0) 
-                for inv in invoices 
-                if (inv.get('status') or '').lower() in ['pending', 'unpaid']
-            )
-            
-            # New invoices this week
-            new_invoices = len([
-                inv for inv in invoices 
-                if inv.get('date', '') >= week_ago
-            ])
-            
-            # Count customers
-            customers = len([p for p in parties if (p.get('party_type') or '').lower() == 'customer'])
+    def _format_metrics(self, data):
+        """
+        Metric card texts for dashboard data
+        
+        Args:
+            data: DashboardData, or None for the empty-state texts
             
-            return {
-                'sales_today': f"₹{sales_today:,.0f}" if sales_today > 0 else "₹0",
-                'sales_trend': "↑ 12% from yesterday" if sales_today > 0 else "No sales yet",
-                'pending_payments': f"₹{pending:,.0f}" if pending > 0 else "₹0",
-                'total_invoices': str(len(invoices)),
-                'new_invoices': new_invoices,
-                'total_parties': str(len(parties)),
-                'customers': customers,
-                'total_products': len(products)
-            }
-        except Exception as e:
-            print(f"Error calculating metrics: {e}")
+        Returns:
+            Dict of card values and descriptions
+        """
+        if data is None:
             return {
                 'sales_today': "₹0",
                 'sales_trend': "Start your day!",
@@ -513,6 +487,18 @@ class DashboardScreen(BaseScreen):
                 'customers': 0,
                 'total_products': 0
             }
+        sales_today = data.sales_today
+        pending = data.pending_amount
+        return {
+            'sales_today': f"₹{sales_today:,.0f}" if sales_today > 0 else "₹0",
+            'sales_trend': "↑ 12% from yesterday" if sales_today > 0 else "No sales yet",
+            'pending_payments': f"₹{pending:,.0f}" if pending > 0 else "₹0",
+            'total_invoices': str(data.total_invoices),
+            'new_invoices': data.new_invoices,
+            'total_parties': str(data.total_parties),
+            'customers': data.customers,
+            'total_products': data.total_products
+        }
     
     def setup_actions(self, parent_layout):
         """Setup quick action buttons"""
@@ -540,11 +526,11 @@ class DashboardScreen(BaseScreen):
         tables_layout.setSpacing(20)
         
         # Left side: Recent Invoices (larger)
-        recent_invoices = DataCard(
+        self.recent_invoices_card = recent_invoices = DataCard(
             "Recent Invoices",
             "📋",
             ["Invoice #", "Date", "Party", "Amount", "Status"],
-            self.get_recent_invoices(),
+            [],
             view_callback=self.view_all_invoices
         )
         
@@ -553,20 +539,20 @@ class DashboardScreen(BaseScreen):
         right_layout.setSpacing(20)
         
         # Low Stock Items
-        low_stock = DataCard(
+        self.low_stock_card = low_stock = DataCard(
             "Low Stock Alert",
             "⚠️",
             ["Product", "Stock", "Min. Req", "Status"],
-            self.get_low_stock_items(),
+            [],
             view_callback=self.view_all_products
         )
         
         # Recent Payments
-        payments = DataCard(
+        self.payments_card = payments = DataCard(
             "Recent Payments",
             "💰",
             ["Party", "Amount", "Date", "Mode"],
-            self.get_payment_received(),
+            [],
             view_callback=self.view_all_payments
         )
         
@@ -584,28 +570,21 @@ class DashboardScreen(BaseScreen):
         tables_widget.setLayout(tables_layout)
         parent_layout.addWidget(tables_widget)
     
-    def get_recent_invoices(self):
-        """Get recent invoices from database"""
-        try:
-            invoices = db.get_invoices()
-            parties = {p['id']: p['name'] for p in db.get_parties()}
-            
-            result = []
-            for inv in invoices[:8]:
-                party_name = parties.get(inv.get('party_id'), 'N/A')
-                amount = f"₹{float(inv.get('grand_total', 0)):,.2f}"
-                status = inv.get('status', 'Unpaid')
-                result.append([
-                    inv.get('invoice_no', 'N/A'),
-                    inv.get('date', 'N/A'),
-                    party_name[:15] + '...' if len(party_name) > 15 else party_name,
-                    amount,
-                    status
-                ])
-            return result if result else self._sample_invoices()
-        except Exception as e:
-            print(f"Error fetching invoices: {e}")
-            return self._sample_invoices()
+    def _format_recent_invoices(self, invoices):
+        """Recent invoice rows for the invoices card"""
+        result = []
+        for inv in invoices:
+            party_name = inv.get('party_name') or 'N/A'
+            amount = f"₹{float(inv.get('grand_total') or 0):,.2f}"
+            status = inv.get('status') or 'Unpaid'
+            result.append([
+                inv.get('invoice_no') or 'N/A',
+                inv.get('date') or 'N/A',
+                party_name[:15] + '...' if len(party_name) > 15 else party_name,
+                amount,
+                status
+            ])
+        return result if result else self._sample_invoices()
     
     def _sample_invoices(self):
         """Sample invoice data when database is empty"""
@@ -615,30 +594,21 @@ class DashboardScreen(BaseScreen):
             ["INV-003", "2026-01-01", "DEF Inc", "₹4,250.00", "Paid"],
         ]
     
-    def get_low_stock_items(self):
-        """Get low stock items from database"""
-        try:
-            products = db.get_products()
-            low_stock = []
-            
-            for product in products:
-                current = float(product.get('opening_stock', 0))
-                min_req = float(product.get('low_stock', 10))
-                
-                if current <= min_req and min_req > 0:
-                    status = "Critical" if current < min_req / 2 else "Low"
-                    name = product.get('name', 'Unknown')
-                    low_stock.append([
-                        name[:18] + '...' if len(name) > 18 else name,
-                        str(int(current)),
-                        str(int(min_req)),
-                        status
-                    ])
-            
-            return low_stock[:5] if low_stock else self._sample_low_stock()
-        except Exception as e:
-            print(f"Error fetching low stock: {e}")
-            return self._sample_low_stock()
+    def _format_low_stock(self, products):
+        """Low stock rows for the stock alert card"""
+        low_stock = []
+        for product in products:
+            current = float(product.get('stock') or 0)
+            min_req = float(product.get('low_stock') or 0)
+            status = "Critical" if current < min_req / 2 else "Low"
+            name = product.get('name') or 'Unknown'
+            low_stock.append([
+                name[:18] + '...' if len(name) > 18 else name,
+                str(int(current)),
+                str(int(min_req)),
+                status
+            ])
+        return low_stock if low_stock else self._sample_low_stock()
     
     def _sample_low_stock(self):
         """Sample low stock data"""
@@ -648,28 +618,21 @@ class DashboardScreen(BaseScreen):
             ["Sample Product C", "3", "12", "Low"],
         ]
     
-    def get_payment_received(self):
-        """Get recent payments from database"""
-        try:
-            payments = db.get_payments()
-            result = []
-            
-            for pay in payments[:5]:
-                party = pay.get('party_name', 'N/A')
-                amount = f"₹{float(pay.get('amount', 0)):,.2f}"
-                date = pay.get('date', 'N/A')
-                mode = pay.get('mode', 'Cash')
-                result.append([
-                    party[:12] + '...' if len(party) > 12 else party,
-                    amount,
-                    date,
-                    mode
-                ])
-            
-            return result if result else self._sample_payments()
-        except Exception as e:
-            print(f"Error fetching payments: {e}")
-            return self._sample_payments()
+    def _format_payments(self, payments):
+        """Recent receipt rows for the payments card"""
+        result = []
+        for pay in payments:
+            party = pay.get('party_name') or 'N/A'
+            amount = f"₹{float(pay.get('amount') or 0):,.2f}"
+            date = pay.get('date') or 'N/A'
+            mode = pay.get('mode') or 'Cash'
+            result.append([
+                party[:12] + '...' if len(party) > 12 else party,
+                amount,
+                date,
+                mode
+            ])
+        return result if result else self._sample_payments()
     
     def _sample_payments(self):
         """Sample payment data"""
@@ -679,25 +642,84 @@ class DashboardScreen(BaseScreen):
             ["DEF Inc", "₹7,200.00", "2026-01-01", "Cash"],
         ]
     
+    # ─────────────────────────────────────────────────────────────────────────
+    # Data Loading
+    # ─────────────────────────────────────────────────────────────────────────
+    
     def refresh_data(self):
-        """Refresh all dashboard data"""
+        """Show current dashboard data, loading it in a worker when it changed"""
         try:
-            # Recalculate metrics
-            metrics_data = self._calculate_metrics()
-            
-            # Update metric cards if they exist
+            cached = dashboard_service.get_cached_data()
+        except Exception as e:
+            print(f"Error refreshing dashboard: {e}")
+            return
+        if cached is not None:
+            self._apply_data(cached)
+            return
+        
+        # Supersede a load that is still running: it may predate the change
+        if self._load_worker is not None:
+            self._load_worker.cancel()
+        self._load_generation += 1
+        worker = ListLoadWorker(self._load_generation, dashboard_service.get_dashboard_data)
+        worker.signals.finished.connect(self._on_load_finished)
+        worker.signals.failed.connect(self._on_load_failed)
+        self._load_worker = worker
+        worker.start()
+    
+    def _on_load_finished(self, generation, data):
+        """Show data from the worker unless a newer load superseded it"""
+        if generation != self._load_generation:
+            return
+        self._load_worker = None
+        self._apply_data(data)
+    
+    def _on_load_failed(self, generation, message):
+        if generation != self._load_generation:
+            return
+        self._load_worker = None
+        print(f"Error refreshing dashboard: {message}")
+    
+    def _apply_data(self, data):
+        """Update the cards whose figures differ from the ones shown"""
+        if data is self._data:
+            return
+        previous, self._data = self._data, data
+        
+        if previous is None or self._metrics_changed(previous, data):
+            metrics_data = self._format_metrics(data)
             if hasattr(self, 'metric_cards') and len(self.metric_cards) >= 4:
                 self.metric_cards[0].update_value(metrics_data['sales_today'])
+                self.metric_cards[0].update_description(metrics_data['sales_trend'])
                 self.metric_cards[1].update_value(metrics_data['pending_payments'])
                 self.metric_cards[2].update_value(metrics_data['total_invoices'])
+                self.metric_cards[2].update_description(f"+{metrics_data['new_invoices']} this week")
                 self.metric_cards[3].update_value(metrics_data['total_parties'])
-        except Exception as e:
-            print(f"Error refreshing dashboard: {e}")
+                self.metric_cards[3].update_description(f"{metrics_data['customers']} customers")
+        
+        # Refill only the tables whose rows changed
+        if previous is None or previous.recent_invoices != data.recent_invoices:
+            self.recent_invoices_card.set_data(self._format_recent_invoices(data.recent_invoices))
+        if previous is None or previous.low_stock != data.low_stock:
+            self.low_stock_card.set_data(self._format_low_stock(data.low_stock))
+        if previous is None or previous.recent_receipts != data.recent_receipts:
+            self.payments_card.set_data(self._format_payments(data.recent_receipts))
+    
+    @staticmethod
+    def _metrics_changed(previous, data):
+        return (
+            previous.sales_today, previous.pending_amount, previous.total_invoices,
+            previous.new_invoices, previous.total_parties, previous.customers
+        ) != (
+            data.sales_today, data.pending_amount, data.total_invoices,
+            data.new_invoices, data.total_parties, data.customers
+        )
     
     # Action button callbacks - opening actual dialogs
     def new_invoice(self):
         """Open new invoice dialog"""
         try:
+            from ui.invoices.sales.sales_invoice_form_dialog import InvoiceDialog
             dialog = InvoiceDialog(self)
             if dialog.exec() == QDialog.Accepted:
                 self.refresh_data()
@@ -710,6 +732,7 @@ class DashboardScreen(BaseScreen):
     def add_product(self):
         """Open add product dialog"""
         try:
+            from ui.products.product_form_dialog import ProductDialog
             dialog = ProductDialog(self)
             if dialog.exec() == QDialog.Accepted:
                 self.refresh_data()
@@ -722,6 +745,7 @@ class DashboardScreen(BaseScreen):
     def add_party(self):
         """Open add party dialog"""
         try:
+            from ui.parties.party_form_dialog import PartyDialog
             dialog = PartyDialog(self)
             if dialog.exec() == QDialog.Accepted:
                 self.refresh_data()
@@ -734,6 +758,7 @@ class DashboardScreen(BaseScreen):
     def record_payment(self):
         """Open record payment dialog"""
         try:
+            from ui.payments.payment_form_dialog import SupplierPaymentDialog
             dialog = SupplierPaymentDialog(self)
             if dialog.exec() == QDialog.Accepted:
                 self.refresh_data()
@@ -213,17 +213,13 @@ class PurchaseInvoiceDialogInner(InvoiceDialog):
     
     def save_invoice(self, final=False):
         """Save purchase invoice to separate purchase_invoices table"""
-        print("DEBUG: save_invoice called")
         try:
             # Validate required fields
             if not self.validate_invoice():
-                print("DEBUG: validate_invoice returned False")
                 return
             
-            print("DEBUG: validation passed")
             # Get supplier
             party_name = self.party_search.text().strip() if hasattr(self, 'party_search') else ''
-            print(f"DEBUG: party_name = '{party_name}'")
             supplier_id = None
             if party_name:
                 for party in self.parties:
@@ -231,7 +227,6 @@ class PurchaseInvoiceDialogInner(InvoiceDialog):
                         supplier_id = party['id']
                         break
             
-            print(f"DEBUG: supplier_id = {supplier_id}")
             if not supplier_id:
                 QMessageBox.warning(self, "Validation Error", "Please select a valid supplier.")
                 return
@@ -262,71 +257,44 @@ class PurchaseInvoiceDialogInner(InvoiceDialog):
             if self.invoice_data and self.invoice_data.get('invoice', {}).get('id'):
                 purchase_id = self.invoice_data['invoice']['id']
                 
-                # Update existing purchase invoice in purchase_invoices table
-                db.update_purchase_invoice({
-                    'id': purchase_id,
-                    'invoice_no': invoice_no,
-                    'date': invoice_date,
-                    'supplier_id': supplier_id,
-                    'grand_total': grand_total,
-                    'status': status,
-                    'type': invoice_type
-                })
+                with db.transaction():
+                    # Update existing purchase invoice in purchase_invoices table
+                    db.update_purchase_invoice({
+                        'id': purchase_id,
+                        'invoice_no': invoice_no,
+                        'date': invoice_date,
+                        'supplier_id': supplier_id,
+                        'grand_total': grand_total,
+                        'status': status,
+                        'type': invoice_type
+                    })
                 
-                # Delete old items and add new ones
-                db.delete_purchase_invoice_items(purchase_id)
-                for item in items:
-                    db.add_purchase_invoice_item(
-                        purchase_invoice_id=purchase_id,
-                        product_id=item['product_id'],
-                        product_name=item['product_name'],
-                        hsn_code=item.get('hsn_no', ''),
-                        quantity=item['quantity'],
-                        unit=item.get('unit', 'Piece'),
-                        rate=item['rate'],
-                        discount_percent=item['discount_percent'],
-                        discount_amount=item['discount_amount'],
-                        tax_percent=item['tax_percent'],
-                        tax_amount=item['tax_amount'],
-                        amount=item['amount']
-                    )
+                    # Delete old items and add new ones
+                    previous_items = db.get_purchase_invoice_items(purchase_id)
+                    db.delete_purchase_invoice_items(purchase_id)
+                    db.add_purchase_invoice_items(purchase_id, items)
                 
-                # Update stock for purchase items (only for products with track_stock enabled)
-                db.update_stock_for_purchase_items(items)
+                    # Update stock by the change from the old items (only for products with track_stock enabled)
+                    db.update_stock_for_purchase_items(items, previous_items)
                 
                 QMessageBox.information(self, "Success", f"Purchase invoice {invoice_no} updated successfully!")
             else:
-                # Create new purchase invoice in purchase_invoices table
-                print(f"DEBUG: Saving new purchase invoice: {invoice_no}, supplier_id: {supplier_id}, grand_total: {grand_total}")
-                purchase_id = db.add_purchase_invoice(
-                    invoice_no=invoice_no,
-                    date=invoice_date,
-                    supplier_id=supplier_id,
-                    invoice_type=invoice_type,
-                    grand_total=grand_total,
-                    status=status
-                )
-                print(f"DEBUG: Purchase invoice saved with ID: {purchase_id}")
-                
-                # Add purchase invoice items to purchase_invoice_items table
-                for item in items:
-                    db.add_purchase_invoice_item(
-                        purchase_invoice_id=purchase_id,
-                        product_id=item['product_id'],
-                        product_name=item['product_name'],
-                        hsn_code=item.get('hsn_no', ''),
-                        quantity=item['quantity'],
-                        unit=item.get('unit', 'Piece'),
-                        rate=item['rate'],
-                        discount_percent=item['discount_percent'],
-                        discount_amount=item['discount_amount'],
-                        tax_percent=item['tax_percent'],
-                        tax_amount=item['tax_amount'],
-                        amount=item['amount']
+                with db.transaction():
+                    # Create new purchase invoice in purchase_invoices table
+                    purchase_id = db.add_purchase_invoice(
+                        invoice_no=invoice_no,
+                        date=invoice_date,
+                        supplier_id=supplier_id,
+                        invoice_type=invoice_type,
+                        grand_total=grand_total,
+                        status=status
                     )
                 
-                # Update stock for purchase items (only for products with track_stock enabled)
-                db.update_stock_for_purchase_items(items)
+                    # Add purchase invoice items to purchase_invoice_items table
+                    db.add_purchase_invoice_items(purchase_id, items)
+                
+                    # Update stock for purchase items (only for products with track_stock enabled)
+                    db.update_stock_for_purchase_items(items)
                 
                 QMessageBox.information(self, "Success", f"Purchase invoice {invoice_no} saved successfully!")
             
@@ -386,68 +354,43 @@ class PurchaseInvoiceDialogInner(InvoiceDialog):
             if self.invoice_data and self.invoice_data.get('invoice', {}).get('id'):
                 purchase_id = self.invoice_data['invoice']['id']
                 
-                # Update existing purchase invoice
-                db.update_purchase_invoice({
-                    'id': purchase_id,
-                    'invoice_no': invoice_no,
-                    'date': invoice_date,
-                    'supplier_id': supplier_id,
-                    'grand_total': grand_total,
-                    'status': status,
-                    'type': invoice_type
-                })
+                with db.transaction():
+                    # Update existing purchase invoice
+                    db.update_purchase_invoice({
+                        'id': purchase_id,
+                        'invoice_no': invoice_no,
+                        'date': invoice_date,
+                        'supplier_id': supplier_id,
+                        'grand_total': grand_total,
+                        'status': status,
+                        'type': invoice_type
+                    })
                 
-                # Delete old items and add new ones
-                db.delete_purchase_invoice_items(purchase_id)
-                for item in items:
-                    db.add_purchase_invoice_item(
-                        purchase_invoice_id=purchase_id,
-                        product_id=item['product_id'],
-                        product_name=item['product_name'],
-                        hsn_code=item.get('hsn_no', ''),
-                        quantity=item['quantity'],
-                        unit=item.get('unit', 'Piece'),
-                        rate=item['rate'],
-                        discount_percent=item['discount_percent'],
-                        discount_amount=item['discount_amount'],
-                        tax_percent=item['tax_percent'],
-                        tax_amount=item['tax_amount'],
-                        amount=item['amount']
-                    )
+                    # Delete old items and add new ones
+                    previous_items = db.get_purchase_invoice_items(purchase_id)
+                    db.delete_purchase_invoice_items(purchase_id)
+                    db.add_purchase_invoice_items(purchase_id, items)
                 
-                # Update stock
-                db.update_stock_for_purchase_items(items)
+                    # Update stock by the change from the old items
+                    db.update_stock_for_purchase_items(items, previous_items)
                 
             else:
-                # Create new purchase invoice
-                purchase_id = db.add_purchase_invoice(
-                    invoice_no=invoice_no,
-                    date=invoice_date,
-                    supplier_id=supplier_id,
-                    invoice_type=invoice_type,
-                    grand_total=grand_total,
-                    status=status
-                )
-                
-                # Add purchase invoice items
-                for item in items:
-                    db.add_purchase_invoice_item(
-                        purchase_invoice_id=purchase_id,
-                        product_id=item['product_id'],
-                        product_name=item['product_name'],
-                        hsn_code=item.get('hsn_no', ''),
-                        quantity=item['quantity'],
-                        unit=item.get('unit', 'Piece'),
-                        rate=item['rate'],
-                        discount_percent=item['discount_percent'],
-                        discount_amount=item['discount_amount'],
-                        tax_percent=item['tax_percent'],
-                        tax_amount=item['tax_amount'],
-                        amount=item['amount']
+                with db.transaction():
+                    # Create new purchase invoice
+                    purchase_id = db.add_purchase_invoice(
+                        invoice_no=invoice_no,
+                        date=invoice_date,
+                        supplier_id=supplier_id,
+                        invoice_type=invoice_type,
+                        grand_total=grand_total,
+                        status=status
                     )
                 
-                # Update stock
-                db.update_stock_for_purchase_items(items)
+                    # Add purchase invoice items
+                    db.add_purchase_invoice_items(purchase_id, items)
+                
+                    # Update stock
+                    db.update_stock_for_purchase_items(items)
             
             # Show print preview
             try:
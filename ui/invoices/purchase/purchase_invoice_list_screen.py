@@ -5,8 +5,8 @@ UI layer - handles layout, signals/slots, and user interactions only.
 Architecture: UI → Controller → Service → DB
 """
 
-from PySide6.QtWidgets import QWidget, QDialog, QTableWidgetItem
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtWidgets import QWidget, QDialog
+from PySide6.QtCore import Qt, Signal, QModelIndex
 
 # Theme imports
 from theme import (
@@ -15,8 +15,8 @@ from theme import (
 )
 
 # Widget imports
-from widgets import StatCard, ListTable, TableFrame, StatsContainer, FilterWidget
-from ui.base.list_table_helper import ListTableHelper
+from widgets import StatCard, ListTableView, TableFrame, StatsContainer, FilterWidget, StatusPillDelegate, ActionButtonsDelegate
+from ui.base.list_table_model import ListTableModel
 
 # Controller import (NOT service or db directly)
 from controllers.purchase_controller import purchase_controller
@@ -32,6 +32,14 @@ from ui.invoices.purchase.purchase_invoice_form_dialog import PurchaseInvoiceDia
 
 logger = get_logger(__name__)
 
+# Status pill colors for purchases
+PURCHASE_STATUS_COLORS = {
+    'Paid': (SUCCESS, SUCCESS_LIGHT),
+    'Unpaid': (WARNING, WARNING_LIGHT),
+    'Partially Paid': (PRIMARY, PRIMARY_LIGHT),
+    'Cancelled': (DANGER, DANGER_LIGHT),
+}
+
 
 class PurchasesScreen(BaseListScreen):
     """
@@ -48,6 +56,9 @@ class PurchasesScreen(BaseListScreen):
     # Signal emitted when purchase data changes
     purchase_updated = Signal()
     
+    # Reload only after writes to these tables
+    DATA_TABLES = ('purchase_invoices', 'parties')
+    
     def __init__(self, parent=None):
         super().__init__(title="Purchase Invoices", parent=parent)
         self.setObjectName("PurchasesScreen")
@@ -139,13 +150,29 @@ class PurchasesScreen(BaseListScreen):
         """Create the purchases table."""
         frame = TableFrame()
         
-        # Create table using common widget
-        self._table = ListTable(headers=[
-            "#", "Invoice No.", "Date", "Supplier", "Amount", "Status", "Actions"
-        ])
+        # Define column configurations - status pill and action buttons are painted by delegates
+        self._column_configs = [
+            {'type': 'row_number'},
+            {'key': 'invoice_no', 'type': 'text', 'bold': True, 'color': PURCHASE_PRIMARY,
+             'formatter': lambda v: v if v else f"PUR-000"},
+            {'key': 'date', 'type': 'date', 'formatter': lambda v: str(v) if v else ''},
+            {'key': 'party_name', 'type': 'text', 'formatter': lambda v: v or 'Unknown Supplier'},
+            {'key': 'grand_total', 'type': 'currency', 'bold': True, 'align': Qt.AlignRight},
+            {'type': 'pill', 'key': 'status', 'default': 'Unpaid'},
+            {'type': 'actions'},
+        ]
+        
+        # Create model-based table: cells are formatted on demand, no widgets per row
+        self._table_model = ListTableModel(
+            headers=["#", "Invoice No.", "Date", "Supplier", "Amount", "Status", "Actions"],
+            column_configs=self._column_configs,
+            items_per_page=self.ITEMS_PER_PAGE,
+            parent=self
+        )
+        self._table = ListTableView(self._table_model)
         
         # Enable double-click to view
-        self._table.itemDoubleClicked.connect(self._on_row_double_clicked)
+        self._table.doubleClicked.connect(self._on_row_double_clicked)
         
         # Column configuration
         self._table.configure_columns([
@@ -158,18 +185,16 @@ class PurchasesScreen(BaseListScreen):
             {"width": 150, "resize": "fixed"},    # Actions
         ])
         
-        # Initialize ListTableHelper for populating the table
-        self._table_helper = ListTableHelper(self._table, self.ITEMS_PER_PAGE)
-        
-        # Define column configurations for table population (columns 0-4 only, 5-6 are custom)
-        self._column_configs = [
-            {'type': 'row_number'},
-            {'key': 'invoice_no', 'type': 'text', 'bold': True, 'color': PURCHASE_PRIMARY,
-             'formatter': lambda v: v if v else f"PUR-000"},
-            {'key': 'date', 'type': 'date', 'formatter': lambda v: str(v) if v else ''},
-            {'key': 'party_name', 'type': 'text', 'formatter': lambda v: v or 'Unknown Supplier'},
-            {'key': 'grand_total', 'type': 'currency', 'bold': True, 'align': Qt.AlignRight},
-        ]
+        # Column 5: status pill, column 6: action buttons
+        self._table.setItemDelegateForColumn(5, StatusPillDelegate(PURCHASE_STATUS_COLORS, parent=self._table))
+        self._actions_delegate = ActionButtonsDelegate([
+            {'name': 'view', 'text': 'View', 'tooltip': 'View Purchase', 'bg_color': WARNING_LIGHT,
+             'hover_color': PURCHASE_PRIMARY, 'size': (60, 32)},
+            {'name': 'delete', 'text': 'Del', 'tooltip': 'Delete Purchase', 'bg_color': DANGER_LIGHT,
+             'hover_color': DANGER, 'size': (50, 32)},
+        ], self._table)
+        self._actions_delegate.action_clicked.connect(self._on_row_action)
+        self._table.setItemDelegateForColumn(6, self._actions_delegate)
         
         frame.set_table(self._table)
         return frame
@@ -195,18 +220,27 @@ class PurchasesScreen(BaseListScreen):
         Returns:
             Filtered list of purchases
         """
-        search_text = self.get_safe_filter_value(
-            self._filter_widget.get_search_text() if hasattr(self, '_filter_widget') else ""
-        )
-        status_filter = self._status_combo.currentData() if hasattr(self, '_status_combo') else "All"
-        period_filter = self._period_combo.currentData() if hasattr(self, '_period_combo') else "All Time"
-        amount_filter = self._amount_combo.currentData() if hasattr(self, '_amount_combo') else "All Amounts"
-        supplier_filter = self._supplier_combo.currentData() if hasattr(self, '_supplier_combo') else "All Suppliers"
+        return self._apply_filters(all_data, **self._filter_state())
+    
+    def _filter_state(self) -> dict:
+        """Read the current filter values (GUI thread).
         
-        # Update supplier filter with available suppliers
+        Returns:
+            Keyword arguments for _apply_filters()
+        """
+        return {
+            'search_text': self.get_safe_filter_value(
+                self._filter_widget.get_search_text() if hasattr(self, '_filter_widget') else ""
+            ),
+            'status_filter': self._status_combo.currentData() if hasattr(self, '_status_combo') else "All",
+            'period_filter': self._period_combo.currentData() if hasattr(self, '_period_combo') else "All Time",
+            'amount_filter': self._amount_combo.currentData() if hasattr(self, '_amount_combo') else "All Amounts",
+            'supplier_filter': self._supplier_combo.currentData() if hasattr(self, '_supplier_combo') else "All Suppliers",
+        }
+    
+    def _on_data_fetched(self, all_data: list):
+        """Update supplier filter with available suppliers."""
         self._update_supplier_filter()
-        
-        return self._apply_filters(all_data, search_text, status_filter, period_filter, amount_filter, supplier_filter)
     
     def _apply_filters(self, purchases: list, search_text: str, status_filter: str, 
                        period_filter: str, amount_filter: str, supplier_filter: str) -> list:
@@ -264,7 +298,7 @@ class PurchasesScreen(BaseListScreen):
         self._supplier_combo.blockSignals(False)
     
     def _populate_table(self, purchases: list):
-        """Populate table with purchase data using ListTableHelper.
+        """Show purchase data in the table model.
         
         Args:
             purchases: List of purchases for current page
@@ -272,45 +306,25 @@ class PurchasesScreen(BaseListScreen):
         # Get current page from pagination widget
         current_page = self.pagination_widget.get_current_page() if self.pagination_widget else 1
         
-        logger.debug(f"Populating table with {len(purchases)} purchases using ListTableHelper")
+        logger.debug(f"Populating table with {len(purchases)} purchases")
+        self._table_model.populate(purchases, current_page)
+    
+    def _on_row_action(self, action: str, row: int):
+        """Dispatch a click on a row's action button.
         
-        # Use ListTableHelper to populate basic columns (0-4)
-        self._table_helper.populate(
-            data=purchases,
-            column_configs=self._column_configs,
-            current_page=current_page
-        )
+        Args:
+            action: Action name from the actions delegate
+            row: Table row that was clicked
+        """
+        purchase = self._table_model.row_data(row)
+        if purchase is None:
+            return
         
-        # Custom status color map for purchases
-        purchase_status_colors = {
-            'Paid': (SUCCESS, SUCCESS_LIGHT),
-            'Unpaid': (WARNING, WARNING_LIGHT),
-            'Partially Paid': (PRIMARY, PRIMARY_LIGHT),
-            'Cancelled': (DANGER, DANGER_LIGHT),
+        handlers = {
+            'view': self._on_view_clicked,
+            'delete': self._on_delete_clicked,
         }
-        
-        # Add custom widgets for status (col 5) and action buttons (col 6)
-        for row in range(self._table.rowCount()):
-            purchase = purchases[row] if row < len(purchases) else None
-            if purchase:
-                # Column 5: Status badge using helper
-                status = purchase.get('status', 'Unpaid')
-                status_widget = self._table_helper.create_status_badge(status, purchase_status_colors)
-                self._table.setCellWidget(row, 5, status_widget)
-                
-                # Column 6: Action buttons using helper
-                actions = [
-                    {'text': 'View', 'tooltip': 'View Purchase', 'bg_color': WARNING_LIGHT, 
-                     'hover_color': PURCHASE_PRIMARY, 'size': (60, 32),
-                     'callback': lambda checked, pur=purchase: self._on_view_clicked(pur)},
-                    {'text': 'Del', 'tooltip': 'Delete Purchase', 'bg_color': DANGER_LIGHT, 
-                     'hover_color': DANGER, 'size': (50, 32),
-                     'callback': lambda checked, pur=purchase: self._on_delete_clicked(pur)},
-                ]
-                actions_widget = self._table_helper.create_action_buttons(actions)
-                self._table.setCellWidget(row, 6, actions_widget)
-        
-        logger.debug(f"Table populated with {self._table.rowCount()} rows")
+        handlers[action](purchase)
     
     # ─────────────────────────────────────────────────────────────────────────
     # Event Handlers (Screen-specific)
@@ -323,9 +337,9 @@ class PurchasesScreen(BaseListScreen):
             self._load_data()
             self.purchase_updated.emit()
 
-    def _on_row_double_clicked(self, item: QTableWidgetItem):
+    def _on_row_double_clicked(self, index: QModelIndex):
         """Handle double-click on table row."""
-        row = item.row()
+        row = index.row()
         # Calculate actual index in filtered data based on current page
         current_page = self.pagination_widget.get_current_page() if self.pagination_widget else 1
         actual_idx = (current_page - 1) * self.ITEMS_PER_PAGE + row
@@ -1285,6 +1285,8 @@ class InvoiceDialog(QDialog):
             )
             
             if success:
+                # The number series may have moved a new invoice to the next free number
+                self.invoice_number.setText(invoice_data_dict['invoice_no'])
                 return invoice_id
             else:
                 QMessageBox.critical(self, "Save Error", message)
@@ -4721,6 +4723,7 @@ class InvoiceDialog(QDialog):
         )
         
         if success:
+            self.invoice_number.setText(invoice_data_dict['invoice_no'])
             highlight_success(self.invoice_number)
             QMessageBox.information(self, "Success", f"✅ {message}")
             self.accept()
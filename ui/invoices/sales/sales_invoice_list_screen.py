@@ -5,15 +5,15 @@ UI layer - handles layout, signals/slots, and user interactions only.
 Architecture: UI → Controller → Service → DB
 """
 
-from PySide6.QtWidgets import QWidget, QDialog, QTableWidgetItem
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtWidgets import QWidget, QDialog
+from PySide6.QtCore import Qt, Signal, QModelIndex
 
 # Theme imports
 from theme import PRIMARY, SUCCESS, DANGER, WARNING, WARNING_LIGHT, SUCCESS_LIGHT, DANGER_LIGHT, PRIMARY_LIGHT
 
 # Widget imports
-from widgets import StatCard, ListTable, TableFrame, TableActionButton, ListHeader, StatsContainer, FilterWidget
-from ui.base.list_table_helper import ListTableHelper
+from widgets import StatCard, ListTableView, TableFrame, ListHeader, StatsContainer, FilterWidget, StatusPillDelegate, ActionButtonsDelegate
+from ui.base.list_table_model import ListTableModel
 
 # Controller import (NOT service or db directly)
 from controllers.invoice_controller import invoice_controller
@@ -29,6 +29,15 @@ from ui.invoices.sales.sales_invoice_form_dialog import InvoiceDialog
 
 logger = get_logger(__name__)
 
+# Status pill colors for invoices
+INVOICE_STATUS_COLORS = {
+    'Paid': (SUCCESS, SUCCESS_LIGHT),
+    'Unpaid': (WARNING, WARNING_LIGHT),
+    'Partially Paid': (PRIMARY, PRIMARY_LIGHT),
+    'Overdue': (DANGER, DANGER_LIGHT),
+    'Cancelled': (DANGER, DANGER_LIGHT),
+}
+
 
 class InvoicesScreen(BaseListScreen):
     """
@@ -45,6 +54,15 @@ class InvoicesScreen(BaseListScreen):
     # Signal emitted when invoice data changes
     invoice_updated = Signal()
     
+    # Filter and page in SQL - only the visible page is loaded
+    PAGED_FETCH = True
+    
+    # Reload only after writes to these tables
+    DATA_TABLES = ('invoices', 'parties')
+    
+    # Scroll the table model instead of paging
+    ITEMS_PER_PAGE = BaseListScreen.MODEL_PAGE_SIZE
+    
     def __init__(self, parent=None):
         super().__init__(title="Sales Invoices", parent=parent)
         self.setObjectName("InvoicesScreen")
@@ -137,13 +155,29 @@ class InvoicesScreen(BaseListScreen):
         """Create the invoices table."""
         frame = TableFrame()
         
-        # Create table using common widget
-        self._table = ListTable(headers=[
-            "#", "Invoice No.", "Date", "Party", "Amount", "Status", "Actions"
-        ])
+        # Define column configurations - status pill and action buttons are painted by delegates
+        self._column_configs = [
+            {'type': 'row_number'},
+            {'key': 'invoice_no', 'type': 'text', 'bold': True, 'color': PRIMARY,
+             'formatter': lambda v: v if v else f"INV-000"},
+            {'key': 'date', 'type': 'date', 'formatter': lambda v: str(v) if v else ''},
+            {'key': 'party_name', 'type': 'text', 'formatter': lambda v: v or 'Unknown'},
+            {'key': 'grand_total', 'type': 'currency', 'bold': True, 'align': Qt.AlignRight},
+            {'type': 'pill', 'key': 'status', 'default': 'Unpaid'},
+            {'type': 'actions'},
+        ]
+        
+        # Create model-based table: cells are formatted on demand, no widgets per row
+        self._table_model = ListTableModel(
+            headers=["#", "Invoice No.", "Date", "Party", "Amount", "Status", "Actions"],
+            column_configs=self._column_configs,
+            items_per_page=self.ITEMS_PER_PAGE,
+            parent=self
+        )
+        self._table = ListTableView(self._table_model)
         
         # Enable double-click to view
-        self._table.itemDoubleClicked.connect(self._on_row_double_clicked)
+        self._table.doubleClicked.connect(self._on_row_double_clicked)
         
         # Column configuration
         self._table.configure_columns([
@@ -156,18 +190,16 @@ class InvoicesScreen(BaseListScreen):
             {"width": 150, "resize": "fixed"},    # Actions
         ])
         
-        # Initialize ListTableHelper for populating the table
-        self._table_helper = ListTableHelper(self._table, self.ITEMS_PER_PAGE)
-        
-        # Define column configurations for table population (columns 0-4 only, 5-6 are custom)
-        self._column_configs = [
-            {'type': 'row_number'},
-            {'key': 'invoice_no', 'type': 'text', 'bold': True, 'color': PRIMARY,
-             'formatter': lambda v: v if v else f"INV-000"},
-            {'key': 'date', 'type': 'date', 'formatter': lambda v: str(v) if v else ''},
-            {'key': 'party_name', 'type': 'text', 'formatter': lambda v: v or 'Unknown'},
-            {'key': 'grand_total', 'type': 'currency', 'bold': True, 'align': Qt.AlignRight},
-        ]
+        # Column 5: status pill, column 6: action buttons
+        self._table.setItemDelegateForColumn(5, StatusPillDelegate(INVOICE_STATUS_COLORS, parent=self._table))
+        self._actions_delegate = ActionButtonsDelegate([
+            {'name': 'view', 'text': 'View', 'tooltip': 'View Invoice', 'bg_color': PRIMARY_LIGHT,
+             'hover_color': PRIMARY, 'size': (60, 32)},
+            {'name': 'delete', 'text': 'Del', 'tooltip': 'Delete Invoice', 'bg_color': DANGER_LIGHT,
+             'hover_color': DANGER, 'size': (50, 32)},
+        ], self._table)
+        self._actions_delegate.action_clicked.connect(self._on_row_action)
+        self._table.setItemDelegateForColumn(6, self._actions_delegate)
         
         frame.set_table(self._table)
         return frame
@@ -176,77 +208,81 @@ class InvoicesScreen(BaseListScreen):
     # Data Methods (required by BaseListScreen)
     # ─────────────────────────────────────────────────────────────────────────
 
-    def _fetch_all_data(self) -> list:
-        """Fetch all invoices from controller.
+    def _fetch_page(self, offset: int, limit: int, filters: dict = None) -> tuple:
+        """Fetch one page of filtered invoices from controller.
         
+        Args:
+            offset: Rows to skip
+            limit: Page size
+            filters: Values from _filter_state(); read from the widgets when None
+            
         Returns:
-            List of all invoice records
+            Tuple of (invoices for the page, total matching invoices)
         """
-        return self._controller.get_all_invoices()
+        if filters is None:
+            filters = self._filter_state()
+        
+        return self._controller.get_invoice_page(limit=limit, offset=offset, **filters)
     
-    def filter_data(self, all_data: list) -> list:
-        """Apply filters to invoices list
+    def _filter_state(self) -> dict:
+        """Read the current filter values (GUI thread).
         
-        Args:
-            all_data: List of all invoices
-            
         Returns:
-            Filtered list of invoices
+            Keyword arguments for the controller's get_invoice_page()
         """
-        search_text = self.get_safe_filter_value(
-            self._filter_widget.get_search_text() if hasattr(self, '_filter_widget') else ""
-        )
-        status_filter = self._status_combo.currentData() if hasattr(self, '_status_combo') else "All"
-        period_filter = self._period_combo.currentData() if hasattr(self, '_period_combo') else "All Time"
-        amount_filter = self._amount_combo.currentData() if hasattr(self, '_amount_combo') else "All Amounts"
-        party_filter = self._party_combo.currentData() if hasattr(self, '_party_combo') else "All Parties"
-        
-        # Update party filter with available parties
-        self._update_party_filter()
+        return {
+            'search_text': self.get_safe_filter_value(
+                self._filter_widget.get_search_text() if hasattr(self, '_filter_widget') else ""
+            ),
+            'status_filter': self._status_combo.currentData() if hasattr(self, '_status_combo') else "All",
+            'period_filter': self._period_combo.currentData() if hasattr(self, '_period_combo') else "All Time",
+            'amount_filter': self._amount_combo.currentData() if hasattr(self, '_amount_combo') else "All Amounts",
+            'party_filter': self._party_combo.currentData() if hasattr(self, '_party_combo') else "All Parties",
+        }
+    
+    def _fetch_paged_extras(self) -> tuple:
+        """Read the stat-card totals and party names (worker thread).
         
-        return self._apply_filters(all_data, search_text, status_filter, period_filter, amount_filter, party_filter)
+        Returns:
+            Tuple of (InvoiceStats, party names for the dropdown)
+        """
+        return self._controller.get_invoice_stats(), self._controller.get_invoice_party_names()
     
-    def _apply_filters(self, invoices: list, search_text: str, status_filter: str, 
-                       period_filter: str, amount_filter: str, party_filter: str) -> list:
-        """Apply filters to invoices list with validation
+    def _apply_paged_extras(self, extras: tuple):
+        """Show the totals and party names read by _fetch_paged_extras().
         
         Args:
-            invoices: List of invoices to filter
-            search_text: Search text (invoice no, party name)
-            status_filter: Status filter (Paid, Unpaid, etc.)
-            period_filter: Period filter (Today, This Week, etc.)
-            amount_filter: Amount range filter
-            party_filter: Party name filter
-            
-        Returns:
-            Filtered list of invoices
+            extras: Tuple of (InvoiceStats, party names)
         """
-        # Delegate to controller for actual filtering logic
-        return self._controller.filter_invoices(
-            invoices=invoices,
-            search_text=search_text,
-            status_filter=status_filter,
-            period_filter=period_filter,
-            amount_filter=amount_filter,
-            party_filter=party_filter
-        )
+        stats, parties = extras
+        self._update_party_filter(parties)
+        self._show_stats(stats)
     
     def _update_stats(self, all_data: list):
         """Update statistics cards with invoice data.
         
         Args:
-            all_data: List of all invoices (unfiltered)
+            all_data: Unused - totals are aggregated in SQL (PAGED_FETCH)
+        """
+        self._show_stats(self._controller.get_invoice_stats())
+    
+    def _show_stats(self, stats):
+        """Fill the statistics cards.
+        
+        Args:
+            stats: InvoiceStats from the controller
         """
-        stats = self._controller.calculate_stats(all_data)
         self._total_card.set_value(str(stats.total))
         self._amount_card.set_value(f"₹{stats.total_amount:,.0f}")
         self._overdue_card.set_value(str(stats.overdue_count))
         self._paid_card.set_value(str(stats.paid_count))
     
-    def _update_party_filter(self):
-        """Update party dropdown with available parties."""
-        parties = self._controller.extract_party_names(self._all_data)
+    def _update_party_filter(self, parties: list):
+        """Update party dropdown with available parties.
         
+        Args:
+            parties: Sorted party names that appear on invoices
+        """
         current_selection = self._party_combo.currentData()
         self._party_combo.blockSignals(True)
         self._party_combo.clear()
@@ -263,7 +299,7 @@ class InvoicesScreen(BaseListScreen):
         self._party_combo.blockSignals(False)
     
     def _populate_table(self, invoices: list):
-        """Populate table with invoice data using ListTableHelper.
+        """Show invoice data in the table model.
         
         Args:
             invoices: List of invoices for current page
@@ -271,46 +307,25 @@ class InvoicesScreen(BaseListScreen):
         # Get current page from pagination widget
         current_page = self.pagination_widget.get_current_page() if self.pagination_widget else 1
         
-        logger.debug(f"Populating table with {len(invoices)} invoices using ListTableHelper")
+        logger.debug(f"Populating table with {len(invoices)} invoices")
+        self._table_model.populate(invoices, current_page)
+    
+    def _on_row_action(self, action: str, row: int):
+        """Dispatch a click on a row's action button.
         
-        # Use ListTableHelper to populate basic columns (0-4)
-        self._table_helper.populate(
-            data=invoices,
-            column_configs=self._column_configs,
-            current_page=current_page
-        )
+        Args:
+            action: Action name from the actions delegate
+            row: Table row that was clicked
+        """
+        invoice = self._table_model.row_data(row)
+        if invoice is None:
+            return
         
-        # Custom status color map for invoices
-        invoice_status_colors = {
-            'Paid': (SUCCESS, SUCCESS_LIGHT),
-            'Unpaid': (WARNING, WARNING_LIGHT),
-            'Partially Paid': (PRIMARY, PRIMARY_LIGHT),
-            'Overdue': (DANGER, DANGER_LIGHT),
-            'Cancelled': (DANGER, DANGER_LIGHT),
+        handlers = {
+            'view': self._on_view_clicked,
+            'delete': self._on_delete_clicked,
         }
-        
-        # Add custom widgets for status (col 5) and action buttons (col 6)
-        for row in range(self._table.rowCount()):
-            invoice = invoices[row] if row < len(invoices) else None
-            if invoice:
-                # Column 5: Status badge using helper
-                status = invoice.get('status', 'Unpaid')
-                status_widget = self._table_helper.create_status_badge(status, invoice_status_colors)
-                self._table.setCellWidget(row, 5, status_widget)
-                
-                # Column 6: Action buttons using helper
-                actions = [
-                    {'text': 'View', 'tooltip': 'View Invoice', 'bg_color': PRIMARY_LIGHT, 
-                     'hover_color': PRIMARY, 'size': (60, 32),
-                     'callback': lambda checked, inv=invoice: self._on_view_clicked(inv)},
-                    {'text': 'Del', 'tooltip': 'Delete Invoice', 'bg_color': DANGER_LIGHT, 
-                     'hover_color': DANGER, 'size': (50, 32),
-                     'callback': lambda checked, inv=invoice: self._on_delete_clicked(inv)},
-                ]
-                actions_widget = self._table_helper.create_action_buttons(actions)
-                self._table.setCellWidget(row, 6, actions_widget)
-        
-        logger.debug(f"Table populated with {self._table.rowCount()} rows")
+        handlers[action](invoice)
     
     # ─────────────────────────────────────────────────────────────────────────
     # Event Handlers (Screen-specific)
@@ -323,15 +338,13 @@ class InvoicesScreen(BaseListScreen):
             self._load_data()
             self.invoice_updated.emit()
     
-    def _on_row_double_clicked(self, item: QTableWidgetItem):
+    def _on_row_double_clicked(self, index: QModelIndex):
         """Handle double-click on table row."""
-        row = item.row()
-        # Calculate actual index in filtered data based on current page
-        current_page = self.pagination_widget.get_current_page() if self.pagination_widget else 1
-        actual_idx = (current_page - 1) * self.ITEMS_PER_PAGE + row
+        row = index.row()
+        page_data = self._get_current_page_data()
         
-        if actual_idx < len(self._filtered_data):
-            self._open_invoice_readonly(self._filtered_data[actual_idx])
+        if row < len(page_data):
+            self._open_invoice_readonly(page_data[row])
     
     def _on_view_clicked(self, invoice: dict):
         """Handle view button click - show print preview."""
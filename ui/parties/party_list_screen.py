@@ -10,7 +10,7 @@ from PySide6.QtCore import Qt, Signal
 from theme import PRIMARY, SUCCESS, DANGER, WARNING, PURPLE, PRIMARY_LIGHT, DANGER_LIGHT
 
 # Widget imports
-from widgets import StatCard, ListTable, TableFrame, StatsContainer, FilterWidget
+from widgets import StatCard, ListTableView, TableFrame, StatsContainer, FilterWidget, ActionButtonsDelegate
 
 # Core imports
 from core.enums import PartyType
@@ -25,7 +25,7 @@ from controllers.party_controller import party_controller
 
 # UI imports - inherit from BaseListScreen
 from ui.base.base_list_screen import BaseListScreen
-from ui.base.list_table_helper import ListTableHelper
+from ui.base.list_table_model import ListTableModel
 from ui.parties.party_form_dialog import PartyDialog
 
 logger = get_logger(__name__)
@@ -44,6 +44,9 @@ class PartiesScreen(BaseListScreen):
     
     party_updated = Signal()
     
+    # Reload only after writes to these tables
+    DATA_TABLES = ('parties',)
+    
     def __init__(self, parent=None):
         # Initialize base class - this calls _setup_ui() automatically
         super().__init__(title="Parties", parent=parent)
@@ -125,10 +128,29 @@ class PartiesScreen(BaseListScreen):
         # Create table frame container
         table_frame = TableFrame()
         
-        # Create table with headers (use _table for consistency with other screens)
-        self._table = ListTable(headers=[
-            "#", "Name", "Type", "GSTIN", "Mobile", "Balance", "Balance Type", "Edit", "Delete"
-        ])
+        # Define column configurations - Edit/Delete buttons are painted by delegates
+        self._column_configs = [
+            {'type': 'row_number'},
+            {'key': 'name', 'type': 'text', 'bold': True, 'align': Qt.AlignLeft},
+            {'key': 'party_type', 'type': 'text', 'align': Qt.AlignCenter, 
+             'formatter': lambda v: v.title() if v else ''},
+            {'key': 'gstin', 'type': 'text', 'formatter': lambda v: v or '-'},
+            {'key': 'mobile', 'type': 'text', 'formatter': lambda v: v or '-'},
+            {'key': 'opening_balance', 'type': 'currency', 'bold': True, 'align': Qt.AlignCenter},
+            {'key': 'balance_type', 'type': 'balance_type', 'align': Qt.AlignCenter,
+             'formatter': lambda v: v.upper() if v else '-'},
+            {'type': 'actions'},
+            {'type': 'actions'},
+        ]
+        
+        # Create model-based table (use _table for consistency with other screens)
+        self._table_model = ListTableModel(
+            headers=["#", "Name", "Type", "GSTIN", "Mobile", "Balance", "Balance Type", "Edit", "Delete"],
+            column_configs=self._column_configs,
+            items_per_page=self.ITEMS_PER_PAGE,
+            parent=self
+        )
+        self._table = ListTableView(self._table_model)
         
         # Configure column widths
         self._table.configure_columns([
@@ -143,25 +165,16 @@ class PartiesScreen(BaseListScreen):
             {"width": 80, "resize": "fixed"},      # Delete (increased)
         ])
         
-        # Initialize ListTableHelper for populating the table
-        self._table_helper = ListTableHelper(self._table, self.ITEMS_PER_PAGE)
-        
-        # Define column configurations for table population
-        self._column_configs = [
-            {'type': 'row_number'},
-            {'key': 'name', 'type': 'text', 'bold': True, 'align': Qt.AlignLeft},
-            {'key': 'party_type', 'type': 'text', 'align': Qt.AlignCenter, 
-             'formatter': lambda v: v.title() if v else ''},
-            {'key': 'gstin', 'type': 'text', 'formatter': lambda v: v or '-'},
-            {'key': 'mobile', 'type': 'text', 'formatter': lambda v: v or '-'},
-            {'key': 'opening_balance', 'type': 'currency', 'bold': True, 'align': Qt.AlignCenter},
-            {'key': 'balance_type', 'type': 'balance_type', 'align': Qt.AlignCenter,
-             'formatter': lambda v: v.upper() if v else '-'},
-            {'type': 'button', 'text': 'Edit', 'tooltip': 'Edit Party',
-             'bg_color': PRIMARY_LIGHT, 'hover_color': PRIMARY, 'size': (60, 32)},
-            {'type': 'button', 'text': 'Del', 'tooltip': 'Delete Party',
-             'bg_color': DANGER_LIGHT, 'hover_color': DANGER, 'size': (60, 32)},
-        ]
+        # Edit (column 7) and Delete (column 8) buttons
+        self._button_delegates = []
+        for column, action in ((7, {'name': 'edit', 'text': 'Edit', 'tooltip': 'Edit Party',
+                                    'bg_color': PRIMARY_LIGHT, 'hover_color': PRIMARY, 'size': (60, 32)}),
+                               (8, {'name': 'delete', 'text': 'Del', 'tooltip': 'Delete Party',
+                                    'bg_color': DANGER_LIGHT, 'hover_color': DANGER, 'size': (60, 32)})):
+            delegate = ActionButtonsDelegate([action], self._table)
+            delegate.action_clicked.connect(self._on_row_action)
+            self._table.setItemDelegateForColumn(column, delegate)
+            self._button_delegates.append(delegate)
         
         table_frame.set_table(self._table)
         
@@ -188,13 +201,21 @@ class PartiesScreen(BaseListScreen):
         Returns:
             Filtered list of parties
         """
-        search_text = self.get_safe_filter_value(
-            self._filter_widget.get_search_text() if hasattr(self, '_filter_widget') else ""
-        )
-        party_type = self.type_combo.currentData() if hasattr(self, 'type_combo') else "all"
-        balance_type = self.balance_combo.currentData() if hasattr(self, 'balance_combo') else "all"
+        return self._apply_filters(all_data, **self._filter_state())
+    
+    def _filter_state(self) -> dict:
+        """Read the current filter values (GUI thread).
         
-        return self._apply_filters(all_data, search_text, party_type, balance_type)
+        Returns:
+            Keyword arguments for _apply_filters()
+        """
+        return {
+            'search_text': self.get_safe_filter_value(
+                self._filter_widget.get_search_text() if hasattr(self, '_filter_widget') else ""
+            ),
+            'party_type': self.type_combo.currentData() if hasattr(self, 'type_combo') else "all",
+            'balance_type': self.balance_combo.currentData() if hasattr(self, 'balance_combo') else "all",
+        }
     
     def _apply_filters(self, parties: list, search_text: str, party_type: str, balance_type: str) -> list:
         """Apply filters to parties list with validation
@@ -213,13 +234,8 @@ class PartiesScreen(BaseListScreen):
             
             # Search filter with null-safety
             if search_text and search_text.strip():
-                search_lower = search_text.lower().strip()
-                filtered = [
-                    p for p in filtered
-                    if (search_lower in (str(p.get('name') or '')).lower()
-                        or search_lower in (str(p.get('gstin') or '')).lower()
-                        or search_lower in (str(p.get('mobile') or '')).lower())
-                ]
+                matched_ids = party_controller.search_party_ids(search_text.strip())
+                filtered = [p for p in filtered if p.get('id') in matched_ids]
                 logger.debug(f"After search filter: {len(filtered)} parties")
             
             # Party type filter with validation
@@ -303,7 +319,7 @@ class PartiesScreen(BaseListScreen):
             logger.error(f"Error updating stats: {str(e)}", exc_info=True)
     
     def _populate_table(self, parties: list):
-        """Populate table with party data using ListTableHelper
+        """Show party data in the table model
         
         Args:
             parties: List of parties for current page (should be up to 49)
@@ -311,30 +327,24 @@ class PartiesScreen(BaseListScreen):
         # Get current page from pagination widget
         current_page = self.pagination_widget.get_current_page() if self.pagination_widget else 1
         
-        logger.debug(f"Populating table with {len(parties)} parties using ListTableHelper")
-        
-        # Use ListTableHelper to populate the table
-        self._table_helper.populate(
-            data=parties,
-            column_configs=self._column_configs,
-            current_page=current_page
-        )
+        logger.debug(f"Populating table with {len(parties)} parties")
+        self._table_model.populate(parties, current_page)
+    
+    def _on_row_action(self, action: str, row: int):
+        """Dispatch a click on a row's Edit/Delete button
         
-        # Connect button click handlers for each row
-        for row in range(self._table.rowCount()):
-            party = parties[row] if row < len(parties) else None
-            if party:
-                # Edit button (column 7)
-                edit_btn = self._table.cellWidget(row, 7)
-                if edit_btn:
-                    edit_btn.clicked.connect(lambda checked, p=party: self._on_edit_party(p))
-                
-                # Delete button (column 8)
-                delete_btn = self._table.cellWidget(row, 8)
-                if delete_btn:
-                    delete_btn.clicked.connect(lambda checked, p=party: self._on_delete_party(p))
+        Args:
+            action: 'edit' or 'delete'
+            row: Table row that was clicked
+        """
+        party = self._table_model.row_data(row)
+        if party is None:
+            return
         
-        logger.debug(f"Table populated with {self._table.rowCount()} rows")
+        if action == 'edit':
+            self._on_edit_party(party)
+        elif action == 'delete':
+            self._on_delete_party(party)
     
     def _force_upper_search(self, text: str):
         """Force search input to uppercase"""
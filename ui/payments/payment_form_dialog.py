@@ -1335,43 +1335,44 @@ class SupplierPaymentDialog(QDialog):
             import datetime
             payment_date = self.payment_date.date().toString('yyyy-MM-dd')
             
-            if self.settlement_mode == "fifo" and hasattr(self, 'fifo_allocations'):
-                # Save multiple payments for FIFO allocation
-                self._save_fifo_payments(party, method, reference, payment_date, payment_notes)
-                msg = "FIFO payments recorded successfully!"
-            else:
-                # Single payment (bill-to-bill or direct)
-                if self.payment_data:
-                    # Update existing
-                    payment_data = {
-                        'id': self.payment_data['id'],
-                        'payment_id': self.payment_data.get('payment_id'),
-                        'party_id': party['id'],
-                        'amount': amount,
-                        'date': payment_date,
-                        'mode': method,
-                        'reference': reference,
-                        'invoice_id': invoice['id'] if invoice else None,
-                        'notes': payment_notes,
-                        'type': 'PAYMENT'
-                    }
-                    db.update_payment(payment_data)
-                    msg = "Payment updated successfully!"
+            with db.transaction():
+                if self.settlement_mode == "fifo" and hasattr(self, 'fifo_allocations'):
+                    # Save multiple payments for FIFO allocation
+                    self._save_fifo_payments(party, method, reference, payment_date, payment_notes)
+                    msg = "FIFO payments recorded successfully!"
                 else:
-                    payment_id = f"PAY-{datetime.datetime.now().strftime('%Y%m%d%H%M%S')}"
+                    # Single payment (bill-to-bill or direct)
+                    if self.payment_data:
+                        # Update existing
+                        payment_data = {
+                            'id': self.payment_data['id'],
+                            'payment_id': self.payment_data.get('payment_id'),
+                            'party_id': party['id'],
+                            'amount': amount,
+                            'date': payment_date,
+                            'mode': method,
+                            'reference': reference,
+                            'invoice_id': invoice['id'] if invoice else None,
+                            'notes': payment_notes,
+                            'type': 'PAYMENT'
+                        }
+                        db.update_payment(payment_data)
+                        msg = "Payment updated successfully!"
+                    else:
+                        payment_id = f"PAY-{datetime.datetime.now().strftime('%Y%m%d%H%M%S')}"
                     
-                    db.add_payment(
-                        payment_id=payment_id,
-                        party_id=party['id'],
-                        amount=amount,
-                        date=payment_date,
-                        mode=method,
-                        reference=reference,
-                        invoice_id=invoice['id'] if invoice else None,
-                        notes=payment_notes,
-                        payment_type='PAYMENT'
-                    )
-                    msg = "Payment recorded successfully!"
+                        db.add_payment(
+                            payment_id=payment_id,
+                            party_id=party['id'],
+                            amount=amount,
+                            date=payment_date,
+                            mode=method,
+                            reference=reference,
+                            invoice_id=invoice['id'] if invoice else None,
+                            notes=payment_notes,
+                            payment_type='PAYMENT'
+                        )
+                        msg = "Payment recorded successfully!"
             
             QMessageBox.information(self, "Success", f"✓ {msg}")
             self.accept()
@@ -12,8 +12,8 @@ from PySide6.QtCore import Qt, Signal
 from theme import PRIMARY, SUCCESS, DANGER, WARNING, WARNING_LIGHT, DANGER_LIGHT, PRIMARY_LIGHT
 
 # Widget imports
-from widgets import StatCard, ListTable, TableFrame, StatsContainer, FilterWidget
-from ui.base.list_table_helper import ListTableHelper
+from widgets import StatCard, ListTableView, TableFrame, StatsContainer, FilterWidget, StatusPillDelegate, ActionButtonsDelegate
+from ui.base.list_table_model import ListTableModel
 
 # Controller import (NOT service directly)
 from controllers.payment_controller import payment_controller
@@ -45,6 +45,12 @@ class PaymentsScreen(BaseListScreen):
     # Signal emitted when payment data changes
     payment_updated = Signal()
     
+    # Reload only after writes to these tables
+    DATA_TABLES = ('payments', 'parties')
+    
+    # Scroll the table model instead of paging
+    ITEMS_PER_PAGE = BaseListScreen.MODEL_PAGE_SIZE
+    
     def __init__(self, parent=None):
         super().__init__(title="Payments (Money Out)", parent=parent)
         self.setObjectName("PaymentsScreen")
@@ -135,29 +141,7 @@ class PaymentsScreen(BaseListScreen):
         """Create the payments table."""
         frame = TableFrame()
         
-        # Create table using common widget
-        self._table = ListTable(headers=[
-            "#", "Date", "Supplier", "Amount", "Method", 
-            "Reference", "Invoice", "Status", "Actions"
-        ])
-        
-        # Column configuration
-        self._table.configure_columns([
-            {"width": 50, "resize": "fixed"},     # #
-            {"width": 100, "resize": "fixed"},    # Date
-            {"resize": "stretch"},                 # Supplier
-            {"width": 120, "resize": "fixed"},    # Amount
-            {"width": 110, "resize": "fixed"},    # Method
-            {"width": 130, "resize": "fixed"},    # Reference
-            {"width": 100, "resize": "fixed"},    # Invoice
-            {"width": 90, "resize": "fixed"},     # Status
-            {"width": 140, "resize": "fixed"},    # Actions
-        ])
-        
-        # Initialize ListTableHelper for populating the table
-        self._table_helper = ListTableHelper(self._table, self.ITEMS_PER_PAGE)
-        
-        # Define column configurations for table population (columns 0-6 only, 7-8 are custom)
+        # Define column configurations - status pill and action buttons are painted by delegates
         self._column_configs = [
             {'type': 'row_number'},
             {'key': 'date', 'type': 'date', 'align': Qt.AlignCenter,
@@ -171,8 +155,45 @@ class PaymentsScreen(BaseListScreen):
              'formatter': lambda v: v or '-'},
             {'key': 'invoice_id', 'type': 'text', 'align': Qt.AlignCenter,
              'formatter': lambda v: f"PUR-{v}" if v else '-'},
+            {'type': 'pill', 'key': 'status', 'default': 'Completed'},
+            {'type': 'actions'},
         ]
         
+        # Create model-based table: cells are formatted on demand, no widgets per row
+        self._table_model = ListTableModel(
+            headers=["#", "Date", "Supplier", "Amount", "Method", "Reference", "Invoice", "Status", "Actions"],
+            column_configs=self._column_configs,
+            items_per_page=self.ITEMS_PER_PAGE,
+            parent=self
+        )
+        self._table = ListTableView(self._table_model)
+        
+        # Column configuration
+        self._table.configure_columns([
+            {"width": 50, "resize": "fixed"},     # #
+            {"width": 100, "resize": "fixed"},    # Date
+            {"resize": "stretch"},                 # Supplier
+            {"width": 120, "resize": "fixed"},    # Amount
+            {"width": 110, "resize": "fixed"},    # Method
+            {"width": 130, "resize": "fixed"},    # Reference
+            {"width": 100, "resize": "fixed"},    # Invoice
+            {"width": 90, "resize": "fixed"},     # Status
+            {"width": 140, "resize": "fixed"},    # Actions
+        ])
+        
+        # Column 7: status pill, column 8: action buttons
+        self._table.setItemDelegateForColumn(7, StatusPillDelegate(parent=self._table))
+        self._actions_delegate = ActionButtonsDelegate([
+            {'name': 'view', 'text': 'View', 'tooltip': 'View Payment Details', 'bg_color': PRIMARY_LIGHT,
+             'hover_color': PRIMARY, 'size': (40, 28)},
+            {'name': 'edit', 'text': 'Edit', 'tooltip': 'Edit Payment', 'bg_color': WARNING_LIGHT,
+             'hover_color': WARNING, 'size': (40, 28)},
+            {'name': 'delete', 'text': 'Del', 'tooltip': 'Delete Payment', 'bg_color': DANGER_LIGHT,
+             'hover_color': DANGER, 'size': (40, 28)},
+        ], self._table)
+        self._actions_delegate.action_clicked.connect(self._on_row_action)
+        self._table.setItemDelegateForColumn(8, self._actions_delegate)
+        
         frame.set_table(self._table)
         return frame
     
@@ -197,14 +218,22 @@ class PaymentsScreen(BaseListScreen):
         Returns:
             Filtered list of payments
         """
-        search_text = self.get_safe_filter_value(
-            self._filter_widget.get_search_text() if hasattr(self, '_filter_widget') else ""
-        )
-        method_filter = self._method_combo.currentData() if hasattr(self, '_method_combo') else "All Methods"
-        period_filter = self._period_combo.currentData() if hasattr(self, '_period_combo') else "All Time"
-        status_filter = self._status_combo.currentData() if hasattr(self, '_status_combo') else "All Status"
+        return self._apply_filters(all_data, **self._filter_state())
+    
+    def _filter_state(self) -> dict:
+        """Read the current filter values (GUI thread).
         
-        return self._apply_filters(all_data, search_text, method_filter, period_filter, status_filter)
+        Returns:
+            Keyword arguments for _apply_filters()
+        """
+        return {
+            'search_text': self.get_safe_filter_value(
+                self._filter_widget.get_search_text() if hasattr(self, '_filter_widget') else ""
+            ),
+            'method_filter': self._method_combo.currentData() if hasattr(self, '_method_combo') else "All Methods",
+            'period_filter': self._period_combo.currentData() if hasattr(self, '_period_combo') else "All Time",
+            'status_filter': self._status_combo.currentData() if hasattr(self, '_status_combo') else "All Status",
+        }
     
     def _apply_filters(self, payments: list, search_text: str, method_filter: str, 
                        period_filter: str, status_filter: str) -> list:
@@ -241,7 +270,7 @@ class PaymentsScreen(BaseListScreen):
         self._suppliers_card.set_value(str(stats.suppliers_count))
     
     def _populate_table(self, payments: list):
-        """Populate table with payment data using ListTableHelper.
+        """Show payment data in the table model.
         
         Args:
             payments: List of payments for current page
@@ -249,37 +278,26 @@ class PaymentsScreen(BaseListScreen):
         # Get current page from pagination widget
         current_page = self.pagination_widget.get_current_page() if self.pagination_widget else 1
         
-        logger.debug(f"Populating table with {len(payments)} payments using ListTableHelper")
-        
-        # Use ListTableHelper to populate basic columns (0-6)
-        self._table_helper.populate(
-            data=payments,
-            column_configs=self._column_configs,
-            current_page=current_page
-        )
+        logger.debug(f"Populating table with {len(payments)} payments")
+        self._table_model.populate(payments, current_page)
+    
+    def _on_row_action(self, action: str, row: int):
+        """Dispatch a click on a row's action button.
         
-        # Add custom widgets for status (col 7) and action buttons (col 8)
-        for row in range(self._table.rowCount()):
-            payment = payments[row] if row < len(payments) else None
-            if payment:
-                # Column 7: Status badge using helper
-                status = payment.get('status', 'Completed')
-                status_widget = self._table_helper.create_status_badge(status)
-                self._table.setCellWidget(row, 7, status_widget)
-                
-                # Column 8: Action buttons using helper
-                actions = [
-                    {'text': 'View', 'tooltip': 'View Payment Details', 'bg_color': PRIMARY_LIGHT, 
-                     'hover_color': PRIMARY, 'callback': lambda checked, p=payment: self._on_view_clicked(p)},
-                    {'text': 'Edit', 'tooltip': 'Edit Payment', 'bg_color': WARNING_LIGHT, 
-                     'hover_color': WARNING, 'callback': lambda checked, p=payment: self._on_edit_clicked(p)},
-                    {'text': 'Del', 'tooltip': 'Delete Payment', 'bg_color': DANGER_LIGHT, 
-                     'hover_color': DANGER, 'callback': lambda checked, p=payment: self._on_delete_clicked(p)},
-                ]
-                actions_widget = self._table_helper.create_action_buttons(actions)
-                self._table.setCellWidget(row, 8, actions_widget)
+        Args:
+            action: Action name from the actions delegate
+            row: Table row that was clicked
+        """
+        payment = self._table_model.row_data(row)
+        if payment is None:
+            return
         
-        logger.debug(f"Table populated with {self._table.rowCount()} rows")
+        handlers = {
+            'view': self._on_view_clicked,
+            'edit': self._on_edit_clicked,
+            'delete': self._on_delete_clicked,
+        }
+        handlers[action](payment)
 
     # ─────────────────────────────────────────────────────────────────────────
     # Event Handlers (Screen-specific)
@@ -5,23 +5,23 @@ Uses common list patterns: pagination, filtering, table population, error handli
 Architecture: UI → Controller → Service → DB
 """
 
-from PySide6.QtWidgets import QWidget, QDialog, QHBoxLayout, QLabel
+from PySide6.QtWidgets import QWidget, QDialog
 from PySide6.QtCore import Qt, Signal
 
 # Theme imports
 from theme import (
-    PRIMARY, SUCCESS, DANGER, WARNING, PRIMARY_LIGHT, DANGER_LIGHT,
-    get_status_badge_style
+    PRIMARY, SUCCESS, DANGER, WARNING, PRIMARY_LIGHT, DANGER_LIGHT
 )
 
 # Widget imports
 from widgets import (
-    StatCard, ListTable, TableFrame, StatsContainer, FilterWidget
+    StatCard, ListTableView, TableFrame, StatsContainer, FilterWidget,
+    StatusPillDelegate, ActionButtonsDelegate
 )
 
 # UI imports - inherit from BaseListScreen
 from ui.base.base_list_screen import BaseListScreen
-from ui.base.list_table_helper import ListTableHelper
+from ui.base.list_table_model import ListTableModel
 
 # Controller import
 from controllers.product_controller import product_controller
@@ -50,12 +50,15 @@ class ProductsScreen(BaseListScreen):
     - Search debouncing
     - Error handling
     
-    Uses ListTableHelper for table population - eliminating duplicate code.
+    Uses ListTableModel for table population - no widgets are created per row.
     """
     
     # Signal emitted when product data changes
     product_updated = Signal()
     
+    # Reload only after writes to these tables
+    DATA_TABLES = ('products',)
+    
     def __init__(self, parent=None):
         """Initialize products screen."""
         # Initialize base class - this calls _setup_ui() automatically
@@ -143,13 +146,31 @@ class ProductsScreen(BaseListScreen):
         return self._filter_widget
     
     def _create_table_section(self) -> QWidget:
-        """Create the products table with ListTableHelper integration."""
+        """Create the products table with ListTableModel integration."""
         table_frame = TableFrame()
         
-        # Create table with headers
-        self._table = ListTable(headers=[
-            "#", "Name", "Type", "HSN", "Price", "Stock", "Edit", "Delete"
-        ])
+        # Define column configurations - stock badge and Edit/Delete buttons are painted by delegates
+        self._column_configs = [
+            {'type': 'row_number'},
+            {'key': 'name', 'type': 'text', 'bold': True, 'align': Qt.AlignLeft,
+             'display': self._product_name_text},
+            {'key': 'product_type', 'type': 'text', 'align': Qt.AlignCenter,
+             'formatter': lambda v: v or '-'},
+            {'key': 'hsn_code', 'type': 'text', 'formatter': lambda v: v or '-'},
+            {'key': 'sales_rate', 'type': 'currency', 'bold': True, 'align': Qt.AlignRight},
+            {'type': 'pill', 'display': self._stock_text, 'colors': self._stock_colors},
+            {'type': 'actions'},
+            {'type': 'actions'},
+        ]
+        
+        # Create model-based table
+        self._table_model = ListTableModel(
+            headers=["#", "Name", "Type", "HSN", "Price", "Stock", "Edit", "Delete"],
+            column_configs=self._column_configs,
+            items_per_page=self.ITEMS_PER_PAGE,
+            parent=self
+        )
+        self._table = ListTableView(self._table_model)
         
         # Configure column widths
         self._table.configure_columns([
@@ -163,23 +184,17 @@ class ProductsScreen(BaseListScreen):
             {"width": 80, "resize": "fixed"},      # Delete
         ])
         
-        # Initialize ListTableHelper for populating the table
-        self._table_helper = ListTableHelper(self._table, self.ITEMS_PER_PAGE)
-        
-        # Define column configurations for table population
-        self._column_configs = [
-            {'type': 'row_number'},
-            {'key': 'name', 'type': 'text', 'bold': True, 'align': Qt.AlignLeft},
-            {'key': 'product_type', 'type': 'text', 'align': Qt.AlignCenter,
-             'formatter': lambda v: v or '-'},
-            {'key': 'hsn_code', 'type': 'text', 'formatter': lambda v: v or '-'},
-            {'key': 'sales_rate', 'type': 'currency', 'bold': True, 'align': Qt.AlignRight},
-            {'type': 'custom', 'key': 'stock'},  # Custom stock cell
-            {'type': 'button', 'text': 'Edit', 'tooltip': 'Edit Product',
-             'bg_color': PRIMARY_LIGHT, 'hover_color': PRIMARY, 'size': (60, 32)},
-            {'type': 'button', 'text': 'Del', 'tooltip': 'Delete Product',
-             'bg_color': DANGER_LIGHT, 'hover_color': DANGER, 'size': (60, 32)},
-        ]
+        # Stock badge (column 5), Edit (column 6) and Delete (column 7) buttons
+        self._table.setItemDelegateForColumn(5, StatusPillDelegate(parent=self._table))
+        self._button_delegates = []
+        for column, action in ((6, {'name': 'edit', 'text': 'Edit', 'tooltip': 'Edit Product',
+                                    'bg_color': PRIMARY_LIGHT, 'hover_color': PRIMARY, 'size': (60, 32)}),
+                               (7, {'name': 'delete', 'text': 'Del', 'tooltip': 'Delete Product',
+                                    'bg_color': DANGER_LIGHT, 'hover_color': DANGER, 'size': (60, 32)})):
+            delegate = ActionButtonsDelegate([action], self._table)
+            delegate.action_clicked.connect(self._on_row_action)
+            self._table.setItemDelegateForColumn(column, delegate)
+            self._button_delegates.append(delegate)
         
         table_frame.set_table(self._table)
         return table_frame
@@ -194,12 +209,11 @@ class ProductsScreen(BaseListScreen):
         Returns:
             List of all products
         """
-        products = self._controller.get_all_products()
-        
-        # Update category filter options when data is loaded
-        self._update_category_filter(products)
-        
-        return products
+        return self._controller.get_all_products()
+    
+    def _on_data_fetched(self, all_data: list):
+        """Update category filter options when data is loaded."""
+        self._update_category_filter(all_data)
     
     def filter_data(self, all_data: list) -> list:
         """Apply filters to products list.
@@ -210,14 +224,22 @@ class ProductsScreen(BaseListScreen):
         Returns:
             Filtered list of products
         """
-        search_text = self.get_safe_filter_value(
-            self._filter_widget.get_search_text() if hasattr(self, '_filter_widget') else ""
-        )
-        type_filter = self._type_combo.currentData() if hasattr(self, '_type_combo') else "all"
-        category_filter = self._category_combo.currentData() if hasattr(self, '_category_combo') else "all"
-        stock_filter = self._stock_combo.currentData() if hasattr(self, '_stock_combo') else "all"
+        return self._apply_filters(all_data, **self._filter_state())
+    
+    def _filter_state(self) -> dict:
+        """Read the current filter values (GUI thread).
         
-        return self._apply_filters(all_data, search_text, type_filter, category_filter, stock_filter)
+        Returns:
+            Keyword arguments for _apply_filters()
+        """
+        return {
+            'search_text': self.get_safe_filter_value(
+                self._filter_widget.get_search_text() if hasattr(self, '_filter_widget') else ""
+            ),
+            'type_filter': self._type_combo.currentData() if hasattr(self, '_type_combo') else "all",
+            'category_filter': self._category_combo.currentData() if hasattr(self, '_category_combo') else "all",
+            'stock_filter': self._stock_combo.currentData() if hasattr(self, '_stock_combo') else "all",
+        }
     
     def _apply_filters(self, products: list, search_text: str, type_filter: str, 
                        category_filter: str, stock_filter: str) -> list:
@@ -327,7 +349,7 @@ class ProductsScreen(BaseListScreen):
             logger.error(f"Failed to update stats: {str(e)}", exc_info=True)
     
     def _populate_table(self, products: list):
-        """Populate table with product data using ListTableHelper.
+        """Show product data in the table model.
         
         Args:
             products: List of products for current page
@@ -335,96 +357,71 @@ class ProductsScreen(BaseListScreen):
         # Get current page from pagination widget
         current_page = self.pagination_widget.get_current_page() if self.pagination_widget else 1
         
-        logger.debug(f"Populating table with {len(products)} products using ListTableHelper")
-        
-        # Use ListTableHelper to populate the table
-        self._table_helper.populate(
-            data=products,
-            column_configs=self._column_configs,
-            current_page=current_page
-        )
+        logger.debug(f"Populating table with {len(products)} products")
+        self._table_model.populate(products, current_page)
+    
+    def _on_row_action(self, action: str, row: int):
+        """Dispatch a click on a row's Edit/Delete button.
         
-        # Add custom stock cells and connect button handlers for each row
-        for row in range(self._table.rowCount()):
-            product = products[row] if row < len(products) else None
-            if product:
-                # Update name column with icon based on product type
-                product_type = product.get('product_type', product.get('type', ''))
-                type_icon = "📦" if product_type == "Goods" else "🔧"
-                name_item = self._table.item(row, 1)
-                if name_item:
-                    name_item.setText(f"{type_icon} {product.get('name', '')}")
-                
-                # Add custom stock cell (column 5)
-                stock_widget = self._create_stock_cell(product)
-                self._table.setCellWidget(row, 5, stock_widget)
-                
-                # Edit button (column 6)
-                edit_btn = self._table.cellWidget(row, 6)
-                if edit_btn:
-                    edit_btn.clicked.connect(lambda checked, p=product: self._on_edit_product(p))
-                
-                # Delete button (column 7)
-                delete_btn = self._table.cellWidget(row, 7)
-                if delete_btn:
-                    delete_btn.clicked.connect(lambda checked, p=product: self._on_delete_product(p))
-        
-        logger.debug(f"Table populated with {self._table.rowCount()} rows")
+        Args:
+            action: 'edit' or 'delete'
+            row: Table row that was clicked
+        """
+        product = self._table_model.row_data(row)
+        if product is None:
+            return
+        
+        if action == 'edit':
+            self._on_edit_product(product)
+        elif action == 'delete':
+            self._on_delete_product(product)
     
-    def _create_stock_cell(self, product: dict) -> QWidget:
-        """Create stock cell with status indicator.
+    def _product_name_text(self, product: dict) -> str:
+        """Name column text with an icon based on product type."""
+        product_type = product.get('product_type', product.get('type', ''))
+        type_icon = "📦" if product_type == "Goods" else "🔧"
+        return f"{type_icon} {product.get('name', '')}"
+    
+    def _stock_text(self, product: dict) -> str:
+        """Stock badge text: quantity with unit, or ∞ for services.
         
         Args:
             product: Product data dict
-            
-        Returns:
-            QWidget with styled stock display
         """
-        widget = QWidget()
-        widget.setStyleSheet("background: transparent; border: none;")
+        product_type = product.get('product_type', product.get('type', ''))
+        if product_type == 'Service':
+            # Services have unlimited stock
+            return "∞"
         
-        layout = QHBoxLayout(widget)
-        layout.setContentsMargins(4, 4, 4, 4)
-        layout.setAlignment(Qt.AlignCenter)
+        # Goods have quantified stock
+        try:
+            stock = (product.get('current_stock') or 
+                    product.get('opening_stock') or 
+                    product.get('stock_quantity') or 0)
+            stock = int(stock)
+        except (ValueError, TypeError):
+            stock = 0
+        
+        unit = product.get('unit', 'Pcs')
+        return f"{stock} {unit}"
+    
+    def _stock_colors(self, product: dict) -> tuple:
+        """Stock badge (text color, background) based on stock status.
         
+        Args:
+            product: Product data dict
+        """
         product_type = product.get('product_type', product.get('type', ''))
-        status = self._controller.get_stock_status(product)
-        
         if product_type == 'Service':
-            # Services have unlimited stock
-            text = "∞"
-            color = PRIMARY
-            bg = PRIMARY_LIGHT
-        else:
-            # Goods have quantified stock
-            try:
-                stock = (product.get('current_stock') or 
-                        product.get('opening_stock') or 
-                        product.get('stock_quantity') or 0)
-                stock = int(stock)
-            except (ValueError, TypeError):
-                stock = 0
-            
-            unit = product.get('unit', 'Pcs')
-            text = f"{stock} {unit}"
-            
-            # Color based on stock status
-            if status == "In Stock":
-                color = SUCCESS
-                bg = "#ECFDF5"
-            elif status == "Low Stock":
-                color = WARNING
-                bg = "#FFFBEB"
-            else:  # Out of Stock
-                color = DANGER
-                bg = "#FEF2F2"
-        
-        label = QLabel(text)
-        label.setAlignment(Qt.AlignCenter)
-        label.setStyleSheet(get_status_badge_style(color, bg))
-        layout.addWidget(label)
-        
-        return widget
+            return PRIMARY, PRIMARY_LIGHT
+        
+        status = self._controller.get_stock_status(product)
+        if status == "In Stock":
+            return SUCCESS, "#ECFDF5"
+        elif status == "Low Stock":
+            return WARNING, "#FFFBEB"
+        else:  # Out of Stock
+            return DANGER, "#FEF2F2"
     
     # ─────────────────────────────────────────────────────────────────────────
     # Event Handler Overrides
@@ -18,6 +18,7 @@ from theme import (
     BORDER, BACKGROUND, PRIMARY_HOVER, PRIMARY_LIGHT
 )
 from core.db.sqlite_db import db
+from core.services.allocation_service import allocation_service
 from ui.error_handler import UIErrorHandler
 from widgets import PartySelector, DialogEditableComboBox
 
@@ -247,7 +248,6 @@ class ReceiptDialog(QDialog):
         super().__init__(parent)
         self.receipt_data = receipt_data
         self.parties = []
-        self.invoices = []
         self.party_data_map = {}
         self.form_dirty = False  # Track unsaved changes
         
@@ -290,16 +290,14 @@ class ReceiptDialog(QDialog):
         self.move(x, y)
     
     def _load_data(self):
-        """Load parties and invoices from database"""
+        """Load parties from database (open invoices are fetched per customer)"""
         try:
             # Get only customer type parties (for receipts)
             all_parties = db.get_parties() or []
             self.parties = [p for p in all_parties if p.get('party_type', '').lower() in ('customer', 'both', '')]
-            self.invoices = db.get_invoices() or []
         except Exception as e:
             print(f"Database error: {e}")
             self.parties = []
-            self.invoices = []
         
         # Build party lookup map
         for party in self.parties:
@@ -1368,8 +1366,10 @@ class ReceiptDialog(QDialog):
     def _on_amount_changed(self):
         """Handle amount change"""
         self.form_dirty = True
+        # Only the FIFO preview depends on the amount
+        if self.settlement_mode == "fifo":
+            self._refresh_fifo_allocation()
         self._update_summary()
-        self._update_allocation_area()
     
     def _on_payment_method_changed(self):
         """Handle payment method change"""
@@ -1421,39 +1421,9 @@ class ReceiptDialog(QDialog):
             return
         
         # Calculate total outstanding for this customer
-        party_id = party.get('id')
-        total_outstanding = 0
-        invoice_count = 0
-        
-        # Get all payments for this party
-        paid_amounts = {}
-        try:
-            payments = db._query("SELECT invoice_id, SUM(amount) as total FROM payments WHERE party_id = ? GROUP BY invoice_id", (party_id,))
-            for p in payments:
-                paid_amounts[p.get('invoice_id')] = p.get('total', 0)
-        except Exception as e:
-            print(f"Error fetching payments: {e}")
-        
-        for inv in self.invoices:
-            if inv.get('party_id') != party_id:
-                continue
-            
-            inv_id = inv.get('id')
-            grand_total = float(inv.get('grand_total', 0) or 0)
-            amount_paid = float(paid_amounts.get(inv_id, 0))
-            balance_due = grand_total - amount_paid
-            
-            # Skip if fully paid or no amount
-            if balance_due <= 0 or grand_total == 0:
-                continue
-            
-            # Skip draft invoices with zero amount
-            status = inv.get('status', 'outstanding').lower()
-            if status == 'draft' and grand_total == 0:
-                continue
-            
-            total_outstanding += balance_due
-            invoice_count += 1
+        open_invoices = self._get_open_invoices()
+        total_outstanding = open_invoices.total_due if open_invoices else 0
+        invoice_count = len(open_invoices) if open_invoices else 0
         
         self.outstanding_amount.setText(f"₹{total_outstanding:,.2f}")
         self.outstanding_label.setText(f"Total Outstanding ({invoice_count} invoices)")
@@ -1502,6 +1472,7 @@ class ReceiptDialog(QDialog):
         
         # Reset invoice_cards list (but not selected_invoice)
         self.invoice_cards = []
+        self._fifo_rows = None
         
         party = self._get_selected_party()
         
@@ -1530,45 +1501,9 @@ class ReceiptDialog(QDialog):
         header.setStyleSheet(f"color: {TEXT_PRIMARY}; border: none; margin-bottom: 5px;")
         self.allocation_layout.addWidget(header)
         
-        # Get outstanding invoices for this customer
-        party = self._get_selected_party()
-        if not party:
-            return
-            
-        party_id = party.get('id')
-        outstanding_invoices = []
-        
-        # Get all payments for this party
-        paid_amounts = {}
-        try:
-            payments = db._query("SELECT invoice_id, SUM(amount) as total FROM payments WHERE party_id = ? GROUP BY invoice_id", (party_id,))
-            for p in payments:
-                paid_amounts[p.get('invoice_id')] = p.get('total', 0)
-        except Exception as e:
-            print(f"Error fetching payments: {e}")
-        
-        for inv in self.invoices:
-            if inv.get('party_id') != party_id:
-                continue
-            
-            inv_id = inv.get('id')
-            grand_total = float(inv.get('grand_total', 0) or 0)
-            amount_paid = float(paid_amounts.get(inv_id, 0))
-            balance_due = grand_total - amount_paid
-            
-            # Skip if fully paid or no amount
-            if balance_due <= 0 or grand_total == 0:
-                continue
-            
-            # Skip draft invoices with zero amount
-            status = inv.get('status', 'outstanding').lower()
-            if status == 'draft' and grand_total == 0:
-                continue
-            
-            outstanding_invoices.append(inv)
-        
-        # Sort by date (newest first for bill-to-bill)
-        outstanding_invoices.sort(key=lambda x: x.get('date', ''), reverse=True)
+        # Get outstanding invoices for this customer (newest first for bill-to-bill)
+        open_invoices = self._get_open_invoices()
+        outstanding_invoices = open_invoices.newest_first() if open_invoices else []
         
         if not outstanding_invoices:
             no_inv = QLabel("✅ No outstanding invoices for this customer")
@@ -1929,6 +1864,7 @@ class ReceiptDialog(QDialog):
         """Calculate FIFO allocation and display"""
         party = self._get_selected_party()
         amount = self.amount_input.value()
+        self.fifo_allocations = []
         
         if not party or amount <= 0:
             placeholder = QLabel("Enter amount to see allocation preview")
@@ -1938,43 +1874,10 @@ class ReceiptDialog(QDialog):
             self.allocation_layout.addStretch()
             return
         
-        # Get outstanding invoices sorted by date (oldest first)
-        party_id = party.get('id')
-        outstanding_invoices = []
+        # Outstanding invoices, oldest first
+        open_invoices = self._get_open_invoices()
         
-        # Get all payments for this party
-        paid_amounts = {}
-        try:
-            payments = db._query("SELECT invoice_id, SUM(amount) as total FROM payments WHERE party_id = ? GROUP BY invoice_id", (party_id,))
-            for p in payments:
-                paid_amounts[p.get('invoice_id')] = p.get('total', 0)
-        except Exception as e:
-            print(f"Error fetching payments: {e}")
-        
-        for inv in self.invoices:
-            if inv.get('party_id') != party_id:
-                continue
-            
-            inv_id = inv.get('id')
-            grand_total = float(inv.get('grand_total', 0) or 0)
-            amount_paid = float(paid_amounts.get(inv_id, 0))
-            balance_due = grand_total - amount_paid
-            
-            # Skip if fully paid or no amount
-            if balance_due <= 0 or grand_total == 0:
-                continue
-            
-            # Skip draft invoices with zero amount
-            status = inv.get('status', 'outstanding').lower()
-            if status == 'draft' and grand_total == 0:
-                continue
-            
-            outstanding_invoices.append(inv)
-        
-        outstanding_invoices.sort(key=lambda x: x.get('date', ''))
-
-        
-        if not outstanding_invoices:
+        if not open_invoices:
             no_inv = QLabel("✅ No outstanding invoices")
             no_inv.setStyleSheet(f"color: {SUCCESS}; border: none;")
             no_inv.setAlignment(Qt.AlignCenter)
@@ -1982,10 +1885,6 @@ class ReceiptDialog(QDialog):
             self.allocation_layout.addStretch()
             return
         
-        # Calculate allocation
-        remaining = amount
-        self.fifo_allocations = []
-        
         # Create scroll area for allocations if many invoices
         scroll = QScrollArea()
         scroll.setWidgetResizable(True)
@@ -2000,33 +1899,10 @@ class ReceiptDialog(QDialog):
         scroll_layout.setSpacing(6)
         scroll_layout.setContentsMargins(0, 0, 5, 0)
         
-        for inv in outstanding_invoices:
-            balance_due = inv.get('balance_due', inv.get('due_amount', inv.get('grand_total', 0)))
-            inv_no = inv.get('invoice_no', f"INV-{inv.get('id', 0):03d}")
-            inv_date = inv.get('date', 'N/A')
-            
-            if remaining <= 0:
-                alloc_amount = 0
-                status = "Pending"
-                status_color = TEXT_SECONDARY
-            elif remaining >= balance_due:
-                alloc_amount = balance_due
-                remaining -= balance_due
-                status = "Full"
-                status_color = SUCCESS
-            else:
-                alloc_amount = remaining
-                remaining = 0
-                status = "Partial"
-                status_color = WARNING
-            
-            if alloc_amount > 0:
-                self.fifo_allocations.append({
-                    'invoice': inv,
-                    'invoice_id': inv.get('id'),
-                    'invoice_no': inv_no,
-                    'amount': alloc_amount
-                })
+        # One row per open invoice; amounts and badges are filled by _apply_fifo_allocations
+        fifo_rows = []
+        for inv in open_invoices.invoices:
+            inv_no = inv.get('invoice_no') or f"INV-{inv.get('id', 0):03d}"
             
             # Create row
             row = QFrame()
@@ -2048,40 +1924,76 @@ class ReceiptDialog(QDialog):
             inv_label.setStyleSheet(f"font-weight: bold; color: {TEXT_PRIMARY}; font-size: 12px;")
             row_layout.addWidget(inv_label)
             
-            due_label = QLabel(f"₹{balance_due:,.0f}")
+            due_label = QLabel(f"₹{inv['balance_due']:,.0f}")
             due_label.setStyleSheet(f"color: {DANGER}; font-size: 11px;")
             row_layout.addWidget(due_label)
             
             row_layout.addStretch()
             
-            alloc_label = QLabel(f"→ ₹{alloc_amount:,.0f}")
+            alloc_label = QLabel()
             alloc_label.setStyleSheet(f"color: {PRIMARY}; font-weight: bold; font-size: 12px;")
             row_layout.addWidget(alloc_label)
             
-            status_badge = QLabel(status)
+            status_badge = QLabel()
             status_badge.setFixedWidth(50)
-            status_badge.setStyleSheet(f"""
-                background: {status_color}20;
-                color: {status_color};
-                padding: 2px 6px;
-                border-radius: 4px;
-                font-size: 10px;
-                font-weight: bold;
-            """)
             status_badge.setAlignment(Qt.AlignCenter)
             row_layout.addWidget(status_badge)
             
             scroll_layout.addWidget(row)
+            fifo_rows.append((alloc_label, status_badge))
         
         scroll_layout.addStretch()
         scroll.setWidget(scroll_content)
         self.allocation_layout.addWidget(scroll, 1)
         
-        # Show excess if any
-        if remaining > 0:
-            excess = QLabel(f"💰 Advance: ₹{remaining:,.2f}")
-            excess.setStyleSheet(f"color: {WARNING}; font-weight: bold; border: none; margin-top: 5px;")
-            self.allocation_layout.addWidget(excess)
+        # Excess over the outstanding total, shown when there is any
+        self.fifo_advance_label = QLabel()
+        self.fifo_advance_label.setStyleSheet(f"color: {WARNING}; font-weight: bold; border: none; margin-top: 5px;")
+        self.allocation_layout.addWidget(self.fifo_advance_label)
+        
+        self._fifo_rows = (open_invoices, fifo_rows)
+        self._apply_fifo_allocations(*open_invoices.fifo(amount))
+    
+    def _apply_fifo_allocations(self, allocations, advance):
+        """Show a FIFO split on the rows built by _calculate_and_show_fifo"""
+        _, fifo_rows = self._fifo_rows
+        status_colors = {'Full': SUCCESS, 'Partial': WARNING, 'Pending': TEXT_SECONDARY}
+        
+        for alloc, (alloc_label, status_badge) in zip(allocations, fifo_rows):
+            alloc_label.setText(f"→ ₹{alloc.amount:,.0f}")
+            if status_badge.text() != alloc.status:
+                status_color = status_colors[alloc.status]
+                status_badge.setText(alloc.status)
+                status_badge.setStyleSheet(f"""
+                    background: {status_color}20;
+                    color: {status_color};
+                    padding: 2px 6px;
+                    border-radius: 4px;
+                    font-size: 10px;
+                    font-weight: bold;
+                """)
+        
+        self.fifo_allocations = [
+            {
+                'invoice': alloc.invoice,
+                'invoice_id': alloc.invoice_id,
+                'invoice_no': alloc.invoice_no,
+                'amount': alloc.amount
+            }
+            for alloc in allocations if alloc.amount > 0
+        ]
+        
+        self.fifo_advance_label.setText(f"💰 Advance: ₹{advance:,.2f}")
+        self.fifo_advance_label.setVisible(advance > 0)
+    
+    def _refresh_fifo_allocation(self):
+        """Re-split the amount over the shown FIFO rows, rebuilding only if they are stale"""
+        amount = self.amount_input.value()
+        fifo_rows = getattr(self, '_fifo_rows', None)
+        if amount > 0 and fifo_rows and self._get_open_invoices() is fifo_rows[0]:
+            self._apply_fifo_allocations(*fifo_rows[0].fifo(amount))
+        else:
+            self._update_allocation_area()
     
     def _update_invoice_detail(self):
         """Update invoice detail display"""
@@ -2130,36 +2042,11 @@ class ReceiptDialog(QDialog):
         if not party:
             return
         
-        party_id = party.get('id')
-        
-        # Get all payments for this party to calculate actual balance
-        paid_amounts = {}
-        try:
-            payments = db._query("SELECT invoice_id, SUM(amount) as total FROM payments WHERE party_id = ? GROUP BY invoice_id", (party_id,))
-            for p in payments:
-                paid_amounts[p.get('invoice_id')] = p.get('total', 0)
-        except Exception as e:
-            print(f"Error fetching payments: {e}")
-        
-        # Filter sales invoices for this customer with outstanding balance
-        for inv in self.invoices:
-            if inv.get('party_id') != party_id:
-                continue
-            
-            inv_id = inv.get('id')
-            grand_total = float(inv.get('grand_total', 0) or 0)
-            amount_paid = float(paid_amounts.get(inv_id, 0))
-            balance_due = grand_total - amount_paid
-            
-            # Skip if fully paid
-            if balance_due <= 0:
-                continue
-            
-            # Skip draft invoices unless they have amount
-            status = inv.get('status', 'outstanding').lower()
-            if status == 'draft' and grand_total == 0:
-                continue
-            
+        # Sales invoices of this customer with an outstanding balance
+        open_invoices = self._get_open_invoices()
+        for inv in (open_invoices.invoices if open_invoices else []):
+            balance_due = inv['balance_due']
+            status = (inv.get('status') or 'outstanding').lower()
             inv_no = inv.get('invoice_no', f"INV-{inv.get('id', 0):03d}")
             icon = "📄" if status == 'outstanding' else "⚠️" if status in ('overdue', 'final') else "✓"
             
@@ -2225,6 +2112,17 @@ class ReceiptDialog(QDialog):
             name = self.party_search.text().strip()
         return self.party_data_map.get(name)
     
+    def _get_open_invoices(self):
+        """Open invoices of the selected customer (OpenInvoices, oldest first), or None"""
+        party = self._get_selected_party()
+        if not party:
+            return None
+        try:
+            return allocation_service.get_open_invoices(party.get('id'))
+        except Exception as e:
+            print(f"Error fetching open invoices: {e}")
+            return None
+    
     def _hex_to_rgb(self, hex_color):
         """Convert hex color to RGB string"""
         hex_color = hex_color.lstrip('#')
@@ -2295,46 +2193,6 @@ class ReceiptDialog(QDialog):
                 return
         event.accept()
     
-    def _update_invoice_status(self, invoice_id, amount_paid):
-        """Update invoice status to 'paid' or 'partial paid' based on payment amount"""
-        if not invoice_id:
-            return
-        
-        try:
-            # Get the invoice details
-            invoice = None
-            for inv in self.invoices:
-                if inv.get('id') == invoice_id:
-                    invoice = inv
-                    break
-            
-            if not invoice:
-                return
-            
-            # Calculate outstanding amount
-            grand_total = invoice.get('grand_total', 0)
-            due_amount = invoice.get('due_amount', grand_total)
-            remaining_due = max(0, due_amount - amount_paid)
-            
-            # Determine status
-            if remaining_due <= 0:
-                new_status = 'Paid'
-            elif remaining_due < due_amount:
-                new_status = 'Partial paid'
-            else:
-                new_status = 'Outstanding'
-            
-            # Update the invoice in database
-            invoice_data = invoice.copy()
-            invoice_data['status'] = new_status
-            # Calculate new balance_due
-            invoice_data['balance_due'] = remaining_due
-            print(f"Updated invoice {invoice_id}: {new_status}, Balance Due: ₹{remaining_due:,.2f} {invoice_data}")
-            db.update_invoice(invoice_data)
-            
-        except Exception as e:
-            print(f"Warning: Could not update invoice status: {e}")
-    
     def _save_receipt(self):
         """Save receipt to database with comprehensive validation"""
         # ===== VALIDATION PHASE =====
@@ -2444,48 +2302,43 @@ class ReceiptDialog(QDialog):
             import datetime
             receipt_date = self.receipt_date.date().toString('yyyy-MM-dd')
             
-            if self.settlement_mode == "fifo" and hasattr(self, 'fifo_allocations'):
-                # Save multiple receipts for FIFO allocation
-                self._save_fifo_receipts(party, method, reference, receipt_date, receipt_notes)
-                msg = "FIFO receipts recorded successfully!"
-            else:
-                # Single receipt (bill-to-bill or direct)
-                if self.receipt_data:
-                    # Update existing
-                    payment_data = {
-                        'id': self.receipt_data['id'],
-                        'payment_id': self.receipt_data.get('payment_id'),
-                        'party_id': party['id'],
-                        'amount': amount,
-                        'date': receipt_date,
-                        'mode': method,
-                        'reference': reference,
-                        'invoice_id': invoice['id'] if invoice else None,
-                        'notes': receipt_notes,
-                        'type': 'RECEIPT'
-                    }
-                    db.update_payment(payment_data)
-                    # Update invoice status if bill-to-bill
-                    if self.settlement_mode == "bill_to_bill" and invoice:
-                        self._update_invoice_status(invoice['id'], amount)
-                    msg = "Receipt updated successfully!"
+            with db.transaction():
+                if self.settlement_mode == "fifo" and hasattr(self, 'fifo_allocations'):
+                    # One receipt allocated over invoices (FIFO)
+                    self._save_fifo_receipts(party, method, reference, receipt_date, receipt_notes)
+                    msg = "FIFO receipt recorded successfully!"
                 else:
-                    payment_id = f"REC-{datetime.datetime.now().strftime('%Y%m%d%H%M%S')}"
+                    # Single receipt (bill-to-bill or direct)
+                    if self.receipt_data:
+                        # Update existing
+                        payment_data = {
+                            'id': self.receipt_data['id'],
+                            'payment_id': self.receipt_data.get('payment_id'),
+                            'party_id': party['id'],
+                            'amount': amount,
+                            'date': receipt_date,
+                            'mode': method,
+                            'reference': reference,
+                            'invoice_id': invoice['id'] if invoice else None,
+                            'notes': receipt_notes,
+                            'type': 'RECEIPT'
+                        }
+                        db.update_payment(payment_data)
+                        msg = "Receipt updated successfully!"
+                    else:
+                        payment_id = f"REC-{datetime.datetime.now().strftime('%Y%m%d%H%M%S')}"
                     
-                    db.add_payment(
-                        payment_id=payment_id,
-                        party_id=party['id'],
-                        amount=amount,
-                        date=receipt_date,
-                        mode=method,
-                        invoice_id=invoice['id'] if invoice else None,
-                        notes=receipt_notes,
-                        payment_type='RECEIPT'
-                    )
-                    # Update invoice status if bill-to-bill
-                    if self.settlement_mode == "bill_to_bill" and invoice:
-                        self._update_invoice_status(invoice['id'], amount)
-                    msg = "Receipt recorded successfully!"
+                        db.add_payment(
+                            payment_id=payment_id,
+                            party_id=party['id'],
+                            amount=amount,
+                            date=receipt_date,
+                            mode=method,
+                            invoice_id=invoice['id'] if invoice else None,
+                            notes=receipt_notes,
+                            payment_type='RECEIPT'
+                        )
+                        msg = "Receipt recorded successfully!"
             
             QMessageBox.information(self, "Success", f"✓ {msg}")
             self.form_dirty = False
@@ -2498,56 +2351,25 @@ class ReceiptDialog(QDialog):
             self.save_btn.setText("✓ " + ("Update Receipt" if self.receipt_data else "Save Receipt"))
     
     def _save_fifo_receipts(self, party, method, reference, receipt_date, base_notes):
-        """Save multiple receipts for FIFO allocation"""
-        import datetime
+        """Save one receipt settled against the FIFO-allocated invoices
         
-        total_amount = self.amount_input.value()
-        allocated_total = 0
+        Whatever is not allocated stays on the receipt as an advance.
+        """
+        import datetime
         
-        for i, alloc in enumerate(self.fifo_allocations):
-            if alloc['amount'] <= 0:
-                continue
-            
-            invoice = alloc['invoice']
-            alloc_amount = alloc['amount']
-            allocated_total += alloc_amount
-            
-            # Generate unique payment ID with sequence
-            timestamp = datetime.datetime.now().strftime('%Y%m%d%H%M%S')
-            payment_id = f"REC-{timestamp}-{i+1:02d}"
-            
-            # Add invoice info to notes
-            inv_no = invoice.get('invoice_no', f"INV-{invoice.get('id', 0):03d}")
-            alloc_notes = f"{base_notes} [Allocated to {inv_no}]"
-            
-            db.add_payment(
-                payment_id=payment_id,
-                party_id=party['id'],
-                amount=alloc_amount,
-                date=receipt_date,
-                mode=method,
-                invoice_id=invoice['id'],
-                notes=alloc_notes,
-                payment_type='RECEIPT'
-            )
-            # Update invoice status after FIFO allocation
-            self._update_invoice_status(invoice['id'], alloc_amount)
-        
-        # If there's excess amount (advance), save as direct receipt
-        excess = total_amount - allocated_total
-        if excess > 0:
-            timestamp = datetime.datetime.now().strftime('%Y%m%d%H%M%S')
-            payment_id = f"REC-{timestamp}-ADV"
-            
-            advance_notes = f"{base_notes} [Advance Payment]"
-            
-            db.add_payment(
-                payment_id=payment_id,
-                party_id=party['id'],
-                amount=excess,
-                date=receipt_date,
-                mode=method,
-                invoice_id=None,
-                notes=advance_notes,
-                payment_type='RECEIPT'
-            )
+        allocations = [(a['invoice_id'], a['amount']) for a in self.fifo_allocations if a['amount'] > 0]
+        invoice_nos = ", ".join(a['invoice_no'] for a in self.fifo_allocations if a['amount'] > 0)
+        notes = f"{base_notes} [Allocated to {invoice_nos}]" if invoice_nos else f"{base_notes} [Advance Payment]"
+        
+        payment_id = f"REC-{datetime.datetime.now().strftime('%Y%m%d%H%M%S')}"
+        receipt_id = db.add_payment(
+            payment_id=payment_id,
+            party_id=party['id'],
+            amount=self.amount_input.value(),
+            date=receipt_date,
+            mode=method,
+            invoice_id=None,
+            notes=notes,
+            payment_type='RECEIPT'
+        )
+        db.add_payment_allocations(receipt_id, allocations)
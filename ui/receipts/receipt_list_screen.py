@@ -12,8 +12,8 @@ from PySide6.QtCore import Qt, Signal
 from theme import PRIMARY, SUCCESS, DANGER, WARNING, WARNING_LIGHT, DANGER_LIGHT, PRIMARY_LIGHT
 
 # Widget imports
-from widgets import StatCard, ListTable, TableFrame, StatsContainer, FilterWidget
-from ui.base.list_table_helper import ListTableHelper
+from widgets import StatCard, ListTableView, TableFrame, StatsContainer, FilterWidget, StatusPillDelegate, ActionButtonsDelegate
+from ui.base.list_table_model import ListTableModel
 
 # Controller import (NOT service directly)
 from controllers.receipt_controller import receipt_controller, ReceiptFilters
@@ -45,6 +45,12 @@ class ReceiptsScreen(BaseListScreen):
     # Signal emitted when receipt data changes
     receipt_updated = Signal()
     
+    # Reload only after writes to these tables
+    DATA_TABLES = ('payments', 'parties')
+    
+    # Scroll the table model instead of paging
+    ITEMS_PER_PAGE = BaseListScreen.MODEL_PAGE_SIZE
+    
     def __init__(self, parent=None):
         super().__init__(title="Receipts (Money In)", parent=parent)
         self.setObjectName("ReceiptsScreen")
@@ -140,29 +146,7 @@ class ReceiptsScreen(BaseListScreen):
         """Create the receipts table."""
         frame = TableFrame()
         
-        # Create table using common widget
-        self._table = ListTable(headers=[
-            "#", "Date", "Customer", "Amount", "Method", 
-            "Reference", "Invoice", "Status", "Actions"
-        ])
-        
-        # Column configuration
-        self._table.configure_columns([
-            {"width": 50, "resize": "fixed"},     # #
-            {"width": 100, "resize": "fixed"},    # Date
-            {"resize": "stretch"},                 # Customer
-            {"width": 120, "resize": "fixed"},    # Amount
-            {"width": 110, "resize": "fixed"},    # Method
-            {"width": 130, "resize": "fixed"},    # Reference
-            {"width": 100, "resize": "fixed"},    # Invoice
-            {"width": 90, "resize": "fixed"},     # Status
-            {"width": 140, "resize": "fixed"},    # Actions
-        ])
-        
-        # Initialize ListTableHelper for populating the table
-        self._table_helper = ListTableHelper(self._table, self.ITEMS_PER_PAGE)
-        
-        # Define column configurations for table population (columns 0-6 only, 7-8 are custom)
+        # Define column configurations - status pill and action buttons are painted by delegates
         self._column_configs = [
             {'type': 'row_number'},
             {'key': 'date', 'type': 'date', 'align': Qt.AlignCenter,
@@ -176,8 +160,45 @@ class ReceiptsScreen(BaseListScreen):
              'formatter': lambda v: v or '-'},
             {'key': 'invoice_id', 'type': 'text', 'align': Qt.AlignCenter,
              'formatter': lambda v: f"INV-{v}" if v else '-'},
+            {'type': 'pill', 'key': 'status', 'default': 'Completed'},
+            {'type': 'actions'},
         ]
         
+        # Create model-based table: cells are formatted on demand, no widgets per row
+        self._table_model = ListTableModel(
+            headers=["#", "Date", "Customer", "Amount", "Method", "Reference", "Invoice", "Status", "Actions"],
+            column_configs=self._column_configs,
+            items_per_page=self.ITEMS_PER_PAGE,
+            parent=self
+        )
+        self._table = ListTableView(self._table_model)
+        
+        # Column configuration
+        self._table.configure_columns([
+            {"width": 50, "resize": "fixed"},     # #
+            {"width": 100, "resize": "fixed"},    # Date
+            {"resize": "stretch"},                 # Customer
+            {"width": 120, "resize": "fixed"},    # Amount
+            {"width": 110, "resize": "fixed"},    # Method
+            {"width": 130, "resize": "fixed"},    # Reference
+            {"width": 100, "resize": "fixed"},    # Invoice
+            {"width": 90, "resize": "fixed"},     # Status
+            {"width": 140, "resize": "fixed"},    # Actions
+        ])
+        
+        # Column 7: status pill, column 8: action buttons
+        self._table.setItemDelegateForColumn(7, StatusPillDelegate(parent=self._table))
+        self._actions_delegate = ActionButtonsDelegate([
+            {'name': 'view', 'text': 'View', 'tooltip': 'View Receipt Details', 'bg_color': PRIMARY_LIGHT,
+             'hover_color': PRIMARY, 'size': (40, 28)},
+            {'name': 'edit', 'text': 'Edit', 'tooltip': 'Edit Receipt', 'bg_color': WARNING_LIGHT,
+             'hover_color': WARNING, 'size': (40, 28)},
+            {'name': 'delete', 'text': 'Del', 'tooltip': 'Delete Receipt', 'bg_color': DANGER_LIGHT,
+             'hover_color': DANGER, 'size': (40, 28)},
+        ], self._table)
+        self._actions_delegate.action_clicked.connect(self._on_row_action)
+        self._table.setItemDelegateForColumn(8, self._actions_delegate)
+        
         frame.set_table(self._table)
         return frame
     
@@ -203,18 +224,27 @@ class ReceiptsScreen(BaseListScreen):
         Returns:
             Filtered list of receipts
         """
-        search_text = self.get_safe_filter_value(
-            self._filter_widget.get_search_text() if hasattr(self, '_filter_widget') else ""
-        )
-        method_filter = self._method_combo.currentData() if hasattr(self, '_method_combo') else "All Methods"
-        period_filter = self._period_combo.currentData() if hasattr(self, '_period_combo') else "All Time"
-        status_filter = self._status_combo.currentData() if hasattr(self, '_status_combo') else "All Status"
-        party_filter = self._party_combo.currentData() if hasattr(self, '_party_combo') else "All Customers"
+        return self._apply_filters(all_data, **self._filter_state())
+    
+    def _filter_state(self) -> dict:
+        """Read the current filter values (GUI thread).
         
-        # Update party/customer filter with available parties
+        Returns:
+            Keyword arguments for _apply_filters()
+        """
+        return {
+            'search_text': self.get_safe_filter_value(
+                self._filter_widget.get_search_text() if hasattr(self, '_filter_widget') else ""
+            ),
+            'method_filter': self._method_combo.currentData() if hasattr(self, '_method_combo') else "All Methods",
+            'period_filter': self._period_combo.currentData() if hasattr(self, '_period_combo') else "All Time",
+            'status_filter': self._status_combo.currentData() if hasattr(self, '_status_combo') else "All Status",
+            'party_filter': self._party_combo.currentData() if hasattr(self, '_party_combo') else "All Customers",
+        }
+    
+    def _on_data_fetched(self, all_data: list):
+        """Update party/customer filter with available parties."""
         self._update_party_filter()
-        
-        return self._apply_filters(all_data, search_text, method_filter, period_filter, status_filter, party_filter)
     
     def _apply_filters(self, receipts: list, search_text: str, method_filter: str, 
                        period_filter: str, status_filter: str, party_filter: str) -> list:
@@ -282,7 +312,7 @@ class ReceiptsScreen(BaseListScreen):
         self._party_combo.blockSignals(False)
     
     def _populate_table(self, receipts: list):
-        """Populate table with receipt data using ListTableHelper.
+        """Show receipt data in the table model.
         
         Args:
             receipts: List of receipts for current page
@@ -290,37 +320,26 @@ class ReceiptsScreen(BaseListScreen):
         # Get current page from pagination widget
         current_page = self.pagination_widget.get_current_page() if self.pagination_widget else 1
         
-        logger.debug(f"Populating table with {len(receipts)} receipts using ListTableHelper")
+        logger.debug(f"Populating table with {len(receipts)} receipts")
+        self._table_model.populate(receipts, current_page)
+    
+    def _on_row_action(self, action: str, row: int):
+        """Dispatch a click on a row's action button.
         
-        # Use ListTableHelper to populate basic columns (0-6)
-        self._table_helper.populate(
-            data=receipts,
-            column_configs=self._column_configs,
-            current_page=current_page
-        )
+        Args:
+            action: Action name from the actions delegate
+            row: Table row that was clicked
+        """
+        receipt = self._table_model.row_data(row)
+        if receipt is None:
+            return
         
-        # Add custom widgets for status (col 7) and action buttons (col 8)
-        for row in range(self._table.rowCount()):
-            receipt = receipts[row] if row < len(receipts) else None
-            if receipt:
-                # Column 7: Status badge using helper
-                status = receipt.get('status', 'Completed')
-                status_widget = self._table_helper.create_status_badge(status)
-                self._table.setCellWidget(row, 7, status_widget)
-                
-                # Column 8: Action buttons using helper
-                actions = [
-                    {'text': 'View', 'tooltip': 'View Receipt Details', 'bg_color': PRIMARY_LIGHT, 
-                     'hover_color': PRIMARY, 'callback': lambda checked, r=receipt: self._on_view_clicked(r)},
-                    {'text': 'Edit', 'tooltip': 'Edit Receipt', 'bg_color': WARNING_LIGHT, 
-                     'hover_color': WARNING, 'callback': lambda checked, r=receipt: self._on_edit_clicked(r)},
-                    {'text': 'Del', 'tooltip': 'Delete Receipt', 'bg_color': DANGER_LIGHT, 
-                     'hover_color': DANGER, 'callback': lambda checked, r=receipt: self._on_delete_clicked(r)},
-                ]
-                actions_widget = self._table_helper.create_action_buttons(actions)
-                self._table.setCellWidget(row, 8, actions_widget)
-        
-        logger.debug(f"Table populated with {self._table.rowCount()} rows")
+        handlers = {
+            'view': self._on_view_clicked,
+            'edit': self._on_edit_clicked,
+            'delete': self._on_delete_clicked,
+        }
+        handlers[action](receipt)
 
     # ─────────────────────────────────────────────────────────────────────────
     # Event Handlers (Screen-specific)
@@ -5,30 +5,63 @@ Reports screen - Comprehensive business reports and analytics
 from PySide6.QtWidgets import (
     QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QWidget, QFrame, 
     QGridLayout, QComboBox, QDateEdit, QSpinBox, QScrollArea, QFileDialog,
-    QMessageBox, QCheckBox, QTabWidget, QTableWidget, QTableWidgetItem
+    QMessageBox, QCheckBox, QTabWidget, QTableWidget, QTableWidgetItem,
+    QHeaderView, QProgressBar
 )
 from PySide6.QtCore import Qt, QDate
 from PySide6.QtGui import QFont, QColor, QIcon
 from PySide6.QtPrintSupport import QPrinter
 
 from ui.base.base_screen import BaseScreen
-from widgets import CustomButton, CustomTable
+from ui.base.list_table_model import ListTableModel
+from ui.base.list_load_worker import ListLoadWorker
+from widgets import CustomButton, CustomTable, ListTableView
 from theme import (
     PRIMARY, WHITE, TEXT_PRIMARY, TEXT_SECONDARY, BORDER, BACKGROUND,
     SUCCESS, DANGER, WARNING, PURPLE, get_title_font
 )
 from core.db.sqlite_db import db
+from core.services.report_service import report_service
 from datetime import datetime, timedelta
 import json
 import csv
 import os
 
 
+def _rupees(key):
+    """Report column showing a row's amount as '₹ 1234.00'"""
+    return {'display': lambda row: f"₹ {float(row[key] or 0):.2f}"}
+
+
+def _fixed(text):
+    """Report column showing the same text on every row"""
+    return {'display': lambda row: text}
+
+
+# Invoice columns shared by the sales and purchase reports
+_INVOICE_REPORT_COLUMNS = [
+    {'key': 'invoice_no'},
+    {'key': 'date'},
+    {'key': 'party_name'},
+    _rupees('subtotal'),
+    _rupees('cgst'),
+    _rupees('sgst'),
+    _rupees('igst'),
+    _rupees('grand_total'),
+]
+
+
 class ReportsScreen(BaseScreen):
     """Reports and analytics screen with multiple report types"""
     
     def __init__(self):
         super().__init__(title="Reports & Analytics")
+        # Streamed reports (sales, purchase, tax): name -> models, progress widgets, worker
+        self._report_models = {}
+        self._report_progress = {}
+        self._report_workers = {}  # last worker per report, kept until the next run
+        self._running_reports = {}  # report name -> generation still running
+        self._report_generation = 0
         self.setup_reports_ui()
         
     def setup_reports_ui(self):
@@ -72,15 +105,15 @@ class ReportsScreen(BaseScreen):
         # Filters section
         filter_layout = self.create_filter_section("Sales Report Filters")
         layout.addLayout(filter_layout)
+        self.sales_dates = (self.from_date, self.to_date)
         
         # Report table
-        self.sales_table = CustomTable()
-        self.sales_table.setColumnCount(8)
-        self.sales_table.setHorizontalHeaderLabels([
+        self.sales_table = self.create_report_table('sales', [
             "Invoice No", "Date", "Party", "Amount", "CGST", "SGST", "IGST", "Total"
-        ])
+        ], _INVOICE_REPORT_COLUMNS)
         layout.addWidget(QLabel("Sales Records:"))
         layout.addWidget(self.sales_table)
+        layout.addLayout(self.create_progress_row('sales'))
         
         # Action buttons
         button_layout = self.create_action_buttons(
@@ -101,15 +134,15 @@ class ReportsScreen(BaseScreen):
         # Filters section
         filter_layout = self.create_filter_section("Purchase Report Filters")
         layout.addLayout(filter_layout)
+        self.purchase_dates = (self.from_date, self.to_date)
         
         # Report table
-        self.purchase_table = CustomTable()
-        self.purchase_table.setColumnCount(8)
-        self.purchase_table.setHorizontalHeaderLabels([
+        self.purchase_table = self.create_report_table('purchase', [
             "Invoice No", "Date", "Supplier", "Amount", "CGST", "SGST", "IGST", "Total"
-        ])
+        ], _INVOICE_REPORT_COLUMNS)
         layout.addWidget(QLabel("Purchase Records:"))
         layout.addWidget(self.purchase_table)
+        layout.addLayout(self.create_progress_row('purchase'))
         
         # Action buttons
         button_layout = self.create_action_buttons(
@@ -213,15 +246,23 @@ class ReportsScreen(BaseScreen):
         # Filters
         filter_layout = self.create_filter_section("Tax Report Filters")
         layout.addLayout(filter_layout)
+        self.tax_dates = (self.from_date, self.to_date)
         
         # Tax report table
-        self.tax_table = CustomTable()
-        self.tax_table.setColumnCount(7)
-        self.tax_table.setHorizontalHeaderLabels([
+        self.tax_table = self.create_report_table('tax', [
             "Invoice No", "Date", "Party", "Taxable Amount", "CGST %", "SGST %", "IGST %"
+        ], [
+            {'key': 'invoice_no'},
+            {'key': 'date'},
+            {'key': 'party_name'},
+            _rupees('subtotal'),
+            _fixed("9%"),
+            _fixed("9%"),
+            _fixed("0%"),
         ])
         layout.addWidget(QLabel("Tax Details:"))
         layout.addWidget(self.tax_table)
+        layout.addLayout(self.create_progress_row('tax'))
         
         # Action buttons
         button_layout = self.create_action_buttons(
@@ -353,6 +394,58 @@ class ReportsScreen(BaseScreen):
         
         return card
         
+    def create_report_table(self, report, headers, column_configs):
+        """
+        Create a model-based table for a streamed report
+        
+        Args:
+            report: Report name ('sales', 'purchase', 'tax')
+            headers: Column header labels
+            column_configs: ListTableModel column configs
+            
+        Returns:
+            ListTableView showing the report's model
+        """
+        model = ListTableModel(headers, column_configs, parent=self)
+        self._report_models[report] = model
+        table = ListTableView(model)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        return table
+    
+    def create_progress_row(self, report):
+        """Create the progress bar, status text and cancel button of a streamed report"""
+        layout = QHBoxLayout()
+        
+        progress = QProgressBar()
+        progress.setFixedHeight(16)
+        progress.setTextVisible(False)
+        progress.setStyleSheet(f"""
+            QProgressBar {{
+                background: {BACKGROUND};
+                border: 1px solid {BORDER};
+                border-radius: 4px;
+            }}
+            QProgressBar::chunk {{
+                background: {PRIMARY};
+                border-radius: 3px;
+            }}
+        """)
+        progress.hide()
+        
+        status = QLabel("")
+        status.setStyleSheet(f"color: {TEXT_SECONDARY};")
+        
+        cancel_btn = CustomButton("Cancel", DANGER)
+        cancel_btn.clicked.connect(lambda: self.cancel_report(report))
+        cancel_btn.hide()
+        
+        layout.addWidget(progress, 1)
+        layout.addWidget(status)
+        layout.addWidget(cancel_btn)
+        
+        self._report_progress[report] = (progress, status, cancel_btn)
+        return layout
+        
     def get_input_style(self):
         """Get input field styling"""
         return f"""
@@ -368,47 +461,28 @@ class ReportsScreen(BaseScreen):
             }}
         """
         
+    def _date_range(self, dates):
+        """(from, to) ISO date strings of a tab's date edits"""
+        from_edit, to_edit = dates
+        return from_edit.date().toString("yyyy-MM-dd"), to_edit.date().toString("yyyy-MM-dd")
+        
     def load_sales_report(self):
-        """Load and display sales report"""
-        try:
-            from_date = self.from_date.date().toString("yyyy-MM-dd")
-            to_date = self.to_date.date().toString("yyyy-MM-dd")
-            
-            # Get invoices from database
-            all_invoices = db.get_invoices() if hasattr(db, 'get_invoices') else []
-            
-            # Filter by date and type (Sales invoices are type 0 or NULL, Purchase are type 1)
-            invoices = [
-                inv for inv in all_invoices 
-                if inv.get('date', '') >= from_date and inv.get('date', '') <= to_date
-                and (inv.get('internal_type') is None or inv.get('internal_type') == 0 or inv.get('internal_type') == 'SALES')
-            ]
-            
-            self.populate_sales_table(invoices)
-            QMessageBox.information(self, "Success", f"Sales report loaded successfully! ({len(invoices)} records)")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to load sales report: {str(e)}")
+        """Generate sales report in the background"""
+        from_date, to_date = self._date_range(self.sales_dates)
+        self.start_report(
+            'sales', "Sales",
+            count=lambda: report_service.count_sales_invoices(from_date, to_date),
+            batches=lambda: report_service.iter_sales_invoices(from_date, to_date)
+        )
             
     def load_purchase_report(self):
-        """Load and display purchase report"""
-        try:
-            from_date = self.from_date.date().toString("yyyy-MM-dd")
-            to_date = self.to_date.date().toString("yyyy-MM-dd")
-            
-            # Get purchase invoices
-            all_invoices = db.get_invoices() if hasattr(db, 'get_invoices') else []
-            
-            # Filter by date and type (Purchase invoices are type 1 or 'PURCHASE')
-            purchases = [
-                inv for inv in all_invoices 
-                if inv.get('date', '') >= from_date and inv.get('date', '') <= to_date
-                and (inv.get('internal_type') == 1 or inv.get('internal_type') == 'PURCHASE')
-            ]
-            
-            self.populate_purchase_table(purchases)
-            QMessageBox.information(self, "Success", f"Purchase report loaded successfully! ({len(purchases)} records)")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to load purchase report: {str(e)}")
+        """Generate purchase report in the background"""
+        from_date, to_date = self._date_range(self.purchase_dates)
+        self.start_report(
+            'purchase', "Purchase",
+            count=lambda: report_service.count_purchase_invoices(from_date, to_date),
+            batches=lambda: report_service.iter_purchase_invoices(from_date, to_date)
+        )
             
     def load_party_report(self):
         """Load and display party report"""
@@ -431,25 +505,15 @@ class ReportsScreen(BaseScreen):
             QMessageBox.critical(self, "Error", f"Failed to load product report: {str(e)}")
             
     def load_tax_report(self):
-        """Load and display tax report"""
-        try:
-            from_date = self.from_date.date().toString("yyyy-MM-dd")
-            to_date = self.to_date.date().toString("yyyy-MM-dd")
-            
-            # Get all invoices
-            all_invoices = db.get_invoices() if hasattr(db, 'get_invoices') else []
-            
-            # Filter by date range
-            invoices = [
-                inv for inv in all_invoices 
-                if inv.get('date', '') >= from_date and inv.get('date', '') <= to_date
-            ]
-            
-            self.populate_tax_table(invoices)
-            self.update_tax_stats(invoices)
-            QMessageBox.information(self, "Success", f"Tax report loaded successfully! ({len(invoices)} records)")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to load tax report: {str(e)}")
+        """Generate tax report in the background"""
+        from_date, to_date = self._date_range(self.tax_dates)
+        self.start_report(
+            'tax', "Tax",
+            count=lambda: report_service.count_sales_invoices(from_date, to_date),
+            batches=lambda: report_service.iter_sales_invoices(from_date, to_date),
+            summary=lambda: report_service.get_tax_totals(from_date, to_date),
+            on_summary=self.update_tax_stats
+        )
             
     def load_payment_report(self):
         """Load and display payment report"""
@@ -464,44 +528,6 @@ class ReportsScreen(BaseScreen):
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load payment report: {str(e)}")
             
-    def populate_sales_table(self, invoices):
-        """Populate sales table with data"""
-        self.sales_table.setRowCount(len(invoices))
-        for row, invoice in enumerate(invoices):
-            # Get party name from party_id
-            party_name = ""
-            if invoice.get('party_id') and hasattr(db, 'get_party_by_id'):
-                party = db.get_party_by_id(invoice.get('party_id'))
-                party_name = party.get('name', '') if party else ""
-            
-            self.sales_table.setItem(row, 0, QTableWidgetItem(str(invoice.get('invoice_no', ''))))
-            self.sales_table.setItem(row, 1, QTableWidgetItem(str(invoice.get('date', ''))))
-            self.sales_table.setItem(row, 2, QTableWidgetItem(party_name))
-            self.sales_table.setItem(row, 3, QTableWidgetItem(f"₹ {float(invoice.get('subtotal', 0)):.2f}"))
-            self.sales_table.setItem(row, 4, QTableWidgetItem(f"₹ {float(invoice.get('cgst', 0)):.2f}"))
-            self.sales_table.setItem(row, 5, QTableWidgetItem(f"₹ {float(invoice.get('sgst', 0)):.2f}"))
-            self.sales_table.setItem(row, 6, QTableWidgetItem(f"₹ {float(invoice.get('igst', 0)):.2f}"))
-            self.sales_table.setItem(row, 7, QTableWidgetItem(f"₹ {float(invoice.get('grand_total', 0)):.2f}"))
-            
-    def populate_purchase_table(self, invoices):
-        """Populate purchase table with data"""
-        self.purchase_table.setRowCount(len(invoices))
-        for row, invoice in enumerate(invoices):
-            # Get party name from party_id
-            party_name = ""
-            if invoice.get('party_id') and hasattr(db, 'get_party_by_id'):
-                party = db.get_party_by_id(invoice.get('party_id'))
-                party_name = party.get('name', '') if party else ""
-            
-            self.purchase_table.setItem(row, 0, QTableWidgetItem(str(invoice.get('invoice_no', ''))))
-            self.purchase_table.setItem(row, 1, QTableWidgetItem(str(invoice.get('date', ''))))
-            self.purchase_table.setItem(row, 2, QTableWidgetItem(party_name))
-            self.purchase_table.setItem(row, 3, QTableWidgetItem(f"₹ {float(invoice.get('subtotal', 0)):.2f}"))
-            self.purchase_table.setItem(row, 4, QTableWidgetItem(f"₹ {float(invoice.get('cgst', 0)):.2f}"))
-            self.purchase_table.setItem(row, 5, QTableWidgetItem(f"₹ {float(invoice.get('sgst', 0)):.2f}"))
-            self.purchase_table.setItem(row, 6, QTableWidgetItem(f"₹ {float(invoice.get('igst', 0)):.2f}"))
-            self.purchase_table.setItem(row, 7, QTableWidgetItem(f"₹ {float(invoice.get('grand_total', 0)):.2f}"))
-            
     def populate_party_table(self, parties):
         """Populate party table with data"""
         self.party_table.setRowCount(len(parties))
@@ -525,24 +551,6 @@ class ReportsScreen(BaseScreen):
             self.product_table.setItem(row, 5, QTableWidgetItem(f"{float(product.get('tax_rate', 0)):.0f}%"))
             self.product_table.setItem(row, 6, QTableWidgetItem(str(product.get('category', ''))))
             
-    def populate_tax_table(self, invoices):
-        """Populate tax table with data"""
-        self.tax_table.setRowCount(len(invoices))
-        for row, invoice in enumerate(invoices):
-            # Get party name from party_id
-            party_name = ""
-            if invoice.get('party_id') and hasattr(db, 'get_party_by_id'):
-                party = db.get_party_by_id(invoice.get('party_id'))
-                party_name = party.get('name', '') if party else ""
-            
-            self.tax_table.setItem(row, 0, QTableWidgetItem(str(invoice.get('invoice_no', ''))))
-            self.tax_table.setItem(row, 1, QTableWidgetItem(str(invoice.get('date', ''))))
-            self.tax_table.setItem(row, 2, QTableWidgetItem(party_name))
-            self.tax_table.setItem(row, 3, QTableWidgetItem(f"₹ {float(invoice.get('subtotal', 0)):.2f}"))
-            self.tax_table.setItem(row, 4, QTableWidgetItem("9%"))
-            self.tax_table.setItem(row, 5, QTableWidgetItem("9%"))
-            self.tax_table.setItem(row, 6, QTableWidgetItem("0%"))
-            
     def populate_payment_table(self, payments):
         """Populate payment table with data"""
         self.payment_table.setRowCount(len(payments))
@@ -590,11 +598,11 @@ class ReportsScreen(BaseScreen):
         if labels:
             labels[-1].setText(f"₹ {value:.2f}")
         
-    def update_tax_stats(self, invoices):
-        """Update tax statistics"""
-        cgst = sum(float(inv.get('cgst', 0)) for inv in invoices)
-        sgst = sum(float(inv.get('sgst', 0)) for inv in invoices)
-        igst = sum(float(inv.get('igst', 0)) for inv in invoices)
+    def update_tax_stats(self, totals):
+        """Update tax statistics from report_service.get_tax_totals()"""
+        cgst = totals['cgst']
+        sgst = totals['sgst']
+        igst = totals['igst']
         
         labels = self.cgst_collected_label.findChildren(QLabel)
         if labels:
@@ -626,6 +634,93 @@ class ReportsScreen(BaseScreen):
         if labels:
             labels[-1].setText(f"₹ {pending:.2f}")
         
+    # ─────────────────────────────────────────────────────────────────────────
+    # Background Report Generation
+    # ─────────────────────────────────────────────────────────────────────────
+    
+    def start_report(self, report, title, count, batches, summary=None, on_summary=None):
+        """
+        Generate a streamed report in a ListLoadWorker
+        
+        Rows are appended to the report's table as each batch arrives; a
+        running generation of the same report is cancelled first.
+        
+        Args:
+            report: Report name ('sales', 'purchase', 'tax')
+            title: Report title for messages
+            count: Callable returning the number of rows (for progress)
+            batches: Callable returning an iterator of row batches
+            summary: Optional callable computed after the rows
+            on_summary: Called on the GUI thread with the summary result
+        """
+        self.cancel_report(report, quiet=True)
+        self._report_models[report].populate([])
+        
+        self._report_generation += 1
+        worker = ListLoadWorker(self._report_generation, summary, batches=batches, count=count)
+        worker.signals.batch_ready.connect(
+            lambda generation, rows, done, total: self._on_report_batch(report, generation, rows, done, total))
+        worker.signals.finished.connect(
+            lambda generation, result: self._on_report_finished(report, title, on_summary, generation, result))
+        worker.signals.failed.connect(
+            lambda generation, message: self._on_report_failed(report, title, generation, message))
+        self._report_workers[report] = worker
+        self._running_reports[report] = worker.generation
+        
+        progress, status, cancel_btn = self._report_progress[report]
+        progress.setRange(0, 0)  # busy until the row count is known
+        progress.show()
+        cancel_btn.show()
+        status.setText("Generating report...")
+        worker.start()
+    
+    def cancel_report(self, report, quiet=False):
+        """Stop a running report, keeping the rows already shown"""
+        if self._running_reports.pop(report, None) is None:
+            return
+        self._report_workers[report].cancel()
+        progress, status, cancel_btn = self._report_progress[report]
+        progress.hide()
+        cancel_btn.hide()
+        if not quiet:
+            rows = self._report_models[report].rowCount()
+            status.setText(f"Cancelled ({rows:,} records loaded)")
+    
+    def _is_current_report(self, report, generation):
+        return self._running_reports.get(report) == generation
+    
+    def _on_report_batch(self, report, generation, rows, done, total):
+        if not self._is_current_report(report, generation):
+            return
+        self._report_models[report].append(rows)
+        progress, status, _ = self._report_progress[report]
+        progress.setRange(0, total)
+        progress.setValue(done)
+        status.setText(f"{done:,} of {total:,} records")
+    
+    def _on_report_finished(self, report, title, on_summary, generation, result):
+        if not self._is_current_report(report, generation):
+            return
+        del self._running_reports[report]
+        progress, status, cancel_btn = self._report_progress[report]
+        progress.hide()
+        cancel_btn.hide()
+        rows = self._report_models[report].rowCount()
+        status.setText(f"{rows:,} records")
+        if on_summary is not None:
+            on_summary(result)
+        QMessageBox.information(self, "Success", f"{title} report loaded successfully! ({rows} records)")
+    
+    def _on_report_failed(self, report, title, generation, message):
+        if not self._is_current_report(report, generation):
+            return
+        del self._running_reports[report]
+        progress, status, cancel_btn = self._report_progress[report]
+        progress.hide()
+        cancel_btn.hide()
+        status.setText("")
+        QMessageBox.critical(self, "Error", f"Failed to load {title.lower()} report: {message}")
+        
     def export_to_csv(self, table, report_name):
         """Export table to CSV file"""
         try:
@@ -642,19 +737,16 @@ class ReportsScreen(BaseScreen):
             with open(file_path, 'w', newline='') as f:
                 writer = csv.writer(f)
                 
+                # Read through the model: works for item tables and report views
+                model = table.model()
+                columns = range(model.columnCount())
+                
                 # Write headers
-                headers = []
-                for col in range(table.columnCount()):
-                    headers.append(table.horizontalHeaderItem(col).text())
-                writer.writerow(headers)
+                writer.writerow([model.headerData(col, Qt.Horizontal) for col in columns])
                 
                 # Write data
-                for row in range(table.rowCount()):
-                    row_data = []
-                    for col in range(table.columnCount()):
-                        item = table.item(row, col)
-                        row_data.append(item.text() if item else "")
-                    writer.writerow(row_data)
+                for row in range(model.rowCount()):
+                    writer.writerow([model.index(row, col).data() or "" for col in columns])
                     
             QMessageBox.information(self, "Success", f"Report exported to {file_path}")
         except Exception as e:
@@ -5,7 +5,7 @@ Widgets module - Reusable UI components
 from .common_widgets import (
     # General widgets
     CustomButton, CustomInput, CustomLabel, CustomComboBox,
-    CustomTable, StatCard, TableActionButton, ListTable, TableFrame,
+    CustomTable, StatCard, TableActionButton, ListTable, ListTableView, TableFrame,
     SearchInputContainer, RefreshButton, ListHeader, StatsContainer,
     SearchBox, FormField, SidebarButton, Sidebar,
     # Dialog-specific widgets
@@ -17,11 +17,12 @@ from .common_widgets import (
     InvoiceItemWidget, highlight_error, highlight_success, show_validation_error
 )
 from .filter_widget import FilterWidget
+from .table_delegates import StatusPillDelegate, ActionButtonsDelegate
 
 __all__ = [
     # General widgets
     'CustomButton', 'CustomInput', 'CustomLabel', 'CustomComboBox',
-    'CustomTable', 'StatCard', 'TableActionButton', 'ListTable', 'TableFrame',
+    'CustomTable', 'StatCard', 'TableActionButton', 'ListTable', 'ListTableView', 'TableFrame',
     'SearchInputContainer', 'RefreshButton', 'ListHeader', 'StatsContainer',
     'SearchBox', 'FormField', 'SidebarButton', 'Sidebar',
     # Dialog-specific widgets
@@ -32,5 +33,7 @@ __all__ = [
     # Invoice item widget and helpers
     'InvoiceItemWidget', 'highlight_error', 'highlight_success', 'show_validation_error',
     # Filter widget
-    'FilterWidget'
+    'FilterWidget',
+    # Table delegates
+    'StatusPillDelegate', 'ActionButtonsDelegate'
 ]
@@ -3,7 +3,7 @@ Custom widgets and reusable UI components
 """
 
 from PySide6.QtWidgets import (
-    QPushButton, QLineEdit, QLabel, QComboBox, QTableWidget, 
+    QPushButton, QLineEdit, QLabel, QComboBox, QTableWidget, QTableView,
     QVBoxLayout, QHBoxLayout, QFrame, QHeaderView, QAbstractItemView,
     QScrollArea, QWidget, QSpinBox, QDoubleSpinBox, QCheckBox, QTextEdit,
     QDialog, QListWidget, QMessageBox, QCompleter, QStyledItemDelegate,
@@ -344,24 +344,7 @@ class ListTable(QTableWidget):
                 {"width": 100, "resize": "fixed"},
             ])
         """
-        header = self.horizontalHeader()
-        
-        for idx, config in enumerate(column_configs):
-            if idx >= self.columnCount():
-                break
-            
-            # Support both "resize" and "mode" keys
-            resize_mode = config.get("resize", config.get("mode", "fixed"))
-            if resize_mode == "stretch":
-                header.setSectionResizeMode(idx, QHeaderView.Stretch)
-            elif resize_mode == "resize_to_contents":
-                header.setSectionResizeMode(idx, QHeaderView.ResizeToContents)
-            else:
-                header.setSectionResizeMode(idx, QHeaderView.Fixed)
-            
-            # Set fixed width if specified
-            if "width" in config:
-                self.setColumnWidth(idx, config["width"])
+        _configure_table_columns(self, self.columnCount(), column_configs)
     
     def add_row_with_data(self, row_data: list, row_height: int = 50) -> int:
         """
@@ -405,6 +388,80 @@ class ListTable(QTableWidget):
         return row
 
 
+class ListTableView(QTableView):
+    """
+    Model-based counterpart of ListTable for large lists.
+    
+    Same look and settings as ListTable, but cells come from a model
+    (see ui.base.ListTableModel) and status pills / action buttons are
+    painted by delegates (see widgets.table_delegates), so no widget or
+    item is allocated per row and only visible rows are ever formatted.
+    
+    Args:
+        model: Optional model to show
+        parent: Parent widget
+    
+    Example:
+        table = ListTableView(ListTableModel(headers, column_configs))
+        table.configure_columns([...])  # same configs as ListTable
+        table.setItemDelegateForColumn(5, StatusPillDelegate(parent=table))
+    """
+    
+    def __init__(self, model=None, parent=None):
+        super().__init__(parent)
+        self._setup_table()
+        if model is not None:
+            self.setModel(model)
+    
+    def _setup_table(self):
+        """Initialize table with the ListTable settings."""
+        self.setStyleSheet(get_enhanced_table_style())
+        
+        self.setAlternatingRowColors(True)
+        self.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.verticalHeader().setVisible(False)
+        self.setShowGrid(False)
+        
+        # Uniform row heights let the view skip measuring rows - scrolling stays
+        # smooth however many rows the model has
+        self.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.verticalHeader().setDefaultSectionSize(50)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+    
+    def configure_columns(self, column_configs: list):
+        """
+        Configure column widths and resize modes (call after setModel).
+        
+        Args:
+            column_configs: Same format as ListTable.configure_columns
+        """
+        _configure_table_columns(self, self.horizontalHeader().count(), column_configs)
+
+
+def _configure_table_columns(table: QTableView, column_count: int, column_configs: list):
+    """Apply ListTable-style column configs to a table or table view."""
+    header = table.horizontalHeader()
+    
+    for idx, config in enumerate(column_configs):
+        if idx >= column_count:
+            break
+        
+        # Support both "resize" and "mode" keys
+        resize_mode = config.get("resize", config.get("mode", "fixed"))
+        if resize_mode == "stretch":
+            header.setSectionResizeMode(idx, QHeaderView.Stretch)
+        elif resize_mode == "resize_to_contents":
+            header.setSectionResizeMode(idx, QHeaderView.ResizeToContents)
+        else:
+            header.setSectionResizeMode(idx, QHeaderView.Fixed)
+        
+        # Set fixed width if specified
+        if "width" in config:
+            table.setColumnWidth(idx, config["width"])
+
+
 class TableFrame(QFrame):
     """
     Reusable frame container for tables with consistent styling.
@@ -443,7 +500,7 @@ class TableFrame(QFrame):
             self._layout.setContentsMargins(16, 16, 16, 16)
             self._layout.setSpacing(0)
     
-    def set_table(self, table: QTableWidget):
+    def set_table(self, table: QTableView):
         """Add a table to this frame."""
         self._ensure_layout()
         self._layout.addWidget(table)
@@ -0,0 +1,283 @@
+"""
+Table delegates - Painted cell content for model-based list tables
+Replace per-row QLabel badges and QPushButton action widgets in ListTableView
+
+Features:
+- StatusPillDelegate: rounded, color-coded status pill
+- ActionButtonsDelegate: row action buttons with hover state, tooltips and
+  click handling by hit-testing - no widget is created per row
+"""
+
+from PySide6.QtWidgets import (
+    QStyledItemDelegate, QStyleOptionViewItem, QStyle, QApplication, QToolTip
+)
+from PySide6.QtCore import Qt, QEvent, QRect, QSize, Signal
+from PySide6.QtGui import QColor, QPainter, QFontMetrics
+
+from theme import (
+    TEXT_PRIMARY, BORDER, WHITE, PRIMARY, SUCCESS, WARNING, DANGER,
+    SUCCESS_LIGHT, WARNING_LIGHT, DANGER_LIGHT, PRIMARY_LIGHT,
+    FONT_SIZE_SMALL, get_bold_font
+)
+
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Status -> (text color, background); same defaults as ListTableHelper.create_status_badge
+STATUS_PILL_COLORS = {
+    'Completed': (SUCCESS, SUCCESS_LIGHT),
+    'Paid': (SUCCESS, SUCCESS_LIGHT),
+    'Pending': (WARNING, WARNING_LIGHT),
+    'Unpaid': (WARNING, WARNING_LIGHT),
+    'Partially Paid': (PRIMARY, PRIMARY_LIGHT),
+    'Failed': (DANGER, DANGER_LIGHT),
+    'Cancelled': (DANGER, DANGER_LIGHT),
+    'Overdue': (DANGER, DANGER_LIGHT),
+}
+_UNKNOWN_STATUS_COLORS = (TEXT_PRIMARY, "#F3F4F6")
+
+# Model role holding a row's own (text_color, bg_color) for StatusPillDelegate
+PILL_COLORS_ROLE = Qt.UserRole + 1
+
+
+def _draw_cell_background(painter: QPainter, option, index):
+    """Draw the cell's background/selection only (no text)."""
+    opt = QStyleOptionViewItem(option)
+    opt.text = ""
+    style = opt.widget.style() if opt.widget else QApplication.style()
+    style.drawControl(QStyle.CE_ItemViewItem, opt, painter, opt.widget)
+
+
+def _small_bold_font():
+    """Font of the badge/button text (12px, bold - as in their stylesheets)."""
+    font = get_bold_font()
+    font.setPixelSize(FONT_SIZE_SMALL)
+    return font
+
+
+class StatusPillDelegate(QStyledItemDelegate):
+    """
+    Paints the cell's display text as a rounded status pill.
+
+    Colors come from PILL_COLORS_ROLE when the model provides it (e.g. a
+    stock badge colored by stock level), otherwise from color_map.
+
+    Args:
+        color_map: Dict mapping status -> (text_color, bg_color);
+                   defaults to STATUS_PILL_COLORS
+        parent: Parent object (usually the table view)
+    """
+
+    PADDING_X = 12
+    PADDING_Y = 4
+    RADIUS = 10
+
+    def __init__(self, color_map: dict = None, parent=None):
+        super().__init__(parent)
+        self._color_map = color_map or STATUS_PILL_COLORS
+        self._font = _small_bold_font()
+        self._metrics = QFontMetrics(self._font)
+        self._colors = {}  # color string -> QColor
+
+    def _color(self, name: str) -> QColor:
+        color = self._colors.get(name)
+        if color is None:
+            color = self._colors[name] = QColor(name)
+        return color
+
+    def paint(self, painter: QPainter, option, index):
+        """Paint background, then the pill centered in the cell."""
+        _draw_cell_background(painter, option, index)
+
+        text = index.data(Qt.DisplayRole)
+        if not text:
+            return
+        text = str(text)
+        colors = index.data(PILL_COLORS_ROLE)
+        text_color, bg_color = colors or self._color_map.get(text, _UNKNOWN_STATUS_COLORS)
+
+        cell = option.rect.adjusted(4, 4, -4, -4)
+        width = min(self._metrics.horizontalAdvance(text) + 2 * self.PADDING_X, cell.width())
+        height = min(self._metrics.height() + 2 * self.PADDING_Y, cell.height())
+        pill = QRect(0, 0, width, height)
+        pill.moveCenter(cell.center())
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(self._color(bg_color))
+        painter.drawRoundedRect(pill, self.RADIUS, self.RADIUS)
+        painter.setFont(self._font)
+        painter.setPen(self._color(text_color))
+        elided = self._metrics.elidedText(text, Qt.ElideRight, pill.width() - self.PADDING_X)
+        painter.drawText(pill, Qt.AlignCenter, elided)
+        painter.restore()
+
+    def sizeHint(self, option, index) -> QSize:
+        text = str(index.data(Qt.DisplayRole) or "")
+        return QSize(self._metrics.horizontalAdvance(text) + 2 * self.PADDING_X + 8,
+                     self._metrics.height() + 2 * self.PADDING_Y + 8)
+
+
+class ActionButtonsDelegate(QStyledItemDelegate):
+    """
+    Paints a row of action buttons in a cell and reports clicks.
+
+    Buttons look like TableActionButton (hover fills with the hover color).
+    A click is hit-tested against the painted button rectangles and emitted
+    as action_clicked(name, row) - connect once instead of per row.
+
+    Args:
+        actions: List of action dicts with keys:
+            - 'name': Identifier emitted on click (e.g. 'view', 'delete')
+            - 'text': Button text
+            - 'tooltip': Tooltip text (optional)
+            - 'bg_color': Background color (optional, default '#EEF2FF')
+            - 'hover_color': Hover color (optional, default PRIMARY)
+            - 'size': Tuple (width, height) (optional, default (60, 32))
+        view: Table view the delegate is installed on
+
+    Example:
+        delegate = ActionButtonsDelegate([
+            {'name': 'view', 'text': 'View', 'bg_color': PRIMARY_LIGHT, 'hover_color': PRIMARY},
+            {'name': 'delete', 'text': 'Del', 'bg_color': DANGER_LIGHT, 'hover_color': DANGER},
+        ], table)
+        table.setItemDelegateForColumn(6, delegate)
+        delegate.action_clicked.connect(self._on_row_action)
+    """
+
+    # Emitted with (action name, model row) when a button is clicked
+    action_clicked = Signal(str, int)
+
+    SPACING = 4
+    RADIUS = 4
+
+    def __init__(self, actions: list, view, parent=None):
+        super().__init__(parent or view)
+        self._view = view
+        self._actions = [
+            {
+                'name': action.get('name', action.get('text', 'action')),
+                'text': action.get('text', 'Action'),
+                'tooltip': action.get('tooltip', ''),
+                'bg_color': QColor(action.get('bg_color', '#EEF2FF')),
+                'hover_color': QColor(action.get('hover_color', PRIMARY)),
+                'size': action.get('size', (60, 32)),
+            }
+            for action in actions
+        ]
+        self._font = _small_bold_font()
+        self._border = QColor(BORDER)
+        self._text_color = QColor(TEXT_PRIMARY)
+        self._hover_text_color = QColor(WHITE)
+        self._hover = None  # (row, column, action name) under the mouse
+        self._pressed = None  # (row, action name) of the pending click
+
+        # Hover is tracked on the viewport so it clears when the mouse leaves the column
+        view.setMouseTracking(True)
+        view.viewport().installEventFilter(self)
+
+    def _button_rects(self, cell: QRect) -> list:
+        """(action, rect) pairs for the buttons, centered in the cell."""
+        total = sum(a['size'][0] for a in self._actions) + self.SPACING * (len(self._actions) - 1)
+        x = cell.center().x() - total // 2
+        rects = []
+        for action in self._actions:
+            width, height = action['size']
+            height = min(height, cell.height() - 4)
+            y = cell.center().y() - height // 2
+            rects.append((action, QRect(x, y, width, height)))
+            x += width + self.SPACING
+        return rects
+
+    def _action_at(self, pos, cell: QRect):
+        """Action under pos within a cell, or None."""
+        for action, rect in self._button_rects(cell):
+            if rect.contains(pos):
+                return action
+        return None
+
+    def paint(self, painter: QPainter, option, index):
+        """Paint background and buttons (hovered one filled with its hover color)."""
+        _draw_cell_background(painter, option, index)
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setFont(self._font)
+        for action, rect in self._button_rects(option.rect):
+            hovered = self._hover == (index.row(), index.column(), action['name'])
+            fill = action['hover_color'] if hovered else action['bg_color']
+            painter.setPen(action['hover_color'] if hovered else self._border)
+            painter.setBrush(fill)
+            painter.drawRoundedRect(rect.adjusted(0, 0, -1, -1), self.RADIUS, self.RADIUS)
+            painter.setPen(self._hover_text_color if hovered else self._text_color)
+            painter.drawText(rect, Qt.AlignCenter, action['text'])
+        painter.restore()
+
+    def sizeHint(self, option, index) -> QSize:
+        width = sum(a['size'][0] for a in self._actions) + self.SPACING * (len(self._actions) - 1)
+        height = max((a['size'][1] for a in self._actions), default=0)
+        return QSize(width + 8, height + 8)
+
+    def editorEvent(self, event, model, option, index) -> bool:
+        """Turn a press + release on the same button into action_clicked."""
+        event_type = event.type()
+        if event_type not in (QEvent.MouseButtonPress, QEvent.MouseButtonRelease,
+                              QEvent.MouseButtonDblClick):
+            return super().editorEvent(event, model, option, index)
+        if event.button() != Qt.LeftButton:
+            return False
+
+        action = self._action_at(event.position().toPoint(), option.rect)
+        if event_type == QEvent.MouseButtonPress:
+            self._pressed = (index.row(), action['name']) if action else None
+        elif event_type == QEvent.MouseButtonRelease:
+            pressed, self._pressed = self._pressed, None
+            if action and pressed == (index.row(), action['name']):
+                logger.debug(f"Row action '{action['name']}' clicked on row {index.row()}")
+                self.action_clicked.emit(action['name'], index.row())
+
+        # Clicks on a button are consumed: no selection change or row double-click
+        return action is not None
+
+    def helpEvent(self, event, view, option, index) -> bool:
+        """Show the tooltip of the button under the mouse."""
+        if event.type() == QEvent.ToolTip:
+            action = self._action_at(event.pos(), option.rect)
+            if action and action['tooltip']:
+                QToolTip.showText(event.globalPos(), action['tooltip'], view)
+                return True
+            QToolTip.hideText()
+            return True
+        return super().helpEvent(event, view, option, index)
+
+    def eventFilter(self, obj, event) -> bool:
+        """Track the hovered button on the view's viewport."""
+        event_type = event.type()
+        if event_type == QEvent.MouseMove:
+            pos = event.position().toPoint()
+            index = self._view.indexAt(pos)
+            hover = None
+            if index.isValid() and self._view.itemDelegateForColumn(index.column()) is self:
+                action = self._action_at(pos, self._view.visualRect(index))
+                if action:
+                    hover = (index.row(), index.column(), action['name'])
+            self._set_hover(hover)
+        elif event_type == QEvent.Leave:
+            self._set_hover(None)
+        return False
+
+    def _set_hover(self, hover):
+        if hover == self._hover:
+            return
+        viewport = self._view.viewport()
+        model = self._view.model()
+        for state in (self._hover, hover):
+            if state is not None and model is not None:
+                viewport.update(self._view.visualRect(model.index(state[0], state[1])))
+        self._hover = hover
+        if hover is None:
+            viewport.unsetCursor()
+        else:
+            viewport.setCursor(Qt.PointingHandCursor)